@@ -0,0 +1,74 @@
+/**
+ * @fileoverview Fleet benchmark: fans `Info.get()` out to 250 fake printers hosted in this process,
+ * comparing the fleet's shared keep-alive agent with a fresh TCP connection per request.
+ * Run with `pnpm bench`.
+ */
+import * as http from 'node:http';
+import { afterAll, beforeAll, bench, describe } from 'vitest';
+import { PrinterFleet } from '../src/PrinterFleet';
+import { FakePrinterServer } from '../src/testing/FakePrinterServer';
+
+const PRINTER_COUNT = 250;
+const LATENCY_MS = 2;
+
+const printers: FakePrinterServer[] = [];
+let pooled: PrinterFleet;
+let unpooled: PrinterFleet;
+
+async function createFleet(options: ConstructorParameters<typeof PrinterFleet>[0]) {
+  const fleet = new PrinterFleet({ connectConcurrency: 32, connectStaggerMs: 0, ...options });
+  for (const printer of printers) {
+    fleet.add({
+      ipAddress: printer.host,
+      serialNumber: printer.serialNumber,
+      checkCode: printer.checkCode,
+      connection: { httpPort: printer.httpPort, httpOnly: true },
+    });
+  }
+  await fleet.waitForConnections();
+
+  const connected = fleet.getPrinters().filter((printer) => printer.state === 'connected').length;
+  if (connected !== PRINTER_COUNT) {
+    throw new Error(`Only ${connected}/${PRINTER_COUNT} fake printers connected`);
+  }
+  return fleet;
+}
+
+async function fanOutInfo(fleet: PrinterFleet) {
+  const results = await fleet.getAllInfo({ concurrency: 64, timeoutMs: 10000 });
+  if (results.some((result) => !result.ok)) {
+    throw new Error('Fan-out failed on at least one printer');
+  }
+}
+
+describe(`Info.get() fan-out to ${PRINTER_COUNT} printers`, () => {
+  beforeAll(async () => {
+    for (let index = 0; index < PRINTER_COUNT; index++) {
+      printers.push(
+        new FakePrinterServer({
+          serialNumber: `SNBENCH${String(index).padStart(5, '0')}`,
+          latencyMs: LATENCY_MS,
+          enableTcp: false,
+        })
+      );
+    }
+    await Promise.all(printers.map((printer) => printer.start()));
+
+    pooled = await createFleet({ maxSocketsPerPrinter: 1, maxTotalSockets: 256 });
+    unpooled = await createFleet({ httpAgent: new http.Agent({ keepAlive: false }) });
+  });
+
+  afterAll(async () => {
+    await pooled?.dispose();
+    await unpooled?.dispose();
+    await Promise.all(printers.map((printer) => printer.stop()));
+  });
+
+  bench('shared keep-alive agent', async () => {
+    await fanOutInfo(pooled);
+  });
+
+  bench('new connection per request', async () => {
+    await fanOutInfo(unpooled);
+  });
+});
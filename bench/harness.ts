@@ -0,0 +1,167 @@
+/**
+ * @fileoverview Latency, throughput and allocation profiling for the benchmark suite. Runs an
+ * operation sequentially, reports p50/p99 latency, ops/sec and heap bytes per operation, and
+ * compares a run with a saved baseline so regressions fail the run.
+ */
+
+/** Options for {@link profile}. */
+export interface ProfileOptions {
+  /** Timed operations (default: 1000). */
+  iterations?: number;
+  /** Untimed operations run first so the JIT and connection pools are warm (default: 10%). */
+  warmup?: number;
+}
+
+/** Measurements for one profiled operation. */
+export interface ProfileResult {
+  name: string;
+  iterations: number;
+  /** Median latency in milliseconds. */
+  p50Ms: number;
+  /** 99th percentile latency in milliseconds. */
+  p99Ms: number;
+  /** Mean latency in milliseconds. */
+  meanMs: number;
+  /** Operations completed per second, run back to back. */
+  opsPerSec: number;
+  /** Average heap growth per operation in bytes, from samples without a garbage collection. */
+  heapBytesPerOp: number;
+}
+
+/** A metric that grew past its baseline by more than the allowed ratio. */
+export interface ProfileRegression {
+  name: string;
+  metric: 'p50Ms' | 'p99Ms' | 'heapBytesPerOp';
+  baseline: number;
+  current: number;
+}
+
+type Operation = () => unknown;
+
+/**
+ * Profiles one operation. Latencies come from a timed pass; heap growth is sampled in a separate
+ * pass so reading heap statistics never inflates the latencies. Samples where the heap shrank (a
+ * garbage collection ran mid-operation) are skipped.
+ * @param name Row label.
+ * @param operation The operation; a returned promise is awaited.
+ * @param options Iteration counts.
+ */
+export async function profile(
+  name: string,
+  operation: Operation,
+  options: ProfileOptions = {}
+): Promise<ProfileResult> {
+  const iterations = options.iterations ?? 1000;
+  const warmup = options.warmup ?? Math.ceil(iterations / 10);
+
+  for (let i = 0; i < warmup; i++) {
+    await operation();
+  }
+
+  const latencies = new Float64Array(iterations);
+  const started = process.hrtime.bigint();
+  for (let i = 0; i < iterations; i++) {
+    const opStart = process.hrtime.bigint();
+    await operation();
+    latencies[i] = Number(process.hrtime.bigint() - opStart) / 1e6;
+  }
+  const elapsedMs = Number(process.hrtime.bigint() - started) / 1e6;
+
+  const allocationSamples = Math.min(iterations, 200);
+  collectGarbage();
+  let heapBytes = 0;
+  let counted = 0;
+  for (let i = 0; i < allocationSamples; i++) {
+    const before = process.memoryUsage().heapUsed;
+    await operation();
+    const growth = process.memoryUsage().heapUsed - before;
+    if (growth >= 0) {
+      heapBytes += growth;
+      counted++;
+    }
+  }
+
+  latencies.sort();
+  return {
+    name,
+    iterations,
+    p50Ms: percentile(latencies, 0.5),
+    p99Ms: percentile(latencies, 0.99),
+    meanMs: elapsedMs / iterations,
+    opsPerSec: (iterations * 1000) / elapsedMs,
+    heapBytesPerOp: counted > 0 ? heapBytes / counted : 0,
+  };
+}
+
+/**
+ * Formats results as an aligned text table.
+ * @param results Results in the order they should be listed.
+ */
+export function formatResults(results: ProfileResult[]): string {
+  const rows = [
+    ['operation', 'p50 ms', 'p99 ms', 'ops/sec', 'heap B/op'],
+    ...results.map((result) => [
+      result.name,
+      result.p50Ms.toFixed(3),
+      result.p99Ms.toFixed(3),
+      Math.round(result.opsPerSec).toString(),
+      Math.round(result.heapBytesPerOp).toString(),
+    ]),
+  ];
+  const widths = rows[0].map((_, column) => Math.max(...rows.map((row) => row[column].length)));
+  return rows
+    .map((row) =>
+      row
+        .map((cell, column) =>
+          column === 0 ? cell.padEnd(widths[0]) : cell.padStart(widths[column])
+        )
+        .join('  ')
+    )
+    .join('\n');
+}
+
+/**
+ * Compares results with a baseline run. Latency and allocation regressions beyond `maxRatio`
+ * (0.25 allows 25% growth) are reported; operations missing from the baseline are skipped.
+ * Latencies below `minMs` are ignored, since timer noise dominates them.
+ * @param results Current run.
+ * @param baseline Earlier run, e.g. parsed from a `--json` report.
+ * @param maxRatio Allowed relative growth.
+ * @param minMs Latency floor below which differences are ignored.
+ */
+export function findRegressions(
+  results: ProfileResult[],
+  baseline: ProfileResult[],
+  maxRatio = 0.25,
+  minMs = 0.05
+): ProfileRegression[] {
+  const byName = new Map(baseline.map((result) => [result.name, result]));
+  const regressions: ProfileRegression[] = [];
+  for (const result of results) {
+    const previous = byName.get(result.name);
+    if (!previous) continue;
+    for (const metric of ['p50Ms', 'p99Ms', 'heapBytesPerOp'] as const) {
+      const floor = metric === 'heapBytesPerOp' ? 64 : minMs;
+      if (result[metric] > Math.max(previous[metric], floor) * (1 + maxRatio)) {
+        regressions.push({
+          name: result.name,
+          metric,
+          baseline: previous[metric],
+          current: result[metric],
+        });
+      }
+    }
+  }
+  return regressions;
+}
+
+function percentile(sorted: Float64Array, fraction: number): number {
+  if (sorted.length === 0) return 0;
+  return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * fraction))];
+}
+
+/** Runs a full collection when node was started with `--expose-gc`. */
+function collectGarbage(): void {
+  const gc = (globalThis as { gc?: () => void }).gc;
+  gc?.();
+}
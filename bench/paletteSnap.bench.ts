@@ -0,0 +1,51 @@
+/**
+ * @fileoverview Palette snapping benchmark: snaps a job pipeline's worth of tool colors to the
+ * AD5X palette, comparing the scalar `snapToAD5XPalette` with the batch `snapRgbToPalette` on a
+ * fresh table (every color computed) and on a warm table (every color memoized).
+ * Run with `pnpm bench`.
+ */
+import { bench, describe } from 'vitest';
+import { AD5X_PALETTE, snapToAD5XPalette } from '../src/api/controls/ad5xPalette';
+import { buildPaletteTable, snapRgbToPalette } from '../src/api/controls/paletteSnap';
+
+const JOB_COUNT = 1000;
+const TOOLS_PER_JOB = 4;
+const DISTINCT_COLORS = 200;
+
+// Jobs reuse a limited set of filament colors, as a real print farm does.
+const distinct: number[] = [];
+let seed = 42;
+for (let i = 0; i < DISTINCT_COLORS; i++) {
+  seed = (seed * 1103515245 + 12345) % 2147483648;
+  distinct.push(seed & 0xffffff);
+}
+
+const rgb = new Uint8Array(JOB_COUNT * TOOLS_PER_JOB * 3);
+const hexes: string[] = [];
+for (let i = 0; i < JOB_COUNT * TOOLS_PER_JOB; i++) {
+  const color = distinct[(i * 7) % DISTINCT_COLORS];
+  rgb[i * 3] = color >> 16;
+  rgb[i * 3 + 1] = (color >> 8) & 0xff;
+  rgb[i * 3 + 2] = color & 0xff;
+  hexes.push(`#${color.toString(16).padStart(6, '0')}`);
+}
+
+const warmTable = buildPaletteTable(AD5X_PALETTE);
+const out = new Uint8Array(hexes.length);
+snapRgbToPalette(rgb, warmTable, out);
+
+describe(`snap ${hexes.length} tool colors (${DISTINCT_COLORS} distinct)`, () => {
+  bench('scalar snapToAD5XPalette', () => {
+    for (let i = 0; i < hexes.length; i++) {
+      out[i] = snapToAD5XPalette(hexes[i]).index;
+    }
+  });
+
+  bench('batch, fresh table', () => {
+    snapRgbToPalette(rgb, buildPaletteTable(AD5X_PALETTE), out);
+  });
+
+  bench('batch, warm table', () => {
+    snapRgbToPalette(rgb, warmTable, out);
+  });
+});
@@ -0,0 +1,254 @@
+/**
+ * @fileoverview Profiling suite for the transport and parser hot paths, driven by in-process fake
+ * printers. Reports p50/p99 latency, ops/sec and heap bytes per operation for TCP command round
+ * trips (whole, fragmented and delayed replies, M662 binary replies), the TCP reply parsers,
+ * `MachineInfo.fromDetail`, the HTTP command queue (`runCommandExclusive`) and upload streaming.
+ *
+ * Run with `pnpm bench:profile`. Flags:
+ * - `--filter <text>`: only run operations whose name contains the text
+ * - `--quick`: a tenth of the iterations, for smoke runs
+ * - `--json <file>`: also write the results as JSON
+ * - `--baseline <file>`: compare with an earlier `--json` report and exit 1 on a regression
+ * - `--max-regression <ratio>`: allowed growth over the baseline (default: 0.25)
+ */
+import * as fs from 'node:fs';
+import { Commands } from '../src/api/server/Commands';
+import { FiveMClient } from '../src/FiveMClient';
+import type { FFPrinterDetail } from '../src/models/ff-models';
+import { MachineInfo } from '../src/models/MachineInfo';
+import { FlashForgeA3Client } from '../src/tcpapi/FlashForgeA3Client';
+import { FlashForgeClient } from '../src/tcpapi/FlashForgeClient';
+import { EndstopStatus } from '../src/tcpapi/replays/EndstopStatus';
+import { LocationInfo } from '../src/tcpapi/replays/LocationInfo';
+import { PrinterInfo } from '../src/tcpapi/replays/PrinterInfo';
+import { PrintStatus } from '../src/tcpapi/replays/PrintStatus';
+import { TempInfo } from '../src/tcpapi/replays/TempInfo';
+import { ThumbnailInfo } from '../src/tcpapi/replays/ThumbnailInfo';
+import { FakePrinterServer, type FakePrinterOptions } from '../src/testing/FakePrinterServer';
+import {
+  findRegressions,
+  formatResults,
+  type ProfileOptions,
+  type ProfileResult,
+  profile,
+} from './harness';
+
+interface Args {
+  filter: string;
+  quick: boolean;
+  json: string | null;
+  baseline: string | null;
+  maxRegression: number;
+}
+
+function parseArgs(argv: string[]): Args {
+  const args: Args = { filter: '', quick: false, json: null, baseline: null, maxRegression: 0.25 };
+  for (let i = 0; i < argv.length; i++) {
+    switch (argv[i]) {
+      case '--filter':
+        args.filter = argv[++i] ?? '';
+        break;
+      case '--quick':
+        args.quick = true;
+        break;
+      case '--json':
+        args.json = argv[++i] ?? null;
+        break;
+      case '--baseline':
+        args.baseline = argv[++i] ?? null;
+        break;
+      case '--max-regression':
+        args.maxRegression = Number(argv[++i]);
+        break;
+      default:
+        throw new Error(`Unknown argument: ${argv[i]}`);
+    }
+  }
+  return args;
+}
+
+/** A PNG-signed payload the size of a typical slicer thumbnail. */
+const THUMBNAIL = Buffer.concat([
+  Buffer.from([0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a]),
+  Buffer.alloc(64 * 1024 - 8, 0x5a),
+]);
+
+/** `/detail` fields of an AD5X with a loaded four-slot material station. */
+const AD5X_DETAIL: Partial<FFPrinterDetail> = {
+  name: 'AD5X',
+  pid: 38,
+  firmwareVersion: '1.1.3-1.0.8',
+  status: 'printing',
+  printFileName: 'benchy.gcode',
+  printProgress: 0.42,
+  printLayer: 120,
+  targetPrintLayer: 280,
+  estimatedTime: 5400,
+  hasMatlStation: true,
+  matlStationInfo: {
+    currentLoadSlot: 1,
+    currentSlot: 1,
+    slotCnt: 4,
+    slotInfos: [
+      { hasFilament: true, materialColor: '#FFFFFF', materialName: 'PLA', slotId: 1 },
+      { hasFilament: true, materialColor: '#2750E0', materialName: 'PLA', slotId: 2 },
+      { hasFilament: true, materialColor: '#FEF043', materialName: 'PETG', slotId: 3 },
+      { hasFilament: false, materialColor: '', materialName: '', slotId: 4 },
+    ],
+    stateAction: 0,
+    stateStep: 0,
+  },
+};
+
+const printers: FakePrinterServer[] = [];
+const disposers: Array<() => Promise<void>> = [];
+
+async function startPrinter(options: FakePrinterOptions): Promise<FakePrinterServer> {
+  const printer = new FakePrinterServer(options);
+  await printer.start();
+  printers.push(printer);
+  return printer;
+}
+
+async function tcpClient(options: FakePrinterOptions = {}): Promise<FlashForgeClient> {
+  const printer = await startPrinter(options);
+  const client = new FlashForgeClient(printer.host, { port: printer.tcpPort });
+  disposers.push(() => client.dispose());
+  return client;
+}
+
+async function reply(client: FlashForgeClient, cmd: string): Promise<string> {
+  const response = await client.sendCommandAsync(cmd);
+  if (!response) throw new Error(`No reply to ${cmd}`);
+  return response;
+}
+
+async function main(): Promise<void> {
+  const args = parseArgs(process.argv.slice(2));
+  const scale = args.quick ? 0.1 : 1;
+  const results: ProfileResult[] = [];
+
+  const write = (text: string) => process.stdout.write(`${text}\n`);
+
+  const run = async (name: string, operation: () => unknown, options: ProfileOptions) => {
+    if (!name.includes(args.filter)) return;
+    const iterations = Math.max(10, Math.round((options.iterations ?? 1000) * scale));
+    results.push(await profile(name, operation, { ...options, iterations }));
+    write(`  done: ${name}`);
+  };
+
+  try {
+    // TCP round trips on the 8899 command channel.
+    const tcp = await tcpClient();
+    const fragmented = await tcpClient({ tcpChunkSize: 16 });
+    const delayed = await tcpClient({ latencyMs: 1, tcpChunkSize: 64, tcpChunkDelayMs: 1 });
+    const a3Printer = await startPrinter({
+      thumbnail: THUMBNAIL,
+      thumbnailFormat: 'adventurer3',
+      tcpChunkSize: 1460,
+    });
+    const a3 = new FlashForgeA3Client(a3Printer.host, { port: a3Printer.tcpPort });
+    disposers.push(() => a3.dispose());
+
+    await run('tcp sendCommandAsync M115', () => reply(tcp, '~M115'), { iterations: 2000 });
+    await run('tcp sendCommandAsync M119, 16 B fragments', () => reply(fragmented, '~M119'), {
+      iterations: 1000,
+    });
+    await run(
+      'tcp sendCommandAsync M105, 1 ms latency, 64 B fragments 1 ms apart',
+      () => reply(delayed, '~M105'),
+      { iterations: 300 }
+    );
+    // The Adventurer 5M M662 framing waits out a fixed 1.5 s settle window after `ok`, so the
+    // length-framed Adventurer 3 path is the one worth timing.
+    await run(
+      'tcp M662 64 KiB thumbnail, 1460 B fragments (A3 framing)',
+      () => a3.sendBinaryCommandAsync('~M662 benchy.gcode'),
+      { iterations: 500 }
+    );
+
+    // Reply parsers, on replies captured from the simulator.
+    const m115 = await reply(tcp, '~M115');
+    const m105 = await reply(tcp, '~M105');
+    const m119 = await reply(tcp, '~M119');
+    const m114 = await reply(tcp, '~M114');
+    const m27 = await reply(tcp, '~M27');
+    const m662 = Buffer.concat([Buffer.from('CMD M662 Received.\r\nok\r\n', 'latin1'), THUMBNAIL]);
+    const parserRuns: Array<[string, () => unknown]> = [
+      ['parse PrinterInfo (M115)', () => new PrinterInfo().fromReplay(m115)],
+      ['parse TempInfo (M105)', () => new TempInfo().fromReplay(m105)],
+      ['parse EndstopStatus (M119)', () => new EndstopStatus().fromReplay(m119)],
+      ['parse LocationInfo (M114)', () => new LocationInfo().fromReplay(m114)],
+      ['parse PrintStatus (M27)', () => new PrintStatus().fromReplay(m27)],
+      ['parse ThumbnailInfo (M662, 64 KiB)', () => new ThumbnailInfo().fromReplay(m662, 'a')],
+    ];
+    for (const [name, operation] of parserRuns) {
+      await run(name, operation, { iterations: 20000 });
+    }
+
+    // HTTP API on the 8898 port.
+    const httpPrinter = await startPrinter({ enableTcp: false, detail: AD5X_DETAIL });
+    const detail = httpPrinter.detail;
+    await run('MachineInfo.fromDetail (AD5X)', () => new MachineInfo().fromDetail(detail), {
+      iterations: 20000,
+    });
+
+    const client = new FiveMClient(
+      httpPrinter.host,
+      httpPrinter.serialNumber,
+      httpPrinter.checkCode,
+      { httpPort: httpPrinter.httpPort, httpOnly: true }
+    );
+    disposers.push(() => client.dispose());
+    if (!(await client.initialize())) throw new Error('FiveMClient failed to connect');
+
+    await run('http Info.get() /detail', () => client.info.get(), { iterations: 1000 });
+    await run(
+      'runCommandExclusive, empty command',
+      () => client.runCommandExclusive(async () => undefined),
+      { iterations: 20000 }
+    );
+    const control = () =>
+      client.control.sendControlCommand(Commands.LightControlCmd, { status: 'open' });
+    await run(
+      'runCommandExclusive, 16 queued /control POSTs',
+      () => Promise.all(Array.from({ length: 16 }, control)),
+      { iterations: 100 }
+    );
+
+    const upload = Buffer.alloc(8 * 1024 * 1024, 'G1 X10 Y10 E0.5\n');
+    await run(
+      'http upload 8 MiB (UploadEngine stream)',
+      () => client.jobControl.uploadFile({ fileName: 'bench.gcode', data: upload }, false, false),
+      { iterations: 20, warmup: 2 }
+    );
+  } finally {
+    for (const dispose of disposers.reverse()) {
+      await dispose().catch(() => undefined);
+    }
+    await Promise.all(printers.map((printer) => printer.stop()));
+  }
+
+  write('');
+  write(formatResults(results));
+
+  if (args.json) {
+    fs.writeFileSync(args.json, `${JSON.stringify(results, null, 2)}\n`);
+  }
+  if (args.baseline) {
+    const baseline = JSON.parse(fs.readFileSync(args.baseline, 'utf8')) as ProfileResult[];
+    const regressions = findRegressions(results, baseline, args.maxRegression);
+    for (const regression of regressions) {
+      write(
+        `REGRESSION ${regression.name} ${regression.metric}: ` +
+          `${regression.baseline.toFixed(3)} -> ${regression.current.toFixed(3)}`
+      );
+    }
+    if (regressions.length > 0) process.exitCode = 1;
+  }
+}
+
+main().catch((error: unknown) => {
+  process.stderr.write(`${error instanceof Error ? error.stack : String(error)}\n`);
+  process.exitCode = 1;
+});
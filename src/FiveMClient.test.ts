@@ -46,7 +46,10 @@ describe('FiveMClient', () => {
     const client = new FiveMClient('192.168.1.10', 'SN-1', 'CHK-1');
 
     expect(client.getEndpoint('/detail')).toBe('http://192.168.1.10:8898/detail');
-    expect(flashForgeClientConstructor).toHaveBeenCalledWith('192.168.1.10', undefined);
+    expect(flashForgeClientConstructor).toHaveBeenCalledWith('192.168.1.10', {
+      port: undefined,
+      fileCache: client.files.cache,
+    });
   });
 
   it('uses custom HTTP and TCP ports when overrides are provided', () => {
@@ -56,7 +59,25 @@ describe('FiveMClient', () => {
     });
 
     expect(client.getEndpoint('/detail')).toBe('http://192.168.1.10:19098/detail');
-    expect(flashForgeClientConstructor).toHaveBeenCalledWith('192.168.1.10', { port: 19099 });
+    expect(flashForgeClientConstructor).toHaveBeenCalledWith('192.168.1.10', {
+      port: 19099,
+      fileCache: client.files.cache,
+    });
+  });
+
+  it('shares one file cache, built from the fileCache options, with the TCP client', async () => {
+    const client = new FiveMClient('192.168.1.10', 'SN-1', 'CHK-1', {
+      fileCache: { listTtlMs: 60_000 },
+    });
+    const [, tcpOptions] = flashForgeClientConstructor.mock.calls[0];
+    const fetchList = vi.fn().mockResolvedValue(['a.gcode']);
+    const byName = (name: string) => ({ name, version: '' });
+
+    await client.files.cache.getFileList('m661', fetchList, byName, true);
+    await tcpOptions.fileCache.getFileList('m661', fetchList, byName, true);
+
+    expect(tcpOptions.fileCache).toBe(client.files.cache);
+    expect(fetchList).toHaveBeenCalledTimes(1);
   });
 
   it('caches the runtime OEM camera stream URL from machine info', () => {
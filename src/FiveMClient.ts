@@ -1,7 +1,9 @@
 /**
  * @fileoverview Main client for controlling FlashForge 5M/5M Pro/AD5X printers via dual HTTP/TCP protocols.
  */
+import type * as http from 'node:http';
 import axios from 'axios';
+import { PrinterFileCache, type PrinterFileCacheOptions } from './api/cache/PrinterFileCache';
 import { Control, type GenericResponse } from './api/controls/Control';
 import { Files } from './api/controls/Files';
 import { Info } from './api/controls/Info';
@@ -9,6 +11,13 @@ import { JobControl } from './api/controls/JobControl';
 import { TempControl } from './api/controls/TempControl';
 import { NetworkUtils } from './api/network/NetworkUtils';
 import { Endpoints } from './api/server/Endpoints';
+import { StatusWatcher } from './api/StatusWatcher';
+import {
+  type CommandQueueEvent,
+  commandQueueChannel,
+  traceHttpRequest,
+} from './diagnostics/Diagnostics';
+import { log } from './diagnostics/Logger';
 import type { FFMachineInfo, Temperature } from './models/ff-models';
 import { MachineInfo } from './models/MachineInfo';
 import { FlashForgeClient } from './tcpapi/FlashForgeClient';
@@ -30,6 +39,17 @@ export interface FiveMClientConnectionOptions {
    * USB product ID) to skip the TCP probe entirely and avoid its connect timeout.
    */
   httpOnly?: boolean;
+  /**
+   * Agent for HTTP API requests (defaults to Node's global agent). Pass one keep-alive agent to
+   * many clients to share a bounded socket pool across printers, as {@link PrinterFleet} does.
+   */
+  httpAgent?: http.Agent;
+  /**
+   * Memory/disk budgets and list TTL for the file list and thumbnail cache used by
+   * {@link Files} and the embedded TCP client, which share one cache. Set `persistDir` to keep
+   * thumbnails across restarts.
+   */
+  fileCache?: PrinterFileCacheOptions;
 }
 
 /**
@@ -53,6 +73,11 @@ export class FiveMClient {
   public tempControl: TempControl;
   /** Instance for lower-level TCP communication with the printer. */
   public tcpClient: FlashForgeClient;
+  /**
+   * Push-style status subscription over the detail endpoint. Idle until `start()` is called;
+   * create a separate {@link StatusWatcher} for custom intervals or thresholds.
+   */
+  public statusWatcher: StatusWatcher;
 
   /**
    * When true, the legacy TCP control channel is never used (HTTP API only).
@@ -67,6 +92,8 @@ export class FiveMClient {
   public checkCode: string;
   /** HTTP client for making requests to the printer's API. */
   public httpClient: ReturnType<typeof axios.create>;
+  /** Agent used for HTTP API requests, or undefined for Node's global agent. */
+  public readonly httpAgent: http.Agent | undefined;
 
   /** True while at least one command is queued or in flight. */
   private httpClientBusy = false;
@@ -151,9 +178,11 @@ export class FiveMClient {
     this.checkCode = checkCode;
     this.PORT = options?.httpPort ?? 8898;
     this.httpOnly = options?.httpOnly ?? false;
+    this.httpAgent = options?.httpAgent;
 
     this.httpClient = axios.create({
       timeout: 5000,
+      httpAgent: this.httpAgent,
       headers: {
         Accept: '*/*',
       },
@@ -161,14 +190,17 @@ export class FiveMClient {
 
     // FlashForgeClient is used internally for some "lower-level" stuff like sending direct g/m-code
     // That isn't available over the new API
-    const tcpOptions = options?.tcpPort !== undefined ? { port: options.tcpPort } : undefined;
-    this.tcpClient = new FlashForgeClient(ipAddress, tcpOptions);
+    // One cache serves both transports, so an upload through either one invalidates the
+    // thumbnail the other would serve.
+    const fileCache = new PrinterFileCache(serialNumber, options?.fileCache);
+    this.tcpClient = new FlashForgeClient(ipAddress, { port: options?.tcpPort, fileCache });
 
     this.control = new Control(this);
     this.jobControl = new JobControl(this);
     this.info = new Info(this);
-    this.files = new Files(this);
+    this.files = new Files(this, fileCache);
     this.tempControl = new TempControl(this);
+    this.statusWatcher = new StatusWatcher(this);
   }
 
   /**
@@ -180,7 +212,7 @@ export class FiveMClient {
     if (connected) {
       return true;
     }
-    console.log('Failed to connect to printer');
+    log.warn('Failed to connect to printer');
     return false;
   }
 
@@ -213,6 +245,7 @@ export class FiveMClient {
   public async runCommandExclusive<T>(fn: () => Promise<T>): Promise<T> {
     this.queuedCommandCount++;
     this.httpClientBusy = true;
+    this.publishCommandQueueDepth();
 
     // `fn` runs as both handlers so the command starts even if the previous
     // tail ever rejects (the tail is built to never reject).
@@ -232,6 +265,20 @@ export class FiveMClient {
   private settleQueuedCommand(): void {
     this.queuedCommandCount--;
     this.httpClientBusy = this.queuedCommandCount > 0;
+    this.publishCommandQueueDepth();
+  }
+
+  /** Number of commands queued or running on the command queue. */
+  public get commandQueueDepth(): number {
+    return this.queuedCommandCount;
+  }
+
+  /** Publishes the command queue depth when a diagnostics subscriber listens. */
+  private publishCommandQueueDepth(): void {
+    if (commandQueueChannel.hasSubscribers) {
+      const event: CommandQueueEvent = { host: this.ipAddress, depth: this.queuedCommandCount };
+      commandQueueChannel.publish(event);
+    }
   }
 
   /**
@@ -248,7 +295,7 @@ export class FiveMClient {
       if (this.httpOnly) return true;
       return await this.tcpClient.initControl();
     }
-    console.log('New API control failed!');
+    log.warn('New API control failed!');
     return false;
   }
 
@@ -257,6 +304,7 @@ export class FiveMClient {
    */
   public async dispose(): Promise<void> {
     this.cameraStreamUrl = '';
+    this.statusWatcher.stop();
     // No TCP channel was opened in HTTP-only mode, so nothing to tear down.
     if (this.httpOnly) return;
     await this.tcpClient.dispose();
@@ -384,7 +432,7 @@ export class FiveMClient {
     try {
       const response = await this.info.getDetailResponse();
       if (!response || !NetworkUtils.isOk(response)) {
-        console.log('Failed to get valid response from printer API');
+        log.warn('Failed to get valid response from printer API');
         return false;
       }
 
@@ -417,7 +465,7 @@ export class FiveMClient {
             this.isPro = true;
           }
         } else {
-          console.error('Unable to get PrinterInfo from TcpAPI, some details might be incomplete');
+          log.error('Unable to get PrinterInfo from TcpAPI, some details might be incomplete');
         }
         // we should probably return false if tcpInfo is null here, like we do for machineInfo,
         // but for now, we'll let cacheDetails be the primary source of truth for these flags.
@@ -426,8 +474,8 @@ export class FiveMClient {
       return this.cacheDetails(machineInfo);
     } catch (error: unknown) {
       const err = error as Error;
-      console.log(`Error in verifyConnection: ${err.message}`);
-      console.log(err.stack);
+      log.warn(`Error in verifyConnection: ${err.message}`);
+      log.debug(err.stack ?? err.message);
       return false;
     }
   }
@@ -472,7 +520,9 @@ export class FiveMClient {
 
     try {
       const response = await this.runCommandExclusive(async () =>
-        this.httpClient.post(this.getEndpoint(Endpoints.Product), payload)
+        traceHttpRequest(this.ipAddress, Endpoints.Product, () =>
+          this.httpClient.post(this.getEndpoint(Endpoints.Product), payload)
+        )
       );
 
       if (response.status !== 200) return false;
@@ -502,11 +552,11 @@ export class FiveMClient {
           return true;
         }
       } catch (error) {
-        console.error(`SendProductCommand error: ${(error as Error).message}`);
+        log.error(`SendProductCommand error: ${(error as Error).message}`);
         throw error;
       }
     } catch (error) {
-      console.error(`SendProductCommand HTTP error: ${(error as Error).message}`);
+      log.error(`SendProductCommand HTTP error: ${(error as Error).message}`);
       throw error;
     }
 
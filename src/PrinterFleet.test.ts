@@ -0,0 +1,163 @@
+/**
+ * @fileoverview Integration tests for PrinterFleet against local fake printers, covering staggered
+ * connection, shared keep-alive sockets, fan-out results, per-printer timeouts and reconnects.
+ */
+import { afterEach, describe, expect, it } from 'vitest';
+import { Endpoints } from './api/server/Endpoints';
+import { type FleetPrinter, PrinterFleet, PrinterFleetError } from './PrinterFleet';
+import { FakePrinterServer, type FakePrinterOptions } from './testing/FakePrinterServer';
+
+describe('PrinterFleet', () => {
+  let printers: FakePrinterServer[] = [];
+  let fleet: PrinterFleet | null = null;
+
+  async function startPrinters(count: number, options: FakePrinterOptions = {}) {
+    const started = Array.from(
+      { length: count },
+      (_, index) =>
+        new FakePrinterServer({
+          serialNumber: `SN${String(index).padStart(4, '0')}`,
+          name: `Printer ${index}`,
+          ...options,
+        })
+    );
+    await Promise.all(started.map((printer) => printer.start()));
+    printers.push(...started);
+    return started;
+  }
+
+  function addAll(target: PrinterFleet, servers: FakePrinterServer[], httpOnly = true) {
+    for (const server of servers) {
+      target.add({
+        ipAddress: server.host,
+        serialNumber: server.serialNumber,
+        checkCode: server.checkCode,
+        connection: { httpPort: server.httpPort, tcpPort: server.tcpPort, httpOnly },
+      });
+    }
+  }
+
+  afterEach(async () => {
+    await fleet?.dispose();
+    fleet = null;
+    await Promise.all(printers.map((printer) => printer.stop()));
+    printers = [];
+  });
+
+  it('connects every printer over HTTP and TCP and fans out Info.get()', async () => {
+    const servers = await startPrinters(3);
+    fleet = new PrinterFleet({ connectStaggerMs: 0 });
+    addAll(fleet, servers, false);
+
+    await fleet.waitForConnections();
+
+    expect(fleet.getPrinters().map((printer) => printer.state)).toEqual([
+      'connected',
+      'connected',
+      'connected',
+    ]);
+    for (const server of servers) {
+      expect(server.getTcpCommandCount('M115')).toBe(1);
+    }
+
+    const results = await fleet.getAllInfo();
+    expect(results.map((result) => (result.ok ? result.value.Name : result.error.message))).toEqual(
+      ['Printer 0', 'Printer 1', 'Printer 2']
+    );
+  });
+
+  it('caps concurrent connection attempts', async () => {
+    const servers = await startPrinters(6, { latencyMs: 20, enableTcp: false });
+    fleet = new PrinterFleet({ connectConcurrency: 2, connectStaggerMs: 0 });
+
+    let inFlight = 0;
+    let peak = 0;
+    for (const server of servers) {
+      server.on('http', (path: string) => {
+        if (path !== Endpoints.Detail) return;
+        inFlight++;
+        peak = Math.max(peak, inFlight);
+        setTimeout(() => inFlight--, server.latencyMs);
+      });
+    }
+
+    addAll(fleet, servers);
+    await fleet.waitForConnections();
+
+    expect(peak).toBeLessThanOrEqual(2);
+    expect(fleet.getPrinters().every((printer) => printer.state === 'connected')).toBe(true);
+  });
+
+  it('reuses keep-alive sockets across repeated fan-outs', async () => {
+    const servers = await startPrinters(4, { enableTcp: false });
+    fleet = new PrinterFleet({ connectStaggerMs: 0, maxSocketsPerPrinter: 1 });
+    addAll(fleet, servers);
+    await fleet.waitForConnections();
+
+    for (let round = 0; round < 5; round++) {
+      const results = await fleet.getAllInfo({ concurrency: 2 });
+      expect(results.every((result) => result.ok)).toBe(true);
+    }
+
+    for (const server of servers) {
+      expect(server.getHttpRequestCount(Endpoints.Detail)).toBe(6);
+      expect(server.httpConnections).toBe(1);
+    }
+  });
+
+  it('reports a per-printer timeout without failing the other printers', async () => {
+    const servers = await startPrinters(2, { enableTcp: false });
+    fleet = new PrinterFleet({ connectStaggerMs: 0 });
+    addAll(fleet, servers);
+    await fleet.waitForConnections();
+
+    servers[1].latencyMs = 200;
+    const results = await fleet.getAllInfo({ timeoutMs: 50 });
+
+    expect(results[0].ok).toBe(true);
+    expect(results[1].ok).toBe(false);
+    if (!results[1].ok) {
+      expect(results[1].error).toBeInstanceOf(PrinterFleetError);
+      expect(results[1].error).toHaveProperty('code', 'TIMEOUT');
+    }
+  });
+
+  it('reconnects a printer with backoff after it drops off the network', async () => {
+    const [server] = await startPrinters(1, { enableTcp: false });
+    fleet = new PrinterFleet({
+      connectStaggerMs: 0,
+      failureThreshold: 1,
+      reconnectBaseDelayMs: 10,
+    });
+    addAll(fleet, [server]);
+    await fleet.waitForConnections();
+
+    const disconnected = new Promise<FleetPrinter>((resolve) =>
+      fleet?.once('disconnected', resolve)
+    );
+    const reconnecting = new Promise<number>((resolve) =>
+      fleet?.once('reconnecting', (_printer: FleetPrinter, delayMs: number) => resolve(delayMs))
+    );
+
+    server.setOffline(true);
+    const [failed] = await fleet.getAllInfo();
+    expect(failed.ok).toBe(false);
+    expect((await disconnected).state).toBe('disconnected');
+    expect(await reconnecting).toBeLessThanOrEqual(10);
+
+    const reconnected = new Promise<FleetPrinter>((resolve) => fleet?.once('connected', resolve));
+    server.setOffline(false);
+
+    expect((await reconnected).state).toBe('connected');
+    const [recovered] = await fleet.getAllInfo();
+    expect(recovered.ok).toBe(true);
+  });
+
+  it('rejects fan-out to an unknown serial number', async () => {
+    fleet = new PrinterFleet();
+
+    await expect(
+      fleet.fanOut(async () => 1, { serialNumbers: ['missing'] })
+    ).rejects.toHaveProperty('code', 'UNKNOWN_PRINTER');
+  });
+});
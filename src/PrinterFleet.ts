@@ -0,0 +1,562 @@
+/**
+ * @fileoverview Multi-printer orchestration for fleets of 5M/5M Pro/AD5X/Creator 5 printers. Shares
+ * one keep-alive HTTP agent across FiveMClient instances, connects printers with capped and
+ * staggered concurrency, reconnects them with exponential backoff, and fans calls out to every
+ * printer with a concurrency limit and per-printer timeouts.
+ */
+import { EventEmitter } from 'node:events';
+import * as http from 'node:http';
+import { ConcurrencyLimiter } from './api/misc/ConcurrencyLimiter';
+import { PrinterDiscovery } from './api/PrinterDiscovery';
+import { FiveMClient, type FiveMClientConnectionOptions } from './FiveMClient';
+import type { FFMachineInfo } from './models/ff-models';
+import type { DiscoveredPrinter, DiscoveryOptions } from './models/PrinterDiscovery';
+
+/**
+ * Connection details for one printer in a fleet.
+ */
+export interface FleetPrinterConfig {
+  /** Printer IP address. */
+  ipAddress: string;
+  /** Printer serial number; identifies the printer within the fleet. */
+  serialNumber: string;
+  /** Printer check code. */
+  checkCode: string;
+  /** Port and transport overrides. `httpAgent` is always replaced by the fleet's shared agent. */
+  connection?: FiveMClientConnectionOptions;
+}
+
+/**
+ * Connection state of a fleet printer.
+ */
+export type FleetPrinterState = 'connecting' | 'connected' | 'disconnected';
+
+/**
+ * Snapshot of one fleet printer.
+ */
+export interface FleetPrinter {
+  /** Printer serial number. */
+  serialNumber: string;
+  /** Printer IP address. */
+  ipAddress: string;
+  /** The client used to talk to the printer; null until the first connection attempt starts. */
+  client: FiveMClient | null;
+  /** Current connection state. */
+  state: FleetPrinterState;
+  /** Failed connection attempts since the printer was last connected. */
+  reconnectAttempts: number;
+  /** Most recent connection or call error, if any. */
+  lastError: Error | null;
+}
+
+/**
+ * Outcome of a fan-out call on one printer.
+ */
+export type FleetResult<T> =
+  | { serialNumber: string; ok: true; value: T }
+  | { serialNumber: string; ok: false; error: Error };
+
+/**
+ * Options for {@link PrinterFleet.fanOut}.
+ */
+export interface FleetFanOutOptions {
+  /** Maximum number of printers called at once (defaults to the fleet's `concurrency`). */
+  concurrency?: number;
+  /** Per-printer timeout in milliseconds (defaults to the fleet's `timeoutMs`). */
+  timeoutMs?: number;
+  /** Restricts the call to these serial numbers (defaults to every connected printer). */
+  serialNumbers?: string[];
+}
+
+/**
+ * Configuration options for a {@link PrinterFleet}.
+ */
+export interface PrinterFleetOptions {
+  /** Maximum sockets per printer in the shared HTTP agent (default: 2). */
+  maxSocketsPerPrinter?: number;
+  /** Maximum sockets across all printers in the shared HTTP agent (default: 64). */
+  maxTotalSockets?: number;
+  /** Maximum idle keep-alive sockets kept per printer (default: 1). */
+  maxFreeSockets?: number;
+  /** Initial delay of TCP keep-alive packets on pooled sockets, in milliseconds (default: 1000). */
+  keepAliveMsecs?: number;
+  /** Use this agent instead of creating one. The fleet does not destroy an agent it was given. */
+  httpAgent?: http.Agent;
+  /** Maximum number of printers connecting at once (default: 8). */
+  connectConcurrency?: number;
+  /** Minimum time between two connection attempts, in milliseconds (default: 25). */
+  connectStaggerMs?: number;
+  /** Default fan-out concurrency (default: 16). */
+  concurrency?: number;
+  /** Default per-printer fan-out and connection timeout, in milliseconds (default: 5000). */
+  timeoutMs?: number;
+  /** First reconnect delay, in milliseconds (default: 1000). */
+  reconnectBaseDelayMs?: number;
+  /** Upper bound of the reconnect delay, in milliseconds (default: 60000). */
+  reconnectMaxDelayMs?: number;
+  /** Give up on a printer after this many failed attempts in a row (default: Infinity). */
+  maxReconnectAttempts?: number;
+  /** Consecutive fan-out failures after which a connected printer is reconnected (default: 3). */
+  failureThreshold?: number;
+}
+
+/**
+ * Error raised for fleet calls that cannot reach a printer.
+ */
+export class PrinterFleetError extends Error {
+  /** Machine-readable reason: `TIMEOUT`, `NOT_CONNECTED`, `CONNECT_FAILED` or `UNKNOWN_PRINTER`. */
+  public readonly code: string;
+
+  /**
+   * Creates a new PrinterFleetError.
+   * @param message Human-readable error description
+   * @param code Machine-readable error code identifier
+   */
+  constructor(message: string, code: string) {
+    super(message);
+    this.name = 'PrinterFleetError';
+    this.code = code;
+  }
+}
+
+/** Internal mutable state for one fleet printer. */
+interface FleetEntry {
+  config: FleetPrinterConfig;
+  client: FiveMClient | null;
+  state: FleetPrinterState;
+  reconnectAttempts: number;
+  consecutiveFailures: number;
+  lastError: Error | null;
+  reconnectTimer: NodeJS.Timeout | null;
+  /** Set once the printer is removed, so pending connection work is discarded. */
+  removed: boolean;
+}
+
+/**
+ * Manages many FiveMClient instances from one Node process.
+ *
+ * All clients share one keep-alive HTTP agent, so the total number of sockets stays bounded no
+ * matter how many printers are in the fleet, and repeated polls reuse warm connections instead of
+ * paying a TCP handshake per request. Printers connect through a limiter that caps concurrent
+ * `initialize()` calls and spaces them out, which avoids a thundering herd when a large fleet
+ * comes up at once. A printer that fails to connect, or fails `failureThreshold` fan-out calls in a
+ * row, is retried with exponential backoff and jitter.
+ *
+ * Events:
+ * - `connected` (printer: FleetPrinter)
+ * - `disconnected` (printer: FleetPrinter, error: Error)
+ * - `reconnecting` (printer: FleetPrinter, delayMs: number)
+ * - `removed` (serialNumber: string)
+ *
+ * Example usage:
+ * ```typescript
+ * const fleet = new PrinterFleet({ concurrency: 32 });
+ * fleet.add({ ipAddress: '192.168.1.50', serialNumber: 'SN1', checkCode: '123456' });
+ * await fleet.waitForConnections();
+ * for (const result of await fleet.getAllInfo()) {
+ *   if (result.ok) console.log(result.serialNumber, result.value?.Status);
+ * }
+ * await fleet.dispose();
+ * ```
+ */
+export class PrinterFleet extends EventEmitter {
+  /** Keep-alive agent shared by every client in the fleet. */
+  public readonly httpAgent: http.Agent;
+
+  private readonly entries = new Map<string, FleetEntry>();
+  private readonly connectLimiter: ConcurrencyLimiter;
+  private readonly ownsAgent: boolean;
+  private readonly concurrency: number;
+  private readonly timeoutMs: number;
+  private readonly reconnectBaseDelayMs: number;
+  private readonly reconnectMaxDelayMs: number;
+  private readonly maxReconnectAttempts: number;
+  private readonly failureThreshold: number;
+  /** In-flight connection attempts, so callers can wait for the fleet to settle. */
+  private readonly pendingConnects = new Set<Promise<void>>();
+  private disposed = false;
+
+  /**
+   * Creates a new PrinterFleet.
+   * @param options Pool, concurrency, timeout and reconnect settings.
+   */
+  constructor(options: PrinterFleetOptions = {}) {
+    super();
+    this.ownsAgent = options.httpAgent === undefined;
+    this.httpAgent =
+      options.httpAgent ??
+      new http.Agent({
+        keepAlive: true,
+        keepAliveMsecs: options.keepAliveMsecs ?? 1000,
+        maxSockets: options.maxSocketsPerPrinter ?? 2,
+        maxTotalSockets: options.maxTotalSockets ?? 64,
+        maxFreeSockets: options.maxFreeSockets ?? 1,
+        scheduling: 'lifo',
+      });
+    this.connectLimiter = new ConcurrencyLimiter({
+      concurrency: options.connectConcurrency ?? 8,
+      minStartIntervalMs: options.connectStaggerMs ?? 25,
+    });
+    this.concurrency = options.concurrency ?? 16;
+    this.timeoutMs = options.timeoutMs ?? 5000;
+    this.reconnectBaseDelayMs = options.reconnectBaseDelayMs ?? 1000;
+    this.reconnectMaxDelayMs = options.reconnectMaxDelayMs ?? 60000;
+    this.maxReconnectAttempts = options.maxReconnectAttempts ?? Number.POSITIVE_INFINITY;
+    this.failureThreshold = options.failureThreshold ?? 3;
+  }
+
+  /** Number of printers in the fleet, connected or not. */
+  public get size(): number {
+    return this.entries.size;
+  }
+
+  /**
+   * Adds a printer and starts connecting it in the background.
+   * Adding a serial number that is already in the fleet returns the existing printer.
+   * @param config Connection details for the printer.
+   * @returns A snapshot of the fleet printer.
+   */
+  public add(config: FleetPrinterConfig): FleetPrinter {
+    if (this.disposed) {
+      throw new Error('PrinterFleet has been disposed');
+    }
+
+    const existing = this.entries.get(config.serialNumber);
+    if (existing) {
+      return this.snapshot(existing);
+    }
+
+    const entry: FleetEntry = {
+      config,
+      client: null,
+      state: 'connecting',
+      reconnectAttempts: 0,
+      consecutiveFailures: 0,
+      lastError: null,
+      reconnectTimer: null,
+      removed: false,
+    };
+    this.entries.set(config.serialNumber, entry);
+    this.startConnect(entry);
+    return this.snapshot(entry);
+  }
+
+  /**
+   * Removes a printer from the fleet and disposes its client.
+   * @param serialNumber Serial number of the printer to remove.
+   * @returns True if the printer was in the fleet.
+   */
+  public async remove(serialNumber: string): Promise<boolean> {
+    const entry = this.entries.get(serialNumber);
+    if (!entry) return false;
+
+    this.entries.delete(serialNumber);
+    entry.removed = true;
+    this.clearReconnect(entry);
+    await entry.client?.dispose();
+    this.emit('removed', serialNumber);
+    return true;
+  }
+
+  /**
+   * Gets a snapshot of one printer.
+   * @param serialNumber Serial number of the printer.
+   * @returns The printer snapshot, or undefined if it is not in the fleet.
+   */
+  public get(serialNumber: string): FleetPrinter | undefined {
+    const entry = this.entries.get(serialNumber);
+    return entry ? this.snapshot(entry) : undefined;
+  }
+
+  /**
+   * Gets snapshots of every printer in the fleet.
+   */
+  public getPrinters(): FleetPrinter[] {
+    return Array.from(this.entries.values(), (entry) => this.snapshot(entry));
+  }
+
+  /**
+   * Adds printers as UDP discovery finds them.
+   *
+   * Only printers that report a serial number (modern protocol) and for which `resolveCheckCode`
+   * returns a check code are added. The returned monitor can be stopped at any time; printers that
+   * were already added stay in the fleet.
+   *
+   * @param resolveCheckCode Returns the check code for a discovered printer, or undefined to skip
+   *                         it.
+   * @param options Discovery options passed to {@link PrinterDiscovery.monitor}.
+   * @param discovery Discovery instance to use (a new one by default).
+   * @returns The running discovery monitor.
+   */
+  public watch(
+    resolveCheckCode: (printer: DiscoveredPrinter) => string | undefined,
+    options?: DiscoveryOptions,
+    discovery: PrinterDiscovery = new PrinterDiscovery()
+  ): ReturnType<PrinterDiscovery['monitor']> {
+    const monitor = discovery.monitor(options);
+    monitor.on('discovered', (printer: DiscoveredPrinter) => {
+      if (this.disposed || !printer.serialNumber) return;
+      const checkCode = resolveCheckCode(printer);
+      if (checkCode === undefined) return;
+
+      this.add({
+        ipAddress: printer.ipAddress,
+        serialNumber: printer.serialNumber,
+        checkCode,
+        connection: {
+          httpPort: printer.eventPort,
+          tcpPort: printer.commandPort,
+        },
+      });
+    });
+    return monitor;
+  }
+
+  /**
+   * Waits until no connection attempt is in flight.
+   * Printers waiting for a backoff timer do not count as in flight.
+   */
+  public async waitForConnections(): Promise<void> {
+    while (this.pendingConnects.size > 0) {
+      await Promise.all(Array.from(this.pendingConnects));
+    }
+  }
+
+  /**
+   * Runs a function on every connected printer with bounded concurrency and a per-printer timeout.
+   *
+   * Failures are reported per printer instead of rejecting the whole call. A printer that fails
+   * `failureThreshold` calls in a row is marked disconnected and reconnected in the background.
+   * A timed-out call is not cancelled; its result is ignored once the timeout fires.
+   *
+   * @param fn Function to run for each printer.
+   * @param options Concurrency, timeout and printer selection.
+   * @returns One result per selected printer, in fleet order.
+   */
+  public async fanOut<T>(
+    fn: (client: FiveMClient, printer: FleetPrinter) => Promise<T>,
+    options: FleetFanOutOptions = {}
+  ): Promise<FleetResult<T>[]> {
+    const timeoutMs = options.timeoutMs ?? this.timeoutMs;
+    const limiter = new ConcurrencyLimiter({
+      concurrency: options.concurrency ?? this.concurrency,
+    });
+    const targets = this.selectTargets(options.serialNumbers);
+
+    return limiter.map(targets, async (entry): Promise<FleetResult<T>> => {
+      const serialNumber = entry.config.serialNumber;
+      if (entry.state !== 'connected') {
+        return {
+          serialNumber,
+          ok: false,
+          error: new PrinterFleetError(`Printer ${serialNumber} is not connected`, 'NOT_CONNECTED'),
+        };
+      }
+
+      try {
+        const value = await withTimeout(
+          fn(entry.client as FiveMClient, this.snapshot(entry)),
+          timeoutMs,
+          `Printer ${serialNumber} did not answer within ${timeoutMs}ms`
+        );
+        entry.consecutiveFailures = 0;
+        return { serialNumber, ok: true, value };
+      } catch (error: unknown) {
+        const err = error instanceof Error ? error : new Error(String(error));
+        this.recordFailure(entry, err);
+        return { serialNumber, ok: false, error: err };
+      }
+    });
+  }
+
+  /**
+   * Fetches `Info.get()` from every connected printer.
+   * A null result counts as a failure, since the detail endpoint did not answer usefully.
+   * @param options Concurrency, timeout and printer selection.
+   * @returns One result per selected printer.
+   */
+  public getAllInfo(options?: FleetFanOutOptions): Promise<FleetResult<FFMachineInfo>[]> {
+    return this.fanOut(async (client) => {
+      const info = await client.info.get();
+      if (!info) {
+        throw new Error(`Printer ${client.serialNumber} returned no machine info`);
+      }
+      return info;
+    }, options);
+  }
+
+  /**
+   * Disposes every client, cancels pending reconnects and destroys the shared agent
+   * (unless it was passed in through the options).
+   */
+  public async dispose(): Promise<void> {
+    if (this.disposed) return;
+    this.disposed = true;
+
+    const entries = Array.from(this.entries.values());
+    this.entries.clear();
+    for (const entry of entries) {
+      entry.removed = true;
+      this.clearReconnect(entry);
+    }
+
+    await Promise.all(entries.map((entry) => entry.client?.dispose().catch(() => undefined)));
+    if (this.ownsAgent) {
+      this.httpAgent.destroy();
+    }
+  }
+
+  /** Creates a client bound to the fleet's shared agent. */
+  private createClient(config: FleetPrinterConfig): FiveMClient {
+    return new FiveMClient(config.ipAddress, config.serialNumber, config.checkCode, {
+      ...config.connection,
+      httpAgent: this.httpAgent,
+    });
+  }
+
+  /** Queues a connection attempt on the connect limiter and tracks it until it settles. */
+  private startConnect(entry: FleetEntry): void {
+    const attempt = this.connectLimiter.run(() => this.connect(entry));
+    this.pendingConnects.add(attempt);
+    void attempt.then(() => {
+      this.pendingConnects.delete(attempt);
+    });
+  }
+
+  /**
+   * Runs `initialize()` on a fresh client and schedules a retry when it fails. Never rejects.
+   * The client is created here rather than in {@link add} because its constructor opens the TCP
+   * socket, which must be covered by the connect limiter too.
+   */
+  private async connect(entry: FleetEntry): Promise<void> {
+    if (entry.removed) return;
+
+    // A previous failed attempt may have left its TCP socket half-open.
+    const stale = entry.client;
+    if (stale) void stale.dispose().catch(() => undefined);
+    const client = this.createClient(entry.config);
+    entry.client = client;
+    entry.state = 'connecting';
+
+    let error: Error | null = null;
+    try {
+      const connected = await withTimeout(
+        client.initialize(),
+        this.timeoutMs,
+        `Printer ${entry.config.serialNumber} did not connect within ${this.timeoutMs}ms`
+      );
+      if (!connected) {
+        error = new PrinterFleetError(
+          `Printer ${entry.config.serialNumber} rejected the connection`,
+          'CONNECT_FAILED'
+        );
+      }
+    } catch (caught: unknown) {
+      error = caught instanceof Error ? caught : new Error(String(caught));
+    }
+
+    if (entry.removed || entry.client !== client) return;
+
+    if (!error) {
+      entry.state = 'connected';
+      entry.reconnectAttempts = 0;
+      entry.consecutiveFailures = 0;
+      entry.lastError = null;
+      this.emit('connected', this.snapshot(entry));
+      return;
+    }
+
+    entry.state = 'disconnected';
+    entry.lastError = error;
+    entry.reconnectAttempts++;
+    this.emit('disconnected', this.snapshot(entry), error);
+    this.scheduleReconnect(entry);
+  }
+
+  /** Counts a failed fan-out call and reconnects the printer once the threshold is reached. */
+  private recordFailure(entry: FleetEntry, error: Error): void {
+    entry.lastError = error;
+    entry.consecutiveFailures++;
+    if (entry.state !== 'connected' || entry.consecutiveFailures < this.failureThreshold) return;
+
+    entry.state = 'disconnected';
+    entry.consecutiveFailures = 0;
+    this.emit('disconnected', this.snapshot(entry), error);
+    this.scheduleReconnect(entry);
+  }
+
+  /** Schedules the next connection attempt with exponential backoff and full jitter. */
+  private scheduleReconnect(entry: FleetEntry): void {
+    if (entry.removed || this.disposed) return;
+    if (entry.reconnectAttempts >= this.maxReconnectAttempts) return;
+
+    const ceiling = Math.min(
+      this.reconnectMaxDelayMs,
+      this.reconnectBaseDelayMs * 2 ** Math.max(0, entry.reconnectAttempts - 1)
+    );
+    // Half fixed, half random: keeps retries of printers that dropped together from lining up.
+    const delayMs = Math.round(ceiling / 2 + Math.random() * (ceiling / 2));
+
+    this.clearReconnect(entry);
+    this.emit('reconnecting', this.snapshot(entry), delayMs);
+    entry.reconnectTimer = setTimeout(() => {
+      entry.reconnectTimer = null;
+      if (!entry.removed) this.startConnect(entry);
+    }, delayMs);
+  }
+
+  private clearReconnect(entry: FleetEntry): void {
+    if (entry.reconnectTimer) {
+      clearTimeout(entry.reconnectTimer);
+      entry.reconnectTimer = null;
+    }
+  }
+
+  private selectTargets(serialNumbers?: string[]): FleetEntry[] {
+    if (!serialNumbers) {
+      return Array.from(this.entries.values()).filter((entry) => entry.state === 'connected');
+    }
+
+    return serialNumbers.map((serialNumber) => {
+      const entry = this.entries.get(serialNumber);
+      if (!entry) {
+        throw new PrinterFleetError(
+          `Printer ${serialNumber} is not in the fleet`,
+          'UNKNOWN_PRINTER'
+        );
+      }
+      return entry;
+    });
+  }
+
+  private snapshot(entry: FleetEntry): FleetPrinter {
+    return {
+      serialNumber: entry.config.serialNumber,
+      ipAddress: entry.config.ipAddress,
+      client: entry.client,
+      state: entry.state,
+      reconnectAttempts: entry.reconnectAttempts,
+      lastError: entry.lastError,
+    };
+  }
+}
+
+/** Races a promise against a timer; the timer is always cleared. */
+function withTimeout<T>(promise: Promise<T>, timeoutMs: number, message: string): Promise<T> {
+  return new Promise<T>((resolve, reject) => {
+    const timer = setTimeout(() => {
+      reject(new PrinterFleetError(message, 'TIMEOUT'));
+    }, timeoutMs);
+
+    promise.then(
+      (value) => {
+        clearTimeout(timer);
+        resolve(value);
+      },
+      (error: unknown) => {
+        clearTimeout(timer);
+        reject(error);
+      }
+    );
+  });
+}
@@ -3,11 +3,14 @@
  *
  * Tests protocol parsers (modern 276-byte, legacy 140-byte), model detection,
  * status mapping, multi-port discovery, timeout handling, deduplication,
- * and monitor/event behavior.
+ * monitor/event behavior, streaming, early finish and the printer cache.
  */
 import { afterAll, beforeAll, describe, expect, it, vi } from 'vitest';
 import type * as dgram from 'node:dgram';
 import { EventEmitter } from 'node:events';
+import * as fs from 'node:fs';
+import * as os from 'node:os';
+import * as path from 'node:path';
 import { PrinterDiscovery } from './PrinterDiscovery';
 import {
     DiscoveryProtocol,
@@ -951,3 +954,123 @@ describe('DiscoveryOptions', () => {
         expect(loopbackPorts).toEqual([8899, 19000, 48899]);
     });
 });
+
+describe('Streaming and cached discovery', () => {
+    class TestPrinterDiscovery extends PrinterDiscovery {
+        public mockSocket: dgram.Socket | null = null;
+
+        protected async createDiscoverySocket(): Promise<dgram.Socket> {
+            const mockSocket = new EventEmitter() as dgram.Socket;
+            mockSocket.bind = vi.fn((_port, callback) => {
+                if (callback) callback();
+            });
+            mockSocket.setBroadcast = vi.fn();
+            mockSocket.setMulticastInterface = vi.fn();
+            mockSocket.send = vi.fn();
+            mockSocket.close = vi.fn();
+            mockSocket.addMembership = vi.fn();
+            this.mockSocket = mockSocket;
+            return mockSocket;
+        }
+
+        public reply(address: string, serialNumber: string, delayMs: number): void {
+            setTimeout(() => {
+                const buffer = Buffer.alloc(276);
+                buffer.write('Adventurer 5M', 0, 'utf8');
+                buffer.writeUInt16BE(8899, 0x84);
+                buffer.writeUInt16BE(0x0023, 0x88);
+                buffer.writeUInt16BE(8898, 0x8e);
+                buffer.write(serialNumber, 0x92, 'utf8');
+                this.mockSocket?.emit('message', buffer, {
+                    address,
+                    port: 8899,
+                    family: 'IPv4',
+                    size: 276,
+                });
+            }, delayMs);
+        }
+    }
+
+    let tempDir: string;
+
+    beforeAll(() => {
+        tempDir = fs.mkdtempSync(path.join(os.tmpdir(), 'ff-api-discovery-'));
+    });
+
+    afterAll(() => {
+        fs.rmSync(tempDir, { recursive: true, force: true });
+    });
+
+    it('should yield printers as soon as they answer', async () => {
+        const discovery = new TestPrinterDiscovery();
+        discovery.reply('192.168.1.10', 'SN-A', 20);
+        discovery.reply('192.168.1.11', 'SN-B', 60);
+
+        const arrivals: Array<{ serialNumber?: string; elapsedMs: number }> = [];
+        const start = Date.now();
+        for await (const printer of discovery.stream({ timeout: 1000, idleTimeout: 150 })) {
+            arrivals.push({ serialNumber: printer.serialNumber, elapsedMs: Date.now() - start });
+        }
+
+        expect(arrivals.map((arrival) => arrival.serialNumber)).toEqual(['SN-A', 'SN-B']);
+        expect(arrivals[0].elapsedMs).toBeLessThan(60);
+        expect(discovery.mockSocket?.close).toHaveBeenCalled();
+    });
+
+    it('should close the socket when the consumer stops early', async () => {
+        const discovery = new TestPrinterDiscovery();
+        discovery.reply('192.168.1.10', 'SN-A', 10);
+
+        for await (const printer of discovery.stream({ timeout: 5000, idleTimeout: 5000 })) {
+            expect(printer.serialNumber).toBe('SN-A');
+            break;
+        }
+
+        expect(discovery.mockSocket?.close).toHaveBeenCalled();
+    });
+
+    it('should finish as soon as every expected printer has answered', async () => {
+        const discovery = new TestPrinterDiscovery();
+        discovery.reply('192.168.1.10', 'SN-A', 10);
+        discovery.reply('192.168.1.11', 'SN-B', 30);
+
+        const start = Date.now();
+        const printers = await discovery.discover({
+            timeout: 5000,
+            idleTimeout: 2000,
+            expectedSerialNumbers: ['SN-A', 'SN-B'],
+        });
+
+        expect(printers.map((printer) => printer.serialNumber).sort()).toEqual(['SN-A', 'SN-B']);
+        expect(Date.now() - start).toBeLessThan(1000);
+    });
+
+    it('should yield cached printers first and probe them by unicast', async () => {
+        const cacheFile = path.join(tempDir, 'printers.json');
+        const writer = new TestPrinterDiscovery();
+        writer.reply('10.20.0.5', 'SN-ROUTED', 10);
+        await writer.discover({ timeout: 200, idleTimeout: 100, maxRetries: 1, cacheFile });
+
+        const discovery = new TestPrinterDiscovery();
+        discovery.reply('10.20.0.5', 'SN-ROUTED', 20);
+        const results: DiscoveredPrinter[] = [];
+        for await (const printer of discovery.stream({
+            timeout: 1000,
+            idleTimeout: 500,
+            cacheFile,
+            expectedSerialNumbers: ['SN-ROUTED'],
+        })) {
+            results.push(printer);
+        }
+
+        expect(results.map((printer) => [printer.serialNumber, printer.fromCache])).toEqual([
+            ['SN-ROUTED', true],
+            ['SN-ROUTED', undefined],
+        ]);
+        const send = discovery.mockSocket?.send as ReturnType<typeof vi.fn>;
+        const unicastPorts = send.mock.calls
+            .filter((call) => call[4] === '10.20.0.5')
+            .map((call) => call[3]);
+        expect(unicastPorts).toEqual([8899, 19000, 48899]);
+    });
+});
@@ -4,10 +4,14 @@
  * Implements multi-port, multi-format UDP discovery supporting all FlashForge models:
  * - AD5X, 5M, 5M Pro (276-byte modern protocol)
  * - Adventurer 4, Adventurer 3 (140-byte legacy protocol)
+ *
+ * Probes go out on every IPv4 interface at once, results can be streamed as they arrive, and
+ * a persisted list of last known printers is probed by unicast.
  */
 import * as dgram from 'node:dgram';
 import { EventEmitter } from 'node:events';
 import { networkInterfaces } from 'node:os';
+import { log } from '../diagnostics/Logger';
 import {
     type DiscoveredPrinter,
     type DiscoveryOptions,
@@ -15,6 +19,7 @@ import {
     PrinterStatus,
     DiscoveryProtocol,
 } from '../models/PrinterDiscovery';
+import { DiscoveryCache } from './network/DiscoveryCache';
 import { InvalidResponseError, SocketCreationError } from './network/DiscoveryErrors';
 
 /**
@@ -27,6 +32,8 @@ const DEFAULT_DISCOVERY_OPTIONS: Required<DiscoveryOptions> = {
     useMulticast: true,
     useBroadcast: true,
     ports: [8899, 19000, 48899],
+    expectedSerialNumbers: [],
+    cacheFile: '',
 };
 
 /**
@@ -76,6 +83,16 @@ const MODERN_PRODUCT_IDS: Readonly<Record<number, PrinterModel>> = {
     0x0029: PrinterModel.Creator5Pro,
 };
 
+/**
+ * An active, non-internal IPv4 interface and its subnet broadcast address.
+ */
+export interface IPv4Interface {
+    /** Interface address */
+    address: string;
+    /** Subnet broadcast address */
+    broadcast: string;
+}
+
 /**
  * EventEmitter-based continuous discovery monitor.
  *
@@ -157,7 +174,7 @@ class DiscoveryMonitor extends EventEmitter {
             if (this.listenerCount('error') > 0) {
                 this.emit('error', error);
             } else {
-                console.error('Discovery monitor error:', error);
+                log.error('Discovery monitor error:', error);
             }
             this.stop();
         }
@@ -222,13 +239,22 @@ export class PrinterDiscovery {
      *
      * Sends UDP discovery packets to multiple ports and protocols,
      * collects responses, and returns deduplicated printer information.
+     * A scan ends early once every printer in `expectedSerialNumbers` has answered.
+     * With `cacheFile` set, the last known printers are probed by unicast as well,
+     * and the printers found are saved back to the cache.
      *
      * @param options Optional configuration for discovery behavior
      * @returns Promise resolving to array of discovered printers
      */
     public async discover(options?: DiscoveryOptions): Promise<DiscoveredPrinter[]> {
         const config: Required<DiscoveryOptions> = { ...DEFAULT_DISCOVERY_OPTIONS, ...options };
+        const cache = config.cacheFile ? new DiscoveryCache(config.cacheFile) : null;
+        const known = cache ? await cache.load() : [];
+        const knownAddresses = known.map((printer) => printer.ipAddress);
         const printers = new Map<string, DiscoveredPrinter>();
+        const missing = new Set(config.expectedSerialNumbers);
+        const isSatisfied = () =>
+            config.expectedSerialNumbers.length > 0 ? missing.size === 0 : printers.size > 0;
         let attempt = 0;
 
         while (attempt < config.maxRetries) {
@@ -237,25 +263,23 @@ export class PrinterDiscovery {
 
             try {
                 await this.bindSocket(socket);
-                this.sendDiscoveryPackets(socket, config);
-
-                const discoveredPrinters = await this.receiveResponses(
+                const responses = this.receiveResponses(
                     socket,
                     config.timeout,
-                    config.idleTimeout
-                );
-
-                // Merge with existing printers, preferring modern protocol responses
-                for (const printer of discoveredPrinters) {
-                    const key = `${printer.ipAddress}:${printer.commandPort}`;
-                    const existing = printers.get(key);
-
-                    if (!existing || printer.protocolFormat === DiscoveryProtocol.Modern) {
-                        printers.set(key, printer);
+                    config.idleTimeout,
+                    (printer) => {
+                        // Merge with existing printers, preferring modern protocol responses
+                        this.mergePrinter(printers, printer);
+                        if (printer.serialNumber) {
+                            missing.delete(printer.serialNumber);
+                        }
+                        return config.expectedSerialNumbers.length > 0 && missing.size === 0;
                     }
-                }
+                );
+                this.sendDiscoveryPackets(socket, config, knownAddresses);
+                await responses;
 
-                if (printers.size > 0) {
+                if (isSatisfied()) {
                     break; // Printers found, exit retry loop
                 }
             } finally {
@@ -267,7 +291,100 @@ export class PrinterDiscovery {
             }
         }
 
-        return Array.from(printers.values());
+        const result = Array.from(printers.values());
+        if (cache && result.length > 0) {
+            await this.saveCache(cache, result);
+        }
+        return result;
+    }
+
+    /**
+     * Streams printers as they answer a single discovery pass.
+     *
+     * Each printer is yielded the moment its response has been validated, instead of after the
+     * whole scan. With `cacheFile` set, the last known printers are yielded first, before any
+     * packet is sent, marked `fromCache`; they are yielded again without the mark once they
+     * answer. A printer first seen over the legacy protocol is yielded again if a modern
+     * response follows. The pass ends on the total timeout, after `idleTimeout` without a new
+     * printer, or as soon as every printer in `expectedSerialNumbers` has answered. Breaking out
+     * of the loop ends the pass and closes the socket.
+     *
+     * ```typescript
+     * for await (const printer of discovery.stream({ cacheFile: 'printers.json' })) {
+     *   console.log(`${printer.fromCache ? 'Known' : 'Found'}: ${printer.name}`);
+     * }
+     * ```
+     *
+     * @param options Optional configuration for discovery behavior (`maxRetries` is ignored)
+     * @returns Async iterator of discovered printers
+     */
+    public async *stream(
+        options?: DiscoveryOptions
+    ): AsyncGenerator<DiscoveredPrinter, void, undefined> {
+        const config: Required<DiscoveryOptions> = { ...DEFAULT_DISCOVERY_OPTIONS, ...options };
+        const cache = config.cacheFile ? new DiscoveryCache(config.cacheFile) : null;
+        const known = cache ? await cache.load() : [];
+        for (const printer of known) {
+            yield { ...printer, fromCache: true };
+        }
+
+        const printers = new Map<string, DiscoveredPrinter>();
+        const missing = new Set(config.expectedSerialNumbers);
+        const queue: DiscoveredPrinter[] = [];
+        const stop = new AbortController();
+        let finished = false;
+        let wake: (() => void) | null = null;
+
+        const socket = await this.createDiscoverySocket();
+        try {
+            await this.bindSocket(socket);
+            const responses = this.receiveResponses(
+                socket,
+                config.timeout,
+                config.idleTimeout,
+                (printer) => {
+                    if (this.mergePrinter(printers, printer)) {
+                        queue.push(printer);
+                        wake?.();
+                    }
+                    if (printer.serialNumber) {
+                        missing.delete(printer.serialNumber);
+                    }
+                    return config.expectedSerialNumbers.length > 0 && missing.size === 0;
+                },
+                stop.signal
+            ).then(() => {
+                finished = true;
+                wake?.();
+            });
+            this.sendDiscoveryPackets(
+                socket,
+                config,
+                known.map((printer) => printer.ipAddress)
+            );
+
+            while (true) {
+                const printer = queue.shift();
+                if (printer) {
+                    yield printer;
+                } else if (finished) {
+                    break;
+                } else {
+                    await new Promise<void>((resolve) => {
+                        wake = resolve;
+                    });
+                    wake = null;
+                }
+            }
+
+            await responses;
+            if (cache && printers.size > 0) {
+                await this.saveCache(cache, Array.from(printers.values()));
+            }
+        } finally {
+            stop.abort();
+            socket.close();
+        }
     }
 
     /**
@@ -333,31 +450,47 @@ export class PrinterDiscovery {
     /**
      * Sends UDP discovery packets to all configured ports and addresses.
      *
+     * Every probe is sent at once, without waiting for replies: multicast goes out on each
+     * IPv4 interface (the OS would otherwise pick a single one), and broadcast goes to each
+     * interface's subnet, so printers on every attached network answer within the same pass.
+     *
      * @param socket The UDP socket to use for sending
      * @param options Discovery configuration options
+     * @param unicastAddresses Addresses of known printers to probe directly on every port
      * @public
      */
     public sendDiscoveryPackets(
         socket: dgram.Socket,
-        options: Required<DiscoveryOptions>
+        options: Required<DiscoveryOptions>,
+        unicastAddresses: string[] = []
     ): void {
         const emptyPacket = Buffer.alloc(0);
+        const interfaces = this.getIPv4Interfaces();
 
-        // Multicast discovery - join group once, then send to all relevant ports
+        // Multicast discovery - join the group on every interface, then send to all relevant ports
         if (options.useMulticast) {
-            try {
-                socket.addMembership(MULTICAST_ADDRESS);
-            } catch (error) {
-                // Log but continue - sending may still work depending on OS/network config
-                console.warn(`Discovery: Failed to join multicast group ${MULTICAST_ADDRESS} - ${(error as Error).message}`);
-            }
+            this.joinMulticastGroup(socket, interfaces);
 
-            for (const port of options.ports) {
-                if (port === 8899 || port === 19000) {
+            // With several interfaces, send once per interface; otherwise let the OS route it.
+            const outgoing: Array<string | null> =
+                interfaces.length > 1 ? interfaces.map((iface) => iface.address) : [null];
+            for (const interfaceAddress of outgoing) {
+                if (interfaceAddress) {
                     try {
-                        socket.send(emptyPacket, 0, 0, port, MULTICAST_ADDRESS);
+                        socket.setMulticastInterface(interfaceAddress);
                     } catch (error) {
-                        console.warn(`Discovery: Failed to send multicast to ${MULTICAST_ADDRESS}:${port} - ${(error as Error).message}`);
+                        log.warn(`Discovery: Failed to select multicast interface ${interfaceAddress} - ${(error as Error).message}`);
+                        continue;
+                    }
+                }
+
+                for (const port of options.ports) {
+                    if (port === 8899 || port === 19000) {
+                        try {
+                            socket.send(emptyPacket, 0, 0, port, MULTICAST_ADDRESS);
+                        } catch (error) {
+                            log.warn(`Discovery: Failed to send multicast to ${MULTICAST_ADDRESS}:${port} - ${(error as Error).message}`);
+                        }
                     }
                 }
             }
@@ -365,14 +498,14 @@ export class PrinterDiscovery {
 
         // Broadcast discovery
         if (options.useBroadcast) {
-            const broadcastAddresses = this.getBroadcastAddresses();
+            const broadcastAddresses = new Set(interfaces.map((iface) => iface.broadcast));
             for (const address of broadcastAddresses) {
                 for (const port of options.ports) {
                     if (port === 48899) {
                         try {
                             socket.send(emptyPacket, 0, 0, port, address);
                         } catch (error) {
-                            console.warn(`Discovery: Failed to send broadcast to ${address}:${port} - ${(error as Error).message}`);
+                            log.warn(`Discovery: Failed to send broadcast to ${address}:${port} - ${(error as Error).message}`);
                         }
                     }
                 }
@@ -385,7 +518,7 @@ export class PrinterDiscovery {
                 try {
                     socket.send(emptyPacket, 0, 0, port, '255.255.255.255');
                 } catch (error) {
-                    console.warn(`Discovery: Failed to send to broadcast 255.255.255.255:${port} - ${(error as Error).message}`);
+                    log.warn(`Discovery: Failed to send to broadcast 255.255.255.255:${port} - ${(error as Error).message}`);
                 }
             }
         }
@@ -399,9 +532,88 @@ export class PrinterDiscovery {
             try {
                 socket.send(emptyPacket, 0, 0, port, LOOPBACK_ADDRESS);
             } catch (error) {
-                console.warn(`Discovery: Failed to send to loopback ${LOOPBACK_ADDRESS}:${port} - ${(error as Error).message}`);
+                log.warn(`Discovery: Failed to send to loopback ${LOOPBACK_ADDRESS}:${port} - ${(error as Error).message}`);
             }
         }
+
+        // Unicast probes to known printers, which also reach routed subnets and
+        // networks that filter broadcast/multicast traffic.
+        for (const address of new Set(unicastAddresses)) {
+            if (address === LOOPBACK_ADDRESS) continue;
+            for (const port of options.ports) {
+                try {
+                    socket.send(emptyPacket, 0, 0, port, address);
+                } catch (error) {
+                    log.warn(`Discovery: Failed to send to ${address}:${port} - ${(error as Error).message}`);
+                }
+            }
+        }
+    }
+
+    /**
+     * Joins the discovery multicast group on every IPv4 interface (or the default one).
+     *
+     * @param socket The UDP socket
+     * @param interfaces The interfaces to join on
+     * @private
+     */
+    protected joinMulticastGroup(socket: dgram.Socket, interfaces: IPv4Interface[]): void {
+        const interfaceAddresses: Array<string | undefined> =
+            interfaces.length > 1 ? interfaces.map((iface) => iface.address) : [undefined];
+
+        for (const interfaceAddress of interfaceAddresses) {
+            try {
+                socket.addMembership(MULTICAST_ADDRESS, interfaceAddress);
+            } catch (error) {
+                // Log but continue - sending may still work depending on OS/network config
+                log.warn(`Discovery: Failed to join multicast group ${MULTICAST_ADDRESS} - ${(error as Error).message}`);
+            }
+        }
+    }
+
+    /**
+     * Merges a response into the printers found so far, keyed by address and command port,
+     * preferring modern protocol responses.
+     *
+     * @param printers Printers found so far
+     * @param printer The new response
+     * @returns True if the response added a printer or upgraded a legacy entry
+     * @private
+     */
+    protected mergePrinter(
+        printers: Map<string, DiscoveredPrinter>,
+        printer: DiscoveredPrinter
+    ): boolean {
+        const key = `${printer.ipAddress}:${printer.commandPort}`;
+        const existing = printers.get(key);
+
+        if (
+            !existing ||
+            (printer.protocolFormat === DiscoveryProtocol.Modern &&
+                existing.protocolFormat !== DiscoveryProtocol.Modern)
+        ) {
+            printers.set(key, printer);
+            return true;
+        }
+        if (printer.protocolFormat === DiscoveryProtocol.Modern) {
+            printers.set(key, printer); // keep the latest status
+        }
+        return false;
+    }
+
+    /**
+     * Saves printers to the discovery cache, logging instead of failing the scan on errors.
+     *
+     * @param cache The discovery cache
+     * @param printers Printers that answered
+     * @private
+     */
+    protected async saveCache(cache: DiscoveryCache, printers: DiscoveredPrinter[]): Promise<void> {
+        try {
+            await cache.save(printers);
+        } catch (error) {
+            log.warn(`Discovery: Failed to save printer cache ${cache.filePath} - ${(error as Error).message}`);
+        }
     }
 
     /**
@@ -410,32 +622,49 @@ export class PrinterDiscovery {
      * @param socket The UDP socket to listen on
      * @param totalTimeoutMs Total time to wait for responses
      * @param idleTimeoutMs Idle time before stopping after last response
+     * @param onPrinter Called with each valid response as it arrives; returning true ends the
+     *                  pass at once
+     * @param signal Ends the pass early when aborted
      * @returns Promise resolving to array of discovered printers
      * @private
      */
     protected async receiveResponses(
         socket: dgram.Socket,
         totalTimeoutMs: number,
-        idleTimeoutMs: number
+        idleTimeoutMs: number,
+        onPrinter?: (printer: DiscoveredPrinter) => boolean,
+        signal?: AbortSignal
     ): Promise<DiscoveredPrinter[]> {
         const printers: DiscoveredPrinter[] = [];
 
         return new Promise((resolve) => {
             let totalTimeoutHandle: NodeJS.Timeout | null = null;
             let idleTimeoutHandle: NodeJS.Timeout | null = null;
+            let settled = false;
 
             const cleanupAndResolve = () => {
+                if (settled) {
+                    return;
+                }
+                settled = true;
                 if (totalTimeoutHandle) {
                     clearTimeout(totalTimeoutHandle);
                 }
                 if (idleTimeoutHandle) {
                     clearTimeout(idleTimeoutHandle);
                 }
+                signal?.removeEventListener('abort', cleanupAndResolve);
                 socket.removeAllListeners('message');
                 socket.removeAllListeners('error');
                 resolve(printers);
             };
 
+            if (signal?.aborted) {
+                cleanupAndResolve();
+                return;
+            }
+            signal?.addEventListener('abort', cleanupAndResolve);
+
             // Set total timeout
             totalTimeoutHandle = setTimeout(() => {
                 cleanupAndResolve();
@@ -457,12 +686,15 @@ export class PrinterDiscovery {
                 const printer = this.parseDiscoveryResponse(buffer, rinfo);
                 if (printer) {
                     printers.push(printer);
+                    if (onPrinter?.(printer)) {
+                        cleanupAndResolve();
+                    }
                 }
             });
 
             // Handle errors gracefully
             socket.on('error', (error) => {
-                console.error(`Socket error during discovery: ${error.message}`);
+                log.error(`Socket error during discovery: ${error.message}`);
             });
 
             // Start the idle timeout
@@ -500,12 +732,12 @@ export class PrinterDiscovery {
             }
 
             // Log invalid response size but don't throw
-            console.warn(
+            log.warn(
                 `Invalid discovery response: ${buffer.length} bytes from ${rinfo.address}`
             );
             return null;
         } catch (error) {
-            console.error(`Error parsing discovery response: ${(error as Error).message}`);
+            log.error(`Error parsing discovery response: ${(error as Error).message}`);
             return null;
         }
     }
@@ -736,11 +968,21 @@ export class PrinterDiscovery {
     /**
      * Retrieves broadcast addresses for all active IPv4 network interfaces.
      *
-     * @returns Array of broadcast address strings
+     * @returns Array of broadcast address strings, without duplicates
      * @private
      */
     protected getBroadcastAddresses(): string[] {
-        const broadcastAddresses: string[] = [];
+        return Array.from(new Set(this.getIPv4Interfaces().map((iface) => iface.broadcast)));
+    }
+
+    /**
+     * Lists active, non-internal IPv4 interfaces with their broadcast addresses.
+     *
+     * @returns Array of interfaces
+     * @private
+     */
+    protected getIPv4Interfaces(): IPv4Interface[] {
+        const result: IPv4Interface[] = [];
         const interfaces = networkInterfaces();
 
         for (const [_name, netInterface] of Object.entries(interfaces)) {
@@ -753,14 +995,14 @@ export class PrinterDiscovery {
                 }
 
                 // Calculate broadcast address
-                const broadcastAddress = this.calculateBroadcastAddress(iface.address, iface.netmask);
-                if (broadcastAddress) {
-                    broadcastAddresses.push(broadcastAddress);
+                const broadcast = this.calculateBroadcastAddress(iface.address, iface.netmask);
+                if (broadcast) {
+                    result.push({ address: iface.address, broadcast });
                 }
             }
         }
 
-        return broadcastAddresses;
+        return result;
     }
 
     /**
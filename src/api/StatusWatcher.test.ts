@@ -0,0 +1,237 @@
+/**
+ * @fileoverview Tests for StatusWatcher covering adaptive polling intervals, change events for
+ * state, temperature, progress and material station slots, failure backoff and cached reads.
+ */
+import { afterEach, beforeEach, describe, expect, it, vi } from 'vitest';
+import type { FiveMClient } from '../FiveMClient';
+import { type FFMachineInfo, type FFPrinterDetail, MachineState } from '../models/ff-models';
+import { MachineInfo } from '../models/MachineInfo';
+import {
+  type ProgressEvent,
+  type SlotChangeEvent,
+  type StateChangeEvent,
+  StatusWatcher,
+  type TemperatureChangeEvent,
+} from './StatusWatcher';
+
+function machineInfo(detail: FFPrinterDetail): FFMachineInfo {
+  return new MachineInfo().fromDetail({
+    name: 'FlashForge 5M Pro',
+    status: 'ready',
+    platTemp: 25,
+    rightTemp: 25,
+    ...detail,
+  }) as FFMachineInfo;
+}
+
+function slots(colors: string[]) {
+  return {
+    currentLoadSlot: 0,
+    currentSlot: 0,
+    slotCnt: colors.length,
+    stateAction: 0,
+    stateStep: 0,
+    slotInfos: colors.map((color, index) => ({
+      hasFilament: color !== '',
+      materialColor: color,
+      materialName: color !== '' ? 'PLA' : '',
+      slotId: index + 1,
+    })),
+  };
+}
+
+describe('StatusWatcher', () => {
+  let get: ReturnType<typeof vi.fn>;
+  let getCached: ReturnType<typeof vi.fn>;
+  let client: FiveMClient;
+  let watcher: StatusWatcher;
+
+  beforeEach(() => {
+    vi.useFakeTimers();
+    get = vi.fn();
+    getCached = vi.fn();
+    client = { info: { get, getCached } } as unknown as FiveMClient;
+    watcher = new StatusWatcher(client);
+  });
+
+  afterEach(() => {
+    watcher.stop();
+    vi.useRealTimers();
+  });
+
+  it('polls immediately and then at the idle interval while ready', async () => {
+    get.mockResolvedValue(machineInfo({}));
+    const updates: FFMachineInfo[] = [];
+    watcher.on('update', (info) => updates.push(info));
+
+    watcher.start();
+    await vi.advanceTimersByTimeAsync(0);
+    expect(get).toHaveBeenCalledTimes(1);
+    expect(updates).toHaveLength(1);
+    expect(watcher.currentIntervalMs).toBe(5000);
+
+    await vi.advanceTimersByTimeAsync(4999);
+    expect(get).toHaveBeenCalledTimes(1);
+    await vi.advanceTimersByTimeAsync(1);
+    expect(get).toHaveBeenCalledTimes(2);
+  });
+
+  it('polls at the active interval while printing or heating', async () => {
+    get.mockResolvedValueOnce(machineInfo({ status: 'printing' }));
+    get.mockResolvedValueOnce(machineInfo({ status: 'ready', platTargetTemp: 60 }));
+    get.mockResolvedValue(machineInfo({}));
+
+    watcher.start();
+    await vi.advanceTimersByTimeAsync(0);
+    expect(watcher.currentIntervalMs).toBe(1000);
+
+    await vi.advanceTimersByTimeAsync(1000);
+    expect(watcher.currentIntervalMs).toBe(1000);
+
+    await vi.advanceTimersByTimeAsync(1000);
+    expect(get).toHaveBeenCalledTimes(3);
+    expect(watcher.currentIntervalMs).toBe(5000);
+  });
+
+  it('emits state transitions', async () => {
+    get.mockResolvedValueOnce(machineInfo({ status: 'ready' }));
+    get.mockResolvedValueOnce(machineInfo({ status: 'heating' }));
+    const events: StateChangeEvent[] = [];
+    watcher.on('stateChange', (event) => events.push(event));
+
+    await watcher.refresh();
+    await watcher.refresh();
+
+    expect(events).toHaveLength(1);
+    expect(events[0].previous).toBe(MachineState.Ready);
+    expect(events[0].current).toBe(MachineState.Heating);
+  });
+
+  it('emits temperature changes once they cross the threshold', async () => {
+    watcher = new StatusWatcher(client, { temperatureThreshold: 1 });
+    for (const platTemp of [25, 25.5, 25.9, 26.2]) {
+      get.mockResolvedValueOnce(machineInfo({ platTemp }));
+    }
+    const events: TemperatureChangeEvent[] = [];
+    watcher.on('temperatureChange', (event) => events.push(event));
+
+    for (let poll = 0; poll < 4; poll++) {
+      await watcher.refresh();
+    }
+
+    expect(events).toEqual([
+      { sensor: 'bed', previous: { current: 25, set: 0 }, current: { current: 26.2, set: 0 } },
+    ]);
+  });
+
+  it('emits progress ticks when the percentage or layer changes', async () => {
+    const printing = { status: 'printing', printFileName: 'benchy.gcode', totalPrintLayer: 100 };
+    get.mockResolvedValueOnce(machineInfo({ ...printing, printProgress: 0.1, printLayer: 10 }));
+    get.mockResolvedValueOnce(machineInfo({ ...printing, printProgress: 0.1, printLayer: 10 }));
+    get.mockResolvedValueOnce(machineInfo({ ...printing, printProgress: 0.1, printLayer: 11 }));
+    get.mockResolvedValueOnce(machineInfo({ ...printing, printProgress: 0.12, printLayer: 11 }));
+    const events: ProgressEvent[] = [];
+    watcher.on('progress', (event) => events.push(event));
+
+    for (let poll = 0; poll < 4; poll++) {
+      await watcher.refresh();
+    }
+
+    expect(events.map((event) => [event.percent, event.layer])).toEqual([
+      [10, 11],
+      [12, 11],
+    ]);
+    expect(events[0].fileName).toBe('benchy.gcode');
+  });
+
+  it('emits material station slot changes', async () => {
+    get.mockResolvedValueOnce(machineInfo({ matlStationInfo: slots(['#FFFFFF', '']) }));
+    get.mockResolvedValueOnce(machineInfo({ matlStationInfo: slots(['#FFFFFF', '#FF0000']) }));
+    const events: SlotChangeEvent[] = [];
+    watcher.on('slotChange', (event) => events.push(event));
+
+    await watcher.refresh();
+    await watcher.refresh();
+
+    expect(events).toHaveLength(1);
+    expect(events[0].slotId).toBe(2);
+    expect(events[0].previous?.hasFilament).toBe(false);
+    expect(events[0].current?.materialColor).toBe('#FF0000');
+  });
+
+  it('backs off and reports errors while polls fail', async () => {
+    watcher = new StatusWatcher(client, { idleIntervalMs: 1000, maxIntervalMs: 3000 });
+    get.mockResolvedValue(null);
+    const errors: Error[] = [];
+    watcher.on('error', (error) => errors.push(error));
+
+    watcher.start();
+    await vi.advanceTimersByTimeAsync(0);
+    expect(watcher.currentIntervalMs).toBe(1000);
+    await vi.advanceTimersByTimeAsync(1000);
+    expect(watcher.currentIntervalMs).toBe(2000);
+    await vi.advanceTimersByTimeAsync(2000);
+    expect(watcher.currentIntervalMs).toBe(3000);
+
+    expect(errors).toHaveLength(3);
+    expect(watcher.current).toBeNull();
+  });
+
+  it('keeps emitting and polling when a listener throws', async () => {
+    get.mockResolvedValueOnce(machineInfo({ status: 'ready' }));
+    get.mockResolvedValue(machineInfo({ status: 'heating' }));
+    const throwing = vi.fn(() => {
+      throw new Error('listener failed');
+    });
+    const updates: FFMachineInfo[] = [];
+    const states: StateChangeEvent[] = [];
+    watcher.on('update', throwing);
+    watcher.on('update', (info) => updates.push(info));
+    watcher.on('stateChange', (event) => states.push(event));
+
+    watcher.start();
+    await vi.advanceTimersByTimeAsync(0);
+    await vi.advanceTimersByTimeAsync(5000);
+    await expect(watcher.refresh()).resolves.not.toBeNull();
+
+    expect(get).toHaveBeenCalledTimes(3);
+    expect(throwing).toHaveBeenCalledTimes(3);
+    expect(updates).toHaveLength(3);
+    expect(states).toHaveLength(1);
+    expect(watcher.isRunning).toBe(true);
+  });
+
+  it('shares one poll between overlapping refreshes', async () => {
+    let resolve!: (info: FFMachineInfo) => void;
+    get.mockReturnValue(new Promise<FFMachineInfo>((r) => (resolve = r)));
+
+    const first = watcher.refresh();
+    const second = watcher.refresh();
+    resolve(machineInfo({}));
+
+    expect(await first).toBe(await second);
+    expect(get).toHaveBeenCalledTimes(1);
+  });
+
+  it('reads through the Info cache with the configured TTL', async () => {
+    watcher = new StatusWatcher(client, { cacheTtlMs: 250 });
+    const info = machineInfo({});
+    getCached.mockResolvedValue(info);
+
+    expect(await watcher.getInfo()).toBe(info);
+    expect(getCached).toHaveBeenCalledWith(250);
+    expect(get).not.toHaveBeenCalled();
+  });
+
+  it('stops polling after stop()', async () => {
+    get.mockResolvedValue(machineInfo({}));
+
+    watcher.start();
+    await vi.advanceTimersByTimeAsync(0);
+    watcher.stop();
+    await vi.advanceTimersByTimeAsync(20000);
+
+    expect(get).toHaveBeenCalledTimes(1);
+    expect(watcher.isRunning).toBe(false);
+  });
+});
@@ -0,0 +1,416 @@
+/**
+ * @fileoverview Push-style status subscription for FiveMClient. Polls the detail endpoint on an
+ * adaptive interval (fast while printing or heating, slow when idle) and emits typed events for
+ * state transitions, temperature changes, progress ticks and material station slot changes.
+ */
+import { EventEmitter } from 'node:events';
+import { log } from '../diagnostics/Logger';
+import type { FiveMClient } from '../FiveMClient';
+import {
+  type FFMachineInfo,
+  MachineState,
+  type SlotInfo,
+  type Temperature,
+} from '../models/ff-models';
+
+/**
+ * Configuration options for a {@link StatusWatcher}.
+ */
+export interface StatusWatcherOptions {
+  /** Poll interval while printing, heating, pausing, calibrating or busy (default: 1000). */
+  activeIntervalMs?: number;
+  /** Poll interval while the printer is idle (default: 5000). */
+  idleIntervalMs?: number;
+  /** Upper bound of the poll interval while polls keep failing (default: 30000). */
+  maxIntervalMs?: number;
+  /** Maximum age of cached info returned by {@link StatusWatcher.getInfo} (default: 1000). */
+  cacheTtlMs?: number;
+  /** Minimum change in °C, current or target, before a temperature event is emitted (default: 1). */
+  temperatureThreshold?: number;
+  /** Minimum change in whole percent before a progress event is emitted (default: 1). */
+  progressStep?: number;
+}
+
+/** Identifies a heater in a {@link TemperatureChangeEvent}. */
+export type TemperatureSensor = 'extruder' | 'bed' | 'chamber' | `tool${number}`;
+
+/** Emitted when the machine state changes. */
+export interface StateChangeEvent {
+  previous: MachineState;
+  current: MachineState;
+  info: FFMachineInfo;
+}
+
+/** Emitted when a heater moved past the temperature threshold since its last event. */
+export interface TemperatureChangeEvent {
+  sensor: TemperatureSensor;
+  /** Reading at the previous event for this sensor. */
+  previous: Temperature;
+  current: Temperature;
+}
+
+/** Emitted when print progress advances by the progress step, or the layer changes. */
+export interface ProgressEvent {
+  /** Progress from 0 to 100. */
+  percent: number;
+  layer: number;
+  totalLayers: number;
+  fileName: string;
+  /** Estimated time remaining in seconds. */
+  estimatedTime: number;
+}
+
+/** Emitted when a material station slot is loaded, unloaded or changes material. */
+export interface SlotChangeEvent {
+  slotId: number;
+  /** The slot before the change, or null if it was not reported. */
+  previous: SlotInfo | null;
+  /** The slot after the change, or null if it is no longer reported. */
+  current: SlotInfo | null;
+}
+
+/**
+ * Listener signatures for {@link StatusWatcher} events.
+ */
+export interface StatusWatcherEvents {
+  /** Every successful poll, with the previous poll's info (null on the first). */
+  update: (info: FFMachineInfo, previous: FFMachineInfo | null) => void;
+  stateChange: (event: StateChangeEvent) => void;
+  temperatureChange: (event: TemperatureChangeEvent) => void;
+  progress: (event: ProgressEvent) => void;
+  slotChange: (event: SlotChangeEvent) => void;
+  /** A poll returned no data. Without an `error` listener, failures are logged instead. */
+  error: (error: Error) => void;
+}
+
+/** States in which the printer changes quickly enough to poll at the active interval. */
+const ACTIVE_STATES: ReadonlySet<MachineState> = new Set([
+  MachineState.Printing,
+  MachineState.Heating,
+  MachineState.Pausing,
+  MachineState.Calibrating,
+  MachineState.Busy,
+]);
+
+/**
+ * Polls a printer's status and pushes changes to subscribers.
+ *
+ * One detail request per interval serves every subscriber; the interval shortens while the
+ * printer is active or a heater has a target set, and grows when it is idle or unreachable.
+ * Results go through {@link Info.get}, so {@link getInfo} and the `Info` status accessors reuse
+ * the latest poll while it is fresh, and callers racing a poll share its request.
+ *
+ * Temperature and progress events are emitted relative to the last *emitted* value rather than
+ * the previous poll, so a slow drift still produces an event once it crosses the threshold.
+ *
+ * A listener that throws is logged and skipped; it does not stop the poll's other events or the
+ * polling loop.
+ *
+ * Example usage:
+ * ```typescript
+ * client.statusWatcher.on('stateChange', ({ previous, current }) => {
+ *   console.log(`${MachineState[previous]} -> ${MachineState[current]}`);
+ * });
+ * client.statusWatcher.on('progress', ({ percent }) => console.log(`${percent}%`));
+ * client.statusWatcher.start();
+ * ```
+ */
+export class StatusWatcher extends EventEmitter {
+  private readonly client: FiveMClient;
+  private readonly activeIntervalMs: number;
+  private readonly idleIntervalMs: number;
+  private readonly maxIntervalMs: number;
+  private readonly cacheTtlMs: number;
+  private readonly temperatureThreshold: number;
+  private readonly progressStep: number;
+
+  private running = false;
+  private timer: NodeJS.Timeout | null = null;
+  private polling: Promise<FFMachineInfo | null> | null = null;
+  private consecutiveFailures = 0;
+  private intervalMs: number;
+
+  private latest: FFMachineInfo | null = null;
+  /** Last emitted reading per heater. */
+  private readonly reportedTemperatures = new Map<TemperatureSensor, Temperature>();
+  private reportedProgress: ProgressEvent | null = null;
+
+  /**
+   * Creates a new StatusWatcher. Polling starts with {@link start}.
+   * @param client The client whose printer is watched.
+   * @param options Intervals, cache TTL and change thresholds.
+   */
+  constructor(client: FiveMClient, options: StatusWatcherOptions = {}) {
+    super();
+    this.client = client;
+    this.activeIntervalMs = options.activeIntervalMs ?? 1000;
+    this.idleIntervalMs = options.idleIntervalMs ?? 5000;
+    this.maxIntervalMs = options.maxIntervalMs ?? 30000;
+    this.cacheTtlMs = options.cacheTtlMs ?? 1000;
+    this.temperatureThreshold = options.temperatureThreshold ?? 1;
+    this.progressStep = options.progressStep ?? 1;
+    this.intervalMs = this.idleIntervalMs;
+  }
+
+  public on<K extends keyof StatusWatcherEvents>(
+    event: K,
+    listener: StatusWatcherEvents[K]
+  ): this {
+    return super.on(event, listener);
+  }
+
+  public once<K extends keyof StatusWatcherEvents>(
+    event: K,
+    listener: StatusWatcherEvents[K]
+  ): this {
+    return super.once(event, listener);
+  }
+
+  public off<K extends keyof StatusWatcherEvents>(
+    event: K,
+    listener: StatusWatcherEvents[K]
+  ): this {
+    return super.off(event, listener);
+  }
+
+  /** True between {@link start} and {@link stop}. */
+  public get isRunning(): boolean {
+    return this.running;
+  }
+
+  /** Info from the most recent successful poll, or null before the first one. */
+  public get current(): FFMachineInfo | null {
+    return this.latest;
+  }
+
+  /** Delay in milliseconds before the next scheduled poll. */
+  public get currentIntervalMs(): number {
+    return this.intervalMs;
+  }
+
+  /**
+   * Starts polling. The first poll runs immediately. Does nothing if already running.
+   */
+  public start(): void {
+    if (this.running) return;
+    this.running = true;
+    this.schedule(0);
+  }
+
+  /**
+   * Stops polling. A poll already in flight still completes and emits its events.
+   */
+  public stop(): void {
+    this.running = false;
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+  }
+
+  /**
+   * Gets the printer's machine info, from the cache when it is fresh enough.
+   * Concurrent callers share one in-flight request.
+   * @param maxAgeMs Maximum acceptable age in milliseconds (defaults to the `cacheTtlMs` option).
+   * @returns A Promise that resolves to the machine info, or null if it could not be fetched.
+   */
+  public getInfo(maxAgeMs: number = this.cacheTtlMs): Promise<FFMachineInfo | null> {
+    return this.client.info.getCached(maxAgeMs);
+  }
+
+  /**
+   * Polls now, emitting change events, and restarts the interval if the watcher is running.
+   * @returns A Promise that resolves to the fresh machine info, or null if the poll failed.
+   */
+  public refresh(): Promise<FFMachineInfo | null> {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    return this.poll();
+  }
+
+  private schedule(delayMs: number): void {
+    this.timer = setTimeout(() => {
+      this.timer = null;
+      void this.poll();
+    }, delayMs);
+  }
+
+  /** Runs one poll; overlapping calls share it. Reschedules itself while running. */
+  private poll(): Promise<FFMachineInfo | null> {
+    if (!this.polling) {
+      this.polling = this.client.info
+        .get()
+        .then(
+          (info) => {
+            this.handleResult(info);
+            return info;
+          },
+          (error: unknown) => {
+            this.handleFailure(error instanceof Error ? error : new Error(String(error)));
+            return null;
+          }
+        )
+        .finally(() => {
+          this.polling = null;
+          if (this.running && !this.timer) {
+            this.schedule(this.intervalMs);
+          }
+        });
+    }
+    return this.polling;
+  }
+
+  private handleResult(info: FFMachineInfo | null): void {
+    if (!info) {
+      this.handleFailure(new Error('Printer returned no machine info'));
+      return;
+    }
+
+    this.consecutiveFailures = 0;
+    const previous = this.latest;
+    this.latest = info;
+    this.intervalMs = this.isActive(info) ? this.activeIntervalMs : this.idleIntervalMs;
+
+    this.emitSafely('update', info, previous);
+    if (previous) {
+      if (previous.MachineState !== info.MachineState) {
+        const event: StateChangeEvent = {
+          previous: previous.MachineState,
+          current: info.MachineState,
+          info,
+        };
+        this.emitSafely('stateChange', event);
+      }
+      this.detectSlotChanges(previous, info);
+    }
+    this.detectTemperatureChanges(info);
+    this.detectProgress(info);
+  }
+
+  private handleFailure(error: Error): void {
+    this.consecutiveFailures++;
+    this.intervalMs = Math.min(
+      this.maxIntervalMs,
+      this.idleIntervalMs * 2 ** (this.consecutiveFailures - 1)
+    );
+
+    if (this.listenerCount('error') > 0) {
+      this.emitSafely('error', error);
+    } else {
+      log.warn(`StatusWatcher poll failed: ${error.message}`);
+    }
+  }
+
+  /**
+   * Calls each listener of an event in turn. A listener that throws is logged and skipped, so it
+   * cannot stop the other listeners, the poll's remaining events or the polling loop.
+   */
+  private emitSafely<K extends keyof StatusWatcherEvents>(
+    event: K,
+    ...args: Parameters<StatusWatcherEvents[K]>
+  ): void {
+    for (const listener of this.rawListeners(event)) {
+      try {
+        (listener as (...values: unknown[]) => void).apply(this, args);
+      } catch (error: unknown) {
+        log.error(`StatusWatcher '${event}' listener threw:`, error);
+      }
+    }
+  }
+
+  /** Active states, or any heater with a target, warrant the fast interval. */
+  private isActive(info: FFMachineInfo): boolean {
+    return (
+      ACTIVE_STATES.has(info.MachineState) ||
+      info.Extruder.set > 0 ||
+      info.PrintBed.set > 0 ||
+      info.Chamber.set > 0
+    );
+  }
+
+  /** Emits heaters that moved past the threshold since their last event; new ones are recorded. */
+  private detectTemperatureChanges(info: FFMachineInfo): void {
+    const readings: Array<[TemperatureSensor, Temperature]> = [
+      ['extruder', info.Extruder],
+      ['bed', info.PrintBed],
+      ['chamber', info.Chamber],
+    ];
+    // Single-nozzle models mirror the extruder in ToolTemps; only report tools on tool-changers.
+    if (info.ToolTemps.length > 1) {
+      info.ToolTemps.forEach((temperature, index) => {
+        readings.push([`tool${index}`, temperature]);
+      });
+    }
+
+    for (const [sensor, current] of readings) {
+      const previous = this.reportedTemperatures.get(sensor);
+      if (!previous) {
+        this.reportedTemperatures.set(sensor, { ...current });
+        continue;
+      }
+
+      if (
+        Math.abs(current.current - previous.current) >= this.temperatureThreshold ||
+        Math.abs(current.set - previous.set) >= this.temperatureThreshold
+      ) {
+        this.reportedTemperatures.set(sensor, { ...current });
+        const event: TemperatureChangeEvent = { sensor, previous, current };
+        this.emitSafely('temperatureChange', event);
+      }
+    }
+  }
+
+  /** Emits when progress moved by the progress step, the layer changed, or a new file started. */
+  private detectProgress(info: FFMachineInfo): void {
+    const event: ProgressEvent = {
+      percent: info.PrintProgressInt,
+      layer: info.CurrentPrintLayer,
+      totalLayers: info.TotalPrintLayers,
+      fileName: info.PrintFileName,
+      estimatedTime: info.EstimatedTime,
+    };
+    const reported = this.reportedProgress;
+    if (!reported) {
+      this.reportedProgress = event;
+      return;
+    }
+
+    if (
+      reported.fileName !== event.fileName ||
+      Math.abs(event.percent - reported.percent) >= this.progressStep ||
+      event.layer !== reported.layer
+    ) {
+      this.reportedProgress = event;
+      this.emitSafely('progress', event);
+    }
+  }
+
+  private detectSlotChanges(previous: FFMachineInfo, info: FFMachineInfo): void {
+    const before = indexSlots(previous.MatlStationInfo?.slotInfos);
+    const after = indexSlots(info.MatlStationInfo?.slotInfos);
+    const slotIds = new Set([...before.keys(), ...after.keys()]);
+
+    for (const slotId of slotIds) {
+      const was = before.get(slotId) ?? null;
+      const now = after.get(slotId) ?? null;
+      if (
+        was?.hasFilament !== now?.hasFilament ||
+        was?.materialName !== now?.materialName ||
+        was?.materialColor !== now?.materialColor
+      ) {
+        const event: SlotChangeEvent = { slotId, previous: was, current: now };
+        this.emitSafely('slotChange', event);
+      }
+    }
+  }
+}
+
+function indexSlots(slots: SlotInfo[] | undefined): Map<number, SlotInfo> {
+  const bySlotId = new Map<number, SlotInfo>();
+  for (const slot of slots ?? []) {
+    bySlotId.set(slot.slotId, slot);
+  }
+  return bySlotId;
+}
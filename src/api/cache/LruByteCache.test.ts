@@ -0,0 +1,70 @@
+/**
+ * @fileoverview Tests for the byte-bounded LRU cache: recency order, eviction by byte budget, and
+ * rejection of values larger than the budget.
+ */
+import { describe, expect, it } from 'vitest';
+import { LruByteCache } from './LruByteCache';
+
+function bufferCache(maxBytes: number): LruByteCache<string, Buffer> {
+  return new LruByteCache<string, Buffer>(maxBytes, (value) => value.length);
+}
+
+describe('LruByteCache', () => {
+  it('tracks entries and their total size', () => {
+    const cache = bufferCache(100);
+
+    cache.set('a', Buffer.alloc(10));
+    cache.set('b', Buffer.alloc(20));
+
+    expect(cache.size).toBe(2);
+    expect(cache.bytes).toBe(30);
+    expect(cache.get('a')?.length).toBe(10);
+    expect(cache.get('missing')).toBeUndefined();
+  });
+
+  it('evicts the least recently used entries to stay within the budget', () => {
+    const cache = bufferCache(30);
+    cache.set('a', Buffer.alloc(10));
+    cache.set('b', Buffer.alloc(10));
+    cache.set('c', Buffer.alloc(10));
+
+    // Reading "a" makes "b" the least recently used entry.
+    cache.get('a');
+    cache.set('d', Buffer.alloc(15));
+
+    expect(Array.from(cache.keys())).toEqual(['a', 'd']);
+    expect(cache.bytes).toBe(25);
+  });
+
+  it('replaces an existing entry and updates the total size', () => {
+    const cache = bufferCache(100);
+    cache.set('a', Buffer.alloc(40));
+    cache.set('a', Buffer.alloc(5));
+
+    expect(cache.size).toBe(1);
+    expect(cache.bytes).toBe(5);
+  });
+
+  it('does not store a value larger than the whole budget', () => {
+    const cache = bufferCache(10);
+    cache.set('a', Buffer.alloc(5));
+
+    expect(cache.set('big', Buffer.alloc(11))).toBe(false);
+    expect(cache.has('big')).toBe(false);
+    expect(cache.has('a')).toBe(true);
+  });
+
+  it('deletes and clears entries', () => {
+    const cache = bufferCache(100);
+    cache.set('a', Buffer.alloc(10));
+    cache.set('b', Buffer.alloc(10));
+
+    expect(cache.delete('a')).toBe(true);
+    expect(cache.delete('a')).toBe(false);
+    expect(cache.bytes).toBe(10);
+
+    cache.clear();
+    expect(cache.size).toBe(0);
+    expect(cache.bytes).toBe(0);
+  });
+});
@@ -0,0 +1,107 @@
+/**
+ * @fileoverview Least-recently-used cache bounded by the total byte size of its values rather than
+ * by entry count, for caching thumbnails and other binary payloads of very different sizes.
+ */
+
+/**
+ * A Map-backed LRU cache whose capacity is a byte budget.
+ *
+ * Map iteration order is insertion order, so re-inserting an entry on every read keeps the
+ * least recently used entry first; eviction removes from the front until the budget is met.
+ * A value larger than the whole budget is not stored.
+ */
+export class LruByteCache<K, V> {
+  /** Maximum total size of all values in bytes. */
+  public readonly maxBytes: number;
+
+  private readonly sizeOf: (value: V) => number;
+  private readonly entries = new Map<K, { value: V; bytes: number }>();
+  private totalBytes = 0;
+
+  /**
+   * Creates a new LruByteCache.
+   * @param maxBytes Maximum total size of all values in bytes.
+   * @param sizeOf Returns the size of a value in bytes.
+   */
+  constructor(maxBytes: number, sizeOf: (value: V) => number) {
+    this.maxBytes = maxBytes;
+    this.sizeOf = sizeOf;
+  }
+
+  /** Number of cached entries. */
+  public get size(): number {
+    return this.entries.size;
+  }
+
+  /** Total size of all cached values in bytes. */
+  public get bytes(): number {
+    return this.totalBytes;
+  }
+
+  /**
+   * Gets a value and marks it as most recently used.
+   * @param key The cache key.
+   * @returns The cached value, or undefined if it is not cached.
+   */
+  public get(key: K): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) return undefined;
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  /**
+   * Checks whether a key is cached without changing its recency.
+   * @param key The cache key.
+   */
+  public has(key: K): boolean {
+    return this.entries.has(key);
+  }
+
+  /**
+   * Stores a value as the most recently used entry, evicting least recently used entries until
+   * the byte budget is met.
+   * @param key The cache key.
+   * @param value The value to store.
+   * @returns True if the value was stored, false if it alone exceeds the budget.
+   */
+  public set(key: K, value: V): boolean {
+    this.delete(key);
+    const bytes = this.sizeOf(value);
+    if (bytes > this.maxBytes) return false;
+
+    this.entries.set(key, { value, bytes });
+    this.totalBytes += bytes;
+    for (const [oldestKey, oldest] of this.entries) {
+      if (this.totalBytes <= this.maxBytes) break;
+      this.entries.delete(oldestKey);
+      this.totalBytes -= oldest.bytes;
+    }
+    return true;
+  }
+
+  /**
+   * Removes an entry.
+   * @param key The cache key.
+   * @returns True if an entry was removed.
+   */
+  public delete(key: K): boolean {
+    const entry = this.entries.get(key);
+    if (!entry) return false;
+    this.entries.delete(key);
+    this.totalBytes -= entry.bytes;
+    return true;
+  }
+
+  /** Removes all entries. */
+  public clear(): void {
+    this.entries.clear();
+    this.totalBytes = 0;
+  }
+
+  /** Iterates over cached keys from least to most recently used. */
+  public keys(): IterableIterator<K> {
+    return this.entries.keys();
+  }
+}
@@ -0,0 +1,270 @@
+/**
+ * @fileoverview Tests for the per-printer file cache: list TTL and request sharing, thumbnail
+ * invalidation from file lists, byte budgets, bounded prefetch and disk persistence.
+ */
+import * as fs from 'node:fs';
+import * as os from 'node:os';
+import * as path from 'node:path';
+import { afterAll, beforeAll, describe, expect, it, vi } from 'vitest';
+import { PrinterFileCache } from './PrinterFileCache';
+
+// Suppress disk error logs during tests
+const originalConsole = { ...console };
+beforeAll(() => {
+  console.log = vi.fn();
+});
+
+afterAll(() => {
+  console.log = originalConsole.log;
+});
+
+function png(fill: number, length = 16): Buffer {
+  return Buffer.alloc(length, fill);
+}
+
+function deferred<T>() {
+  let resolve!: (value: T) => void;
+  const promise = new Promise<T>((res) => {
+    resolve = res;
+  });
+  return { promise, resolve };
+}
+
+const byName = (name: string) => ({ name, version: '' });
+
+describe('PrinterFileCache', () => {
+  describe('file lists', () => {
+    it('shares one fetch between concurrent callers and reuses it within the TTL', async () => {
+      const cache = new PrinterFileCache('SN1', { listTtlMs: 60000 });
+      const fetch = vi.fn().mockResolvedValue(['a.gcode', 'b.gcode']);
+
+      const [first, second] = await Promise.all([
+        cache.getFileList('m661', fetch, byName, true),
+        cache.getFileList('m661', fetch, byName, true),
+      ]);
+      const third = await cache.getFileList('m661', fetch, byName, true);
+
+      expect(fetch).toHaveBeenCalledTimes(1);
+      expect(first).toEqual(['a.gcode', 'b.gcode']);
+      expect(second).toBe(first);
+      expect(third).toBe(first);
+    });
+
+    it('does not cache failed fetches', async () => {
+      const cache = new PrinterFileCache('SN1', { listTtlMs: 60000 });
+      const fetch = vi.fn().mockResolvedValueOnce(null).mockResolvedValueOnce(['a.gcode']);
+
+      await expect(cache.getFileList('m661', fetch, byName, true)).resolves.toBeNull();
+      await expect(cache.getFileList('m661', fetch, byName, true)).resolves.toEqual(['a.gcode']);
+      expect(fetch).toHaveBeenCalledTimes(2);
+    });
+
+    it('refetches once the list is older than the TTL', async () => {
+      const cache = new PrinterFileCache('SN1', { listTtlMs: 0 });
+      const fetch = vi.fn().mockResolvedValue(['a.gcode']);
+
+      await cache.getFileList('m661', fetch, byName, true);
+      await cache.getFileList('m661', fetch, byName, true, -1);
+
+      expect(fetch).toHaveBeenCalledTimes(2);
+    });
+  });
+
+  describe('thumbnails', () => {
+    it('fetches a thumbnail once and serves repeats from memory', async () => {
+      const cache = new PrinterFileCache('SN1');
+      const fetch = vi.fn().mockResolvedValue(png(1));
+
+      const [first, second] = await Promise.all([
+        cache.getThumbnail('a.gcode', fetch),
+        cache.getThumbnail('a.gcode', fetch),
+      ]);
+      const third = await cache.getThumbnail('a.gcode', fetch);
+
+      expect(fetch).toHaveBeenCalledTimes(1);
+      expect(second).toBe(first);
+      expect(third).toBe(first);
+      expect(cache.getStats()).toMatchObject({ thumbnails: 1, bytes: 16, hits: 1, misses: 1 });
+    });
+
+    it('caches a copy of a thumbnail that is a view into a larger buffer', async () => {
+      const cache = new PrinterFileCache('SN1');
+      const header = Buffer.from('CMD M662 Received.\nok');
+      const reply = Buffer.concat([header, png(1), Buffer.alloc(4096)]);
+      const view = reply.subarray(header.length, header.length + 16);
+
+      const cached = await cache.getThumbnail('a.gcode', async () => view);
+
+      expect(cached).toEqual(view);
+      expect(cached?.buffer).not.toBe(view.buffer);
+      expect(cached?.buffer.byteLength).toBe(16);
+      expect(await cache.getThumbnail('a.gcode', vi.fn())).toBe(cached);
+    });
+
+    it('does not cache a missing thumbnail', async () => {
+      const cache = new PrinterFileCache('SN1');
+      const fetch = vi.fn().mockResolvedValueOnce(null).mockResolvedValueOnce(png(1));
+
+      await expect(cache.getThumbnail('a.gcode', fetch)).resolves.toBeNull();
+      await expect(cache.getThumbnail('a.gcode', fetch)).resolves.toEqual(png(1));
+    });
+
+    it('drops a thumbnail when the file list reports a new version', async () => {
+      const cache = new PrinterFileCache('SN1');
+      cache.updateFileList([{ name: 'a.gcode', version: '100' }], false);
+      await cache.getThumbnail('a.gcode', async () => png(1));
+
+      expect(cache.updateFileList([{ name: 'a.gcode', version: '100' }], false)).toBe(false);
+      expect(cache.updateFileList([{ name: 'a.gcode', version: '250' }], false)).toBe(true);
+      await expect(cache.getThumbnail('a.gcode', async () => png(2))).resolves.toEqual(png(2));
+    });
+
+    it('drops thumbnails of files missing from a complete list only', async () => {
+      const cache = new PrinterFileCache('SN1');
+      await cache.getThumbnail('a.gcode', async () => png(1));
+      await cache.getThumbnail('b.gcode', async () => png(2));
+
+      cache.updateFileList([byName('a.gcode')], false);
+      expect(cache.getStats().thumbnails).toBe(2);
+
+      cache.updateFileList([byName('a.gcode')], true);
+      expect(cache.getStats().thumbnails).toBe(1);
+    });
+
+    it('keeps the known version when a list carries names only', async () => {
+      const cache = new PrinterFileCache('SN1');
+      cache.updateFileList([{ name: 'a.gcode', version: '100' }], false);
+      const fetch = vi.fn().mockResolvedValue(png(1));
+      await cache.getThumbnail('a.gcode', fetch);
+
+      cache.updateFileList([byName('a.gcode')], true);
+      await cache.getThumbnail('a.gcode', fetch);
+
+      expect(fetch).toHaveBeenCalledTimes(1);
+    });
+
+    it('does not store a thumbnail whose file changed while it was fetched', async () => {
+      const cache = new PrinterFileCache('SN1');
+      cache.updateFileList([{ name: 'a.gcode', version: '1' }], false);
+      const reply = deferred<Buffer | null>();
+
+      const pending = cache.getThumbnail('a.gcode', () => reply.promise);
+      cache.updateFileList([{ name: 'a.gcode', version: '2' }], false);
+      reply.resolve(png(1));
+      await pending;
+
+      expect(cache.getStats().thumbnails).toBe(0);
+    });
+
+    it('evicts the least recently used thumbnails beyond the byte budget', async () => {
+      const cache = new PrinterFileCache('SN1', { maxBytes: 40 });
+      await cache.getThumbnail('a.gcode', async () => png(1));
+      await cache.getThumbnail('b.gcode', async () => png(2));
+      await cache.getThumbnail('a.gcode', async () => png(9));
+      await cache.getThumbnail('c.gcode', async () => png(3));
+
+      expect(cache.getStats()).toMatchObject({ thumbnails: 2, bytes: 32 });
+      const refetch = vi.fn().mockResolvedValue(png(2));
+      await cache.getThumbnail('b.gcode', refetch);
+      expect(refetch).toHaveBeenCalledTimes(1);
+    });
+
+    it('invalidates one file or everything', async () => {
+      const cache = new PrinterFileCache('SN1');
+      await cache.getThumbnail('a.gcode', async () => png(1));
+      await cache.getThumbnail('b.gcode', async () => png(2));
+
+      cache.invalidate('a.gcode');
+      expect(cache.getStats().thumbnails).toBe(1);
+
+      cache.invalidate();
+      expect(cache.getStats().thumbnails).toBe(0);
+    });
+  });
+
+  describe('prefetchThumbnails', () => {
+    it('fetches thumbnails in order with bounded concurrency', async () => {
+      const cache = new PrinterFileCache('SN1');
+      let active = 0;
+      let peak = 0;
+      const fetch = vi.fn(async (name: string) => {
+        active++;
+        peak = Math.max(peak, active);
+        await new Promise((resolve) => setTimeout(resolve, 5));
+        active--;
+        return name === 'c.gcode' ? null : Buffer.from(name);
+      });
+
+      const names = ['a.gcode', 'b.gcode', 'c.gcode', 'd.gcode', 'e.gcode'];
+      const results = await cache.prefetchThumbnails(names, fetch, 2);
+
+      expect(peak).toBe(2);
+      expect(results).toEqual([
+        Buffer.from('a.gcode'),
+        Buffer.from('b.gcode'),
+        null,
+        Buffer.from('d.gcode'),
+        Buffer.from('e.gcode'),
+      ]);
+      expect(cache.getStats().thumbnails).toBe(4);
+    });
+  });
+
+  describe('disk persistence', () => {
+    let persistDir: string;
+
+    beforeAll(() => {
+      persistDir = fs.mkdtempSync(path.join(os.tmpdir(), 'ff-api-file-cache-'));
+    });
+
+    afterAll(() => {
+      fs.rmSync(persistDir, { recursive: true, force: true });
+    });
+
+    it('serves thumbnails persisted by an earlier cache', async () => {
+      const writer = new PrinterFileCache('SN/1', { persistDir });
+      writer.updateFileList([{ name: 'a.gcode', version: '100' }], false);
+      await writer.getThumbnail('a.gcode', async () => png(7));
+      await writer.flush();
+
+      expect(fs.existsSync(path.join(persistDir, 'SN_1', 'index.json'))).toBe(true);
+
+      const reader = new PrinterFileCache('SN/1', { persistDir });
+      reader.updateFileList([{ name: 'a.gcode', version: '100' }], false);
+      const fetch = vi.fn().mockResolvedValue(png(0));
+      await expect(reader.getThumbnail('a.gcode', fetch)).resolves.toEqual(png(7));
+      expect(fetch).not.toHaveBeenCalled();
+
+      // A different version on the printer makes the persisted copy stale.
+      const stale = new PrinterFileCache('SN/1', { persistDir });
+      stale.updateFileList([{ name: 'a.gcode', version: '200' }], false);
+      await expect(stale.getThumbnail('a.gcode', fetch)).resolves.toEqual(png(0));
+      await stale.flush();
+    });
+
+    it('removes persisted thumbnails of deleted files', async () => {
+      const cache = new PrinterFileCache('SN2', { persistDir });
+      await cache.getThumbnail('a.gcode', async () => png(1));
+      await cache.flush();
+
+      cache.updateFileList([], true);
+      await cache.flush();
+
+      const dir = path.join(persistDir, 'SN2');
+      expect(fs.readdirSync(dir)).toEqual(['index.json']);
+    });
+
+    it('keeps the disk within its budget', async () => {
+      const cache = new PrinterFileCache('SN3', { persistDir, maxDiskBytes: 40 });
+      await cache.getThumbnail('a.gcode', async () => png(1));
+      await cache.getThumbnail('b.gcode', async () => png(2));
+      await cache.getThumbnail('c.gcode', async () => png(3));
+      await cache.flush();
+
+      const index = JSON.parse(
+        fs.readFileSync(path.join(persistDir, 'SN3', 'index.json'), 'utf8')
+      ) as Record<string, unknown>;
+      expect(Object.keys(index).sort()).toEqual(['b.gcode', 'c.gcode']);
+    });
+  });
+});
@@ -0,0 +1,427 @@
+/**
+ * @fileoverview Per-printer cache for file lists and thumbnails. Keeps thumbnail PNG bytes in a
+ * byte-bounded LRU (optionally persisted to disk), invalidates them when the printer's file list
+ * shows a file was removed or replaced, and shares in-flight fetches between concurrent callers.
+ */
+import { createHash } from 'node:crypto';
+import { promises as fs } from 'node:fs';
+import * as path from 'node:path';
+import { log } from '../../diagnostics/Logger';
+import { ConcurrencyLimiter } from '../misc/ConcurrencyLimiter';
+import { LruByteCache } from './LruByteCache';
+
+/**
+ * Configuration options for a {@link PrinterFileCache}.
+ */
+export interface PrinterFileCacheOptions {
+  /** Memory budget for thumbnails in bytes (default: 32 MiB). 0 disables thumbnail caching. */
+  maxBytes?: number;
+  /** How long a fetched file list is reused, in milliseconds (default: 1000). */
+  listTtlMs?: number;
+  /** Directory to persist thumbnails in, across restarts. Disabled when unset. */
+  persistDir?: string;
+  /** Disk budget for persisted thumbnails in bytes (default: 256 MiB). */
+  maxDiskBytes?: number;
+}
+
+/** A file as reported by a file list, used to detect replaced files. */
+export interface FileListEntryVersion {
+  /** File name without the `/data/` prefix. */
+  name: string;
+  /**
+   * Metadata that changes when the file is replaced (size, print time, ...). Empty when the
+   * list carries names only, in which case the version already known for the file is kept.
+   */
+  version: string;
+}
+
+/** Cache statistics, for diagnostics. */
+export interface PrinterFileCacheStats {
+  /** Thumbnails held in memory. */
+  thumbnails: number;
+  /** Bytes held in memory. */
+  bytes: number;
+  /** Thumbnail reads served from memory or disk. */
+  hits: number;
+  /** Thumbnail reads that went to the printer. */
+  misses: number;
+}
+
+interface CachedThumbnail {
+  data: Buffer;
+  version: string;
+}
+
+interface DiskIndexEntry {
+  version: string;
+  file: string;
+  bytes: number;
+  storedAt: number;
+}
+
+const INDEX_FILE = 'index.json';
+
+/**
+ * Caches one printer's file lists and thumbnails.
+ *
+ * A thumbnail is cached under its file name together with the version the latest file list
+ * reported for it, so a read only hits while the file is unchanged. Each fresh file list is
+ * compared with what the cache knows: thumbnails of files whose metadata changed are dropped,
+ * and a complete list (M661) also drops thumbnails of files that are gone. Lists that carry
+ * names only cannot reveal a file replaced under the same name, so uploads through this
+ * library invalidate the uploaded name explicitly.
+ *
+ * Failed fetches (null results) are never cached.
+ */
+/**
+ * Copies a Buffer that is a view into a larger allocation (a framed TCP reply or a pooled
+ * socket chunk), so caching it keeps only its own bytes alive. The byte budget counts
+ * `data.length`, which would otherwise understate what the cache retains.
+ */
+function ownBytes(data: Buffer | null): Buffer | null {
+  if (!data || (data.byteOffset === 0 && data.byteLength === data.buffer.byteLength)) return data;
+  // Not Buffer.from(): small copies would land in Node's shared 8 KiB allocation pool.
+  const copy = Buffer.allocUnsafeSlow(data.length);
+  data.copy(copy);
+  return copy;
+}
+
+export class PrinterFileCache {
+  private readonly thumbnails: LruByteCache<string, CachedThumbnail>;
+  private readonly listTtlMs: number;
+  private readonly persistDir: string | null;
+  private readonly maxDiskBytes: number;
+
+  /** Latest known version per file name. */
+  private readonly versions = new Map<string, string>();
+  private readonly lists = new Map<string, { entries: unknown[]; fetchedAt: number }>();
+  private readonly pendingLists = new Map<string, Promise<unknown[] | null>>();
+  private readonly pendingThumbnails = new Map<string, Promise<Buffer | null>>();
+
+  private diskIndex: Promise<Map<string, DiskIndexEntry>> | null = null;
+  private diskWrites: Promise<void> = Promise.resolve();
+  private hits = 0;
+  private misses = 0;
+
+  /**
+   * Creates a new PrinterFileCache.
+   * @param printerId Identifies the printer (serial number or host); names the disk directory.
+   * @param options Memory and disk budgets, list TTL and persistence directory.
+   */
+  constructor(printerId: string, options: PrinterFileCacheOptions = {}) {
+    this.thumbnails = new LruByteCache(
+      options.maxBytes ?? 32 * 1024 * 1024,
+      (entry) => entry.data.length
+    );
+    this.listTtlMs = options.listTtlMs ?? 1000;
+    this.persistDir = options.persistDir
+      ? path.join(options.persistDir, printerId.replace(/[^A-Za-z0-9._-]/g, '_'))
+      : null;
+    this.maxDiskBytes = options.maxDiskBytes ?? 256 * 1024 * 1024;
+  }
+
+  /**
+   * Gets a file list, reusing one fetched within the list TTL. Concurrent callers share one
+   * fetch. A fresh list is checked for changed and removed files (see {@link updateFileList}).
+   * @param key Names the list, e.g. `recent` or `local`.
+   * @param fetch Fetches the list from the printer, or resolves to null on failure.
+   * @param describe Maps an entry to its file name and version.
+   * @param complete True if the list holds every file on the printer (M661), so files missing
+   * from it were deleted; false for partial lists such as the 10 most recent files.
+   * @param maxAgeMs Maximum age of a reused list (defaults to the `listTtlMs` option).
+   * @returns A Promise that resolves to the list, or null if the fetch failed.
+   */
+  public getFileList<T>(
+    key: string,
+    fetch: () => Promise<T[] | null>,
+    describe: (entry: T) => FileListEntryVersion,
+    complete: boolean,
+    maxAgeMs: number = this.listTtlMs
+  ): Promise<T[] | null> {
+    const cached = this.lists.get(key);
+    if (cached && Date.now() - cached.fetchedAt <= maxAgeMs) {
+      return Promise.resolve(cached.entries as T[]);
+    }
+
+    let pending = this.pendingLists.get(key) as Promise<T[] | null> | undefined;
+    if (!pending) {
+      pending = fetch()
+        .then((entries) => {
+          if (entries) {
+            this.lists.set(key, { entries, fetchedAt: Date.now() });
+            this.updateFileList(entries.map(describe), complete);
+          }
+          return entries;
+        })
+        .finally(() => {
+          this.pendingLists.delete(key);
+        });
+      this.pendingLists.set(key, pending);
+    }
+    return pending;
+  }
+
+  /**
+   * Records a freshly fetched file list and drops thumbnails it shows to be stale.
+   * @param entries The files in the list.
+   * @param complete True if the list holds every file on the printer.
+   * @returns True if any cached thumbnail was dropped.
+   */
+  public updateFileList(entries: FileListEntryVersion[], complete: boolean): boolean {
+    const listed = new Set<string>();
+    const stale: string[] = [];
+    for (const { name, version } of entries) {
+      listed.add(name);
+      const known = this.versions.get(name);
+      if (known === undefined || (version !== '' && known !== version)) {
+        if (known !== undefined) stale.push(name);
+        this.versions.set(name, version);
+      }
+    }
+    if (complete) {
+      for (const name of Array.from(this.versions.keys())) {
+        if (!listed.has(name)) {
+          this.versions.delete(name);
+          stale.push(name);
+        }
+      }
+    }
+
+    let dropped = false;
+    for (const name of stale) {
+      dropped = this.thumbnails.delete(name) || dropped;
+    }
+    if ((stale.length > 0 || complete) && this.persistDir) {
+      // The disk may hold thumbnails from earlier runs that this session has not seen listed.
+      this.queueDiskWork(async (index) => {
+        let changed = false;
+        for (const [name, entry] of Array.from(index.entries())) {
+          const version = this.versions.get(name);
+          const gone = complete && !listed.has(name);
+          if (gone || (version !== undefined && version !== entry.version)) {
+            changed = (await this.removeDiskEntry(index, name)) || changed;
+          }
+        }
+        return changed;
+      });
+    }
+    return dropped;
+  }
+
+  /**
+   * Gets a thumbnail from memory, then disk, then the printer. Concurrent callers for the same
+   * file share one fetch, and a fetched thumbnail is cached for the file's current version.
+   * @param fileName File name without the `/data/` prefix.
+   * @param fetch Fetches the PNG bytes from the printer, or resolves to null on failure.
+   * @returns A Promise that resolves to the PNG bytes, or null if they could not be fetched.
+   */
+  public getThumbnail(
+    fileName: string,
+    fetch: (fileName: string) => Promise<Buffer | null>
+  ): Promise<Buffer | null> {
+    const version = this.versions.get(fileName) ?? '';
+    const cached = this.thumbnails.get(fileName);
+    if (cached && cached.version === version) {
+      this.hits++;
+      return Promise.resolve(cached.data);
+    }
+
+    let pending = this.pendingThumbnails.get(fileName);
+    if (!pending) {
+      pending = this.loadThumbnail(fileName, version, fetch).finally(() => {
+        this.pendingThumbnails.delete(fileName);
+      });
+      this.pendingThumbnails.set(fileName, pending);
+    }
+    return pending;
+  }
+
+  /**
+   * Fetches thumbnails that are not cached yet, a few at a time, so a gallery can render from
+   * the cache afterwards.
+   * @param fileNames The files to prefetch.
+   * @param fetch Fetches one thumbnail from the printer.
+   * @param concurrency Maximum number of fetches in flight (default: 4).
+   * @returns A Promise that resolves to the thumbnails in the order of `fileNames`, with null for
+   * files whose thumbnail could not be fetched.
+   */
+  public prefetchThumbnails(
+    fileNames: string[],
+    fetch: (fileName: string) => Promise<Buffer | null>,
+    concurrency = 4
+  ): Promise<Array<Buffer | null>> {
+    const limiter = new ConcurrencyLimiter({ concurrency: Math.max(1, concurrency) });
+    return limiter.map(fileNames, (fileName) => this.getThumbnail(fileName, fetch));
+  }
+
+  /**
+   * Drops cached data for one file (its thumbnail, in memory and on disk) or for everything,
+   * and forgets cached file lists so the next read fetches them.
+   * @param fileName File name without the `/data/` prefix, or undefined for all files.
+   */
+  public invalidate(fileName?: string): void {
+    this.lists.clear();
+    if (fileName === undefined) {
+      this.thumbnails.clear();
+      this.versions.clear();
+      if (this.persistDir) {
+        this.queueDiskWork(async (index) => {
+          for (const name of Array.from(index.keys())) {
+            await this.removeDiskEntry(index, name);
+          }
+          return true;
+        });
+      }
+      return;
+    }
+
+    this.thumbnails.delete(fileName);
+    this.versions.delete(fileName);
+    if (this.persistDir) {
+      this.queueDiskWork((index) => this.removeDiskEntry(index, fileName));
+    }
+  }
+
+  /** Forgets cached file lists so the next read fetches them, keeping thumbnails. */
+  public invalidateLists(): void {
+    this.lists.clear();
+  }
+
+  /** Gets cache statistics. */
+  public getStats(): PrinterFileCacheStats {
+    return {
+      thumbnails: this.thumbnails.size,
+      bytes: this.thumbnails.bytes,
+      hits: this.hits,
+      misses: this.misses,
+    };
+  }
+
+  /**
+   * Waits for pending disk writes and removals to finish.
+   * @returns A Promise that resolves once the disk is up to date.
+   */
+  public flush(): Promise<void> {
+    return this.diskWrites;
+  }
+
+  private async loadThumbnail(
+    fileName: string,
+    version: string,
+    fetch: (fileName: string) => Promise<Buffer | null>
+  ): Promise<Buffer | null> {
+    const persisted = await this.readFromDisk(fileName, version);
+    if (persisted) {
+      this.hits++;
+      this.store(fileName, version, persisted);
+      return persisted;
+    }
+
+    this.misses++;
+    const data = ownBytes(await fetch(fileName));
+    // Store only if no newer list changed the file's version while the fetch was in flight.
+    if (data && (this.versions.get(fileName) ?? '') === version) {
+      this.store(fileName, version, data);
+      if (this.persistDir) {
+        this.queueDiskWork((index) => this.writeDiskEntry(index, fileName, version, data));
+      }
+    }
+    return data;
+  }
+
+  private store(fileName: string, version: string, data: Buffer): void {
+    this.thumbnails.set(fileName, { data, version });
+    // Track the file so a complete list without it drops the thumbnail.
+    if (!this.versions.has(fileName)) this.versions.set(fileName, version);
+  }
+
+  private async readFromDisk(fileName: string, version: string): Promise<Buffer | null> {
+    if (!this.persistDir) return null;
+    try {
+      const index = await this.loadDiskIndex();
+      const entry = index.get(fileName);
+      if (!entry || entry.version !== version) return null;
+      return await fs.readFile(path.join(this.persistDir, entry.file));
+    } catch {
+      return null;
+    }
+  }
+
+  private loadDiskIndex(): Promise<Map<string, DiskIndexEntry>> {
+    if (!this.diskIndex) {
+      const dir = this.persistDir as string;
+      this.diskIndex = fs
+        .readFile(path.join(dir, INDEX_FILE), 'utf8')
+        .then((json) => new Map(Object.entries(JSON.parse(json) as Record<string, DiskIndexEntry>)))
+        .catch(() => new Map<string, DiskIndexEntry>());
+    }
+    return this.diskIndex;
+  }
+
+  /**
+   * Serializes disk work so index updates never interleave, and saves the index when the work
+   * reports a change. Disk errors are logged only.
+   */
+  private queueDiskWork(work: (index: Map<string, DiskIndexEntry>) => Promise<boolean>): void {
+    this.diskWrites = this.diskWrites
+      .then(async () => {
+        const index = await this.loadDiskIndex();
+        if (await work(index)) {
+          await this.saveDiskIndex(index);
+        }
+      })
+      .catch((error: unknown) => {
+        log.warn(
+          `PrinterFileCache: disk cache error: ${error instanceof Error ? error.message : String(error)}`
+        );
+      });
+  }
+
+  private async writeDiskEntry(
+    index: Map<string, DiskIndexEntry>,
+    fileName: string,
+    version: string,
+    data: Buffer
+  ): Promise<boolean> {
+    const dir = this.persistDir as string;
+    await fs.mkdir(dir, { recursive: true });
+    await this.removeDiskEntry(index, fileName);
+
+    const file = `${createHash('sha1').update(`${fileName}\0${version}`).digest('hex')}.png`;
+    await fs.writeFile(path.join(dir, file), data);
+    index.set(fileName, { version, file, bytes: data.length, storedAt: Date.now() });
+
+    // Enforce the disk budget, oldest first.
+    let total = 0;
+    for (const entry of index.values()) total += entry.bytes;
+    const oldestFirst = Array.from(index.entries()).sort((a, b) => a[1].storedAt - b[1].storedAt);
+    for (const [name, entry] of oldestFirst) {
+      if (total <= this.maxDiskBytes) break;
+      total -= entry.bytes;
+      await this.removeDiskEntry(index, name);
+    }
+    return true;
+  }
+
+  private async removeDiskEntry(
+    index: Map<string, DiskIndexEntry>,
+    fileName: string
+  ): Promise<boolean> {
+    const entry = index.get(fileName);
+    if (!entry) return false;
+    index.delete(fileName);
+    await fs.unlink(path.join(this.persistDir as string, entry.file)).catch(() => undefined);
+    return true;
+  }
+
+  private async saveDiskIndex(index: Map<string, DiskIndexEntry>): Promise<void> {
+    const dir = this.persistDir as string;
+    const json: Record<string, DiskIndexEntry> = {};
+    for (const [name, entry] of index) json[name] = entry;
+    await fs.mkdir(dir, { recursive: true });
+    // Write then rename, so a crash never leaves a truncated index behind.
+    const tmp = path.join(dir, `${INDEX_FILE}.tmp`);
+    await fs.writeFile(tmp, JSON.stringify(json));
+    await fs.rename(tmp, path.join(dir, INDEX_FILE));
+  }
+}
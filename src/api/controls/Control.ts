@@ -4,6 +4,8 @@
  */
 
 import axios from 'axios';
+import { traceHttpRequest } from '../../diagnostics/Diagnostics';
+import { log } from '../../diagnostics/Logger';
 import type { FiveMClient } from '../../FiveMClient';
 import type { FlashForgeClient } from '../../tcpapi/FlashForgeClient';
 import type { SlotAction } from '../../models/ff-models';
@@ -52,7 +54,7 @@ export class Control {
    */
   private canUseTcp(op: string): boolean {
     if (this.client.httpOnly) {
-      console.log(`${op}() unavailable: printer has no TCP control channel (HTTP-only).`);
+      log.warn(`${op}() unavailable: printer has no TCP control channel (HTTP-only).`);
       return false;
     }
     return true;
@@ -85,7 +87,7 @@ export class Control {
     if (this.client.filtrationControl) {
       return await this.sendFiltrationCommand(new FiltrationArgs(false, true));
     }
-    console.log('SetExternalFiltrationOn() error, filtration not equipped.');
+    log.warn('SetExternalFiltrationOn() error, filtration not equipped.');
     return false;
   }
 
@@ -98,7 +100,7 @@ export class Control {
     if (this.client.filtrationControl) {
       return await this.sendFiltrationCommand(new FiltrationArgs(true, false));
     }
-    console.log('SetInternalFiltrationOn() error, filtration not equipped.');
+    log.warn('SetInternalFiltrationOn() error, filtration not equipped.');
     return false;
   }
 
@@ -111,7 +113,7 @@ export class Control {
     if (this.client.filtrationControl) {
       return await this.sendFiltrationCommand(new FiltrationArgs(false, false));
     }
-    console.log('SetFiltrationOff() error, filtration not equipped.');
+    log.warn('SetFiltrationOff() error, filtration not equipped.');
     return false;
   }
 
@@ -180,7 +182,7 @@ export class Control {
     if (this.client.ledControl) {
       return await this.sendControlCommand(Commands.LightControlCmd, { status: 'open' });
     }
-    console.log('SetLedOn() error, LEDs not equipped.');
+    log.warn('SetLedOn() error, LEDs not equipped.');
     return false;
   }
 
@@ -193,7 +195,7 @@ export class Control {
     if (this.client.ledControl) {
       return await this.sendControlCommand(Commands.LightControlCmd, { status: 'close' });
     }
-    console.log('SetLedOff() error, LEDs not equipped.');
+    log.warn('SetLedOff() error, LEDs not equipped.');
     return false;
   }
 
@@ -277,7 +279,7 @@ export class Control {
     hexRgb: string
   ): Promise<boolean> {
     if (!this.client.isAD5X && !this.client.isCreator5) {
-      console.log('configureSlot() error, material station only available on AD5X / Creator 5.');
+      log.warn('configureSlot() error, material station only available on AD5X / Creator 5.');
       return false;
     }
     // Both models render a slot icon only on a byte-for-byte match against their own
@@ -308,7 +310,7 @@ export class Control {
    */
   public async slotAction(slot: number, action: SlotAction): Promise<boolean> {
     if (!this.client.isAD5X) {
-      console.log('slotAction() error, material station only available on AD5X.');
+      log.warn('slotAction() error, material station only available on AD5X.');
       return false;
     }
     return await this.sendControlCommand(Commands.MaterialStationCmd, {
@@ -343,19 +345,22 @@ export class Control {
       },
     };
 
-    console.log(`SendControlCommand:\n${JSON.stringify(payload)}`);
+    log.debug('SendControlCommand:', payload);
 
     try {
       return await this.client.runCommandExclusive(async () => {
-        const response = await axios.post(this.client.getEndpoint(Endpoints.Control), payload, {
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          timeout: 5000,
-        });
+        const response = await traceHttpRequest(this.client.ipAddress, Endpoints.Control, () =>
+          axios.post(this.client.getEndpoint(Endpoints.Control), payload, {
+            headers: {
+              'Content-Type': 'application/json',
+            },
+            timeout: 5000,
+            httpAgent: this.client.httpAgent,
+          })
+        );
 
         const data = response.data;
-        console.log(`Command reply: ${JSON.stringify(data)}`);
+        log.debug('Command reply:', data);
 
         const result = data as GenericResponse;
         return this.isResponseOk(result);
@@ -188,5 +188,78 @@ describe('Files Control', () => {
       const result = await filesControl.getRecentFileList();
       expect(result).toHaveLength(0);
     });
+
+    it('should reuse a fresh list and retry after a failed request', async () => {
+      mockedAxios.post
+        .mockRejectedValueOnce(new Error('Network Error'))
+        .mockResolvedValue({
+          status: 200,
+          data: { code: 0, message: 'Success', gcodeList: olderPrinterGcodeListResponse },
+        });
+
+      await expect(filesControl.getRecentFileList()).resolves.toEqual([]);
+      const first = await filesControl.getRecentFileList();
+      const second = await filesControl.getRecentFileList();
+
+      expect(second).toEqual(first);
+      expect(mockedAxios.post).toHaveBeenCalledTimes(2);
+    });
+  });
+
+  describe('getGCodeThumbnail', () => {
+    const thumbnailResponse = {
+      status: 200,
+      data: { code: 0, message: 'Success', imageData: Buffer.from('png').toString('base64') },
+    };
+
+    it('should share one request between concurrent callers and cache the result', async () => {
+      mockedAxios.post.mockResolvedValue(thumbnailResponse);
+
+      const [first, second] = await Promise.all([
+        filesControl.getGCodeThumbnail('cube.gcode'),
+        filesControl.getGCodeThumbnail('cube.gcode'),
+      ]);
+      const third = await filesControl.getGCodeThumbnail('cube.gcode');
+
+      expect(first?.toString()).toBe('png');
+      expect(second).toBe(first);
+      expect(third).toBe(first);
+      expect(mockedAxios.post).toHaveBeenCalledTimes(1);
+    });
+
+    it('should not cache a failed request', async () => {
+      mockedAxios.post
+        .mockRejectedValueOnce(new Error('Network Error'))
+        .mockResolvedValue(thumbnailResponse);
+
+      await expect(filesControl.getGCodeThumbnail('cube.gcode')).resolves.toBeNull();
+      await expect(filesControl.getGCodeThumbnail('cube.gcode')).resolves.toEqual(
+        Buffer.from('png')
+      );
+    });
+
+    it('should refetch a thumbnail once the recent list reports the file changed', async () => {
+      const listResponse = (printingTime: number) => ({
+        status: 200,
+        data: {
+          code: 0,
+          message: 'Success',
+          gcodeList: [{ gcodeFileName: 'cube.gcode', printingTime }],
+        },
+      });
+      mockedAxios.post
+        .mockResolvedValueOnce(listResponse(60))
+        .mockResolvedValueOnce(thumbnailResponse)
+        .mockResolvedValueOnce(listResponse(90))
+        .mockResolvedValueOnce(thumbnailResponse);
+
+      await filesControl.getRecentFileList();
+      await filesControl.getGCodeThumbnail('cube.gcode');
+      filesControl.cache.invalidateLists();
+      await filesControl.getRecentFileList();
+      await filesControl.getGCodeThumbnail('cube.gcode');
+
+      expect(mockedAxios.post).toHaveBeenCalledTimes(4);
+    });
   });
 });
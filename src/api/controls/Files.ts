@@ -1,11 +1,15 @@
 /**
  * @fileoverview HTTP API file management module for FlashForge 5M printers.
  * Handles file operations including listing local and recent print files, and retrieving G-code thumbnails via HTTP endpoints.
+ * File lists and thumbnails are cached per printer (see {@link PrinterFileCache}).
  */
 
 import axios from 'axios';
+import { traceHttpRequest } from '../../diagnostics/Diagnostics';
+import { log } from '../../diagnostics/Logger';
 import type { FiveMClient } from '../../FiveMClient';
 import type { FFGcodeFileEntry } from '../../models/ff-models';
+import { PrinterFileCache } from '../cache/PrinterFileCache';
 import { NetworkUtils } from '../network/NetworkUtils';
 import { Endpoints } from '../server/Endpoints';
 import type { GenericResponse } from './Control';
@@ -17,12 +21,22 @@ import type { GenericResponse } from './Control';
 export class Files {
   private client: FiveMClient;
 
+  /**
+   * Cache of this printer's file lists and thumbnails. Lists are reused for a short TTL, and
+   * thumbnails are kept until a file list shows the file was removed or replaced, or an upload
+   * through {@link JobControl} overwrites it.
+   */
+  public readonly cache: PrinterFileCache;
+
   /**
    * Creates an instance of the Files class.
    * @param printerClient The FiveMClient instance used for communication with the printer.
+   * @param cache The printer's file cache, shared with its TCP client (defaults to a new cache
+   * keyed by serial number).
    */
-  constructor(printerClient: FiveMClient) {
+  constructor(printerClient: FiveMClient, cache?: PrinterFileCache) {
     this.client = printerClient;
+    this.cache = cache ?? new PrinterFileCache(printerClient.serialNumber);
   }
 
   /**
@@ -37,6 +51,7 @@ export class Files {
       const recent = await this.getRecentFileList();
       return recent.map((entry) => entry.gcodeFileName);
     }
+    // The TCP client records the list in the shared cache, dropping thumbnails of missing files.
     return await this.client.tcpClient.getFileListAsync();
   }
 
@@ -54,27 +69,81 @@ export class Files {
    * sends `gcodeListDetail`. Callers needing per-tool data on a Creator 5 must parse
    * the 3mf at upload time.
    *
+   * The list is cached briefly, and concurrent callers share one request.
+   *
    * @returns A Promise that resolves to an array of `FFGcodeFileEntry` objects.
    *          Returns an empty array if the request fails or an error occurs.
    */
   public async getRecentFileList(): Promise<FFGcodeFileEntry[]> {
+    const entries = await this.cache.getFileList(
+      'recent',
+      () => this.fetchRecentFileList(),
+      (entry) => ({ name: entry.gcodeFileName, version: JSON.stringify(entry) }),
+      false
+    );
+    return entries ? entries.slice() : [];
+  }
+
+  /**
+   * Retrieves the thumbnail image for a specified G-code file.
+   * The image data is returned as a Buffer. Thumbnails are served from the file cache while
+   * the file is unchanged, and concurrent requests for the same file share one fetch.
+   *
+   * @param fileName The name of the G-code file (e.g., "my_print.gcode") for which to retrieve the thumbnail.
+   * @returns A Promise that resolves to a Buffer containing the thumbnail image data (in base64 format, then converted to Buffer),
+   *          or null if the request fails, the file has no thumbnail, or an error occurs.
+   */
+  public async getGCodeThumbnail(fileName: string): Promise<Buffer | null> {
+    return await this.cache.getThumbnail(fileName, (name) => this.fetchGCodeThumbnail(name));
+  }
+
+  /**
+   * Fetches the thumbnails of several files into the file cache, a few requests at a time, so a
+   * file browser can render them from the cache.
+   * @param fileNames The files to prefetch (defaults to the recent file list).
+   * @param concurrency Maximum number of requests in flight (default: 4).
+   * @returns A Promise that resolves to the thumbnails in the order of `fileNames`, with null for
+   *          files whose thumbnail could not be fetched.
+   */
+  public async prefetchThumbnails(
+    fileNames?: string[],
+    concurrency = 4
+  ): Promise<Array<Buffer | null>> {
+    const names =
+      fileNames ?? (await this.getRecentFileList()).map((entry) => entry.gcodeFileName);
+    return await this.cache.prefetchThumbnails(
+      names,
+      (name) => this.fetchGCodeThumbnail(name),
+      concurrency
+    );
+  }
+
+  /**
+   * Requests the recent file list from the printer.
+   * @returns A Promise that resolves to the list, or null if the request fails.
+   * @private
+   */
+  private async fetchRecentFileList(): Promise<FFGcodeFileEntry[] | null> {
     const payload = {
       serialNumber: this.client.serialNumber,
       checkCode: this.client.checkCode,
     };
 
     try {
-      const response = await axios.post(this.client.getEndpoint(Endpoints.GCodeList), payload, {
-        headers: { 'Content-Type': 'application/json' },
-      });
+      const response = await traceHttpRequest(this.client.ipAddress, Endpoints.GCodeList, () =>
+        axios.post(this.client.getEndpoint(Endpoints.GCodeList), payload, {
+          headers: { 'Content-Type': 'application/json' },
+          httpAgent: this.client.httpAgent,
+        })
+      );
 
-      if (response.status !== 200) return [];
+      if (response.status !== 200) return null;
 
       const result = response.data as GCodeListResponse;
 
       if (!NetworkUtils.isOk(result)) {
-        console.log(`Error retrieving file list: ${result.message || 'Unknown error'}`);
-        return [];
+        log.warn(`Error retrieving file list: ${result.message || 'Unknown error'}`);
+        return null;
       }
 
       // Only the AD5X provides detailed info in gcodeListDetail. The Creator 5
@@ -102,20 +171,18 @@ export class Files {
       return [];
     } catch (error: unknown) {
       const err = error as Error;
-      console.log(`GetRecentFileList error: ${err.message}\n${err.stack}`);
-      return [];
+      log.warn(`GetRecentFileList error: ${err.message}\n${err.stack}`);
+      return null;
     }
   }
 
   /**
-   * Retrieves the thumbnail image for a specified G-code file.
-   * The image data is returned as a Buffer.
-   *
-   * @param fileName The name of the G-code file (e.g., "my_print.gcode") for which to retrieve the thumbnail.
-   * @returns A Promise that resolves to a Buffer containing the thumbnail image data (in base64 format, then converted to Buffer),
-   *          or null if the request fails, the file has no thumbnail, or an error occurs.
+   * Requests a thumbnail from the printer.
+   * @param fileName The name of the G-code file.
+   * @returns A Promise that resolves to the decoded image bytes, or null if the request fails.
+   * @private
    */
-  public async getGCodeThumbnail(fileName: string): Promise<Buffer | null> {
+  private async fetchGCodeThumbnail(fileName: string): Promise<Buffer | null> {
     const payload = {
       serialNumber: this.client.serialNumber,
       checkCode: this.client.checkCode,
@@ -123,11 +190,14 @@ export class Files {
     };
 
     try {
-      const response = await axios.post(this.client.getEndpoint(Endpoints.GCodeThumb), payload, {
-        headers: {
-          'Content-Type': 'application/json',
-        },
-      });
+      const response = await traceHttpRequest(this.client.ipAddress, Endpoints.GCodeThumb, () =>
+        axios.post(this.client.getEndpoint(Endpoints.GCodeThumb), payload, {
+          headers: {
+            'Content-Type': 'application/json',
+          },
+          httpAgent: this.client.httpAgent,
+        })
+      );
 
       if (response.status !== 200) return null;
 
@@ -136,11 +206,11 @@ export class Files {
         return Buffer.from(result.imageData, 'base64');
       }
 
-      console.log(`Error retrieving thumbnail: ${result.message}`);
+      log.warn(`Error retrieving thumbnail: ${result.message}`);
       return null;
     } catch (error: unknown) {
       const err = error as Error;
-      console.log(`GetGcodeThumbnail error: ${err.message}\n${err.stack}`);
+      log.warn(`GetGcodeThumbnail error: ${err.message}\n${err.stack}`);
       return null;
     }
   }
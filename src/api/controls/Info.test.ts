@@ -231,4 +231,82 @@ describe('Info', () => {
       expect(result).toBeNull();
     });
   });
+
+  describe('caching', () => {
+    const readyResponse = {
+      status: 200,
+      data: {
+        code: 0,
+        message: 'Success',
+        detail: { name: 'FlashForge 5M Pro', status: 'ready' } as FFPrinterDetail,
+      },
+    };
+
+    it('should share one request between concurrent get() calls', async () => {
+      mockedAxios.post.mockResolvedValue(readyResponse);
+
+      const [first, second] = await Promise.all([info.get(), info.get()]);
+
+      expect(mockedAxios.post).toHaveBeenCalledTimes(1);
+      expect(second).toEqual(first);
+    });
+
+    it('should give each caller a copy the cache does not share', async () => {
+      mockedAxios.post.mockResolvedValue(readyResponse);
+
+      const [first, second] = await Promise.all([info.get(), info.get()]);
+      if (!first) throw new Error('expected machine info');
+      first.Status = 'printing';
+      const cached = await info.getCached();
+
+      expect(second).not.toBe(first);
+      expect(second?.Status).toBe('ready');
+      expect(cached?.Status).toBe('ready');
+      expect(cached).not.toBe(await info.getCached());
+      expect(await info.getStatus()).toBe('ready');
+      expect(mockedAxios.post).toHaveBeenCalledTimes(1);
+    });
+
+    it('should answer status reads within the TTL from one request', async () => {
+      mockedAxios.post.mockResolvedValue(readyResponse);
+
+      const [printing, status, state] = await Promise.all([
+        info.isPrinting(),
+        info.getStatus(),
+        info.getMachineState(),
+      ]);
+      await info.getCached();
+
+      expect(printing).toBe(false);
+      expect(status).toBe('ready');
+      expect(state).toBe(MachineState.Ready);
+      expect(mockedAxios.post).toHaveBeenCalledTimes(1);
+    });
+
+    it('should fetch again once the cache is stale or invalidated', async () => {
+      mockedAxios.post.mockResolvedValue(readyResponse);
+
+      vi.useFakeTimers();
+      try {
+        await info.get();
+        vi.advanceTimersByTime(Info.DEFAULT_CACHE_TTL_MS + 1);
+        await info.getCached();
+        info.invalidateCache();
+        await info.getCached();
+      } finally {
+        vi.useRealTimers();
+      }
+
+      expect(mockedAxios.post).toHaveBeenCalledTimes(3);
+    });
+
+    it('should not cache failed requests', async () => {
+      mockedAxios.post.mockRejectedValueOnce(new Error('Network error'));
+      mockedAxios.post.mockResolvedValueOnce(readyResponse);
+
+      expect(await info.getCached()).toBeNull();
+      expect(await info.getCached()).not.toBeNull();
+      expect(mockedAxios.post).toHaveBeenCalledTimes(2);
+    });
+  });
 });
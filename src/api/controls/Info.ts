@@ -4,6 +4,8 @@
  */
 
 import axios from 'axios';
+import { traceHttpRequest } from '../../diagnostics/Diagnostics';
+import { log } from '../../diagnostics/Logger';
 import type { FiveMClient } from '../../FiveMClient';
 import type { FFMachineInfo, FFPrinterDetail, MachineState } from '../../models/ff-models';
 import { MachineInfo } from '../../models/MachineInfo';
@@ -15,7 +17,14 @@ import type { GenericResponse } from './Control';
  * This includes general machine information, printing status, and raw detail responses.
  */
 export class Info {
+  /** Default maximum age, in milliseconds, of the cached machine info used by {@link getCached}. */
+  public static readonly DEFAULT_CACHE_TTL_MS = 1000;
+
   private client: FiveMClient;
+  /** Most recent successful `get()` result and when it arrived. */
+  private cached: { info: FFMachineInfo; fetchedAt: number } | null = null;
+  /** The `get()` request currently in flight, shared by concurrent callers. */
+  private pending: Promise<FFMachineInfo | null> | null = null;
 
   /**
    * Creates an instance of the Info class.
@@ -28,37 +37,62 @@ export class Info {
   /**
    * Retrieves comprehensive machine information, processed into the `FFMachineInfo` model.
    * This method fetches detailed data from the printer and transforms it.
+   * Calls made while a request is already in flight share that request instead of sending another.
+   * Each caller gets its own shallow copy of the result, so changing its top-level fields does not
+   * affect other callers or the cache.
    * @returns A Promise that resolves to an `FFMachineInfo` object, or null if an error occurs or no data is returned.
    */
   public async get(): Promise<FFMachineInfo | null> {
-    const detail = await this.getDetailResponse();
-    return detail ? new MachineInfo().fromDetail(detail.detail) : null;
+    return copyInfo(await this.fetchShared());
+  }
+
+  /**
+   * Returns the last machine info if it is recent enough, otherwise fetches it with {@link get}.
+   * Lets several status reads (state, temperatures, progress) share one detail request.
+   * Like {@link get}, each caller gets its own shallow copy.
+   * @param maxAgeMs Maximum age of the cached info in milliseconds (default: {@link Info.DEFAULT_CACHE_TTL_MS}).
+   * @returns A Promise that resolves to an `FFMachineInfo` object, or null if it could not be fetched.
+   */
+  public async getCached(
+    maxAgeMs: number = Info.DEFAULT_CACHE_TTL_MS
+  ): Promise<FFMachineInfo | null> {
+    return copyInfo(await this.readCached(maxAgeMs));
+  }
+
+  /**
+   * Drops the cached machine info, so the next {@link getCached} call fetches fresh data.
+   */
+  public invalidateCache(): void {
+    this.cached = null;
   }
 
   /**
    * Checks if the printer is currently in the "printing" state.
+   * Uses machine info up to {@link Info.DEFAULT_CACHE_TTL_MS} old (see {@link getCached}).
    * @returns A Promise that resolves to true if the printer is printing, false otherwise or if status cannot be determined.
    */
   public async isPrinting(): Promise<boolean> {
-    const info = await this.get();
+    const info = await this.readCached();
     return info?.Status === 'printing' || false;
   }
 
   /**
    * Retrieves the raw status string of the printer (e.g., "ready", "printing", "error").
+   * Uses machine info up to {@link Info.DEFAULT_CACHE_TTL_MS} old (see {@link getCached}).
    * @returns A Promise that resolves to the status string, or null if it cannot be determined.
    */
   public async getStatus(): Promise<string | null> {
-    const info = await this.get();
+    const info = await this.readCached();
     return info?.Status ?? null;
   }
 
   /**
    * Retrieves the machine state as a `MachineState` enum value.
+   * Uses machine info up to {@link Info.DEFAULT_CACHE_TTL_MS} old (see {@link getCached}).
    * @returns A Promise that resolves to a `MachineState` enum value, or null if it cannot be determined.
    */
   public async getMachineState(): Promise<MachineState | null> {
-    const info = await this.get();
+    const info = await this.readCached();
     return info?.MachineState ?? null;
   }
 
@@ -76,28 +110,66 @@ export class Info {
     };
 
     try {
-      const response = await axios.post(this.client.getEndpoint(Endpoints.Detail), payload, {
-        headers: {
-          'Content-Type': 'application/json',
-        },
-      });
+      const response = await traceHttpRequest(this.client.ipAddress, Endpoints.Detail, () =>
+        axios.post(this.client.getEndpoint(Endpoints.Detail), payload, {
+          headers: {
+            'Content-Type': 'application/json',
+          },
+          httpAgent: this.client.httpAgent,
+        })
+      );
 
       if (response.status !== 200) {
-        console.log('Non-200 status from detail endpoint:', response.status);
+        log.warn('Non-200 status from detail endpoint:', response.status);
         return null;
       }
 
       return response.data as DetailResponse;
     } catch (error: unknown) {
       const err = error as Error;
-      console.log(`GetDetailResponse Request error: ${err.message}`);
+      log.warn(`GetDetailResponse Request error: ${err.message}`);
       if ('cause' in err) {
         const errorWithCause = err as Error & { cause?: unknown };
-        console.log(`GetDetailResponse Inner exception: ${errorWithCause.cause}`);
+        log.warn(`GetDetailResponse Inner exception: ${errorWithCause.cause}`);
       }
       return null;
     }
   }
+
+  /** The shared in-flight request, started if none is running. */
+  private fetchShared(): Promise<FFMachineInfo | null> {
+    if (!this.pending) {
+      this.pending = this.fetchMachineInfo().finally(() => {
+        this.pending = null;
+      });
+    }
+    return this.pending;
+  }
+
+  /** The cached info itself when fresh enough, otherwise the shared request's result. */
+  private readCached(
+    maxAgeMs: number = Info.DEFAULT_CACHE_TTL_MS
+  ): Promise<FFMachineInfo | null> {
+    if (this.cached && Date.now() - this.cached.fetchedAt <= maxAgeMs) {
+      return Promise.resolve(this.cached.info);
+    }
+    return this.fetchShared();
+  }
+
+  /** Fetches and converts the detail response, and caches a successful result. */
+  private async fetchMachineInfo(): Promise<FFMachineInfo | null> {
+    const detail = await this.getDetailResponse();
+    const info = detail ? new MachineInfo().fromDetail(detail.detail) : null;
+    if (info) {
+      this.cached = { info, fetchedAt: Date.now() };
+    }
+    return info;
+  }
+}
+
+/** Shallow copy handed to callers, so they cannot change the cached info. */
+function copyInfo(info: FFMachineInfo | null): FFMachineInfo | null {
+  return info ? { ...info } : null;
 }
 
 /**
@@ -3,10 +3,10 @@
  * Manages print job operations including pause/resume/cancel, file uploads with firmware-specific handling, and AD5X multi-color printing with material station support.
  */
 
-import * as fs from 'node:fs';
-import * as path from 'node:path';
-import axios from 'axios';
+import axios, { type AxiosResponse } from 'axios';
 import FormData from 'form-data';
+import { traceHttpRequest } from '../../diagnostics/Diagnostics';
+import { log } from '../../diagnostics/Logger';
 import type { FiveMClient } from '../../FiveMClient';
 import type {
   AD5XLocalJobParams,
@@ -19,8 +19,17 @@ import type {
 } from '../../models/ff-models';
 import { NetworkUtils } from '../network/NetworkUtils';
 import { Endpoints } from '../server/Endpoints';
+import { type UploadInput, type UploadOptions, UploadEngine } from '../upload/UploadEngine';
 import type { Control, GenericResponse } from './Control';
 
+/**
+ * Upload options for a request that may start a print. Once the whole file was sent, a failed
+ * attempt is not retried unless the caller asks for it: the printer may already be printing it.
+ */
+function printUploadOptions(options: UploadOptions, startPrint: boolean): UploadOptions {
+  return { ...options, retryAfterBodySent: options.retryAfterBodySent ?? !startPrint };
+}
+
 /**
  * Provides methods for managing print jobs on the FlashForge 3D printer.
  * This includes pausing, resuming, canceling prints, uploading files for printing,
@@ -95,6 +104,52 @@ export class JobControl {
     }
   }
 
+  /**
+   * POSTs an upload to `/uploadGcode` as multipart form data through the client's HTTP client,
+   * so it uses the client's agent. Each attempt streams a fresh body with a known length.
+   * Afterwards the file's cached thumbnail and the cached file lists are dropped, since even a
+   * failed upload may have replaced the stored file.
+   * @param upload The prepared upload.
+   * @param customHeaders Printer-specific upload headers (serial number, print flags, ...).
+   * @returns A Promise that resolves to the printer's response.
+   * @private
+   */
+  private async postUpload(
+    upload: UploadEngine,
+    customHeaders: Record<string, string>
+  ): Promise<AxiosResponse> {
+    try {
+      return await upload.run((body, signal) => {
+        const form = new FormData();
+        form.append('gcodeFile', body, {
+          filename: upload.fileName,
+          contentType: 'application/octet-stream', // Ensure correct MIME type
+          knownLength: upload.size,
+        });
+
+        return traceHttpRequest(this.client.ipAddress, Endpoints.UploadFile, () =>
+          this.client.httpClient.post(this.client.getEndpoint(Endpoints.UploadFile), form, {
+            headers: {
+              ...customHeaders,
+              'Content-Type': form.getHeaders()['content-type'],
+              'Content-Length': form.getLengthSync().toString(),
+            },
+            signal,
+            // Stalls are detected by the upload engine; a whole-request timeout would cut off
+            // large files on slow links.
+            timeout: 0,
+            // Without redirects axios uses Node's http transport directly; follow-redirects would
+            // buffer the entire request body in memory in case it has to replay it.
+            maxRedirects: 0,
+            maxBodyLength: Number.POSITIVE_INFINITY,
+          })
+        );
+      });
+    } finally {
+      this.client.files.cache.invalidate(upload.fileName);
+    }
+  }
+
   /**
    * Sends a command to clear the printer's build platform.
    * (Note: The exact behavior of "setClearPlatform" might need further clarification from printer documentation,
@@ -112,43 +167,39 @@ export class JobControl {
   /**
    * Uploads a G-code or 3MF file to the printer and optionally starts printing.
    * It handles different API requirements based on the printer's firmware version.
+   * The file is streamed, and transient failures are retried (see {@link UploadOptions}).
    *
-   * @param filePath The local path to the G-code or 3MF file to upload.
+   * @param file The local path to the G-code or 3MF file, or an in-memory or streamed source.
    * @param startPrint If true, the printer will start printing the file immediately after upload.
    * @param levelBeforePrint If true, the printer will perform bed leveling before starting the print.
+   * @param options Progress callback, abort signal, retry and stall settings. With `startPrint`,
+   * an attempt that sent the whole file is not retried (see `retryAfterBodySent`).
    * @returns A Promise that resolves to true if the file upload (and optional print start) is successful, false otherwise.
    */
   public async uploadFile(
-    filePath: string,
+    file: UploadInput,
     startPrint: boolean,
-    levelBeforePrint: boolean
+    levelBeforePrint: boolean,
+    options: UploadOptions = {}
   ): Promise<boolean> {
-    if (!fs.existsSync(filePath)) {
-      console.error(`UploadFile error: File not found at ${filePath}`);
+    let upload: UploadEngine;
+    try {
+      upload = await UploadEngine.prepare(file, printUploadOptions(options, startPrint));
+    } catch (error) {
+      log.error(`UploadFile error: ${(error as Error).message}`);
       return false;
     }
 
-    const stats = fs.statSync(filePath);
-    const fileSize = stats.size;
-    const fileName = path.basename(filePath);
-
-    console.log(
-      `Starting upload for ${fileName}, Size: ${fileSize}, Start: ${startPrint}, Level: ${levelBeforePrint}`
+    log.debug(
+      `Starting upload for ${upload.fileName}, Size: ${upload.size}, Start: ${startPrint}, Level: ${levelBeforePrint}`
     );
 
     try {
-      // Create FormData with the file content
-      const form = new FormData();
-      form.append('gcodeFile', fs.createReadStream(filePath), {
-        filename: fileName,
-        contentType: 'application/octet-stream', // Ensure correct MIME type
-      });
-
       // Prepare the custom HTTP headers with metadata
       const customHeaders: Record<string, string> = {
         serialNumber: this.client.serialNumber,
         checkCode: this.client.checkCode,
-        fileSize: fileSize.toString(),
+        fileSize: upload.size.toString(),
         printNow: startPrint.toString().toLowerCase(),
         levelingBeforePrint: levelBeforePrint.toString().toLowerCase(),
         Expect: '100-continue',
@@ -156,54 +207,35 @@ export class JobControl {
 
       // Add additional headers for new firmware
       if (this.isNewFirmwareVersion()) {
-        console.log('Using new firmware headers for upload.');
+        log.debug('Using new firmware headers for upload.');
         customHeaders['flowCalibration'] = 'false';
         customHeaders['useMatlStation'] = 'false';
         customHeaders['gcodeToolCnt'] = '0';
         // Base64 encode "[]" which is "W10="
         customHeaders['materialMappings'] = 'W10=';
       } else {
-        console.log('Using old firmware headers for upload.');
+        log.debug('Using old firmware headers for upload.');
       }
 
-      // Get necessary headers from FormData
-      const formHeaders = form.getHeaders();
+      log.debug('Upload Request Headers:', customHeaders);
 
-      // Combine custom headers and FormData headers
-      const requestHeaders = {
-        ...customHeaders,
-        'Content-Type': formHeaders['content-type'],
-      };
-
-      console.log('Upload Request Headers:', requestHeaders);
-
-      // Configure Axios request
-      const config = {
-        headers: requestHeaders,
-      };
-
-      // Make the POST request
-      const response = await axios.post(
-        this.client.getEndpoint(Endpoints.UploadFile),
-        form,
-        config
-      );
+      const response = await this.postUpload(upload, customHeaders);
 
-      console.log(`Upload Response Status: ${response.status}`);
-      console.log('Upload Response Data:', response.data); // Log the response body
+      log.debug(`Upload Response Status: ${response.status}`);
+      log.debug('Upload Response Data:', response.data); // Log the response body
 
       if (response.status !== 200) {
-        console.error(`Upload failed: Printer responded with status ${response.status}`);
+        log.error(`Upload failed: Printer responded with status ${response.status}`);
         return false;
       }
 
       // Assuming response.data is already parsed JSON by axios
       const result = response.data as GenericResponse;
       if (NetworkUtils.isOk(result)) {
-        console.log('Upload successful according to printer response.');
+        log.debug('Upload successful according to printer response.');
         return true;
       } else {
-        console.error(
+        log.error(
           `Upload failed: Printer response code=${result.code}, message=${result.message}`
         );
         return false;
@@ -213,16 +245,16 @@ export class JobControl {
         response?: { status: number; data: GenericResponse };
         request?: unknown;
       };
-      console.error(`UploadFile error: ${err.message}`);
+      log.error(`UploadFile error: ${err.message}`);
       if (err.response) {
-        console.error(`Error Status: ${err.response.status}`);
-        console.error('Error Response Data:', err.response.data);
+        log.error(`Error Status: ${err.response.status}`);
+        log.error('Error Response Data:', err.response.data);
       } else if (err.request) {
-        console.error('Error Request:', err.request);
+        log.error('Error Request:', err.request);
       } else {
-        console.error('Error', err.message);
+        log.error('Error', err.message);
       }
-      console.error(err.stack);
+      log.debug(err.stack ?? err.message);
       return false;
     }
   }
@@ -233,9 +265,14 @@ export class JobControl {
    * Material mappings are base64-encoded in HTTP headers according to AD5X API requirements.
    *
    * @param params AD5X upload parameters including file path, print options, and material mappings
+   * @param options Progress callback, abort signal, retry and stall settings. With `startPrint`,
+   * an attempt that sent the whole file is not retried (see `retryAfterBodySent`).
    * @returns A Promise that resolves to true if the file upload is successful, false otherwise
    */
-  public async uploadFileAD5X(params: AD5XUploadParams): Promise<boolean> {
+  public async uploadFileAD5X(
+    params: AD5XUploadParams,
+    options: UploadOptions = {}
+  ): Promise<boolean> {
     // Validate that this is an AD5X printer
     if (!this.validateMaterialStationPrinter()) {
       return false;
@@ -246,28 +283,23 @@ export class JobControl {
       return false;
     }
 
-    // Validate file exists
-    if (!fs.existsSync(params.filePath)) {
-      console.error(`UploadFileAD5X error: File not found at ${params.filePath}`);
+    // Validate the file exists (or the in-memory source is usable)
+    let upload: UploadEngine;
+    try {
+      upload = await UploadEngine.prepare(
+        params.filePath,
+        printUploadOptions(options, params.startPrint)
+      );
+    } catch (error) {
+      log.error(`UploadFileAD5X error: ${(error as Error).message}`);
       return false;
     }
 
-    const stats = fs.statSync(params.filePath);
-    const fileSize = stats.size;
-    const fileName = path.basename(params.filePath);
-
-    console.log(
-      `Starting AD5X upload for ${fileName}, Size: ${fileSize}, Start: ${params.startPrint}, Level: ${params.levelingBeforePrint}, Tools: ${params.materialMappings.length}`
+    log.debug(
+      `Starting AD5X upload for ${upload.fileName}, Size: ${upload.size}, Start: ${params.startPrint}, Level: ${params.levelingBeforePrint}, Tools: ${params.materialMappings.length}`
     );
 
     try {
-      // Create FormData with the file content
-      const form = new FormData();
-      form.append('gcodeFile', fs.createReadStream(params.filePath), {
-        filename: fileName,
-        contentType: 'application/octet-stream',
-      });
-
       // Encode material mappings to base64
       const materialMappingsBase64 = this.encodeMaterialMappingsToBase64(params.materialMappings);
 
@@ -275,7 +307,7 @@ export class JobControl {
       const customHeaders: Record<string, string> = {
         serialNumber: this.client.serialNumber,
         checkCode: this.client.checkCode,
-        fileSize: fileSize.toString(),
+        fileSize: upload.size.toString(),
         printNow: params.startPrint.toString().toLowerCase(),
         levelingBeforePrint: params.levelingBeforePrint.toString().toLowerCase(),
         flowCalibration: params.flowCalibration.toString().toLowerCase(),
@@ -287,44 +319,25 @@ export class JobControl {
         Expect: '100-continue',
       };
 
-      // Get necessary headers from FormData
-      const formHeaders = form.getHeaders();
-
-      // Combine custom headers and FormData headers
-      const requestHeaders = {
-        ...customHeaders,
-        'Content-Type': formHeaders['content-type'],
-      };
-
-      console.log('AD5X Upload Request Headers:', requestHeaders);
+      log.debug('AD5X Upload Request Headers:', customHeaders);
 
-      // Configure Axios request
-      const config = {
-        headers: requestHeaders,
-      };
+      const response = await this.postUpload(upload, customHeaders);
 
-      // Make the POST request
-      const response = await axios.post(
-        this.client.getEndpoint(Endpoints.UploadFile),
-        form,
-        config
-      );
-
-      console.log(`AD5X Upload Response Status: ${response.status}`);
-      console.log('AD5X Upload Response Data:', response.data);
+      log.debug(`AD5X Upload Response Status: ${response.status}`);
+      log.debug('AD5X Upload Response Data:', response.data);
 
       if (response.status !== 200) {
-        console.error(`AD5X Upload failed: Printer responded with status ${response.status}`);
+        log.error(`AD5X Upload failed: Printer responded with status ${response.status}`);
         return false;
       }
 
       // Assuming response.data is already parsed JSON by axios
       const result = response.data as GenericResponse;
       if (NetworkUtils.isOk(result)) {
-        console.log('AD5X Upload successful according to printer response.');
+        log.debug('AD5X Upload successful according to printer response.');
         return true;
       } else {
-        console.error(
+        log.error(
           `AD5X Upload failed: Printer response code=${result.code}, message=${result.message}`
         );
         return false;
@@ -334,16 +347,16 @@ export class JobControl {
         response?: { status: number; data: GenericResponse };
         request?: unknown;
       };
-      console.error(`UploadFileAD5X error: ${err.message}`);
+      log.error(`UploadFileAD5X error: ${err.message}`);
       if (err.response) {
-        console.error(`Error Status: ${err.response.status}`);
-        console.error('Error Response Data:', err.response.data);
+        log.error(`Error Status: ${err.response.status}`);
+        log.error('Error Response Data:', err.response.data);
       } else if (err.request) {
-        console.error('Error Request:', err.request);
+        log.error('Error Request:', err.request);
       } else {
-        console.error('Error', err.message);
+        log.error('Error', err.message);
       }
-      console.error(err.stack);
+      log.debug(err.stack ?? err.message);
       return false;
     }
   }
@@ -386,12 +399,15 @@ export class JobControl {
       // Print-start is a command POST: run it on the client's FIFO command
       // queue so it cannot interleave with other commands.
       const response = await this.client.runCommandExclusive(async () =>
-        axios.post(this.client.getEndpoint(Endpoints.GCodePrint), payload, {
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          timeout: 5000,
-        })
+        traceHttpRequest(this.client.ipAddress, Endpoints.GCodePrint, () =>
+          axios.post(this.client.getEndpoint(Endpoints.GCodePrint), payload, {
+            headers: {
+              'Content-Type': 'application/json',
+            },
+            timeout: 5000,
+            httpAgent: this.client.httpAgent,
+          })
+        )
       );
 
       if (response.status !== 200) return false;
@@ -399,7 +415,7 @@ export class JobControl {
       const result = response.data as GenericResponse;
       return NetworkUtils.isOk(result);
     } catch (error) {
-      console.error(`PrintLocalFile error: ${(error as Error).message}`);
+      log.error(`PrintLocalFile error: ${(error as Error).message}`);
       throw error;
     }
   }
@@ -426,7 +442,7 @@ export class JobControl {
 
     // Validate file name
     if (!params.fileName || params.fileName.trim() === '') {
-      console.error('AD5X Multi-Color Job error: fileName cannot be empty');
+      log.error('AD5X Multi-Color Job error: fileName cannot be empty');
       return false;
     }
 
@@ -448,12 +464,15 @@ export class JobControl {
       // Print-start is a command POST: run it on the client's FIFO command
       // queue so it cannot interleave with other commands.
       const response = await this.client.runCommandExclusive(async () =>
-        axios.post(this.client.getEndpoint(Endpoints.GCodePrint), payload, {
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          timeout: 5000,
-        })
+        traceHttpRequest(this.client.ipAddress, Endpoints.GCodePrint, () =>
+          axios.post(this.client.getEndpoint(Endpoints.GCodePrint), payload, {
+            headers: {
+              'Content-Type': 'application/json',
+            },
+            timeout: 5000,
+            httpAgent: this.client.httpAgent,
+          })
+        )
       );
 
       if (response.status !== 200) return false;
@@ -461,7 +480,7 @@ export class JobControl {
       const result = response.data as GenericResponse;
       return NetworkUtils.isOk(result);
     } catch (error) {
-      console.error(`AD5X Multi-Color Job error: ${(error as Error).message}`);
+      log.error(`AD5X Multi-Color Job error: ${(error as Error).message}`);
       throw error;
     }
   }
@@ -483,7 +502,7 @@ export class JobControl {
 
     // Validate file name
     if (!params.fileName || params.fileName.trim() === '') {
-      console.error('AD5X Single-Color Job error: fileName cannot be empty');
+      log.error('AD5X Single-Color Job error: fileName cannot be empty');
       return false;
     }
 
@@ -505,12 +524,15 @@ export class JobControl {
       // Print-start is a command POST: run it on the client's FIFO command
       // queue so it cannot interleave with other commands.
       const response = await this.client.runCommandExclusive(async () =>
-        axios.post(this.client.getEndpoint(Endpoints.GCodePrint), payload, {
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          timeout: 5000,
-        })
+        traceHttpRequest(this.client.ipAddress, Endpoints.GCodePrint, () =>
+          axios.post(this.client.getEndpoint(Endpoints.GCodePrint), payload, {
+            headers: {
+              'Content-Type': 'application/json',
+            },
+            timeout: 5000,
+            httpAgent: this.client.httpAgent,
+          })
+        )
       );
 
       if (response.status !== 200) return false;
@@ -518,7 +540,7 @@ export class JobControl {
       const result = response.data as GenericResponse;
       return NetworkUtils.isOk(result);
     } catch (error) {
-      console.error(`AD5X Single-Color Job error: ${(error as Error).message}`);
+      log.error(`AD5X Single-Color Job error: ${(error as Error).message}`);
       throw error;
     }
   }
@@ -546,36 +568,37 @@ export class JobControl {
    * C5 has no such field) and no `materialMappings` header (the C5 maps materials at
    * print-start, not upload).
    * @param params Creator 5 upload parameters.
+   * @param options Progress callback, abort signal, retry and stall settings. With `startPrint`,
+   * an attempt that sent the whole file is not retried (see `retryAfterBodySent`).
    * @returns Promise resolving to true on success.
    */
-  public async uploadFileCreator5(params: Creator5UploadParams): Promise<boolean> {
-    if (!fs.existsSync(params.filePath)) {
-      console.error(`uploadFileCreator5 error: File not found at ${params.filePath}`);
+  public async uploadFileCreator5(
+    params: Creator5UploadParams,
+    options: UploadOptions = {}
+  ): Promise<boolean> {
+    let upload: UploadEngine;
+    try {
+      upload = await UploadEngine.prepare(
+        params.filePath,
+        printUploadOptions(options, params.startPrint)
+      );
+    } catch (error) {
+      log.error(`uploadFileCreator5 error: ${(error as Error).message}`);
       return false;
     }
 
-    const stats = fs.statSync(params.filePath);
-    const fileSize = stats.size;
-    const fileName = path.basename(params.filePath);
-
-    console.log(
-      `Starting Creator 5 upload for ${fileName}, Size: ${fileSize}, Start: ${params.startPrint}, ` +
+    log.debug(
+      `Starting Creator 5 upload for ${upload.fileName}, Size: ${upload.size}, Start: ${params.startPrint}, ` +
         `Level: ${params.levelingBeforePrint}, MatlStation: ${params.useMatlStation}, Tools: ${params.gcodeToolCnt}`
     );
 
     try {
-      const form = new FormData();
-      form.append('gcodeFile', fs.createReadStream(params.filePath), {
-        filename: fileName,
-        contentType: 'application/octet-stream',
-      });
-
       // C5 upload headers. No firstLayerInspection (absent on the C5); booleans are
       // sent as the string "true"/"false" (the firmware checks for "true", not "1").
       const customHeaders: Record<string, string> = {
         serialNumber: this.client.serialNumber,
         checkCode: this.client.checkCode,
-        fileSize: fileSize.toString(),
+        fileSize: upload.size.toString(),
         printNow: params.startPrint.toString().toLowerCase(),
         levelingBeforePrint: params.levelingBeforePrint.toString().toLowerCase(),
         flowCalibration: (params.flowCalibration ?? false).toString().toLowerCase(),
@@ -585,34 +608,24 @@ export class JobControl {
         Expect: '100-continue',
       };
 
-      const formHeaders = form.getHeaders();
-      const requestHeaders = {
-        ...customHeaders,
-        'Content-Type': formHeaders['content-type'],
-      };
+      log.debug('Creator 5 Upload Request Headers:', customHeaders);
 
-      console.log('Creator 5 Upload Request Headers:', requestHeaders);
-
-      const response = await axios.post(
-        this.client.getEndpoint(Endpoints.UploadFile),
-        form,
-        { headers: requestHeaders }
-      );
+      const response = await this.postUpload(upload, customHeaders);
 
-      console.log(`Creator 5 Upload Response Status: ${response.status}`);
-      console.log('Creator 5 Upload Response Data:', response.data);
+      log.debug(`Creator 5 Upload Response Status: ${response.status}`);
+      log.debug('Creator 5 Upload Response Data:', response.data);
 
       if (response.status !== 200) {
-        console.error(`Creator 5 Upload failed: Printer responded with status ${response.status}`);
+        log.error(`Creator 5 Upload failed: Printer responded with status ${response.status}`);
         return false;
       }
 
       const result = response.data as GenericResponse;
       if (NetworkUtils.isOk(result)) {
-        console.log('Creator 5 Upload successful according to printer response.');
+        log.debug('Creator 5 Upload successful according to printer response.');
         return true;
       }
-      console.error(
+      log.error(
         `Creator 5 Upload failed: Printer response code=${result.code}, message=${result.message}`
       );
       return false;
@@ -621,14 +634,14 @@ export class JobControl {
         response?: { status: number; data: GenericResponse };
         request?: unknown;
       };
-      console.error(`uploadFileCreator5 error: ${err.message}`);
+      log.error(`uploadFileCreator5 error: ${err.message}`);
       if (err.response) {
-        console.error(`Error Status: ${err.response.status}`);
-        console.error('Error Response Data:', err.response.data);
+        log.error(`Error Status: ${err.response.status}`);
+        log.error('Error Response Data:', err.response.data);
       } else if (err.request) {
-        console.error('Error Request:', err.request);
+        log.error('Error Request:', err.request);
       }
-      console.error(err.stack);
+      log.debug(err.stack ?? err.message);
       return false;
     }
   }
@@ -651,7 +664,7 @@ export class JobControl {
     }
 
     if (!params.fileName || params.fileName.trim() === '') {
-      console.error('Creator 5 Job error: fileName cannot be empty');
+      log.error('Creator 5 Job error: fileName cannot be empty');
       return false;
     }
 
@@ -679,12 +692,15 @@ export class JobControl {
       // Print-start is a command POST: run it on the client's FIFO command
       // queue so it cannot interleave with other commands.
       const response = await this.client.runCommandExclusive(async () =>
-        axios.post(this.client.getEndpoint(Endpoints.GCodePrint), payload, {
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          timeout: 5000,
-        })
+        traceHttpRequest(this.client.ipAddress, Endpoints.GCodePrint, () =>
+          axios.post(this.client.getEndpoint(Endpoints.GCodePrint), payload, {
+            headers: {
+              'Content-Type': 'application/json',
+            },
+            timeout: 5000,
+            httpAgent: this.client.httpAgent,
+          })
+        )
       );
 
       if (response.status !== 200) return false;
@@ -692,7 +708,7 @@ export class JobControl {
       const result = response.data as GenericResponse;
       return NetworkUtils.isOk(result);
     } catch (error) {
-      console.error(`Creator 5 Job error: ${(error as Error).message}`);
+      log.error(`Creator 5 Job error: ${(error as Error).message}`);
       throw error;
     }
   }
@@ -708,7 +724,7 @@ export class JobControl {
    */
   private validateCreator5MaterialMappings(materialMappings: Creator5MaterialMapping[]): boolean {
     if (materialMappings.length > 4) {
-      console.error('Creator 5 material mappings error: Maximum 4 material mappings allowed');
+      log.error('Creator 5 material mappings error: Maximum 4 material mappings allowed');
       return false;
     }
 
@@ -718,35 +734,35 @@ export class JobControl {
       const mapping = materialMappings[i];
 
       if (mapping.toolId < 0 || mapping.toolId > 3) {
-        console.error(
+        log.error(
           `Creator 5 material mappings error: toolId must be between 0-3, got ${mapping.toolId} at index ${i}`
         );
         return false;
       }
 
       if (mapping.slotId < 1 || mapping.slotId > 4) {
-        console.error(
+        log.error(
           `Creator 5 material mappings error: slotId must be between 1-4, got ${mapping.slotId} at index ${i}`
         );
         return false;
       }
 
       if (!mapping.materialName || mapping.materialName.trim() === '') {
-        console.error(
+        log.error(
           `Creator 5 material mappings error: materialName cannot be empty at index ${i}`
         );
         return false;
       }
 
       if (!hexColorRegex.test(mapping.toolMaterialColor)) {
-        console.error(
+        log.error(
           `Creator 5 material mappings error: toolMaterialColor must be in #RRGGBB format, got ${mapping.toolMaterialColor} at index ${i}`
         );
         return false;
       }
 
       if (!hexColorRegex.test(mapping.slotMaterialColor)) {
-        console.error(
+        log.error(
           `Creator 5 material mappings error: slotMaterialColor must be in #RRGGBB format, got ${mapping.slotMaterialColor} at index ${i}`
         );
         return false;
@@ -765,7 +781,7 @@ export class JobControl {
    */
   private validateMaterialStationPrinter(): boolean {
     if (!this.client.isAD5X && !this.client.isCreator5) {
-      console.error(
+      log.error(
         'Material-station job error: this method requires an AD5X or Creator 5 series printer'
       );
       return false;
@@ -786,7 +802,7 @@ export class JobControl {
       const jsonString = JSON.stringify(materialMappings);
       return Buffer.from(jsonString, 'utf8').toString('base64');
     } catch (error) {
-      console.error('Failed to encode material mappings to base64:', error);
+      log.error('Failed to encode material mappings to base64:', error);
       throw new Error('Failed to encode material mappings for upload');
     }
   }
@@ -800,14 +816,14 @@ export class JobControl {
    */
   private validateMaterialMappings(materialMappings: AD5XMaterialMapping[]): boolean {
     if (!materialMappings || materialMappings.length === 0) {
-      console.error(
+      log.error(
         'Material mappings validation error: materialMappings array cannot be empty for multi-color jobs'
       );
       return false;
     }
 
     if (materialMappings.length > 4) {
-      console.error('Material mappings validation error: Maximum 4 material mappings allowed');
+      log.error('Material mappings validation error: Maximum 4 material mappings allowed');
       return false;
     }
 
@@ -818,7 +834,7 @@ export class JobControl {
 
       // Validate toolId (0-3)
       if (mapping.toolId < 0 || mapping.toolId > 3) {
-        console.error(
+        log.error(
           `Material mappings validation error: toolId must be between 0-3, got ${mapping.toolId} at index ${i}`
         );
         return false;
@@ -826,7 +842,7 @@ export class JobControl {
 
       // Validate slotId (1-4)
       if (mapping.slotId < 1 || mapping.slotId > 4) {
-        console.error(
+        log.error(
           `Material mappings validation error: slotId must be between 1-4, got ${mapping.slotId} at index ${i}`
         );
         return false;
@@ -834,7 +850,7 @@ export class JobControl {
 
       // Validate materialName is not empty
       if (!mapping.materialName || mapping.materialName.trim() === '') {
-        console.error(
+        log.error(
           `Material mappings validation error: materialName cannot be empty at index ${i}`
         );
         return false;
@@ -842,7 +858,7 @@ export class JobControl {
 
       // Validate toolMaterialColor format
       if (!hexColorRegex.test(mapping.toolMaterialColor)) {
-        console.error(
+        log.error(
           `Material mappings validation error: toolMaterialColor must be in #RRGGBB format, got ${mapping.toolMaterialColor} at index ${i}`
         );
         return false;
@@ -850,7 +866,7 @@ export class JobControl {
 
       // Validate slotMaterialColor format
       if (!hexColorRegex.test(mapping.slotMaterialColor)) {
-        console.error(
+        log.error(
           `Material mappings validation error: slotMaterialColor must be in #RRGGBB format, got ${mapping.slotMaterialColor} at index ${i}`
         );
         return false;
@@ -4,6 +4,7 @@
  * TCP G-code/M-code commands; HTTP-only printers (Creator 5 / 5 Pro, no TCP
  * channel) use the HTTP `temperatureCtl_cmd` instead.
  */
+import { log } from '../../diagnostics/Logger';
 import type { FiveMClient } from '../../FiveMClient';
 import type { FlashForgeClient } from '../../tcpapi/FlashForgeClient';
 import { Commands } from '../server/Commands';
@@ -94,7 +95,7 @@ export class TempControl {
    */
   private buildNozzleArray(toolIndex: number, value: number): number[] | null {
     if (!Number.isInteger(toolIndex) || toolIndex < 0 || toolIndex >= NOZZLE_COUNT) {
-      console.error(`TempControl: toolIndex ${toolIndex} out of range (0-${NOZZLE_COUNT - 1}).`);
+      log.error(`TempControl: toolIndex ${toolIndex} out of range (0-${NOZZLE_COUNT - 1}).`);
       return null;
     }
     const nozzles = new Array<number>(NOZZLE_COUNT).fill(TEMP_NO_CHANGE);
@@ -127,7 +128,7 @@ export class TempControl {
    */
   public async setToolTemps(temps: number[]): Promise<boolean> {
     if (temps.length !== NOZZLE_COUNT) {
-      console.error(`setToolTemps: expected ${NOZZLE_COUNT} temps, got ${temps.length}.`);
+      log.error(`setToolTemps: expected ${NOZZLE_COUNT} temps, got ${temps.length}.`);
       return false;
     }
     return await this.sendHttpTempCommand({ nozzles: [...temps] });
@@ -242,7 +243,7 @@ export class TempControl {
    */
   public async waitForPartCool(temp: number): Promise<void> {
     if (this.client.httpOnly) {
-      console.log(
+      log.debug(
         'waitForPartCool() unavailable over HTTP-only connection; poll info.get() instead.'
       );
       return;
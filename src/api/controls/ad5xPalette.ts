@@ -14,9 +14,17 @@
  * - AD5X_PALETTE: the firmware's 24-entry color palette
  * - AD5X_MATERIALS: the 14 material names the UI renders
  * - snapToAD5XPalette(): nearest palette entry for an arbitrary color
+ * - snapRgbToAD5XPalette(): batch snapping of packed RGB arrays
+ * - clearAD5XPaletteMemo(): release the batch snapping memo
  */
 
-import { buildPaletteLab, type PaletteColor, snapToPalette } from './paletteSnap';
+import {
+  buildPaletteLab,
+  buildPaletteTable,
+  type PaletteColor,
+  snapRgbToPalette,
+  snapToPalette,
+} from './paletteSnap';
 
 /** A single entry in the AD5X firmware color palette. */
 export type AD5XPaletteColor = PaletteColor;
@@ -72,6 +80,8 @@ export const AD5X_MATERIALS: readonly string[] = [
 
 // L*a*b* values precomputed once at module load.
 const PALETTE_LAB = buildPaletteLab(AD5X_PALETTE);
+// Batch table, shared by every batch call so its color memo keeps filling up.
+const PALETTE_TABLE = buildPaletteTable(AD5X_PALETTE);
 
 /**
  * Snaps an arbitrary hex color to the nearest entry in the AD5X firmware palette
@@ -85,3 +95,27 @@ const PALETTE_LAB = buildPaletteLab(AD5X_PALETTE);
 export function snapToAD5XPalette(hex: string): AD5XPaletteColor {
   return snapToPalette(hex, PALETTE_LAB, 'snapToAD5XPalette');
 }
+
+/**
+ * Snaps many colors to the AD5X firmware palette at once. Picks the same entry as
+ * {@link snapToAD5XPalette} for every color; repeated colors are served from a memo.
+ *
+ * The memo lives for the life of the process and holds up to `DEFAULT_PALETTE_MEMO_LIMIT`
+ * colors (about 2 MiB when full); it is emptied and refilled when more distinct colors than
+ * that come through. Call {@link clearAD5XPaletteMemo} to release it.
+ *
+ * @param rgb Packed 8-bit RGB triplets (`[r0, g0, b0, r1, g1, b1, ...]`).
+ * @param out Optional array to write the results into.
+ * @returns The firmware palette index of each color, in order.
+ */
+export function snapRgbToAD5XPalette(
+  rgb: Uint8Array | Uint8ClampedArray,
+  out?: Uint8Array
+): Uint8Array {
+  return snapRgbToPalette(rgb, PALETTE_TABLE, out);
+}
+
+/** Empties the color memo behind {@link snapRgbToAD5XPalette} and releases its memory. */
+export function clearAD5XPaletteMemo(): void {
+  PALETTE_TABLE.clearMemo();
+}
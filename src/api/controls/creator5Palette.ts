@@ -15,7 +15,13 @@
  * it snaps against.
  */
 
-import { buildPaletteLab, type PaletteColor, snapToPalette } from './paletteSnap';
+import {
+  buildPaletteLab,
+  buildPaletteTable,
+  type PaletteColor,
+  snapRgbToPalette,
+  snapToPalette,
+} from './paletteSnap';
 
 /** A single entry in the Creator 5 firmware color palette. */
 export type Creator5PaletteColor = PaletteColor;
@@ -53,6 +59,8 @@ export const CREATOR5_PALETTE: readonly Creator5PaletteColor[] = [
 
 // L*a*b* values precomputed once at module load.
 const PALETTE_LAB = buildPaletteLab(CREATOR5_PALETTE);
+// Batch table, shared by every batch call so its color memo keeps filling up.
+const PALETTE_TABLE = buildPaletteTable(CREATOR5_PALETTE);
 
 /**
  * Snaps an arbitrary hex color to the nearest entry in the Creator 5 firmware
@@ -66,3 +74,27 @@ const PALETTE_LAB = buildPaletteLab(CREATOR5_PALETTE);
 export function snapToCreator5Palette(hex: string): Creator5PaletteColor {
   return snapToPalette(hex, PALETTE_LAB, 'snapToCreator5Palette');
 }
+
+/**
+ * Snaps many colors to the Creator 5 firmware palette at once. Picks the same entry as
+ * {@link snapToCreator5Palette} for every color; repeated colors are served from a memo.
+ *
+ * The memo lives for the life of the process and holds up to `DEFAULT_PALETTE_MEMO_LIMIT`
+ * colors (about 2 MiB when full); it is emptied and refilled when more distinct colors than
+ * that come through. Call {@link clearCreator5PaletteMemo} to release it.
+ *
+ * @param rgb Packed 8-bit RGB triplets (`[r0, g0, b0, r1, g1, b1, ...]`).
+ * @param out Optional array to write the results into.
+ * @returns The firmware palette index of each color, in order.
+ */
+export function snapRgbToCreator5Palette(
+  rgb: Uint8Array | Uint8ClampedArray,
+  out?: Uint8Array
+): Uint8Array {
+  return snapRgbToPalette(rgb, PALETTE_TABLE, out);
+}
+
+/** Empties the color memo behind {@link snapRgbToCreator5Palette} and releases its memory. */
+export function clearCreator5PaletteMemo(): void {
+  PALETTE_TABLE.clearMemo();
+}
@@ -0,0 +1,126 @@
+/**
+ * @fileoverview Tests for batch palette snapping.
+ *
+ * The batch path must pick exactly the entry the scalar `snapToPalette` picks for every color,
+ * on both firmware palettes: a different pick would show a different color on the printer
+ * depending on which API the caller used.
+ */
+import { describe, expect, it } from 'vitest';
+import { AD5X_PALETTE, snapRgbToAD5XPalette, snapToAD5XPalette } from './ad5xPalette';
+import {
+  CREATOR5_PALETTE,
+  snapRgbToCreator5Palette,
+  snapToCreator5Palette,
+} from './creator5Palette';
+import {
+  buildPaletteLab,
+  buildPaletteTable,
+  type PaletteColor,
+  snapRgbToPalette,
+  snapToPalette,
+} from './paletteSnap';
+
+const toHex = (r: number, g: number, b: number): string =>
+  `#${((r << 16) | (g << 8) | b).toString(16).padStart(6, '0')}`;
+
+/** A coarse grid over the RGB cube, every palette color, and deterministic pseudo-random colors. */
+function sampleColors(palette: readonly PaletteColor[]): Uint8Array {
+  const values: number[] = [];
+  for (let r = 0; r < 256; r += 17) {
+    for (let g = 0; g < 256; g += 17) {
+      for (let b = 0; b < 256; b += 17) {
+        values.push(r, g, b);
+      }
+    }
+  }
+  for (const color of palette) {
+    const packed = parseInt(color.hex.slice(1), 16);
+    values.push(packed >> 16, (packed >> 8) & 0xff, packed & 0xff);
+  }
+  let seed = 12345;
+  for (let i = 0; i < 3000 * 3; i++) {
+    seed = (seed * 1103515245 + 12345) % 2147483648;
+    values.push(seed >> 23);
+  }
+  return Uint8Array.from(values);
+}
+
+describe('snapRgbToPalette', () => {
+  for (const [name, palette] of [
+    ['AD5X', AD5X_PALETTE],
+    ['Creator 5', CREATOR5_PALETTE],
+  ] as const) {
+    it(`matches the scalar snap for every sampled color on the ${name} palette`, () => {
+      const paletteLab = buildPaletteLab(palette);
+      const table = buildPaletteTable(palette);
+      const rgb = sampleColors(palette);
+
+      const batch = snapRgbToPalette(rgb, table);
+      // Served from the memo the second time around.
+      const memoized = snapRgbToPalette(rgb, table);
+
+      const mismatches: string[] = [];
+      for (let i = 0; i < batch.length; i++) {
+        const hex = toHex(rgb[i * 3], rgb[i * 3 + 1], rgb[i * 3 + 2]);
+        const expected = snapToPalette(hex, paletteLab, name).index;
+        if (batch[i] !== expected || memoized[i] !== expected) {
+          mismatches.push(`${hex}: scalar ${expected}, batch ${batch[i]}/${memoized[i]}`);
+        }
+      }
+      expect(mismatches).toEqual([]);
+    });
+  }
+
+  it('returns firmware indices even when they differ from palette positions', () => {
+    const palette: PaletteColor[] = [
+      { index: 7, name: 'White', hex: '#FFFFFF' },
+      { index: 3, name: 'Black', hex: '#000000' },
+    ];
+    const table = buildPaletteTable(palette);
+
+    expect(Array.from(snapRgbToPalette(Uint8Array.of(250, 250, 250, 5, 5, 5), table))).toEqual([
+      7, 3,
+    ]);
+  });
+
+  it('writes into a caller-supplied array and validates lengths', () => {
+    const table = buildPaletteTable(AD5X_PALETTE);
+    const out = new Uint8Array(4).fill(99);
+
+    expect(snapRgbToPalette(Uint8Array.of(255, 255, 255), table, out)).toBe(out);
+    expect(Array.from(out)).toEqual([0, 99, 99, 99]);
+    expect(() => snapRgbToPalette(Uint8Array.of(1, 2), table)).toThrow(RangeError);
+    expect(() => snapRgbToPalette(new Uint8Array(6), table, new Uint8Array(1))).toThrow(
+      RangeError
+    );
+    expect(() => buildPaletteTable([])).toThrow(RangeError);
+  });
+
+  it('keeps the memo within its limit and can clear it', () => {
+    const table = buildPaletteTable(AD5X_PALETTE, 2);
+
+    const first = snapRgbToPalette(Uint8Array.of(255, 0, 0, 0, 255, 0), table);
+    expect(table.memo.size).toBe(2);
+
+    // A third color empties the full memo before it is stored.
+    const second = snapRgbToPalette(Uint8Array.of(0, 0, 255, 255, 0, 0), table);
+    expect(table.memo.size).toBe(2);
+    expect(second[1]).toBe(first[0]);
+
+    table.clearMemo();
+    expect(table.memo.size).toBe(0);
+    expect(Array.from(snapRgbToPalette(Uint8Array.of(255, 0, 0), table))).toEqual([first[0]]);
+  });
+
+  it('model wrappers agree with the per-model scalar snaps', () => {
+    const rgb = Uint8Array.of(255, 0, 0, 18, 52, 86, 69, 168, 249, 76, 170, 248);
+    const hexes = ['#FF0000', '#123456', '#45A8F9', '#4CAAF8'];
+
+    expect(Array.from(snapRgbToAD5XPalette(rgb))).toEqual(
+      hexes.map((hex) => snapToAD5XPalette(hex).index)
+    );
+    expect(Array.from(snapRgbToCreator5Palette(rgb))).toEqual(
+      hexes.map((hex) => snapToCreator5Palette(hex).index)
+    );
+  });
+});
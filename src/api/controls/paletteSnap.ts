@@ -15,7 +15,10 @@
  * - hexToRgb(): tolerant hex parsing
  * - buildPaletteLab(): precompute a palette's L*a*b* values
  * - snapToPalette(): nearest palette entry for an arbitrary color
+ * - buildPaletteTable() / snapRgbToPalette(): batch snapping of packed RGB arrays, with a
+ *   bounded memo (DEFAULT_PALETTE_MEMO_LIMIT colors)
  */
+import { log } from '../../diagnostics/Logger';
 
 /** A single entry in a printer's firmware color palette. */
 export interface PaletteColor {
@@ -40,12 +43,43 @@ export interface PaletteLabEntry {
   lab: Lab;
 }
 
+/** Most colors a {@link PaletteTable} memo holds by default (about 2 MiB when full). */
+export const DEFAULT_PALETTE_MEMO_LIMIT = 1 << 16;
+
+/**
+ * A palette prepared for batch snapping: L*a*b* values packed into one typed array and a
+ * lazily filled, bounded color -> palette position memo.
+ */
+export interface PaletteTable {
+  /** Palette entries, in palette order. */
+  readonly colors: readonly PaletteColor[];
+  /** L*, a*, b* of each entry, three values per entry in palette order. */
+  readonly lab: Float64Array;
+  /** Firmware index of each entry, by palette position. */
+  readonly indices: Uint8Array;
+  /**
+   * Palette position of each 24-bit color snapped since the memo was last emptied. It is
+   * emptied when a new color would take it past `memoLimit`.
+   */
+  readonly memo: Map<number, number>;
+  /** Most colors `memo` holds. */
+  readonly memoLimit: number;
+  /** Empties the memo and releases its memory; later colors are computed again. */
+  clearMemo(): void;
+}
+
 /** sRGB component (0-255) channel transfer function -> linear value (0-1). */
 function srgbToLinear(channel: number): number {
   const c = channel / 255;
   return c <= 0.04045 ? c / 12.92 : ((c + 0.055) / 1.055) ** 2.4;
 }
 
+/** {@link srgbToLinear} for every 8-bit channel value, so conversions avoid `pow`. */
+const SRGB_TO_LINEAR = new Float64Array(256);
+for (let channel = 0; channel < 256; channel++) {
+  SRGB_TO_LINEAR[channel] = srgbToLinear(channel);
+}
+
 /** D65 reference white point used by the sRGB -> XYZ transform. */
 const D65 = { Xn: 0.95047, Yn: 1.0, Zn: 1.08883 };
 
@@ -54,9 +88,10 @@ const D65 = { Xn: 0.95047, Yn: 1.0, Zn: 1.08883 };
  * Used as the perceptual basis for the CIEDE2000 nearest-color match.
  */
 export function rgbToLab(r: number, g: number, b: number): Lab {
-  const R = srgbToLinear(r);
-  const G = srgbToLinear(g);
-  const B = srgbToLinear(b);
+  // Integer channels come from the table; anything else is converted directly.
+  const R = SRGB_TO_LINEAR[r] ?? srgbToLinear(r);
+  const G = SRGB_TO_LINEAR[g] ?? srgbToLinear(g);
+  const B = SRGB_TO_LINEAR[b] ?? srgbToLinear(b);
 
   let x = R * 0.4124564 + G * 0.3575761 + B * 0.1804375;
   let y = R * 0.2126729 + G * 0.7151522 + B * 0.072175;
@@ -92,9 +127,21 @@ function atan2deg(ordinate: number, abscissa: number): number {
  * perceptual neighbor would display the wrong color on the printer.
  */
 export function deltaE2000(c1: Lab, c2: Lab): number {
-  const { L: L1, a: a1, b: b1 } = c1;
-  const { L: L2, a: a2, b: b2 } = c2;
+  return deltaE2000Components(c1.L, c1.a, c1.b, c2.L, c2.a, c2.b);
+}
 
+/**
+ * {@link deltaE2000} on unpacked components, so the batch path can read palette values
+ * straight from a typed array without building an object per comparison.
+ */
+function deltaE2000Components(
+  L1: number,
+  a1: number,
+  b1: number,
+  L2: number,
+  a2: number,
+  b2: number
+): number {
   const C1 = Math.sqrt(a1 * a1 + b1 * b1);
   const C2 = Math.sqrt(a2 * a2 + b2 * b2);
   const Cbar = (C1 + C2) / 2;
@@ -201,7 +248,7 @@ export function snapToPalette(
 ): PaletteColor {
   const rgb = hexToRgb(hex);
   if (!rgb) {
-    console.warn(`${paletteName}: could not parse "${hex}" as hex; falling back to White.`);
+    log.warn(`${paletteName}: could not parse "${hex}" as hex; falling back to White.`);
     return paletteLab[0].color;
   }
 
@@ -217,3 +264,102 @@ export function snapToPalette(
   }
   return best.color;
 }
+
+/**
+ * Prepares a palette for {@link snapRgbToPalette}. Build it once per palette and reuse it:
+ * the memo it carries is what makes repeated colors cheap.
+ *
+ * @param palette Palette entries, 1-255 of them.
+ * @param memoLimit Most colors the memo holds before it is emptied and starts over.
+ */
+export function buildPaletteTable(
+  palette: readonly PaletteColor[],
+  memoLimit: number = DEFAULT_PALETTE_MEMO_LIMIT
+): PaletteTable {
+  if (palette.length === 0 || palette.length > 255) {
+    throw new RangeError(`Palette must have 1-255 entries, got ${palette.length}`);
+  }
+  const lab = new Float64Array(palette.length * 3);
+  const indices = new Uint8Array(palette.length);
+  buildPaletteLab(palette).forEach((entry, position) => {
+    lab[position * 3] = entry.lab.L;
+    lab[position * 3 + 1] = entry.lab.a;
+    lab[position * 3 + 2] = entry.lab.b;
+    indices[position] = entry.color.index;
+  });
+  const memo = new Map<number, number>();
+  return { colors: palette, lab, indices, memo, memoLimit, clearMemo: () => memo.clear() };
+}
+
+/**
+ * Finds the palette position nearest to an sRGB color by CIEDE2000 distance. Ties go to the
+ * earlier entry, exactly as in {@link snapToPalette}.
+ */
+function nearestPosition(table: PaletteTable, r: number, g: number, b: number): number {
+  const target = rgbToLab(r, g, b);
+  const lab = table.lab;
+  let best = 0;
+  let bestDelta = Number.POSITIVE_INFINITY;
+  for (let position = 0, offset = 0; offset < lab.length; position++, offset += 3) {
+    const delta = deltaE2000Components(
+      target.L,
+      target.a,
+      target.b,
+      lab[offset],
+      lab[offset + 1],
+      lab[offset + 2]
+    );
+    if (delta < bestDelta) {
+      bestDelta = delta;
+      best = position;
+    }
+  }
+  return best;
+}
+
+/**
+ * Snaps many colors at once. `rgb` holds packed 8-bit triplets (`[r0, g0, b0, r1, g1, b1, ...]`,
+ * e.g. a `Buffer` or the RGB channels of decoded image data), and the result holds the firmware
+ * palette index of each color, in order.
+ *
+ * Picks the same entry as {@link snapToPalette} for every color. Each distinct color is computed
+ * once per table and then served from the table's memo, so snapping the same tool colors across
+ * thousands of jobs costs one map lookup per color. The memo holds at most `table.memoLimit`
+ * colors; input with more distinct colors than that (a photo, say) empties it and refills it.
+ *
+ * @param rgb Packed RGB triplets; the length must be a multiple of 3.
+ * @param table Prepared palette, from {@link buildPaletteTable}.
+ * @param out Optional array to write into (at least `rgb.length / 3` long).
+ * @returns `out`, or a new array of `rgb.length / 3` palette indices.
+ */
+export function snapRgbToPalette(
+  rgb: Uint8Array | Uint8ClampedArray,
+  table: PaletteTable,
+  out?: Uint8Array
+): Uint8Array {
+  if (rgb.length % 3 !== 0) {
+    throw new RangeError(`RGB input length must be a multiple of 3, got ${rgb.length}`);
+  }
+  const count = rgb.length / 3;
+  const result = out ?? new Uint8Array(count);
+  if (result.length < count) {
+    throw new RangeError(`Output holds ${result.length} indices but ${count} are needed`);
+  }
+
+  const memo = table.memo;
+  const indices = table.indices;
+  for (let color = 0, offset = 0; color < count; color++, offset += 3) {
+    const r = rgb[offset];
+    const g = rgb[offset + 1];
+    const b = rgb[offset + 2];
+    const key = (r << 16) | (g << 8) | b;
+    let position = memo.get(key);
+    if (position === undefined) {
+      position = nearestPosition(table, r, g, b);
+      if (memo.size >= table.memoLimit) memo.clear();
+      memo.set(key, position);
+    }
+    result[color] = indices[position];
+  }
+  return result;
+}
@@ -0,0 +1,110 @@
+/**
+ * @fileoverview Tests for ConcurrencyLimiter covering the in-flight cap, submission order,
+ * start spacing, error propagation and ordered map results.
+ */
+import { afterEach, describe, expect, it, vi } from 'vitest';
+import { ConcurrencyLimiter } from './ConcurrencyLimiter';
+
+function deferred<T = void>() {
+  let resolve!: (value: T) => void;
+  const promise = new Promise<T>((r) => {
+    resolve = r;
+  });
+  return { promise, resolve };
+}
+
+describe('ConcurrencyLimiter', () => {
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it('never runs more tasks than the concurrency cap', async () => {
+    const limiter = new ConcurrencyLimiter({ concurrency: 2 });
+    let running = 0;
+    let peak = 0;
+
+    await Promise.all(
+      Array.from({ length: 10 }, () =>
+        limiter.run(async () => {
+          running++;
+          peak = Math.max(peak, running);
+          await new Promise((resolve) => setTimeout(resolve, 1));
+          running--;
+        })
+      )
+    );
+
+    expect(peak).toBe(2);
+    expect(limiter.activeCount).toBe(0);
+    expect(limiter.pendingCount).toBe(0);
+  });
+
+  it('starts waiting tasks in submission order', async () => {
+    const limiter = new ConcurrencyLimiter({ concurrency: 1 });
+    const gate = deferred();
+    const order: number[] = [];
+
+    const first = limiter.run(async () => {
+      order.push(1);
+      await gate.promise;
+    });
+    const second = limiter.run(async () => {
+      order.push(2);
+    });
+    const third = limiter.run(async () => {
+      order.push(3);
+    });
+
+    await new Promise((resolve) => setImmediate(resolve));
+    expect(order).toEqual([1]);
+    expect(limiter.pendingCount).toBe(2);
+
+    gate.resolve();
+    await Promise.all([first, second, third]);
+    expect(order).toEqual([1, 2, 3]);
+  });
+
+  it('spaces task starts by minStartIntervalMs', async () => {
+    vi.useFakeTimers();
+    const limiter = new ConcurrencyLimiter({ concurrency: 10, minStartIntervalMs: 100 });
+    const started: number[] = [];
+
+    const runs = [0, 1, 2].map((id) =>
+      limiter.run(async () => {
+        started.push(id);
+      })
+    );
+
+    await vi.advanceTimersByTimeAsync(0);
+    expect(started).toEqual([0]);
+
+    await vi.advanceTimersByTimeAsync(100);
+    expect(started).toEqual([0, 1]);
+
+    await vi.advanceTimersByTimeAsync(100);
+    expect(started).toEqual([0, 1, 2]);
+    await Promise.all(runs);
+  });
+
+  it('releases the slot when a task rejects', async () => {
+    const limiter = new ConcurrencyLimiter({ concurrency: 1 });
+
+    await expect(
+      limiter.run(async () => {
+        throw new Error('boom');
+      })
+    ).rejects.toThrow('boom');
+
+    await expect(limiter.run(async () => 'next')).resolves.toBe('next');
+  });
+
+  it('maps items with results in input order', async () => {
+    const limiter = new ConcurrencyLimiter({ concurrency: 3 });
+    const result = await limiter.map([30, 10, 20], async (delay, index) => {
+      await new Promise((resolve) => setTimeout(resolve, delay));
+      return index;
+    });
+
+    expect(result).toEqual([0, 1, 2]);
+  });
+});
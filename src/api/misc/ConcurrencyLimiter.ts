@@ -0,0 +1,103 @@
+/**
+ * @fileoverview Counting semaphore that caps how many asynchronous tasks run at once, with an
+ * optional minimum spacing between task starts to smooth out connection bursts.
+ */
+
+/**
+ * Options for a {@link ConcurrencyLimiter}.
+ */
+export interface ConcurrencyLimiterOptions {
+  /** Maximum number of tasks running at the same time (values below 1 are treated as 1). */
+  concurrency: number;
+  /** Minimum time in milliseconds between two task starts (default: 0, no spacing). */
+  minStartIntervalMs?: number;
+}
+
+/**
+ * Runs asynchronous tasks with a cap on how many are in flight.
+ *
+ * Tasks start in submission order. When `minStartIntervalMs` is set, starts are additionally
+ * spaced out, so a burst of N tasks ramps up over `N * minStartIntervalMs` instead of hitting the
+ * network all at once.
+ */
+export class ConcurrencyLimiter {
+  private readonly concurrency: number;
+  private readonly minStartIntervalMs: number;
+  /** Resolvers of tasks waiting for a slot, in submission order. */
+  private readonly waiters: Array<() => void> = [];
+  private running = 0;
+  /** Earliest time the next task may start when spacing is enabled. */
+  private nextStartAt = 0;
+  private startTimer: NodeJS.Timeout | null = null;
+
+  /**
+   * Creates a new ConcurrencyLimiter.
+   * @param options Concurrency cap and start spacing.
+   */
+  constructor(options: ConcurrencyLimiterOptions) {
+    this.concurrency = Math.max(1, Math.floor(options.concurrency));
+    this.minStartIntervalMs = Math.max(0, options.minStartIntervalMs ?? 0);
+  }
+
+  /** Number of tasks currently running. */
+  public get activeCount(): number {
+    return this.running;
+  }
+
+  /** Number of tasks waiting for a slot. */
+  public get pendingCount(): number {
+    return this.waiters.length;
+  }
+
+  /**
+   * Runs a task once a slot is free.
+   * @param task Function that starts the work and returns its promise.
+   * @returns A Promise that settles with the task's result.
+   */
+  public async run<T>(task: () => Promise<T>): Promise<T> {
+    await new Promise<void>((resolve) => {
+      this.waiters.push(resolve);
+      this.pump();
+    });
+
+    try {
+      return await task();
+    } finally {
+      this.running--;
+      this.pump();
+    }
+  }
+
+  /**
+   * Applies a function to every item with bounded concurrency.
+   * @param items Items to process.
+   * @param fn Function applied to each item.
+   * @returns Results in the same order as `items`. Rejects with the first error, like Promise.all.
+   */
+  public map<T, R>(items: readonly T[], fn: (item: T, index: number) => Promise<R>): Promise<R[]> {
+    return Promise.all(items.map((item, index) => this.run(() => fn(item, index))));
+  }
+
+  /** Starts waiting tasks while slots are free and the start spacing allows it. */
+  private pump(): void {
+    while (this.waiters.length > 0 && this.running < this.concurrency) {
+      if (this.minStartIntervalMs > 0) {
+        const now = Date.now();
+        if (now < this.nextStartAt) {
+          if (!this.startTimer) {
+            this.startTimer = setTimeout(() => {
+              this.startTimer = null;
+              this.pump();
+            }, this.nextStartAt - now);
+          }
+          return;
+        }
+        this.nextStartAt = now + this.minStartIntervalMs;
+      }
+
+      this.running++;
+      const start = this.waiters.shift() as () => void;
+      start();
+    }
+  }
+}
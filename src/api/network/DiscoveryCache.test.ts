@@ -0,0 +1,83 @@
+/**
+ * @fileoverview Tests for the persisted last-known-printers cache used by printer discovery.
+ */
+import * as fs from 'node:fs';
+import * as os from 'node:os';
+import * as path from 'node:path';
+import { afterAll, beforeAll, describe, expect, it } from 'vitest';
+import {
+    type DiscoveredPrinter,
+    DiscoveryProtocol,
+    PrinterModel,
+} from '../../models/PrinterDiscovery';
+import { DiscoveryCache } from './DiscoveryCache';
+
+const printer = (overrides: Partial<DiscoveredPrinter>): DiscoveredPrinter => ({
+    model: PrinterModel.Adventurer5M,
+    protocolFormat: DiscoveryProtocol.Modern,
+    name: 'Adventurer 5M',
+    ipAddress: '192.168.1.10',
+    commandPort: 8899,
+    serialNumber: 'SN-A',
+    ...overrides,
+});
+
+describe('DiscoveryCache', () => {
+    let tempDir: string;
+
+    beforeAll(() => {
+        tempDir = fs.mkdtempSync(path.join(os.tmpdir(), 'ff-api-discovery-cache-'));
+    });
+
+    afterAll(() => {
+        fs.rmSync(tempDir, { recursive: true, force: true });
+    });
+
+    it('should read a missing or corrupt file as an empty cache', async () => {
+        const missing = new DiscoveryCache(path.join(tempDir, 'missing.json'));
+        await expect(missing.load()).resolves.toEqual([]);
+
+        const corruptPath = path.join(tempDir, 'corrupt.json');
+        fs.writeFileSync(corruptPath, '{not json');
+        await expect(new DiscoveryCache(corruptPath).load()).resolves.toEqual([]);
+    });
+
+    it('should round-trip printers and replace a printer that moved', async () => {
+        const cache = new DiscoveryCache(path.join(tempDir, 'nested', 'printers.json'));
+        await cache.save([
+            printer({}),
+            printer({ serialNumber: 'SN-B', ipAddress: '192.168.1.11' }),
+        ]);
+        await cache.save([printer({ ipAddress: '192.168.1.99', fromCache: true })]);
+
+        const loaded = await cache.load();
+
+        expect(loaded.map((entry) => [entry.serialNumber, entry.ipAddress])).toEqual([
+            ['SN-A', '192.168.1.99'],
+            ['SN-B', '192.168.1.11'],
+        ]);
+        expect(loaded[0].fromCache).toBeUndefined();
+        expect(loaded[0]).not.toHaveProperty('lastSeen');
+    });
+
+    it('should drop expired and malformed entries', async () => {
+        const filePath = path.join(tempDir, 'expiry.json');
+        fs.writeFileSync(
+            filePath,
+            JSON.stringify([
+                { ...printer({ serialNumber: 'OLD' }), lastSeen: Date.now() - 60000 },
+                {
+                    ...printer({ serialNumber: 'BAD', ipAddress: 'not-an-ip' }),
+                    lastSeen: Date.now(),
+                },
+            ])
+        );
+        const cache = new DiscoveryCache(filePath, 1000);
+
+        expect(await cache.load()).toEqual([]);
+
+        await cache.save([printer({ serialNumber: 'NEW' })]);
+        const loaded = await cache.load();
+        expect(loaded.map((entry) => entry.serialNumber)).toEqual(['NEW']);
+    });
+});
@@ -0,0 +1,104 @@
+/**
+ * @fileoverview Persisted last-known-printers list for FlashForge printer discovery.
+ *
+ * Lets a scan start from the printers found last time: they can be shown immediately and
+ * probed by unicast while the broadcast/multicast scan runs.
+ */
+import { promises as fs } from 'node:fs';
+import { isIPv4 } from 'node:net';
+import * as path from 'node:path';
+import type { DiscoveredPrinter } from '../../models/PrinterDiscovery';
+
+/**
+ * A cached printer together with the time it last answered a scan.
+ */
+interface CachedPrinterRecord extends DiscoveredPrinter {
+    /** Epoch milliseconds of the last scan the printer answered */
+    lastSeen: number;
+}
+
+/**
+ * Reads and writes the discovery cache file.
+ *
+ * The file is a JSON array of discovered printers. Writes go to a temporary file that is then
+ * renamed over the cache, so a crash never leaves a truncated file behind. A missing or
+ * unreadable file reads as an empty cache.
+ */
+export class DiscoveryCache {
+    /**
+     * Creates a new DiscoveryCache.
+     * @param filePath Path of the JSON cache file
+     * @param maxAgeMs Printers not seen for this long are ignored and dropped on the next save
+     *                 (default: 30 days)
+     */
+    constructor(
+        public readonly filePath: string,
+        private readonly maxAgeMs: number = 30 * 24 * 60 * 60 * 1000
+    ) {}
+
+    /**
+     * Loads the cached printers that have not expired.
+     * @returns Promise resolving to the last known printers, or an empty array if there are none
+     */
+    public async load(): Promise<DiscoveredPrinter[]> {
+        const now = Date.now();
+        const records = await this.readRecords();
+        return records
+            .filter((record) => now - record.lastSeen <= this.maxAgeMs)
+            .map(({ lastSeen: _lastSeen, ...printer }) => printer);
+    }
+
+    /**
+     * Records printers that answered a scan, keeping other cached printers until they expire.
+     * Printers are matched by serial number, or by address and command port when they report none.
+     * @param printers Printers that answered
+     */
+    public async save(printers: DiscoveredPrinter[]): Promise<void> {
+        const now = Date.now();
+        const records = new Map<string, CachedPrinterRecord>();
+
+        for (const record of await this.readRecords()) {
+            if (now - record.lastSeen <= this.maxAgeMs) {
+                records.set(this.keyOf(record), record);
+            }
+        }
+        for (const { fromCache: _fromCache, ...printer } of printers) {
+            // A printer that moved to a new address replaces its old entry.
+            records.set(this.keyOf(printer), { ...printer, lastSeen: now });
+        }
+
+        await fs.mkdir(path.dirname(this.filePath), { recursive: true });
+        const tmpPath = `${this.filePath}.${process.pid}.tmp`;
+        await fs.writeFile(tmpPath, JSON.stringify(Array.from(records.values()), null, 2));
+        await fs.rename(tmpPath, this.filePath);
+    }
+
+    private keyOf(printer: DiscoveredPrinter): string {
+        return printer.serialNumber
+            ? `sn:${printer.serialNumber}`
+            : `ip:${printer.ipAddress}:${printer.commandPort}`;
+    }
+
+    private async readRecords(): Promise<CachedPrinterRecord[]> {
+        let parsed: unknown;
+        try {
+            parsed = JSON.parse(await fs.readFile(this.filePath, 'utf8'));
+        } catch {
+            return [];
+        }
+        if (!Array.isArray(parsed)) {
+            return [];
+        }
+
+        // Skip malformed entries rather than probing arbitrary addresses from a damaged file.
+        return parsed.filter(
+            (record): record is CachedPrinterRecord =>
+                typeof record === 'object' &&
+                record !== null &&
+                typeof record.ipAddress === 'string' &&
+                isIPv4(record.ipAddress) &&
+                typeof record.commandPort === 'number' &&
+                typeof record.lastSeen === 'number'
+        );
+    }
+}
@@ -0,0 +1,316 @@
+/**
+ * @fileoverview Tests for the shared upload engine: source resolution, chunked streaming with
+ * progress, retries of transient failures, stall detection and cancellation, plus end-to-end
+ * JobControl uploads against a fake printer.
+ */
+import * as fs from 'node:fs';
+import * as os from 'node:os';
+import * as path from 'node:path';
+import { PassThrough, type Readable } from 'node:stream';
+import { afterAll, afterEach, beforeAll, describe, expect, it, vi } from 'vitest';
+import { FiveMClient } from '../../FiveMClient';
+import { FakePrinterServer } from '../../testing/FakePrinterServer';
+import { Endpoints } from '../server/Endpoints';
+import {
+  isTransientUploadError,
+  UploadEngine,
+  UploadError,
+  type UploadProgress,
+} from './UploadEngine';
+
+// Suppress logs (from API files) during tests
+const originalConsole = { ...console };
+beforeAll(() => {
+  console.log = vi.fn();
+  console.warn = vi.fn();
+  console.error = vi.fn();
+});
+
+afterAll(() => {
+  console.log = originalConsole.log;
+  console.warn = originalConsole.warn;
+  console.error = originalConsole.error;
+});
+
+async function readAll(body: Readable): Promise<Buffer> {
+  const chunks: Buffer[] = [];
+  for await (const chunk of body) {
+    chunks.push(chunk as Buffer);
+  }
+  return Buffer.concat(chunks);
+}
+
+function connectionReset(): Error {
+  return Object.assign(new Error('read ECONNRESET'), { code: 'ECONNRESET' });
+}
+
+describe('UploadEngine', () => {
+  let tempDir: string;
+
+  beforeAll(() => {
+    tempDir = fs.mkdtempSync(path.join(os.tmpdir(), 'ff-api-upload-engine-'));
+  });
+
+  afterAll(() => {
+    fs.rmSync(tempDir, { recursive: true, force: true });
+  });
+
+  describe('prepare', () => {
+    it('resolves the name and size of a local file', async () => {
+      const filePath = path.join(tempDir, 'cube.gcode');
+      fs.writeFileSync(filePath, 'G28\nG1 X10\n');
+
+      const upload = await UploadEngine.prepare(filePath);
+
+      expect(upload.fileName).toBe('cube.gcode');
+      expect(upload.size).toBe(11);
+      expect(upload.replayable).toBe(true);
+      await expect(upload.run(readAll)).resolves.toEqual(Buffer.from('G28\nG1 X10\n'));
+    });
+
+    it('rejects a missing file and a directory', async () => {
+      await expect(
+        UploadEngine.prepare(path.join(tempDir, 'missing.gcode'))
+      ).rejects.toHaveProperty('code', 'NOT_FOUND');
+      await expect(UploadEngine.prepare(tempDir)).rejects.toHaveProperty('code', 'INVALID_SOURCE');
+    });
+
+    it('requires a size for stream sources', async () => {
+      await expect(
+        UploadEngine.prepare({ fileName: 'part.gcode', data: new PassThrough() })
+      ).rejects.toBeInstanceOf(UploadError);
+    });
+
+    it('wraps a Uint8Array without copying it', async () => {
+      const bytes = new Uint8Array([1, 2, 3, 4, 5, 6]).subarray(2);
+      const upload = await UploadEngine.prepare({ fileName: 'part.gcode', data: bytes });
+
+      expect(upload.size).toBe(4);
+      await expect(upload.run(readAll)).resolves.toEqual(Buffer.from([3, 4, 5, 6]));
+    });
+  });
+
+  describe('run', () => {
+    it('reads a Buffer in chunks and reports progress per chunk', async () => {
+      const data = Buffer.from('0123456789');
+      const progress: UploadProgress[] = [];
+      const upload = await UploadEngine.prepare(
+        { fileName: 'part.gcode', data },
+        { chunkSize: 4, progressIntervalMs: 0, onProgress: (p) => progress.push(p) }
+      );
+
+      await expect(upload.run(readAll)).resolves.toEqual(data);
+
+      expect(progress.map((p) => p.bytesSent)).toEqual([4, 8, 10, 10]);
+      expect(progress[progress.length - 1]).toMatchObject({
+        totalBytes: 10,
+        percent: 100,
+        attempt: 1,
+      });
+      expect(progress.every((p) => p.bytesPerSecond >= 0)).toBe(true);
+    });
+
+    it('retries transient failures with a fresh body', async () => {
+      const data = Buffer.from('G28\n');
+      const upload = await UploadEngine.prepare(
+        { fileName: 'part.gcode', data },
+        { retries: 2, retryDelayMs: 1 }
+      );
+      const send = vi
+        .fn<(body: Readable) => Promise<Buffer>>()
+        .mockRejectedValueOnce(connectionReset())
+        .mockImplementation(readAll);
+
+      await expect(upload.run(send)).resolves.toEqual(data);
+      expect(send).toHaveBeenCalledTimes(2);
+    });
+
+    it('does not resend a fully sent body when retryAfterBodySent is false', async () => {
+      const data = Buffer.from('G28\n');
+      const upload = await UploadEngine.prepare(
+        { fileName: 'part.gcode', data },
+        { retries: 2, retryDelayMs: 1, retryAfterBodySent: false }
+      );
+      const sendAll = vi.fn(async (body: Readable) => {
+        await readAll(body);
+        throw connectionReset();
+      });
+
+      await expect(upload.run(sendAll)).rejects.toHaveProperty('code', 'ECONNRESET');
+      expect(sendAll).toHaveBeenCalledTimes(1);
+
+      // A failure before the body was read is still retried.
+      const sendLater = vi
+        .fn<(body: Readable) => Promise<Buffer>>()
+        .mockRejectedValueOnce(connectionReset())
+        .mockImplementation(readAll);
+      await expect(upload.run(sendLater)).resolves.toEqual(data);
+      expect(sendLater).toHaveBeenCalledTimes(2);
+    });
+
+    it('does not retry HTTP client errors or stream sources', async () => {
+      const rejected = Object.assign(new Error('Bad Request'), { response: { status: 400 } });
+      const buffered = await UploadEngine.prepare(
+        { fileName: 'part.gcode', data: Buffer.from('G28\n') },
+        { retryDelayMs: 1 }
+      );
+      const send = vi.fn().mockRejectedValue(rejected);
+      await expect(buffered.run(send)).rejects.toBe(rejected);
+      expect(send).toHaveBeenCalledTimes(1);
+
+      const stream = new PassThrough();
+      stream.end('G28\n');
+      const streamed = await UploadEngine.prepare(
+        { fileName: 'part.gcode', data: stream, size: 4 },
+        { retryDelayMs: 1 }
+      );
+      const failing = vi.fn().mockRejectedValue(connectionReset());
+      await expect(streamed.run(failing)).rejects.toHaveProperty('code', 'ECONNRESET');
+      expect(failing).toHaveBeenCalledTimes(1);
+      expect(streamed.replayable).toBe(false);
+    });
+
+    it('fails a stalled attempt and aborts its signal', async () => {
+      const upload = await UploadEngine.prepare(
+        { fileName: 'part.gcode', data: Buffer.from('G28\n') },
+        { retries: 0, stallTimeoutMs: 20 }
+      );
+      let attemptSignal: AbortSignal | undefined;
+
+      const result = upload.run(
+        (_body, signal) =>
+          new Promise((_resolve, reject) => {
+            attemptSignal = signal;
+            signal.addEventListener('abort', () => reject(new Error('canceled')));
+          })
+      );
+
+      await expect(result).rejects.toHaveProperty('code', 'STALLED');
+      expect(attemptSignal?.aborted).toBe(true);
+    });
+
+    it('stops on abort without retrying', async () => {
+      const controller = new AbortController();
+      const upload = await UploadEngine.prepare(
+        { fileName: 'part.gcode', data: Buffer.from('G28\n') },
+        { signal: controller.signal, retryDelayMs: 1 }
+      );
+      const send = vi.fn(
+        (_body: Readable, signal: AbortSignal) =>
+          new Promise((_resolve, reject) => {
+            signal.addEventListener('abort', () => reject(new Error('canceled')));
+            controller.abort();
+          })
+      );
+
+      await expect(upload.run(send)).rejects.toHaveProperty('code', 'ABORTED');
+      expect(send).toHaveBeenCalledTimes(1);
+    });
+
+    it('rejects a stream that ends short of its declared size', async () => {
+      const stream = new PassThrough();
+      stream.end('G28\n');
+      const upload = await UploadEngine.prepare({ fileName: 'part.gcode', data: stream, size: 10 });
+
+      await expect(upload.run(readAll)).rejects.toHaveProperty('code', 'INVALID_SOURCE');
+    });
+  });
+
+  it('classifies transient errors', () => {
+    expect(isTransientUploadError(connectionReset())).toBe(true);
+    expect(isTransientUploadError(new Error('socket hang up'))).toBe(true);
+    expect(isTransientUploadError({ response: { status: 503 } })).toBe(true);
+    expect(isTransientUploadError({ response: { status: 404 } })).toBe(false);
+    expect(isTransientUploadError(new UploadError('stalled', 'STALLED'))).toBe(true);
+    expect(isTransientUploadError(new UploadError('aborted', 'ABORTED'))).toBe(false);
+  });
+});
+
+describe('JobControl uploads over HTTP', () => {
+  let printer: FakePrinterServer;
+  let client: FiveMClient;
+
+  async function connect() {
+    printer = new FakePrinterServer({ enableTcp: false, recordUploads: true });
+    await printer.start();
+    client = new FiveMClient(printer.host, printer.serialNumber, printer.checkCode, {
+      httpPort: printer.httpPort,
+      httpOnly: true,
+    });
+    expect(await client.initialize()).toBe(true);
+  }
+
+  afterEach(async () => {
+    await client?.dispose();
+    await printer?.stop();
+  });
+
+  it('streams an in-memory file with its size and print headers', async () => {
+    await connect();
+    const data = Buffer.alloc(256 * 1024, 'G1 X10 Y10\n');
+    const progress: UploadProgress[] = [];
+
+    const ok = await client.jobControl.uploadFile({ fileName: 'part.gcode', data }, false, true, {
+      onProgress: (p) => progress.push(p),
+    });
+
+    expect(ok).toBe(true);
+    expect(printer.uploads).toHaveLength(1);
+    const [upload] = printer.uploads;
+    expect(upload.file).toEqual(data);
+    expect(upload.headers.filesize).toBe(String(data.length));
+    expect(upload.headers.levelingbeforeprint).toBe('true');
+    expect(upload.headers['content-length']).toBe(String(upload.bytesReceived));
+    expect(progress[progress.length - 1].percent).toBe(100);
+  });
+
+  it('retries an upload whose connection was reset', async () => {
+    await connect();
+    printer.failUploads = 1;
+
+    const ok = await client.jobControl.uploadFile(
+      { fileName: 'part.gcode', data: Buffer.alloc(128 * 1024, 'M105\n') },
+      false,
+      false,
+      { retryDelayMs: 1 }
+    );
+
+    expect(ok).toBe(true);
+    expect(printer.getHttpRequestCount(Endpoints.UploadFile)).toBe(2);
+    expect(printer.uploads).toHaveLength(1);
+  });
+
+  it('does not upload again after a failed reply when the upload starts a print', async () => {
+    await connect();
+    const data = Buffer.alloc(64 * 1024, 'M105\n');
+
+    printer.failUploadReplies = 1;
+    const started = await client.jobControl.uploadFile(
+      { fileName: 'part.gcode', data },
+      true,
+      false,
+      { retryDelayMs: 1 }
+    );
+    expect(started).toBe(false);
+    expect(printer.getHttpRequestCount(Endpoints.UploadFile)).toBe(1);
+
+    printer.failUploadReplies = 1;
+    const stored = await client.jobControl.uploadFile(
+      { fileName: 'part.gcode', data },
+      false,
+      false,
+      { retryDelayMs: 1 }
+    );
+    expect(stored).toBe(true);
+    expect(printer.getHttpRequestCount(Endpoints.UploadFile)).toBe(3);
+  });
+
+  it('returns false for a missing file without contacting the printer', async () => {
+    await connect();
+
+    const ok = await client.jobControl.uploadFile('/nonexistent/part.gcode', false, false);
+
+    expect(ok).toBe(false);
+    expect(printer.getHttpRequestCount(Endpoints.UploadFile)).toBe(0);
+  });
+});
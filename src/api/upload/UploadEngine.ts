@@ -0,0 +1,463 @@
+/**
+ * @fileoverview Shared streaming upload engine used by the HTTP `/uploadGcode` uploads in
+ * `JobControl` and the legacy TCP M28/M29 upload in `FlashForgeTcpClient`. Resolves file, Buffer
+ * and stream sources without blocking the event loop, meters the bytes the transport pulls
+ * (progress, throughput and stall detection) and retries transient failures.
+ */
+import { createReadStream, promises as fs } from 'node:fs';
+import * as path from 'node:path';
+import { pipeline, Readable, Transform, type TransformCallback } from 'node:stream';
+import { log } from '../../diagnostics/Logger';
+
+/**
+ * In-memory or streamed file contents to upload, for callers that have no file on disk
+ * (for example G-code piped straight from a slicer).
+ */
+export interface UploadSource {
+  /** File name to store on the printer, e.g. `part.gcode`. */
+  fileName: string;
+  /** File contents. A stream can only be read once, so stream uploads are never retried. */
+  data: Buffer | Uint8Array | Readable;
+  /** Size in bytes. Required for streams: the printer needs the size before the upload starts. */
+  size?: number;
+}
+
+/** A local file path, or an {@link UploadSource}. */
+export type UploadInput = string | UploadSource;
+
+/**
+ * Progress of one upload attempt.
+ */
+export interface UploadProgress {
+  /** Bytes handed to the transport so far. */
+  bytesSent: number;
+  /** Total size of the file in bytes. */
+  totalBytes: number;
+  /** Progress from 0 to 100. */
+  percent: number;
+  /** Average throughput of this attempt in bytes per second. */
+  bytesPerSecond: number;
+  /** Milliseconds since this attempt started. */
+  elapsedMs: number;
+  /** Attempt number, starting at 1. Progress restarts from zero on a retry. */
+  attempt: number;
+}
+
+/**
+ * Options shared by every upload method.
+ */
+export interface UploadOptions {
+  /** Cancels the upload. An aborted upload is never retried. */
+  signal?: AbortSignal;
+  /** Called with upload progress, at most once per `progressIntervalMs` and once at the end. */
+  onProgress?: (progress: UploadProgress) => void;
+  /** Minimum time in milliseconds between progress callbacks (default: 250). */
+  progressIntervalMs?: number;
+  /**
+   * How many times a transient failure (connection reset or refused, a stall, HTTP 408, 429 or
+   * 5xx) is retried (default: 2). File and Buffer sources only; TCP uploads are not retried.
+   * A failure after the whole body was sent may mean the printer stored the file and only the
+   * reply was lost, so such attempts are only retried while `retryAfterBodySent` is true.
+   */
+  retries?: number;
+  /**
+   * Whether an attempt that failed after its whole body was sent may be retried (default: true).
+   * Resending a file that only gets stored is harmless, but resending one that starts a print
+   * can start it twice, so `JobControl` defaults this to false for uploads with `startPrint`.
+   */
+  retryAfterBodySent?: boolean;
+  /** Delay in milliseconds before the first retry, doubled for each further retry (default: 1000). */
+  retryDelayMs?: number;
+  /**
+   * Maximum time in milliseconds without progress, including the wait for the printer's reply
+   * after the last byte, before the attempt fails as stalled (default: 30000, 0 to disable).
+   */
+  stallTimeoutMs?: number;
+  /** Size in bytes of the chunks read from the source (default: 65536). */
+  chunkSize?: number;
+}
+
+/** Error codes reported by {@link UploadError}. */
+export type UploadErrorCode = 'NOT_FOUND' | 'INVALID_SOURCE' | 'ABORTED' | 'STALLED';
+
+/**
+ * Error raised by the upload engine itself, as opposed to the transport.
+ */
+export class UploadError extends Error {
+  /** Machine-readable reason for the failure. */
+  public readonly code: UploadErrorCode;
+
+  /**
+   * Creates an UploadError. It carries no HTTP status: errors from the transport, including
+   * rejected HTTP responses (with their `response.status`), are rethrown as they are.
+   * @param message Human-readable description of the failure.
+   * @param code `NOT_FOUND` or `INVALID_SOURCE` for a bad source, `ABORTED` when cancelled, or
+   * `STALLED` when an attempt made no progress for `stallTimeoutMs`.
+   */
+  constructor(message: string, code: UploadErrorCode) {
+    super(message);
+    this.name = 'UploadError';
+    this.code = code;
+  }
+}
+
+/** Socket-level error codes worth retrying. */
+const TRANSIENT_ERROR_CODES: ReadonlySet<string> = new Set([
+  'ECONNRESET',
+  'ECONNREFUSED',
+  'ECONNABORTED',
+  'ETIMEDOUT',
+  'EPIPE',
+  'EHOSTUNREACH',
+  'ENETUNREACH',
+  'EAI_AGAIN',
+]);
+
+/**
+ * Reports whether an upload failure is worth retrying: connection-level errors, stalls, and
+ * HTTP 408, 429 and 5xx responses.
+ * @param error The error an upload attempt failed with.
+ */
+export function isTransientUploadError(error: unknown): boolean {
+  if (error instanceof UploadError) {
+    return error.code === 'STALLED';
+  }
+
+  const err = error as { code?: string; message?: string; response?: { status?: number } } | null;
+  const status = err?.response?.status;
+  if (status !== undefined) {
+    return status === 408 || status === 429 || status >= 500;
+  }
+  if (err?.code && TRANSIENT_ERROR_CODES.has(err.code)) {
+    return true;
+  }
+  return /socket hang up/i.test(err?.message ?? '');
+}
+
+/**
+ * Streams one file to a printer.
+ *
+ * {@link prepare} resolves the file name and size up front (asynchronously, for paths), since
+ * both the HTTP headers and the M28 command need the size before any data is sent. {@link run}
+ * then hands each attempt a fresh, metered `Readable` of the file. The transport pulls from it
+ * at its own pace, so memory use stays at a few chunks regardless of file size, and progress
+ * reflects what the transport has actually consumed.
+ *
+ * Example usage:
+ * ```typescript
+ * const upload = await UploadEngine.prepare('/tmp/part.gcode', {
+ *   onProgress: ({ percent, bytesPerSecond }) => console.log(`${percent}% at ${bytesPerSecond} B/s`),
+ * });
+ * await upload.run((body, signal) => sendSomewhere(body, signal));
+ * ```
+ */
+export class UploadEngine {
+  /** Name of the file on the printer. */
+  public readonly fileName: string;
+  /** Size of the file in bytes. */
+  public readonly size: number;
+
+  private readonly source: string | Buffer | Readable;
+  private readonly options: UploadOptions;
+  private streamConsumed = false;
+  /** Whether the transport read the whole body in the latest attempt. */
+  private bodySent = false;
+
+  private constructor(
+    fileName: string,
+    size: number,
+    source: string | Buffer | Readable,
+    options: UploadOptions
+  ) {
+    this.fileName = fileName;
+    this.size = size;
+    this.source = source;
+    this.options = options;
+  }
+
+  /**
+   * Resolves an upload source.
+   * @param input A local file path, or an in-memory or streamed source.
+   * @param options Progress, retry, stall and abort options for {@link run}.
+   * @returns A Promise that resolves to the prepared upload.
+   * @throws {UploadError} `NOT_FOUND` if the file cannot be accessed, or `INVALID_SOURCE` if the
+   * path is not a regular file, the source has no name, or a stream source has no size.
+   */
+  public static async prepare(
+    input: UploadInput,
+    options: UploadOptions = {}
+  ): Promise<UploadEngine> {
+    if (typeof input === 'string') {
+      let stats: Awaited<ReturnType<typeof fs.stat>>;
+      try {
+        stats = await fs.stat(input);
+      } catch (error) {
+        throw new UploadError(
+          `File not found at ${input}: ${error instanceof Error ? error.message : String(error)}`,
+          'NOT_FOUND'
+        );
+      }
+      if (!stats.isFile()) {
+        throw new UploadError(`${input} is not a file`, 'INVALID_SOURCE');
+      }
+      return new UploadEngine(path.basename(input), stats.size, input, options);
+    }
+
+    if (!input.fileName) {
+      throw new UploadError('Upload source has no file name', 'INVALID_SOURCE');
+    }
+
+    if (input.data instanceof Uint8Array) {
+      // Wrap, don't copy: a Uint8Array view becomes a Buffer over the same memory.
+      const buffer = Buffer.isBuffer(input.data)
+        ? input.data
+        : Buffer.from(input.data.buffer, input.data.byteOffset, input.data.byteLength);
+      if (input.size !== undefined && input.size !== buffer.length) {
+        throw new UploadError(
+          `Upload source size ${input.size} does not match its ${buffer.length} bytes of data`,
+          'INVALID_SOURCE'
+        );
+      }
+      return new UploadEngine(input.fileName, buffer.length, buffer, options);
+    }
+
+    if (input.size === undefined || !Number.isInteger(input.size) || input.size < 0) {
+      throw new UploadError(
+        `Upload source ${input.fileName} is a stream and needs its size in bytes`,
+        'INVALID_SOURCE'
+      );
+    }
+    return new UploadEngine(input.fileName, input.size, input.data, options);
+  }
+
+  /** True if the source can be read again for a retry (file and Buffer sources). */
+  public get replayable(): boolean {
+    return typeof this.source === 'string' || Buffer.isBuffer(this.source);
+  }
+
+  /**
+   * Runs the upload, retrying transient failures of replayable sources with exponential backoff.
+   *
+   * `send` receives the file as a stream and a signal that is aborted when the caller's signal
+   * fires or the attempt stalls. It must consume the stream and settle once the printer has
+   * answered. A failed attempt's stream is destroyed before the next attempt opens a new one.
+   * @param send Sends one attempt's body and resolves to the printer's reply.
+   * @param signal Cancels the upload (defaults to the `signal` option).
+   * @returns A Promise that resolves to the result of the successful attempt.
+   * @throws {UploadError} `ABORTED` when cancelled, `STALLED` when the last attempt stalled, or
+   * `INVALID_SOURCE` when the source yields a different number of bytes than its size. Other
+   * failures of the last attempt are rethrown as they are.
+   */
+  public async run<T>(
+    send: (body: Readable, signal: AbortSignal) => Promise<T>,
+    signal: AbortSignal | undefined = this.options.signal
+  ): Promise<T> {
+    const retries = this.replayable ? Math.max(0, this.options.retries ?? 2) : 0;
+    const retryDelayMs = this.options.retryDelayMs ?? 1000;
+
+    for (let attempt = 1; ; attempt++) {
+      try {
+        return await this.attempt(send, attempt, signal);
+      } catch (error) {
+        if (
+          attempt > retries ||
+          !isTransientUploadError(error) ||
+          (this.bodySent && this.options.retryAfterBodySent === false)
+        ) {
+          throw error;
+        }
+        const delayMs = retryDelayMs * 2 ** (attempt - 1);
+        log.warn(
+          `Upload of ${this.fileName} failed (${
+            error instanceof Error ? error.message : String(error)
+          }), retrying in ${delayMs} ms (attempt ${attempt + 1} of ${retries + 1})`
+        );
+        await sleep(delayMs, signal);
+      }
+    }
+  }
+
+  private async attempt<T>(
+    send: (body: Readable, signal: AbortSignal) => Promise<T>,
+    attempt: number,
+    signal: AbortSignal | undefined
+  ): Promise<T> {
+    if (signal?.aborted) {
+      throw new UploadError(`Upload of ${this.fileName} was aborted`, 'ABORTED');
+    }
+
+    const source = this.open();
+    const controller = new AbortController();
+    let failure: UploadError | null = null;
+    const fail = (error: UploadError) => {
+      if (failure) return;
+      failure = error;
+      controller.abort();
+      meter.destroy(error);
+    };
+    const onAbort = () =>
+      fail(new UploadError(`Upload of ${this.fileName} was aborted`, 'ABORTED'));
+
+    const meter = new UploadMeter(this.size, attempt, this.options, (idleMs) =>
+      fail(new UploadError(`Upload of ${this.fileName} stalled for ${idleMs} ms`, 'STALLED'))
+    );
+    // pipeline() destroys the source if the meter is destroyed, closing file descriptors early.
+    pipeline(source, meter, () => {});
+    signal?.addEventListener('abort', onAbort, { once: true });
+
+    try {
+      return await send(meter, controller.signal);
+    } catch (error) {
+      // Transports wrap stream errors in their own; report the engine's reason when there is one.
+      const streamError = meter.errored;
+      throw failure ?? (streamError instanceof UploadError ? streamError : error);
+    } finally {
+      // `end` fires once the transport has read every byte.
+      this.bodySent = meter.readableEnded;
+      meter.stop();
+      signal?.removeEventListener('abort', onAbort);
+      if (!meter.readableEnded) {
+        meter.destroy();
+      }
+    }
+  }
+
+  /** Opens a fresh stream of the file's bytes. */
+  private open(): Readable {
+    const chunkSize = this.options.chunkSize ?? 64 * 1024;
+    if (typeof this.source === 'string') {
+      return createReadStream(this.source, { highWaterMark: chunkSize });
+    }
+    if (Buffer.isBuffer(this.source)) {
+      return Readable.from(sliceBuffer(this.source, chunkSize), { objectMode: false });
+    }
+    if (this.streamConsumed) {
+      throw new UploadError(
+        `Upload source ${this.fileName} is a stream and was already read`,
+        'INVALID_SOURCE'
+      );
+    }
+    this.streamConsumed = true;
+    return this.source;
+  }
+}
+
+/**
+ * Pass-through stream that counts bytes, reports throttled progress and detects stalls. One
+ * timer per attempt is re-armed lazily, so metering costs a counter update per chunk.
+ */
+class UploadMeter extends Transform {
+  private readonly totalBytes: number;
+  private readonly attempt: number;
+  private readonly onProgress: ((progress: UploadProgress) => void) | undefined;
+  private readonly progressIntervalMs: number;
+  private readonly stallTimeoutMs: number;
+  private readonly onStall: (idleMs: number) => void;
+  private readonly startedAt = Date.now();
+  private bytesSent = 0;
+  private lastActivityAt = this.startedAt;
+  private lastReportAt = 0;
+  private stallTimer: NodeJS.Timeout | null = null;
+
+  constructor(
+    totalBytes: number,
+    attempt: number,
+    options: UploadOptions,
+    onStall: (idleMs: number) => void
+  ) {
+    super();
+    this.totalBytes = totalBytes;
+    this.attempt = attempt;
+    this.onProgress = options.onProgress;
+    this.progressIntervalMs = options.progressIntervalMs ?? 250;
+    this.stallTimeoutMs = options.stallTimeoutMs ?? 30000;
+    this.onStall = onStall;
+    this.armStallTimer(this.stallTimeoutMs);
+  }
+
+  /** Stops stall detection. */
+  public stop(): void {
+    if (this.stallTimer) {
+      clearTimeout(this.stallTimer);
+      this.stallTimer = null;
+    }
+  }
+
+  public _transform(chunk: Buffer, _encoding: BufferEncoding, callback: TransformCallback): void {
+    this.bytesSent += chunk.length;
+    const now = Date.now();
+    this.lastActivityAt = now;
+    if (this.onProgress && now - this.lastReportAt >= this.progressIntervalMs) {
+      this.lastReportAt = now;
+      this.report(now);
+    }
+    callback(null, chunk);
+  }
+
+  public _flush(callback: TransformCallback): void {
+    if (this.bytesSent !== this.totalBytes) {
+      callback(
+        new UploadError(
+          `Upload source produced ${this.bytesSent} bytes, expected ${this.totalBytes}`,
+          'INVALID_SOURCE'
+        )
+      );
+      return;
+    }
+    const now = Date.now();
+    // The wait for the printer's reply starts now; it gets a full stall timeout of its own.
+    this.lastActivityAt = now;
+    this.report(now);
+    callback();
+  }
+
+  private report(now: number): void {
+    if (!this.onProgress) return;
+    const elapsedMs = now - this.startedAt;
+    this.onProgress({
+      bytesSent: this.bytesSent,
+      totalBytes: this.totalBytes,
+      percent: this.totalBytes > 0 ? Math.min(100, (this.bytesSent / this.totalBytes) * 100) : 100,
+      bytesPerSecond: elapsedMs > 0 ? Math.round((this.bytesSent * 1000) / elapsedMs) : 0,
+      elapsedMs,
+      attempt: this.attempt,
+    });
+  }
+
+  private armStallTimer(delayMs: number): void {
+    if (this.stallTimeoutMs <= 0) return;
+    this.stallTimer = setTimeout(() => {
+      const idleMs = Date.now() - this.lastActivityAt;
+      if (idleMs >= this.stallTimeoutMs) {
+        this.stallTimer = null;
+        this.onStall(idleMs);
+        return;
+      }
+      this.armStallTimer(this.stallTimeoutMs - idleMs);
+    }, delayMs);
+  }
+}
+
+function* sliceBuffer(buffer: Buffer, chunkSize: number): Generator<Buffer> {
+  for (let offset = 0; offset < buffer.length; offset += chunkSize) {
+    yield buffer.subarray(offset, offset + chunkSize);
+  }
+}
+
+function sleep(delayMs: number, signal: AbortSignal | undefined): Promise<void> {
+  return new Promise<void>((resolve, reject) => {
+    const onAbort = () => {
+      clearTimeout(timer);
+      reject(new UploadError('Upload was aborted', 'ABORTED'));
+    };
+    const timer = setTimeout(() => {
+      signal?.removeEventListener('abort', onAbort);
+      resolve();
+    }, delayMs);
+    if (signal?.aborted) {
+      onAbort();
+      return;
+    }
+    signal?.addEventListener('abort', onAbort, { once: true });
+  });
+}
@@ -0,0 +1,138 @@
+/**
+ * @fileoverview Tests for the diagnostics channels: HTTP request timing and failure counters,
+ * unsubscribing, and TCP command and command queue events published by clients talking to the
+ * fake printer.
+ */
+import { afterEach, describe, expect, it } from 'vitest';
+import { FiveMClient } from '../FiveMClient';
+import { FlashForgeClient } from '../tcpapi/FlashForgeClient';
+import { FakePrinterServer } from '../testing/FakePrinterServer';
+import {
+  type CommandQueueEvent,
+  type CounterEvent,
+  DiagnosticsChannels,
+  type DiagnosticsEventMap,
+  type HttpRequestEvent,
+  subscribeDiagnostics,
+  type TcpCommandEvent,
+  traceHttpRequest,
+} from './Diagnostics';
+
+describe('Diagnostics', () => {
+  const unsubscribers: Array<() => void> = [];
+
+  function collect<K extends keyof DiagnosticsEventMap>(name: K): Array<DiagnosticsEventMap[K]> {
+    const events: Array<DiagnosticsEventMap[K]> = [];
+    unsubscribers.push(subscribeDiagnostics(name, (event) => events.push(event)));
+    return events;
+  }
+
+  afterEach(() => {
+    for (const unsubscribe of unsubscribers.splice(0)) unsubscribe();
+  });
+
+  describe('traceHttpRequest', () => {
+    it('publishes the status and duration of a request', async () => {
+      const events: HttpRequestEvent[] = collect(DiagnosticsChannels.HttpRequest);
+
+      const response = await traceHttpRequest('10.0.0.5', '/detail', async () => ({
+        status: 200,
+      }));
+
+      expect(response.status).toBe(200);
+      expect(events).toHaveLength(1);
+      expect(events[0]).toMatchObject({
+        host: '10.0.0.5',
+        method: 'POST',
+        endpoint: '/detail',
+        status: 200,
+        ok: true,
+      });
+      expect(events[0].durationMs).toBeGreaterThanOrEqual(0);
+    });
+
+    it('publishes failures, counts timeouts and rethrows', async () => {
+      const events: HttpRequestEvent[] = collect(DiagnosticsChannels.HttpRequest);
+      const counters: CounterEvent[] = collect(DiagnosticsChannels.Counter);
+      const timeout = Object.assign(new Error('timeout of 5000ms exceeded'), {
+        code: 'ECONNABORTED',
+      });
+
+      await expect(
+        traceHttpRequest('10.0.0.5', '/control', () => Promise.reject(timeout))
+      ).rejects.toBe(timeout);
+
+      expect(events[0]).toMatchObject({ status: null, ok: false, error: 'ECONNABORTED' });
+      expect(counters).toEqual([{ host: '10.0.0.5', counter: 'http.timeout' }]);
+    });
+
+    it('stops delivering events once unsubscribed', async () => {
+      const events: HttpRequestEvent[] = [];
+      const unsubscribe = subscribeDiagnostics(DiagnosticsChannels.HttpRequest, (event) =>
+        events.push(event)
+      );
+      unsubscribe();
+
+      await traceHttpRequest('10.0.0.5', '/detail', async () => ({ status: 200 }));
+
+      expect(events).toHaveLength(0);
+    });
+  });
+
+  describe('client instrumentation', () => {
+    let printer: FakePrinterServer;
+    let dispose: (() => Promise<void>) | null = null;
+
+    afterEach(async () => {
+      await dispose?.();
+      dispose = null;
+      await printer.stop();
+    });
+
+    it('times TCP commands from queueing to the end of the reply', async () => {
+      printer = new FakePrinterServer({ tcpChunkSize: 16, tcpChunkDelayMs: 1 });
+      await printer.start();
+      const tcp = new FlashForgeClient(printer.host, { port: printer.tcpPort });
+      dispose = () => tcp.dispose();
+      const events: TcpCommandEvent[] = collect(DiagnosticsChannels.TcpCommand);
+
+      await tcp.sendCommandAsync('~M115');
+
+      const event = events.find((candidate) => candidate.command === 'M115');
+      expect(event).toMatchObject({ host: printer.host, port: printer.tcpPort, ok: true });
+      expect(event?.firstByteMs).not.toBeNull();
+      expect(event?.totalMs).toBeGreaterThanOrEqual(
+        (event?.queueWaitMs ?? 0) + (event?.writeMs ?? 0) + (event?.firstByteMs ?? 0)
+      );
+      expect(tcp.getTransportMetrics()).toEqual({
+        timeouts: 0,
+        reconnects: 0,
+        keepAliveFailures: 0,
+      });
+    });
+
+    it('publishes HTTP requests and command queue depth of a FiveMClient', async () => {
+      printer = new FakePrinterServer();
+      await printer.start();
+      const client = new FiveMClient(printer.host, printer.serialNumber, printer.checkCode, {
+        httpPort: printer.httpPort,
+        tcpPort: printer.tcpPort,
+      });
+      dispose = () => client.dispose();
+      const requests: HttpRequestEvent[] = collect(DiagnosticsChannels.HttpRequest);
+      const depths: CommandQueueEvent[] = collect(DiagnosticsChannels.CommandQueue);
+
+      await Promise.all([
+        client.runCommandExclusive(() => client.info.getDetailResponse()),
+        client.runCommandExclusive(async () => undefined),
+      ]);
+      await new Promise((resolve) => setImmediate(resolve));
+
+      expect(requests).toEqual([
+        expect.objectContaining({ endpoint: '/detail', status: 200, ok: true }),
+      ]);
+      expect(depths.map((event) => event.depth)).toEqual([1, 2, 1, 0]);
+      expect(client.commandQueueDepth).toBe(0);
+    });
+  });
+});
@@ -0,0 +1,176 @@
+/**
+ * @fileoverview Timing and counter events for the HTTP and TCP transports, published on
+ * `node:diagnostics_channel` channels. Publishers check for subscribers before building an event,
+ * so the instrumentation costs a property read per request while nobody listens.
+ *
+ * Key exports:
+ * - DiagnosticsChannels: channel names, for `diagnostics_channel.subscribe()`
+ * - subscribeDiagnostics(): typed subscription that returns an unsubscribe function
+ * - TcpCommandEvent, HttpRequestEvent, CounterEvent, CommandQueueEvent: event payloads
+ */
+import * as diagnosticsChannel from 'node:diagnostics_channel';
+import { performance } from 'node:perf_hooks';
+
+/** Names of the channels the library publishes on. */
+export const DiagnosticsChannels = {
+  /** One {@link TcpCommandEvent} per command sent on the TCP command socket. */
+  TcpCommand: 'ff-api:tcp:command',
+  /** One {@link HttpRequestEvent} per HTTP API request. */
+  HttpRequest: 'ff-api:http:request',
+  /** One {@link CounterEvent} per timeout, reconnect or keep-alive failure. */
+  Counter: 'ff-api:counter',
+  /** A {@link CommandQueueEvent} whenever the HTTP command queue grows or shrinks. */
+  CommandQueue: 'ff-api:http:command-queue',
+} as const;
+
+/** Timing of one TCP command, from the moment it was queued. All durations are milliseconds. */
+export interface TcpCommandEvent {
+  host: string;
+  port: number;
+  /** Command code without arguments, e.g. `M115`. */
+  command: string;
+  /** Time spent waiting for the socket behind earlier commands. */
+  queueWaitMs: number;
+  /** Time from dispatch until the command was flushed to the socket (includes reconnecting). */
+  writeMs: number;
+  /** Time from the write to the first reply byte, or null when no byte arrived. */
+  firstByteMs: number | null;
+  /** Time from queueing to the end of the reply. */
+  totalMs: number;
+  /** False when the command failed, timed out, was cancelled or got no valid reply. */
+  ok: boolean;
+  /** Failure reason when `ok` is false (an error code or message). */
+  error?: string;
+}
+
+/** Timing of one HTTP API request. */
+export interface HttpRequestEvent {
+  host: string;
+  method: string;
+  /** Endpoint path, e.g. `/detail`. */
+  endpoint: string;
+  /** HTTP status, or null when no response arrived. */
+  status: number | null;
+  /** Time from sending the request to its response or failure, in milliseconds. */
+  durationMs: number;
+  /** False when the request threw (network error, timeout or non-2xx status). */
+  ok: boolean;
+  /** Failure reason when `ok` is false (an error code or message). */
+  error?: string;
+}
+
+/** Counters published on {@link DiagnosticsChannels.Counter}. */
+export type DiagnosticsCounter =
+  | 'tcp.timeout'
+  | 'tcp.reconnect'
+  | 'tcp.keepAliveFailure'
+  | 'http.timeout';
+
+/** One increment of a counter. */
+export interface CounterEvent {
+  host: string;
+  counter: DiagnosticsCounter;
+}
+
+/** Depth of a client's HTTP command queue (`runCommandExclusive`) after it changed. */
+export interface CommandQueueEvent {
+  host: string;
+  /** Commands queued or in flight. */
+  depth: number;
+}
+
+/** Event payload of each channel. */
+export interface DiagnosticsEventMap {
+  'ff-api:tcp:command': TcpCommandEvent;
+  'ff-api:http:request': HttpRequestEvent;
+  'ff-api:counter': CounterEvent;
+  'ff-api:http:command-queue': CommandQueueEvent;
+}
+
+// Channel objects the transports publish on; not exported from the package index.
+export const tcpCommandChannel = diagnosticsChannel.channel(DiagnosticsChannels.TcpCommand);
+export const httpRequestChannel = diagnosticsChannel.channel(DiagnosticsChannels.HttpRequest);
+export const counterChannel = diagnosticsChannel.channel(DiagnosticsChannels.Counter);
+export const commandQueueChannel = diagnosticsChannel.channel(DiagnosticsChannels.CommandQueue);
+
+/**
+ * Subscribes to a diagnostics channel with a typed listener.
+ * @param name Channel name from {@link DiagnosticsChannels}.
+ * @param listener Called synchronously with each event; keep it cheap.
+ * @returns A function that unsubscribes the listener.
+ */
+export function subscribeDiagnostics<K extends keyof DiagnosticsEventMap>(
+  name: K,
+  listener: (event: DiagnosticsEventMap[K]) => void
+): () => void {
+  const onMessage = (message: unknown) => listener(message as DiagnosticsEventMap[K]);
+  diagnosticsChannel.subscribe(name, onMessage);
+  return () => {
+    diagnosticsChannel.unsubscribe(name, onMessage);
+  };
+}
+
+/**
+ * Publishes a counter increment when anyone listens.
+ * @param host Printer address.
+ * @param counter The counter to increment.
+ */
+export function incrementCounter(host: string, counter: DiagnosticsCounter): void {
+  if (counterChannel.hasSubscribers) {
+    const event: CounterEvent = { host, counter };
+    counterChannel.publish(event);
+  }
+}
+
+/**
+ * Runs an HTTP request and publishes its timing. Without subscribers the request runs untouched.
+ * @param host Printer address.
+ * @param endpoint Endpoint path.
+ * @param request Sends the request; resolves to a response with a `status`.
+ * @param method HTTP method (default: `POST`, which every printer endpoint uses).
+ */
+export async function traceHttpRequest<T extends { status: number }>(
+  host: string,
+  endpoint: string,
+  request: () => Promise<T>,
+  method = 'POST'
+): Promise<T> {
+  if (!httpRequestChannel.hasSubscribers && !counterChannel.hasSubscribers) {
+    return request();
+  }
+
+  const started = performance.now();
+  try {
+    const response = await request();
+    if (httpRequestChannel.hasSubscribers) {
+      const event: HttpRequestEvent = {
+        host,
+        method,
+        endpoint,
+        status: response.status,
+        durationMs: performance.now() - started,
+        ok: true,
+      };
+      httpRequestChannel.publish(event);
+    }
+    return response;
+  } catch (error) {
+    const err = error as { code?: string; message?: string; response?: { status?: number } };
+    if (err.code === 'ECONNABORTED' || err.code === 'ETIMEDOUT') {
+      incrementCounter(host, 'http.timeout');
+    }
+    if (httpRequestChannel.hasSubscribers) {
+      const event: HttpRequestEvent = {
+        host,
+        method,
+        endpoint,
+        status: err.response?.status ?? null,
+        durationMs: performance.now() - started,
+        ok: false,
+        error: err.code ?? err.message ?? String(error),
+      };
+      httpRequestChannel.publish(event);
+    }
+    throw error;
+  }
+}
@@ -0,0 +1,86 @@
+/**
+ * @fileoverview Tests for the library logger: silent default, installing and removing a logger,
+ * and level filtering in the console logger.
+ */
+import { afterEach, describe, expect, it, vi } from 'vitest';
+import {
+  createConsoleLogger,
+  getLogger,
+  type Logger,
+  log,
+  setLogger,
+  silentLogger,
+} from './Logger';
+
+function recordingLogger(): Logger & { calls: Array<[string, string, unknown[]]> } {
+  const calls: Array<[string, string, unknown[]]> = [];
+  const record =
+    (level: string) =>
+    (message: string, ...details: unknown[]) =>
+      calls.push([level, message, details]);
+  return {
+    calls,
+    debug: record('debug'),
+    info: record('info'),
+    warn: record('warn'),
+    error: record('error'),
+  };
+}
+
+describe('Logger', () => {
+  afterEach(() => {
+    setLogger(null);
+    vi.restoreAllMocks();
+  });
+
+  it('logs nothing until a logger is installed', () => {
+    const spy = vi.spyOn(console, 'log');
+    const warn = vi.spyOn(console, 'warn');
+
+    log.warn('dropped');
+
+    expect(getLogger()).toBe(silentLogger);
+    expect(spy).not.toHaveBeenCalled();
+    expect(warn).not.toHaveBeenCalled();
+  });
+
+  it('forwards messages and details to the installed logger', () => {
+    const logger = recordingLogger();
+    setLogger(logger);
+
+    const error = new Error('boom');
+    log.error('Upload failed', error);
+    log.debug('sendCommand: ~M115');
+
+    expect(logger.calls).toEqual([
+      ['error', 'Upload failed', [error]],
+      ['debug', 'sendCommand: ~M115', []],
+    ]);
+  });
+
+  it('goes back to the silent logger when null is installed', () => {
+    const logger = recordingLogger();
+    setLogger(logger);
+    setLogger(null);
+
+    log.info('dropped');
+
+    expect(getLogger()).toBe(silentLogger);
+    expect(logger.calls).toHaveLength(0);
+  });
+
+  it('drops console messages below the configured level', () => {
+    const debug = vi.spyOn(console, 'debug').mockImplementation(() => undefined);
+    const info = vi.spyOn(console, 'info').mockImplementation(() => undefined);
+    const warn = vi.spyOn(console, 'warn').mockImplementation(() => undefined);
+    setLogger(createConsoleLogger('warn'));
+
+    log.debug('debug');
+    log.info('info');
+    log.warn('warn', 42);
+
+    expect(debug).not.toHaveBeenCalled();
+    expect(info).not.toHaveBeenCalled();
+    expect(warn).toHaveBeenCalledWith('warn', 42);
+  });
+});
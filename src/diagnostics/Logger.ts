@@ -0,0 +1,71 @@
+/**
+ * @fileoverview Leveled logging for the library. Every client, parser and controller logs through
+ * the logger installed with {@link setLogger}; until one is installed, nothing is written.
+ *
+ * Key exports:
+ * - Logger: the interface a logger implements (compatible with `console`, pino, winston, ...)
+ * - setLogger() / getLogger(): install or read the active logger
+ * - createConsoleLogger(): a `console` logger that drops messages below a level
+ */
+
+/** Log levels from most to least verbose. `silent` drops everything. */
+export type LogLevel = 'debug' | 'info' | 'warn' | 'error' | 'silent';
+
+/** A leveled logger. Messages come first; further arguments carry details such as errors. */
+export interface Logger {
+  debug(message: string, ...details: unknown[]): void;
+  info(message: string, ...details: unknown[]): void;
+  warn(message: string, ...details: unknown[]): void;
+  error(message: string, ...details: unknown[]): void;
+}
+
+const LEVEL_ORDER: Record<LogLevel, number> = { debug: 0, info: 1, warn: 2, error: 3, silent: 4 };
+
+const noop = (): void => undefined;
+
+/** A logger that discards every message. Installed by default. */
+export const silentLogger: Logger = { debug: noop, info: noop, warn: noop, error: noop };
+
+let activeLogger: Logger = silentLogger;
+
+/**
+ * Installs the logger used by the whole library.
+ * @param logger The logger, or null to go back to logging nothing.
+ */
+export function setLogger(logger: Logger | null): void {
+  activeLogger = logger ?? silentLogger;
+}
+
+/**
+ * Gets the installed logger.
+ */
+export function getLogger(): Logger {
+  return activeLogger;
+}
+
+/**
+ * Creates a logger that writes to `console` and drops messages below `level`. Install it with
+ * `setLogger(createConsoleLogger('debug'))` to get the library's previous console output back.
+ * @param level Least severe level that is written (default: `info`).
+ */
+export function createConsoleLogger(level: LogLevel = 'info'): Logger {
+  const threshold = LEVEL_ORDER[level];
+  const enabled = (messageLevel: LogLevel) => LEVEL_ORDER[messageLevel] >= threshold;
+  return {
+    debug: enabled('debug') ? (message, ...details) => console.debug(message, ...details) : noop,
+    info: enabled('info') ? (message, ...details) => console.info(message, ...details) : noop,
+    warn: enabled('warn') ? (message, ...details) => console.warn(message, ...details) : noop,
+    error: enabled('error') ? (message, ...details) => console.error(message, ...details) : noop,
+  };
+}
+
+/**
+ * The logger library code writes to. Forwards to the installed logger at call time, so modules can
+ * hold on to it while callers swap loggers.
+ */
+export const log: Logger = {
+  debug: (message, ...details) => activeLogger.debug(message, ...details),
+  info: (message, ...details) => activeLogger.info(message, ...details),
+  warn: (message, ...details) => activeLogger.warn(message, ...details),
+  error: (message, ...details) => activeLogger.error(message, ...details),
+};
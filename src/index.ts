@@ -12,18 +12,41 @@ export { TempControl } from './api/controls/TempControl';
 export {
   AD5X_MATERIALS,
   AD5X_PALETTE,
+  clearAD5XPaletteMemo,
+  snapRgbToAD5XPalette,
   snapToAD5XPalette,
   type AD5XPaletteColor,
 } from './api/controls/ad5xPalette';
 export {
   CREATOR5_PALETTE,
+  clearCreator5PaletteMemo,
+  snapRgbToCreator5Palette,
   snapToCreator5Palette,
   type Creator5PaletteColor,
 } from './api/controls/creator5Palette';
-export type { PaletteColor } from './api/controls/paletteSnap';
+export {
+  buildPaletteTable,
+  DEFAULT_PALETTE_MEMO_LIMIT,
+  snapRgbToPalette,
+  type PaletteColor,
+  type PaletteTable,
+} from './api/controls/paletteSnap';
+
+// File Cache
+export { LruByteCache } from './api/cache/LruByteCache';
+export {
+  type FileListEntryVersion,
+  PrinterFileCache,
+  type PrinterFileCacheOptions,
+  type PrinterFileCacheStats,
+} from './api/cache/PrinterFileCache';
 // Filament
 export { Filament } from './api/filament/Filament';
 // Misc
+export {
+  ConcurrencyLimiter,
+  type ConcurrencyLimiterOptions,
+} from './api/misc/ConcurrencyLimiter';
 export { formatScientificNotation } from './api/misc/ScientificNotationFloatConverter';
 // Network Utilities
 export { FNetCode } from './api/network/FNetCode';
@@ -31,6 +54,18 @@ export { NetworkUtils } from './api/network/NetworkUtils';
 
 // Printer Discovery
 export { PrinterDiscovery } from './api/PrinterDiscovery';
+export { DiscoveryCache } from './api/network/DiscoveryCache';
+// Status Watcher
+export {
+  type ProgressEvent,
+  type SlotChangeEvent,
+  type StateChangeEvent,
+  StatusWatcher,
+  type StatusWatcherEvents,
+  type StatusWatcherOptions,
+  type TemperatureChangeEvent,
+  type TemperatureSensor,
+} from './api/StatusWatcher';
 export {
     PrinterModel,
     DiscoveryProtocol,
@@ -42,12 +77,52 @@ export {
 // Server constants
 export { Commands } from './api/server/Commands';
 export { Endpoints } from './api/server/Endpoints';
+// Uploads
+export {
+  isTransientUploadError,
+  UploadEngine,
+  UploadError,
+  type UploadErrorCode,
+  type UploadInput,
+  type UploadOptions,
+  type UploadProgress,
+  type UploadSource,
+} from './api/upload/UploadEngine';
+// Diagnostics
+export {
+  type CommandQueueEvent,
+  type CounterEvent,
+  DiagnosticsChannels,
+  type DiagnosticsCounter,
+  type DiagnosticsEventMap,
+  type HttpRequestEvent,
+  subscribeDiagnostics,
+  type TcpCommandEvent,
+} from './diagnostics/Diagnostics';
+export {
+  createConsoleLogger,
+  getLogger,
+  type Logger,
+  type LogLevel,
+  setLogger,
+  silentLogger,
+} from './diagnostics/Logger';
 export {
   FiveMClient,
   type FiveMClientConnectionOptions,
   Product,
   type ProductCapabilities,
 } from './FiveMClient';
+export {
+  type FleetFanOutOptions,
+  type FleetPrinter,
+  type FleetPrinterConfig,
+  type FleetPrinterState,
+  type FleetResult,
+  PrinterFleet,
+  PrinterFleetError,
+  type PrinterFleetOptions,
+} from './PrinterFleet';
 // Models
 export {
   AD5XLocalJobParams,
@@ -72,7 +147,20 @@ export { GCodes } from './tcpapi/client/GCodes';
 export { A3GCodeController } from './tcpapi/client/A3GCodeController';
 // TCP API
 export { FlashForgeClient } from './tcpapi/FlashForgeClient';
-export { FlashForgeTcpClient, type FlashForgeTcpClientOptions } from './tcpapi/FlashForgeTcpClient';
+export {
+  FlashForgeTcpClient,
+  type FlashForgeTcpClientOptions,
+  type TcpCommandOptions,
+  type TcpTransportMetrics,
+} from './tcpapi/FlashForgeTcpClient';
+export {
+  CommandPriority,
+  CommandScheduleError,
+  CommandScheduler,
+  type CommandScheduleOptions,
+  type CommandSchedulerMetrics,
+} from './tcpapi/CommandScheduler';
+export { OK_MARKER, ResponseFrameDecoder } from './tcpapi/ResponseFrameDecoder';
 export {
   FlashForgeA4Client,
   type A4BuildVolume,
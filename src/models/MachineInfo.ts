@@ -1,6 +1,7 @@
 /**
  * @fileoverview Transforms raw printer detail data from the API into structured machine info.
  */
+import { log } from '../diagnostics/Logger';
 import { type FFMachineInfo, type FFPrinterDetail, MachineState } from './ff-models';
 
 // Firmware-reported PIDs from FlashForge's /detail endpoint. These are stable
@@ -250,8 +251,8 @@ export class MachineInfo {
         FormattedTotalRunTime: formattedTotalRunTime,
       };
     } catch (error: unknown) {
-      console.error('Error in MachineInfo.fromDetail:', (error as Error).message);
-      console.error('Detail object causing error:', JSON.stringify(detail, null, 2)); // Log detail on error
+      log.error('Error in MachineInfo.fromDetail:', (error as Error).message);
+      log.error('Detail object causing error:', detail);
       return null;
     }
   }
@@ -271,7 +272,7 @@ export class MachineInfo {
       const minutes = Math.floor((validSeconds % 3600) / 60);
       return `${hours.toString().padStart(2, '0')}:${minutes.toString().padStart(2, '0')}`;
     } catch (error) {
-      console.error('Error formatting time:', error);
+      log.error('Error formatting time:', error);
       return '00:00';
     }
   }
@@ -330,7 +331,7 @@ export class MachineInfo {
         return MachineState.Busy;
       default:
         if (validStatus) {
-          console.warn(`Unknown machine status received: '${status}'`);
+          log.warn(`Unknown machine status received: '${status}'`);
         }
         return MachineState.Unknown;
     }
@@ -85,6 +85,11 @@ export interface DiscoveredPrinter {
     statusCode?: number;
     /** Decoded printer status */
     status?: PrinterStatus;
+    /**
+     * True when the entry was read from the discovery cache and the printer has not answered
+     * in the current scan (see {@link DiscoveryOptions.cacheFile})
+     */
+    fromCache?: boolean;
 }
 
 /**
@@ -105,4 +110,17 @@ export interface DiscoveryOptions {
     useBroadcast?: boolean;
     /** Specific ports to use for discovery (default: [8899, 19000, 48899]) */
     ports?: number[];
+    /**
+     * Serial numbers of the printers the caller expects to find. A scan ends as soon as all of
+     * them have answered, instead of waiting out the idle timeout (default: none). Only modern
+     * printers report a serial number.
+     */
+    expectedSerialNumbers?: string[];
+    /**
+     * JSON file holding the last known printers (default: none). Cached printers are probed by
+     * unicast, which reaches them even where broadcast and multicast do not, and
+     * `PrinterDiscovery.stream()` yields them immediately, marked `fromCache`. Printers that
+     * answer are written back when a scan completes.
+     */
+    cacheFile?: string;
 }
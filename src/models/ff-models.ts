@@ -1,6 +1,8 @@
 /**
  * @fileoverview TypeScript interfaces and enums for FlashForge printer data models and API responses.
  */
+import type { UploadSource } from '../api/upload/UploadEngine';
+
 /**
  * Represents the raw detailed information about a FlashForge 3D printer as obtained from its API.
  * Properties are often in the printer's native naming format (e.g., camelCase or with underscores)
@@ -530,8 +532,8 @@ export interface Creator5JobParams {
  * (see {@link Creator5JobParams}). There is no `firstLayerInspection` field on the C5.
  */
 export interface Creator5UploadParams {
-  /** Local file path to upload (.gcode or .3mf). */
-  filePath: string;
+  /** Local file path to upload (.gcode or .3mf), or an in-memory or streamed source. */
+  filePath: string | UploadSource;
   /** Whether to start printing immediately after upload (`printNow`). For a
    * multi-tool job, upload with this false and then call `startCreator5Job` with
    * the material mappings. */
@@ -554,8 +556,8 @@ export interface Creator5UploadParams {
  * flow calibration, and first layer inspection.
  */
 export interface AD5XUploadParams {
-  /** Local file path to upload */
-  filePath: string;
+  /** Local file path to upload, or an in-memory or streamed source */
+  filePath: string | UploadSource;
   /** Whether to start printing immediately after upload */
   startPrint: boolean;
   /** Whether to perform bed leveling before printing */
@@ -0,0 +1,204 @@
+/**
+ * @fileoverview Tests for CommandScheduler ordering, priorities, deadlines, cancellation, and metrics.
+ */
+import { describe, expect, it } from 'vitest';
+import { CommandPriority, CommandScheduleError, CommandScheduler } from './CommandScheduler';
+
+/** Creates a promise that the test resolves manually. */
+const deferred = <T>() => {
+  let resolve!: (value: T) => void;
+  const promise = new Promise<T>((res) => {
+    resolve = res;
+  });
+  return { promise, resolve };
+};
+
+describe('CommandScheduler', () => {
+  it('runs jobs one at a time in submission order', async () => {
+    const scheduler = new CommandScheduler();
+    const order: string[] = [];
+    let running = 0;
+    let maxRunning = 0;
+
+    const job = (name: string) => async () => {
+      running++;
+      maxRunning = Math.max(maxRunning, running);
+      await new Promise((resolve) => setTimeout(resolve, 5));
+      order.push(name);
+      running--;
+      return name;
+    };
+
+    const results = await Promise.all([
+      scheduler.schedule(job('a')),
+      scheduler.schedule(job('b')),
+      scheduler.schedule(job('c')),
+    ]);
+
+    expect(results).toEqual(['a', 'b', 'c']);
+    expect(order).toEqual(['a', 'b', 'c']);
+    expect(maxRunning).toBe(1);
+  });
+
+  it('lets higher-priority jobs overtake queued lower-priority ones', async () => {
+    const scheduler = new CommandScheduler();
+    const gate = deferred<void>();
+    const order: string[] = [];
+
+    const first = scheduler.schedule(async () => {
+      await gate.promise;
+      order.push('first');
+    });
+    const telemetry = scheduler.schedule(
+      async () => {
+        order.push('telemetry');
+      },
+      { priority: CommandPriority.Telemetry }
+    );
+    const idle = scheduler.schedule(
+      async () => {
+        order.push('idle');
+      },
+      { priority: CommandPriority.Idle }
+    );
+    const stop = scheduler.schedule(
+      async () => {
+        order.push('stop');
+      },
+      { priority: CommandPriority.Control }
+    );
+    const estop = scheduler.schedule(
+      async () => {
+        order.push('estop');
+      },
+      { priority: CommandPriority.Emergency }
+    );
+
+    gate.resolve();
+    await Promise.all([first, telemetry, idle, stop, estop]);
+
+    expect(order).toEqual(['first', 'estop', 'stop', 'telemetry', 'idle']);
+  });
+
+  it('keeps running later jobs after a job rejects', async () => {
+    const scheduler = new CommandScheduler();
+
+    const failing = scheduler.schedule(async () => {
+      throw new Error('boom');
+    });
+    const next = scheduler.schedule(async () => 'ok');
+
+    await expect(failing).rejects.toThrow('boom');
+    await expect(next).resolves.toBe('ok');
+    expect(scheduler.getMetrics()).toMatchObject({ completed: 1, failed: 1 });
+  });
+
+  it('removes a queued job when its signal aborts', async () => {
+    const scheduler = new CommandScheduler();
+    const gate = deferred<void>();
+    const controller = new AbortController();
+    let ran = false;
+
+    const first = scheduler.schedule(() => gate.promise);
+    const cancelled = scheduler.schedule(
+      async () => {
+        ran = true;
+      },
+      { signal: controller.signal }
+    );
+
+    controller.abort();
+    await expect(cancelled).rejects.toHaveProperty('code', 'ABORTED');
+    expect(scheduler.getQueueDepth()).toBe(0);
+
+    gate.resolve();
+    await first;
+    expect(ran).toBe(false);
+    expect(scheduler.getMetrics().cancelled).toBe(1);
+  });
+
+  it('rejects a job that waits longer than its queue timeout', async () => {
+    const scheduler = new CommandScheduler();
+    const gate = deferred<void>();
+
+    const first = scheduler.schedule(() => gate.promise);
+    const waiting = scheduler.schedule(async () => 'late', { queueTimeoutMs: 10 });
+
+    await expect(waiting).rejects.toBeInstanceOf(CommandScheduleError);
+    await expect(waiting).rejects.toHaveProperty('code', 'QUEUE_TIMEOUT');
+
+    gate.resolve();
+    await first;
+    expect(scheduler.getMetrics().timedOut).toBe(1);
+  });
+
+  it('aborts the running job when its deadline passes and holds the slot until it returns', async () => {
+    const scheduler = new CommandScheduler();
+    const gate = deferred<void>();
+    let sawAbort = false;
+    let secondStarted = false;
+
+    const slow = scheduler.schedule(
+      async (signal) => {
+        await new Promise<void>((resolve) => {
+          signal.addEventListener('abort', () => {
+            sawAbort = true;
+            resolve();
+          });
+        });
+        await gate.promise;
+      },
+      { deadlineMs: 10 }
+    );
+    const second = scheduler.schedule(async () => {
+      secondStarted = true;
+    });
+
+    await expect(slow).rejects.toHaveProperty('code', 'DEADLINE_EXCEEDED');
+    expect(sawAbort).toBe(true);
+    expect(secondStarted).toBe(false);
+
+    gate.resolve();
+    await second;
+    expect(secondStarted).toBe(true);
+  });
+
+  it('clears queued jobs without touching the running one', async () => {
+    const scheduler = new CommandScheduler();
+    const gate = deferred<string>();
+
+    const running = scheduler.schedule(() => gate.promise);
+    const queued = scheduler.schedule(async () => 'never');
+
+    scheduler.clear('disposed');
+    await expect(queued).rejects.toThrow('disposed');
+    await expect(queued).rejects.toHaveProperty('code', 'CLEARED');
+
+    gate.resolve('done');
+    await expect(running).resolves.toBe('done');
+    expect(scheduler.isBusy()).toBe(false);
+  });
+
+  it('reports queue depth and wait times', async () => {
+    const scheduler = new CommandScheduler();
+    const gate = deferred<void>();
+
+    const first = scheduler.schedule(() => gate.promise);
+    const second = scheduler.schedule(async () => undefined);
+    const third = scheduler.schedule(async () => undefined);
+
+    expect(scheduler.getMetrics()).toMatchObject({ queueDepth: 2, inFlight: true });
+
+    await new Promise((resolve) => setTimeout(resolve, 15));
+    gate.resolve();
+    await Promise.all([first, second, third]);
+
+    const metrics = scheduler.getMetrics();
+    expect(metrics.queueDepth).toBe(0);
+    expect(metrics.maxQueueDepth).toBe(2);
+    expect(metrics.inFlight).toBe(false);
+    expect(metrics.completed).toBe(3);
+    expect(metrics.maxWaitMs).toBeGreaterThanOrEqual(10);
+    expect(metrics.averageWaitMs).toBeGreaterThan(0);
+  });
+});
@@ -0,0 +1,338 @@
+/**
+ * @fileoverview Priority-aware FIFO scheduler that serializes work on a shared TCP command socket,
+ * with per-command deadlines, AbortSignal cancellation, and queue depth/wait-time metrics.
+ */
+
+/**
+ * Dispatch priority of a scheduled command. Higher values run first; commands with the
+ * same priority run in submission order.
+ */
+export enum CommandPriority {
+  /** Background work that only runs when nothing else is queued (keep-alive). */
+  Idle = 0,
+  /** Status polling such as M105, M27, M114, M115 and M119. */
+  Telemetry = 1,
+  /** Regular commands. */
+  Normal = 2,
+  /** Job control that must not wait behind telemetry (pause, resume, stop). */
+  Control = 3,
+  /** Emergency stop (M112). */
+  Emergency = 4,
+}
+
+/**
+ * Per-command scheduling options.
+ */
+export interface CommandScheduleOptions {
+  /** Dispatch priority (defaults to {@link CommandPriority.Normal}). */
+  priority?: CommandPriority;
+  /**
+   * Maximum time in milliseconds the command may wait in the queue before it is rejected.
+   * Does not apply once the command has started.
+   */
+  queueTimeoutMs?: number;
+  /**
+   * Deadline in milliseconds, measured from submission, covering both queue wait and execution.
+   * When it passes, the command is rejected and the signal handed to the job is aborted.
+   */
+  deadlineMs?: number;
+  /** Cancels the command while it is queued, or aborts the signal handed to the job once running. */
+  signal?: AbortSignal;
+}
+
+/**
+ * Snapshot of scheduler counters.
+ */
+export interface CommandSchedulerMetrics {
+  /** Commands currently waiting in the queue. */
+  queueDepth: number;
+  /** Highest queue depth seen since creation. */
+  maxQueueDepth: number;
+  /** True while a command is running. */
+  inFlight: boolean;
+  /** Commands that ran and resolved. */
+  completed: number;
+  /** Commands that ran and rejected. */
+  failed: number;
+  /** Commands cancelled through their AbortSignal or by {@link CommandScheduler.clear}. */
+  cancelled: number;
+  /** Commands rejected by a queue timeout or deadline. */
+  timedOut: number;
+  /** Wait time in the queue of the most recently dispatched command, in milliseconds. */
+  lastWaitMs: number;
+  /** Longest queue wait seen, in milliseconds. */
+  maxWaitMs: number;
+  /** Average queue wait of all dispatched commands, in milliseconds. */
+  averageWaitMs: number;
+}
+
+/**
+ * Error raised when a scheduled command does not run to completion because it was cancelled,
+ * timed out in the queue, missed its deadline, or the queue was cleared.
+ */
+export class CommandScheduleError extends Error {
+  /** Machine-readable reason: `ABORTED`, `QUEUE_TIMEOUT`, `DEADLINE_EXCEEDED` or `CLEARED`. */
+  public readonly code: string;
+
+  /**
+   * Creates a new CommandScheduleError.
+   * @param message Human-readable error description
+   * @param code Machine-readable error code identifier
+   */
+  constructor(message: string, code: string) {
+    super(message);
+    this.name = 'CommandScheduleError';
+    this.code = code;
+  }
+}
+
+/** Internal bookkeeping for one scheduled command. */
+interface QueueEntry {
+  job: (signal: AbortSignal) => Promise<unknown>;
+  priority: CommandPriority;
+  enqueuedAt: number;
+  controller: AbortController;
+  settled: boolean;
+  resolve: (value: unknown) => void;
+  reject: (reason: unknown) => void;
+  release: () => void;
+}
+
+/**
+ * Runs asynchronous jobs one at a time on a shared resource.
+ *
+ * Waiters are plain promises: a job starts the moment the previous one settles, with no polling.
+ * Higher-priority jobs overtake lower-priority ones that have not started yet, and jobs of equal
+ * priority keep their submission order. A running job is never preempted; cancelling or timing
+ * it out rejects the caller immediately and aborts the job's signal, but the next job only starts
+ * once the running one has actually returned, so the socket is never shared.
+ */
+export class CommandScheduler {
+  /** Waiting jobs, ordered by priority (highest first) and then by submission time. */
+  private readonly queue: QueueEntry[] = [];
+  /** The job currently running, if any. */
+  private active: QueueEntry | null = null;
+  /** Time at which the last job finished (or the scheduler was created). */
+  private lastActivityAt = Date.now();
+
+  private maxQueueDepth = 0;
+  private completed = 0;
+  private failed = 0;
+  private cancelled = 0;
+  private timedOut = 0;
+  private dispatched = 0;
+  private totalWaitMs = 0;
+  private lastWaitMs = 0;
+  private maxWaitMs = 0;
+
+  /**
+   * Queues a job and resolves or rejects with its result.
+   * @param job Function that performs the work. It receives an AbortSignal that fires when the
+   *            caller cancels or the deadline passes while it runs.
+   * @param options Priority, queue timeout, deadline and cancellation signal.
+   * @returns A Promise that settles with the job's result, or rejects with a
+   *          {@link CommandScheduleError} when the job is cancelled or times out.
+   */
+  public schedule<T>(
+    job: (signal: AbortSignal) => Promise<T>,
+    options: CommandScheduleOptions = {}
+  ): Promise<T> {
+    const { signal } = options;
+    if (signal?.aborted) {
+      this.cancelled++;
+      return Promise.reject(new CommandScheduleError('Command was aborted', 'ABORTED'));
+    }
+
+    return new Promise<T>((resolve, reject) => {
+      let queueTimer: NodeJS.Timeout | null = null;
+      let deadlineTimer: NodeJS.Timeout | null = null;
+
+      const entry: QueueEntry = {
+        job,
+        priority: options.priority ?? CommandPriority.Normal,
+        enqueuedAt: Date.now(),
+        controller: new AbortController(),
+        settled: false,
+        resolve: resolve as (value: unknown) => void,
+        reject,
+        release: () => {
+          if (queueTimer) clearTimeout(queueTimer);
+          if (deadlineTimer) clearTimeout(deadlineTimer);
+          queueTimer = null;
+          deadlineTimer = null;
+          signal?.removeEventListener('abort', onAbort);
+        },
+      };
+
+      const onAbort = () => {
+        this.cancelled++;
+        this.fail(entry, new CommandScheduleError('Command was aborted', 'ABORTED'));
+      };
+
+      if (options.queueTimeoutMs !== undefined) {
+        const queueTimeoutMs = options.queueTimeoutMs;
+        queueTimer = setTimeout(() => {
+          queueTimer = null;
+          if (this.active === entry) return;
+          this.timedOut++;
+          this.fail(
+            entry,
+            new CommandScheduleError(
+              `Command waited in queue for more than ${queueTimeoutMs}ms`,
+              'QUEUE_TIMEOUT'
+            )
+          );
+        }, queueTimeoutMs);
+      }
+
+      if (options.deadlineMs !== undefined) {
+        const deadlineMs = options.deadlineMs;
+        deadlineTimer = setTimeout(() => {
+          deadlineTimer = null;
+          this.timedOut++;
+          this.fail(
+            entry,
+            new CommandScheduleError(
+              `Command missed its ${deadlineMs}ms deadline`,
+              'DEADLINE_EXCEEDED'
+            )
+          );
+        }, deadlineMs);
+      }
+
+      signal?.addEventListener('abort', onAbort);
+
+      this.enqueue(entry);
+      this.dispatch();
+    });
+  }
+
+  /**
+   * Rejects every job that has not started yet. The running job, if any, is left to finish.
+   * @param reason Message used for the rejection.
+   */
+  public clear(reason: string = 'Command queue was cleared'): void {
+    const pending = this.queue.splice(0, this.queue.length);
+    for (const entry of pending) {
+      this.cancelled++;
+      this.settle(entry, false, new CommandScheduleError(reason, 'CLEARED'));
+    }
+  }
+
+  /**
+   * Checks whether a job is running or waiting.
+   * @returns True if at least one job is running or queued.
+   */
+  public isBusy(): boolean {
+    return this.active !== null || this.queue.length > 0;
+  }
+
+  /**
+   * Gets the number of jobs waiting to start.
+   */
+  public getQueueDepth(): number {
+    return this.queue.length;
+  }
+
+  /**
+   * Gets the time at which the scheduler last finished a job.
+   * @returns Epoch milliseconds, or the creation time if no job has run yet.
+   */
+  public getLastActivityAt(): number {
+    return this.lastActivityAt;
+  }
+
+  /**
+   * Returns a snapshot of the scheduler counters.
+   */
+  public getMetrics(): CommandSchedulerMetrics {
+    return {
+      queueDepth: this.queue.length,
+      maxQueueDepth: this.maxQueueDepth,
+      inFlight: this.active !== null,
+      completed: this.completed,
+      failed: this.failed,
+      cancelled: this.cancelled,
+      timedOut: this.timedOut,
+      lastWaitMs: this.lastWaitMs,
+      maxWaitMs: this.maxWaitMs,
+      averageWaitMs: this.dispatched > 0 ? this.totalWaitMs / this.dispatched : 0,
+    };
+  }
+
+  /** Inserts a job behind every queued job of equal or higher priority. */
+  private enqueue(entry: QueueEntry): void {
+    let index = this.queue.length;
+    while (index > 0 && this.queue[index - 1].priority < entry.priority) {
+      index--;
+    }
+    this.queue.splice(index, 0, entry);
+    if (this.queue.length > this.maxQueueDepth) {
+      this.maxQueueDepth = this.queue.length;
+    }
+  }
+
+  /** Starts the next queued job if nothing is running. */
+  private dispatch(): void {
+    if (this.active !== null) return;
+    const entry = this.queue.shift();
+    if (!entry) return;
+
+    this.active = entry;
+    const waitMs = Date.now() - entry.enqueuedAt;
+    this.dispatched++;
+    this.totalWaitMs += waitMs;
+    this.lastWaitMs = waitMs;
+    if (waitMs > this.maxWaitMs) this.maxWaitMs = waitMs;
+
+    Promise.resolve()
+      .then(() => entry.job(entry.controller.signal))
+      .then(
+        (value) => this.finish(entry, true, value),
+        (error: unknown) => this.finish(entry, false, error)
+      );
+  }
+
+  /** Frees the slot after a job returns, settles its caller and starts the next job. */
+  private finish(entry: QueueEntry, success: boolean, value: unknown): void {
+    if (!entry.settled) {
+      if (success) {
+        this.completed++;
+      } else {
+        this.failed++;
+      }
+    }
+
+    this.active = null;
+    this.lastActivityAt = Date.now();
+    this.settle(entry, success, value);
+    this.dispatch();
+  }
+
+  /** Rejects a job that was cancelled or timed out, wherever it is. */
+  private fail(entry: QueueEntry, error: CommandScheduleError): void {
+    if (entry.settled) return;
+
+    if (this.active === entry) {
+      // The job keeps the slot until it returns; aborting lets it stop early.
+      entry.controller.abort();
+    } else {
+      const index = this.queue.indexOf(entry);
+      if (index !== -1) this.queue.splice(index, 1);
+    }
+
+    this.settle(entry, false, error);
+  }
+
+  /** Settles a job's caller promise exactly once and releases its timers and listeners. */
+  private settle(entry: QueueEntry, success: boolean, value: unknown): void {
+    if (entry.settled) return;
+    entry.settled = true;
+    entry.release();
+    if (success) {
+      entry.resolve(value);
+    } else {
+      entry.reject(value);
+    }
+  }
+}
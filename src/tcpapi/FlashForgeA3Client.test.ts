@@ -252,7 +252,7 @@ describe('FlashForgeA3Client', () => {
         Buffer.from('CMD M662 Received.\nack header length: 64\n', 'utf8'),
         thumbnailPayload,
       ]);
-      vi.spyOn(client, 'sendCommandAsync').mockResolvedValue(fullResponse.toString('binary'));
+      vi.spyOn(client, 'sendBinaryCommandAsync').mockResolvedValue(fullResponse);
 
       const thumbnail = await client.getThumbnail('test.gcode');
 
@@ -262,8 +262,8 @@ describe('FlashForgeA3Client', () => {
     });
 
     it('should return null for documented M662 file-not-found errors', async () => {
-      vi.spyOn(client, 'sendCommandAsync').mockResolvedValue(
-        'CMD M662 Received.\nError: File not exists\n'
+      vi.spyOn(client, 'sendBinaryCommandAsync').mockResolvedValue(
+        Buffer.from('CMD M662 Received.\nError: File not exists\n', 'utf8')
       );
 
       await expect(client.getThumbnail('missing.gcode')).resolves.toBeNull();
@@ -6,13 +6,20 @@
  * a trailing `ok`, so this client normalizes transport responses before parsing them.
  */
 
+import { log } from '../diagnostics/Logger';
 import { GCodes } from './client/GCodes';
 import { FlashForgeTcpClient } from './FlashForgeTcpClient';
+import type { ResponseFrameDecoder } from './ResponseFrameDecoder';
 import { EndstopStatus } from './replays/EndstopStatus';
 import { LocationInfo } from './replays/LocationInfo';
 import { PrintStatus } from './replays/PrintStatus';
 import { TempInfo } from './replays/TempInfo';
 
+/** Marker that precedes the big-endian payload length of an M662 thumbnail reply. */
+const THUMBNAIL_MAGIC = Buffer.from([0xa2, 0xa2, 0x2a, 0x2a]);
+/** M662 reply for a file that does not exist. */
+const THUMBNAIL_NOT_FOUND = Buffer.from('Error: File not exists', 'utf8');
+
 export interface A3BuildVolume {
   x: number;
   y: number;
@@ -95,22 +102,24 @@ export class FlashForgeA3Client extends FlashForgeTcpClient {
     return super.getResponseCompletionDelayMs(cmd, binary);
   }
 
-  protected override isBinaryResponseComplete(cmd: string, response: Buffer): boolean {
+  protected override isBinaryResponseComplete(
+    cmd: string,
+    response: ResponseFrameDecoder
+  ): boolean {
     if (!this.stripProtocolPrefix(cmd).startsWith('M662')) {
       return super.isBinaryResponseComplete(cmd, response);
     }
 
-    const textPrefix = response.toString('utf8');
-    if (textPrefix.includes('Error: File not exists')) {
+    if (response.findMarker(THUMBNAIL_NOT_FOUND) !== -1) {
       return true;
     }
 
-    const magicOffset = response.indexOf(Buffer.from([0xa2, 0xa2, 0x2a, 0x2a]));
+    const magicOffset = response.findMarker(THUMBNAIL_MAGIC);
     if (magicOffset === -1 || response.length < magicOffset + 8) {
       return false;
     }
 
-    const length = response.readUInt32BE(magicOffset + 4);
+    const length = response.bytes().readUInt32BE(magicOffset + 4);
     return response.length >= magicOffset + 8 + length;
   }
 
@@ -128,18 +137,18 @@ export class FlashForgeA3Client extends FlashForgeTcpClient {
       const loginCommand = GCodes.CmdLogin;
       const response = await this.sendCommandAsync(loginCommand);
       if (response === null) {
-        console.error('A3: Failed to send M601 S1 login command');
+        log.error('A3: Failed to send M601 S1 login command');
         return false;
       }
 
       if (response.includes('Error: have been connected')) {
-        console.warn('A3: Already connected to printer');
+        log.warn('A3: Already connected to printer');
         return true;
       }
 
       return this.isSuccessfulCommandResponse(loginCommand, response);
     } catch (error) {
-      console.error('A3: initControl error:', error);
+      log.error('A3: initControl error:', error);
       return false;
     }
   }
@@ -208,7 +217,7 @@ export class FlashForgeA3Client extends FlashForgeTcpClient {
     try {
       return new EndstopStatus().fromReplay(this.normalizeA3TextResponse(response));
     } catch (error) {
-      console.error('A3: Failed to parse endstop status:', error);
+      log.error('A3: Failed to parse endstop status:', error);
       return null;
     }
   }
@@ -221,33 +230,36 @@ export class FlashForgeA3Client extends FlashForgeTcpClient {
   }
 
   /**
-   * Lists files from printer storage using M661.
+   * Lists files from printer storage using M661. The list is reused from the file cache for a
+   * short TTL, and thumbnails of files missing from a fresh list are dropped.
    */
   public async listFiles(): Promise<A3FileEntry[]> {
-    const response = await this.sendCommandAsync('~M661');
-    if (response === null) return [];
-
-    try {
-      return this.parseFileList(response);
-    } catch (error) {
-      console.error('A3: Failed to parse file list:', error);
-      return [];
-    }
+    const files = await this.fileCache.getFileList(
+      'a3-m661',
+      () => this.fetchFileList(),
+      (file) => ({ name: file.name, version: file.size === undefined ? '' : String(file.size) }),
+      true
+    );
+    return files ? files.slice() : [];
   }
 
   /**
-   * Gets a file thumbnail using M662.
+   * Gets a file thumbnail using M662. Thumbnails are served from the file cache while the file
+   * is unchanged.
    */
   public async getThumbnail(filename: string): Promise<A3Thumbnail | null> {
-    const response = await this.sendCommandAsync(`~M662 ${filename}`);
-    if (response === null) return null;
-
-    try {
-      return this.parseThumbnail(response);
-    } catch (error) {
-      console.error('A3: Failed to parse thumbnail:', error);
-      return null;
-    }
+    const data = await this.getCachedThumbnail(filename, async () => {
+      const response = await this.sendBinaryCommandAsync(`~M662 ${filename}`);
+      if (response === null) return null;
+
+      try {
+        return this.parseThumbnail(response)?.data ?? null;
+      } catch (error) {
+        log.error('A3: Failed to parse thumbnail:', error);
+        return null;
+      }
+    });
+    return data ? { data } : null;
   }
 
   /**
@@ -289,7 +301,7 @@ export class FlashForgeA3Client extends FlashForgeTcpClient {
     try {
       return new PrintStatus().fromReplay(this.normalizeA3TextResponse(response));
     } catch (error) {
-      console.error('A3: Failed to parse print status:', error);
+      log.error('A3: Failed to parse print status:', error);
       return null;
     }
   }
@@ -304,7 +316,7 @@ export class FlashForgeA3Client extends FlashForgeTcpClient {
     try {
       return new LocationInfo().fromReplay(this.normalizeA3TextResponse(response));
     } catch (error) {
-      console.error('A3: Failed to parse position:', error);
+      log.error('A3: Failed to parse position:', error);
       return null;
     }
   }
@@ -319,7 +331,7 @@ export class FlashForgeA3Client extends FlashForgeTcpClient {
     try {
       return new LocationInfo().fromReplay(this.normalizeA3TextResponse(response));
     } catch (error) {
-      console.error('A3: Failed to parse XYZE position:', error);
+      log.error('A3: Failed to parse XYZE position:', error);
       return null;
     }
   }
@@ -348,7 +360,7 @@ export class FlashForgeA3Client extends FlashForgeTcpClient {
     try {
       return new TempInfo().fromReplay(this.normalizeA3TextResponse(response));
     } catch (error) {
-      console.error('A3: Failed to parse temperature info:', error);
+      log.error('A3: Failed to parse temperature info:', error);
       return null;
     }
   }
@@ -470,6 +482,23 @@ export class FlashForgeA3Client extends FlashForgeTcpClient {
     return await this.sendCmdOk(`~M654 ${params}`);
   }
 
+  /**
+   * Sends M661 and parses the reply.
+   * @returns The listed files, or null if the command or parsing failed.
+   */
+  private async fetchFileList(): Promise<A3FileEntry[] | null> {
+    const response = await this.sendCommandAsync('~M661');
+    // An error reply must not read as an empty printer, which would drop every thumbnail.
+    if (response === null || response.includes('CMD M661 Error.')) return null;
+
+    try {
+      return this.parseFileList(response);
+    } catch (error) {
+      log.error('A3: Failed to parse file list:', error);
+      return null;
+    }
+  }
+
   private parseFileList(response: string): A3FileEntry[] {
     const lines = this.getNormalizedLines(response);
     if (lines.some((line) => line.includes('CMD M661 Error.'))) {
@@ -497,22 +526,20 @@ export class FlashForgeA3Client extends FlashForgeTcpClient {
     return files;
   }
 
-  private parseThumbnail(response: string): A3Thumbnail | null {
-    const buffer = Buffer.from(response, 'binary');
-    const errorText = buffer.toString('utf8');
-    if (errorText.includes('Error: File not exists')) {
+  private parseThumbnail(buffer: Buffer): A3Thumbnail | null {
+    if (buffer.indexOf(THUMBNAIL_NOT_FOUND) !== -1) {
       return null;
     }
 
-    const magicOffset = buffer.indexOf(Buffer.from([0xa2, 0xa2, 0x2a, 0x2a]));
+    const magicOffset = buffer.indexOf(THUMBNAIL_MAGIC);
     if (magicOffset === -1 || buffer.length < magicOffset + 8) {
-      console.error('A3: Invalid thumbnail response');
+      log.error('A3: Invalid thumbnail response');
       return null;
     }
 
     const length = buffer.readUInt32BE(magicOffset + 4);
     if (buffer.length < magicOffset + 8 + length) {
-      console.error('A3: Thumbnail response truncated');
+      log.error('A3: Thumbnail response truncated');
       return null;
     }
 
@@ -6,6 +6,7 @@
  * generic legacy client while reusing the shared TCP transport and parsers.
  */
 
+import { log } from '../diagnostics/Logger';
 import type { GCodeClientCapabilities } from './client/GCodeClientCapabilities';
 import { GCodeController } from './client/GCodeController';
 import { GCodes } from './client/GCodes';
@@ -80,12 +81,12 @@ export class FlashForgeA4Client
       const loginCommand = GCodes.CmdLogin;
       const response = await this.sendCommandAsync(loginCommand);
       if (response === null) {
-        console.error('A4: Failed to send M601 S1 login command');
+        log.error('A4: Failed to send M601 S1 login command');
         return false;
       }
 
       if (response.includes('Error: have been connected')) {
-        console.warn('A4: Already connected to printer');
+        log.warn('A4: Already connected to printer');
         return true;
       }
 
@@ -96,14 +97,14 @@ export class FlashForgeA4Client
       await new Promise((resolve) => setTimeout(resolve, 100));
       const info = await this.getPrinterInfo();
       if (!info) {
-        console.error('A4: Failed to retrieve printer info after M601 S1');
+        log.error('A4: Failed to retrieve printer info after M601 S1');
         return false;
       }
 
       this.startKeepAlive();
       return true;
     } catch (error) {
-      console.error('A4: initControl error:', error);
+      log.error('A4: initControl error:', error);
       return false;
     }
   }
@@ -225,7 +226,7 @@ export class FlashForgeA4Client
 
       return this.isSuccessfulCommandResponse(cmd, response);
     } catch (error) {
-      console.error(`A4: sendCmdOk failed for ${cmd}:`, error);
+      log.error(`A4: sendCmdOk failed for ${cmd}:`, error);
       return false;
     }
   }
@@ -359,12 +360,16 @@ export class FlashForgeA4Client
   }
 
   /**
-   * Retrieves the thumbnail for a stored file.
+   * Retrieves the thumbnail for a stored file, from the file cache while the file is unchanged.
    */
   public async getThumbnail(fileName: string): Promise<ThumbnailInfo | null> {
     const filePath = fileName.startsWith('/data/') ? fileName : `/data/${fileName}`;
-    const response = await this.sendCommandAsync(`${GCodes.CmdGetThumbnail} ${filePath}`);
-    return response ? new ThumbnailInfo().fromReplay(response, fileName) : null;
+    const data = await this.getCachedThumbnail(fileName, async () => {
+      const response = await this.sendBinaryCommandAsync(`${GCodes.CmdGetThumbnail} ${filePath}`);
+      const thumbnail = response ? new ThumbnailInfo().fromReplay(response, fileName) : null;
+      return thumbnail?.getImageBuffer() ?? null;
+    });
+    return data ? new ThumbnailInfo().fromImageData(data, fileName) : null;
   }
 
   private normalizeA4TextResponse(response: string): string {
@@ -4,6 +4,7 @@
  */
 
 import type { Filament } from '../api/filament/Filament';
+import { log } from '../diagnostics/Logger';
 import { GCodeController } from './client/GCodeController';
 import { GCodes } from './client/GCodes';
 import { FlashForgeTcpClient, type FlashForgeTcpClientOptions } from './FlashForgeTcpClient';
@@ -53,7 +54,7 @@ export class FlashForgeClient extends FlashForgeTcpClient {
    * @returns A Promise that resolves to true if control is successfully initialized, false otherwise.
    */
   public async initControl(): Promise<boolean> {
-    console.log('(Legacy API) InitControl()');
+    log.debug('(Legacy API) InitControl()');
     let tries = 0;
     while (tries <= 3) {
       const result = await this.sendRawCmd(GCodes.CmdLogin);
@@ -61,11 +62,11 @@ export class FlashForgeClient extends FlashForgeTcpClient {
         await sleep(100);
         const info = await this.getPrinterInfo();
         if (!info) {
-          console.log('(Legacy API) Failed to get printer info, aborting.');
+          log.warn('(Legacy API) Failed to get printer info, aborting.');
           return false;
         }
-        console.log(`(Legacy API) connected to: ${info.TypeName}`);
-        console.log(`(Legacy API) Firmware version: ${info.FirmwareVersion}`);
+        log.debug(`(Legacy API) connected to: ${info.TypeName}`);
+        log.debug(`(Legacy API) Firmware version: ${info.FirmwareVersion}`);
         if (info.TypeName.includes('5M') && info.TypeName.includes('Pro')) {
           this.is5mPro = true;
         }
@@ -154,7 +155,7 @@ export class FlashForgeClient extends FlashForgeTcpClient {
     if (this.is5mPro) {
       return await this.sendCmdOk(GCodes.CmdRunoutSensorOn);
     }
-    console.log('Filament runout sensor not equipped on this printer.');
+    log.warn('Filament runout sensor not equipped on this printer.');
     return false;
   }
 
@@ -167,7 +168,7 @@ export class FlashForgeClient extends FlashForgeTcpClient {
     if (this.is5mPro) {
       return await this.sendCmdOk(GCodes.CmdRunoutSensorOff);
     }
-    console.log('Filament runout sensor not equipped on this printer.');
+    log.warn('Filament runout sensor not equipped on this printer.');
     return false;
   }
 
@@ -269,7 +270,7 @@ export class FlashForgeClient extends FlashForgeTcpClient {
    */
   public async loadFilament(): Promise<boolean> {
     if (await this.canExtrude()) return await this.extrude(250);
-    console.log('LoadFilament() failed, nozzle is not hot enough.');
+    log.warn('LoadFilament() failed, nozzle is not hot enough.');
     return false;
   }
 
@@ -306,7 +307,7 @@ export class FlashForgeClient extends FlashForgeTcpClient {
       const reply = await this.sendCommandAsync(cmd);
       if (reply?.includes('Received.') && reply.includes('ok')) return true;
     } catch (ex) {
-      console.log(`SendCmdOk exception sending cmd: ${cmd} : ${ex}`);
+      log.warn(`SendCmdOk exception sending cmd: ${cmd} : ${ex}`);
       return false;
     }
     return false;
@@ -390,6 +391,7 @@ export class FlashForgeClient extends FlashForgeTcpClient {
    * The command requires the file path to be prefixed with `/data/`.
    * @param fileName The name of the file (e.g., "my_print.gcode") for which to retrieve the thumbnail.
    *                 The `/data/` prefix will be added if not present.
+   * Thumbnails are served from the file cache while the file is unchanged.
    * @returns A Promise that resolves to a `ThumbnailInfo` object containing thumbnail data,
    *          or null if retrieval fails or the file has no thumbnail.
    */
@@ -397,20 +399,23 @@ export class FlashForgeClient extends FlashForgeTcpClient {
     // Ensure the filename has the required /data/ prefix
     const filePath = fileName.startsWith('/data/') ? fileName : `/data/${fileName}`;
 
-    try {
-      const response = await this.sendCommandAsync(`${GCodes.CmdGetThumbnail} ${filePath}`);
-      if (!response) {
-        console.log(`Failed to get thumbnail for ${fileName} - null response`);
+    const data = await this.getCachedThumbnail(fileName, async () => {
+      try {
+        const response = await this.sendBinaryCommandAsync(`${GCodes.CmdGetThumbnail} ${filePath}`);
+        if (!response) {
+          log.warn(`Failed to get thumbnail for ${fileName} - null response`);
+          return null;
+        }
+
+        return new ThumbnailInfo().fromReplay(response, fileName)?.getImageBuffer() ?? null;
+      } catch (error) {
+        log.warn(
+          `Failed to get thumbnail for ${fileName}: ${error instanceof Error ? error.message : String(error)}`
+        );
         return null;
       }
-
-      return new ThumbnailInfo().fromReplay(response, fileName);
-    } catch (error) {
-      console.log(
-        `Failed to get thumbnail for ${fileName}: ${error instanceof Error ? error.message : String(error)}`
-      );
-      return null;
-    }
+    });
+    return data ? new ThumbnailInfo().fromImageData(data, fileName) : null;
   }
 }
 
@@ -10,6 +10,7 @@ import * as path from 'node:path';
 import { EventEmitter } from 'node:events';
 import { afterAll, beforeAll, describe, expect, it, vi } from 'vitest';
 import { GCodes } from './client/GCodes';
+import { CommandPriority } from './CommandScheduler';
 import { FlashForgeTcpClient } from './FlashForgeTcpClient';
 
 // Suppress logs (from API files) during tests
@@ -134,6 +135,130 @@ describe('FlashForgeTcpClient', () => {
     });
   });
 
+  describe('sendCommandAsync scheduling', () => {
+    it('sends emergency stop and job control ahead of queued status polls', async () => {
+      const { client, writes } = createUploadTestClient({
+        '~M115\n': 'CMD M115 Received.\nok\n',
+        '~M27\n': 'CMD M27 Received.\nok\n',
+        '~M26\n': 'CMD M26 Received.\nok\n',
+        '~M112\n': 'CMD M112 Received.\nok\n',
+      });
+
+      const replies = await Promise.all([
+        client.sendCommandAsync('~M115'),
+        client.sendCommandAsync('~M27'),
+        client.sendCommandAsync('~M26'),
+        client.sendCommandAsync('~M112'),
+      ]);
+
+      expect(replies.every((reply) => reply?.includes('ok'))).toBe(true);
+      expect(writes).toEqual(['~M115\n', '~M112\n', '~M26\n', '~M27\n']);
+      expect(client.getCommandQueueMetrics()).toMatchObject({
+        completed: 4,
+        maxQueueDepth: 3,
+        queueDepth: 0,
+      });
+      await expect(client.isSocketBusy()).resolves.toBe(false);
+    });
+
+    it('rejects a queued command whose signal aborts without writing it', async () => {
+      const { client, writes } = createUploadTestClient({
+        '~M115\n': 'CMD M115 Received.\nok\n',
+        '~M105\n': 'CMD M105 Received.\nok\n',
+      });
+      const controller = new AbortController();
+
+      const first = client.sendCommandAsync('~M115');
+      const cancelled = client.sendCommandAsync('~M105', { signal: controller.signal });
+      controller.abort();
+
+      await expect(cancelled).rejects.toHaveProperty('code', 'ABORTED');
+      await expect(first).resolves.toContain('ok');
+      expect(writes).toEqual(['~M115\n']);
+    });
+
+    it('does not reconnect when disposed while a keep-alive awaits its reply', async () => {
+      const { client, writes } = createUploadTestClient({});
+      const socket = (client as any).socket as net.Socket;
+      const controller = new AbortController();
+      (client as any).keepAliveAbort = controller;
+      const keepAlive = client.sendCommandAsync(GCodes.CmdPrintStatus, {
+        priority: CommandPriority.Idle,
+        signal: controller.signal,
+      });
+      await new Promise((resolve) => setTimeout(resolve, 0));
+      const connect = vi.spyOn(client as any, 'connect').mockImplementation(() => undefined);
+
+      // dispose() is stubbed for this suite; run the real one
+      vi.mocked(FlashForgeTcpClient.prototype.dispose).mockRestore();
+      try {
+        await client.dispose();
+      } finally {
+        vi.spyOn(FlashForgeTcpClient.prototype, 'dispose').mockImplementation(vi.fn());
+      }
+      await expect(keepAlive).rejects.toHaveProperty('code', 'ABORTED');
+      await new Promise((resolve) => setTimeout(resolve, 0));
+
+      expect(writes).toEqual([`${GCodes.CmdPrintStatus}\n`]);
+      expect(socket.destroy).toHaveBeenCalledTimes(1);
+      expect(connect).not.toHaveBeenCalled();
+      expect((client as any).socket).toBeNull();
+      expect(client.getTransportMetrics().reconnects).toBe(0);
+    });
+  });
+
+  describe('reply framing', () => {
+    it('reads an abandoned reply to its end before sending the next command', async () => {
+      const { client, writes } = createUploadTestClient({});
+      const socket = (client as any).socket as net.Socket;
+
+      const abandoned = client.sendCommandAsync('~M115', { deadlineMs: 20 });
+      const next = client.sendCommandAsync('~M105');
+      await expect(abandoned).rejects.toHaveProperty('code', 'DEADLINE_EXCEEDED');
+      expect(writes).toEqual(['~M115\n']);
+
+      // The late reply arrives after its caller gave up
+      socket.emit('data', Buffer.from('CMD M115 Received.\nMachine Type: Adventurer 5M\n', 'utf8'));
+      socket.emit('data', Buffer.from('ok\n', 'utf8'));
+      await vi.waitFor(() => expect(writes).toEqual(['~M115\n', '~M105\n']));
+      socket.emit('data', Buffer.from('CMD M105 Received.\nT0:200/200\nok\n', 'utf8'));
+
+      const reply = await next;
+      expect(reply).toBe('CMD M105 Received.\nT0:200/200\nok\n');
+      expect(reply).not.toContain('M115');
+      expect(reply).not.toContain('Machine Type');
+      expect((client as any).socket).toBe(socket);
+    });
+
+    it('completes a text reply whose ok terminator is split across chunks', async () => {
+      const { client } = createUploadTestClient({});
+      const socket = (client as any).socket as net.Socket;
+
+      const reply = client.sendCommandAsync('~M105');
+      await new Promise((resolve) => setTimeout(resolve, 0));
+
+      socket.emit('data', Buffer.from('CMD M105 Received.\nT0:200/200 ', 'utf8'));
+      socket.emit('data', Buffer.from('B:60/60\no', 'utf8'));
+      socket.emit('data', Buffer.from('k\n', 'utf8'));
+
+      await expect(reply).resolves.toBe('CMD M105 Received.\nT0:200/200 B:60/60\nok\n');
+    });
+
+    it('attaches one data listener per socket rather than one per command', async () => {
+      const { client } = createUploadTestClient({
+        '~M105\n': 'CMD M105 Received.\nok\n',
+        '~M27\n': 'CMD M27 Received.\nok\n',
+      });
+      const socket = (client as any).socket as net.Socket;
+
+      await client.sendCommandAsync('~M105');
+      await client.sendCommandAsync('~M27');
+      await client.sendCommandAsync('~M105');
+
+      expect(socket.listenerCount('data')).toBe(1);
+    });
+  });
+
   describe('parseFileListResponse', () => {
     it('should parse Pro model response correctly', () => {
       // Sample response from 5M Pro
@@ -243,6 +368,27 @@ describe('FlashForgeTcpClient', () => {
       expect(Buffer.concat(binaryWrites)).toEqual(fileData);
     });
 
+    it('should upload an in-memory source in chunks and report progress', async () => {
+      const fileData = Buffer.alloc(10000, 'G1 X1\n');
+      const startCommand = `${GCodes.CmdPrepFileUpload.replace('%%size%%', fileData.length.toString()).replace('%%filename%%', 'sliced.gcode')}\n`;
+      const { client, writes } = createUploadTestClient({
+        [startCommand]: 'CMD M28 Received.\n/data/sliced.gcode\n',
+        [`${GCodes.CmdCompleteFileUpload}\n`]: 'CMD M29 Received.\n',
+      });
+      const progress: number[] = [];
+
+      await expect(
+        client.uploadFile({ fileName: 'sliced.gcode', data: fileData }, undefined, {
+          chunkSize: 4096,
+          onProgress: ({ bytesSent }) => progress.push(bytesSent),
+        })
+      ).resolves.toBe(true);
+
+      const binaryWrites = writes.filter((entry): entry is Buffer => Buffer.isBuffer(entry));
+      expect(Buffer.concat(binaryWrites)).toEqual(fileData);
+      expect(progress[progress.length - 1]).toBe(fileData.length);
+    });
+
     it('should normalize legacy prefixes in the requested remote file name', async () => {
       const tempDir = fs.mkdtempSync(path.join(os.tmpdir(), 'ff-api-upload-'));
       const localFile = path.join(tempDir, 'local-name.gcode');
@@ -2,11 +2,24 @@
  * @fileoverview Low-level TCP socket client for FlashForge printers, managing connections,
  * command serialization, multi-line response parsing, and keep-alive mechanisms.
  */
-import { createReadStream, promises as fs } from 'node:fs';
 import * as net from 'node:net';
 import * as path from 'node:path';
-import { setTimeout as sleep } from 'node:timers/promises';
+import { performance } from 'node:perf_hooks';
+import { PrinterFileCache } from '../api/cache/PrinterFileCache';
+import { type UploadInput, type UploadOptions, UploadEngine } from '../api/upload/UploadEngine';
+import {
+  incrementCounter,
+  type TcpCommandEvent,
+  tcpCommandChannel,
+} from '../diagnostics/Diagnostics';
+import { log } from '../diagnostics/Logger';
 import { GCodes } from './client/GCodes';
+import {
+  CommandPriority,
+  CommandScheduler,
+  type CommandSchedulerMetrics,
+} from './CommandScheduler';
+import { OK_MARKER, ResponseFrameDecoder } from './ResponseFrameDecoder';
 
 /**
  * Optional transport overrides for TCP printer clients.
@@ -14,6 +27,58 @@ import { GCodes } from './client/GCodes';
 export interface FlashForgeTcpClientOptions {
   /** TCP command port override (defaults to 8899). */
   port?: number;
+  /**
+   * Cache for file lists and thumbnails. Pass one built with a `persistDir` to keep thumbnails
+   * across restarts; defaults to an in-memory cache keyed by hostname.
+   */
+  fileCache?: PrinterFileCache;
+}
+
+/**
+ * Per-call options for {@link FlashForgeTcpClient.sendCommandAsync}.
+ */
+export interface TcpCommandOptions {
+  /** Dispatch priority. Defaults to the priority derived from the command (see `getCommandPriority`). */
+  priority?: CommandPriority;
+  /** Maximum time in milliseconds to wait for the socket before giving up (defaults to 10000). */
+  queueTimeoutMs?: number;
+  /** Overall deadline in milliseconds covering queue wait and the reply. */
+  deadlineMs?: number;
+  /** Cancels the command while queued, or abandons the reply once sent. */
+  signal?: AbortSignal;
+}
+
+/**
+ * Failure counters of a TCP client's connection, counted since the client was created.
+ */
+export interface TcpTransportMetrics {
+  /** Replies that did not complete within the command timeout. */
+  timeouts: number;
+  /** Times the socket was reopened after it was closed or reset. */
+  reconnects: number;
+  /** Keep-alive status commands that failed or got no reply. */
+  keepAliveFailures: number;
+}
+
+/**
+ * Timestamps (`performance.now()`) of one command, collected while a diagnostics subscriber
+ * listens. Zero means the step has not happened.
+ */
+interface CommandTrace {
+  queuedAt: number;
+  startedAt: number;
+  writtenAt: number;
+  firstByteAt: number;
+}
+
+/**
+ * Callbacks of the reply currently being collected; the socket's persistent listeners forward to it.
+ */
+interface PendingReply {
+  onData(chunk: Buffer): void;
+  onError(error: Error): void;
+  /** Ends the reply without waiting for more bytes, because the socket is going away. */
+  cancel(reason: string): void;
 }
 
 export class FlashForgeTcpClient {
@@ -29,8 +94,26 @@ export class FlashForgeTcpClient {
   private keepAliveCancellationToken: boolean = false;
   /** Counter for consecutive keep-alive errors. */
   private keepAliveErrors: number = 0;
-  /** Flag indicating if the socket is currently busy sending a command and awaiting a response. */
-  private socketBusy: boolean = false;
+  /** Timer for the next keep-alive check. Null when no check is pending. */
+  private keepAliveTimer: NodeJS.Timeout | null = null;
+  /** Cancels the keep-alive status command while it is queued or awaiting its reply. */
+  private keepAliveAbort: AbortController | null = null;
+  /** Set by `dispose()`; a disposed client never opens another socket. */
+  private disposed = false;
+  /** Serializes commands on the socket; every command and upload runs as one job. */
+  private readonly commandScheduler = new CommandScheduler();
+  /** Reply currently being collected. Null when no command awaits a reply. */
+  private pendingReply: PendingReply | null = null;
+  /** Socket the persistent `data`/`error` listeners are attached to. */
+  private listeningSocket: net.Socket | null = null;
+  /** Cache of the printer's M661 file list and M662 thumbnails. */
+  public readonly fileCache: PrinterFileCache;
+  /** Timeout, reconnect and keep-alive failure counts. */
+  private readonly transportMetrics: TcpTransportMetrics = {
+    timeouts: 0,
+    reconnects: 0,
+    keepAliveFailures: 0,
+  };
 
   /**
    * Creates an instance of FlashForgeTcpClient.
@@ -41,52 +124,27 @@ export class FlashForgeTcpClient {
   constructor(hostname: string, options?: FlashForgeTcpClientOptions) {
     this.hostname = hostname;
     this.port = options?.port ?? 8899;
+    this.fileCache = options?.fileCache ?? new PrinterFileCache(hostname);
     try {
-      console.log('TcpPrinterClient creation');
+      log.debug('TcpPrinterClient creation');
       this.connect();
-      console.log('Connected');
+      log.debug('Connected');
     } catch (_error: unknown) {
-      console.log('TcpPrinterClient failed to init!!!');
+      log.warn('TcpPrinterClient failed to init!!!');
     }
   }
 
   /**
    * Starts a keep-alive mechanism to maintain the TCP connection with the printer.
-   * Periodically sends a status command (`GCodes.CmdPrintStatus`) to the printer.
-   * Adjusts the keep-alive interval based on error counts.
-   * This method runs asynchronously and will continue until `stopKeepAlive` is called
-   * or too many consecutive errors occur.
+   * Sends a status command (`GCodes.CmdPrintStatus`) whenever the socket has been idle for a full
+   * keep-alive interval. The command runs at idle priority, so it never delays real commands,
+   * and regular traffic postpones it. The interval grows with the error count.
+   * Checks continue until `stopKeepAlive` is called or a keep-alive command fails.
    */
   public startKeepAlive(): void {
     if (this.keepAliveCancellationToken) return; // a stop was already requested (stopKeepAlive); don't start a new loop
-    this.keepAliveCancellationToken = false;
-
-    const runKeepAlive = async () => {
-      try {
-        while (!this.keepAliveCancellationToken) {
-          if (this.socketBusy) {
-            await sleep(250);
-            continue;
-          }
-
-          const result = await this.sendCommandAsync(GCodes.CmdPrintStatus);
-          if (result === null) {
-            // keep alive failed, connection error/timeout etc
-            this.keepAliveErrors++; // keep track of errors
-            break;
-          }
-
-          if (this.keepAliveErrors > 0) this.keepAliveErrors--; // move back to 0 errors with each "good" keep-alive
-          // increase keep alive timeout based on error count
-          await sleep(5000 + this.keepAliveErrors * 1000);
-        }
-      } catch (error: unknown) {
-        const err = error as Error;
-        console.log(`KeepAlive encountered an exception: ${err.message}`);
-      }
-    };
-
-    runKeepAlive();
+    if (this.keepAliveTimer || this.keepAliveAbort) return; // already running
+    this.scheduleKeepAlive(this.getKeepAliveIntervalMs());
   }
 
   /**
@@ -95,174 +153,434 @@ export class FlashForgeTcpClient {
    */
   public stopKeepAlive(logout: boolean = false): void {
     if (logout) {
-      this.sendCommandAsync(GCodes.CmdLogout).then(() => {
-        // Ignore: Logout errors during disposal are acceptable
-      });
+      this.sendCommandAsync(GCodes.CmdLogout).then(
+        () => {
+          // Ignore: Logout errors during disposal are acceptable
+        },
+        () => {
+          // Ignore: Logout errors during disposal are acceptable
+        }
+      );
     } // release control
     this.keepAliveCancellationToken = true;
-    console.log('Keep-alive stopped.');
+    this.cancelKeepAlive();
+    log.debug('Keep-alive stopped.');
   }
 
   /**
    * Checks if the socket is currently busy processing a command.
-   * @returns A Promise that resolves to true if the socket is busy, false otherwise.
+   * @returns A Promise that resolves to true if a command is running or queued, false otherwise.
    */
   public async isSocketBusy(): Promise<boolean> {
-    return this.socketBusy;
+    return this.commandScheduler.isBusy();
+  }
+
+  /**
+   * Returns queue depth and wait-time counters for the command socket.
+   */
+  public getCommandQueueMetrics(): CommandSchedulerMetrics {
+    return this.commandScheduler.getMetrics();
+  }
+
+  /**
+   * Returns timeout, reconnect and keep-alive failure counts for the connection.
+   */
+  public getTransportMetrics(): TcpTransportMetrics {
+    return { ...this.transportMetrics };
   }
 
   /**
    * Sends a command string to the printer asynchronously via the TCP socket.
-   * It ensures the socket is available, writes the command (appending a newline),
-   * and then waits to receive a multi-line reply.
-   * Handles socket busy state and various connection errors.
+   * The command is queued on the client's command scheduler, which runs one command at a time.
+   * Emergency stop and job control commands overtake queued status polls (see `getCommandPriority`).
+   * Once dispatched, the command is written (with a trailing newline) and the multi-line reply is
+   * collected. Handles various connection errors.
    *
    * @param cmd The command string to send (e.g., "~M115").
+   * @param options Optional priority, queue timeout, deadline and cancellation signal.
    * @returns A Promise that resolves to the printer's string reply, or null if an error occurs,
    *          the reply is invalid, or the connection needs to be reset.
+   * @throws CommandScheduleError if the command is aborted, waits longer than its queue timeout,
+   *         or misses its deadline.
    */
-  public async sendCommandAsync(cmd: string): Promise<string | null> {
-    if (this.socketBusy) {
-      await this.waitUntilSocketAvailable();
-    }
+  public async sendCommandAsync(
+    cmd: string,
+    options: TcpCommandOptions = {}
+  ): Promise<string | null> {
+    return await this.scheduleCommand(cmd, options, (signal, trace) =>
+      this.sendCommandWithLockedSocket(cmd, true, signal, trace)
+    );
+  }
 
-    this.socketBusy = true;
+  /**
+   * Sends a command whose reply carries binary data (such as M662 thumbnails) and returns the raw
+   * reply bytes. Scheduling and error handling match {@link sendCommandAsync}, but the reply is
+   * returned as the Buffer it was framed into, without a round trip through a `'binary'` string.
+   *
+   * @param cmd The command string to send (e.g., "~M662 /data/file.gcode").
+   * @param options Optional priority, queue timeout, deadline and cancellation signal.
+   * @returns A Promise that resolves to the reply bytes, or null if an error occurs or the reply is empty.
+   * @throws CommandScheduleError if the command is aborted, waits longer than its queue timeout,
+   *         or misses its deadline.
+   */
+  public async sendBinaryCommandAsync(
+    cmd: string,
+    options: TcpCommandOptions = {}
+  ): Promise<Buffer | null> {
+    return await this.scheduleCommand(cmd, options, (signal, trace) =>
+      this.exchangeWithLockedSocket<Buffer>(
+        cmd,
+        true,
+        signal,
+        Buffer.alloc(0),
+        (frame) => this.decodeBinaryReply(frame),
+        trace
+      )
+    );
+  }
+
+  /**
+   * Queues one command exchange on the scheduler. While anyone subscribes to the
+   * `ff-api:tcp:command` diagnostics channel, the exchange is timed and a {@link TcpCommandEvent}
+   * is published once it settles; otherwise no trace is created.
+   * @private
+   */
+  private async scheduleCommand<T>(
+    cmd: string,
+    options: TcpCommandOptions,
+    exchange: (signal: AbortSignal, trace: CommandTrace | null) => Promise<T | null>
+  ): Promise<T | null> {
+    const scheduleOptions = {
+      priority: options.priority ?? this.getCommandPriority(cmd),
+      queueTimeoutMs: options.queueTimeoutMs ?? 10000,
+      deadlineMs: options.deadlineMs,
+      signal: options.signal,
+    };
+    if (!tcpCommandChannel.hasSubscribers) {
+      return await this.commandScheduler.schedule(
+        (signal) => exchange(signal, null),
+        scheduleOptions
+      );
+    }
 
+    const trace: CommandTrace = {
+      queuedAt: performance.now(),
+      startedAt: 0,
+      writtenAt: 0,
+      firstByteAt: 0,
+    };
+    let result: T | null = null;
+    let failure: unknown;
     try {
-      return await this.sendCommandWithLockedSocket(cmd);
+      result = await this.commandScheduler.schedule((signal) => {
+        trace.startedAt = performance.now();
+        return exchange(signal, trace);
+      }, scheduleOptions);
+      return result;
+    } catch (error: unknown) {
+      failure = error;
+      throw error;
     } finally {
-      this.socketBusy = false;
+      this.publishCommandTrace(cmd, trace, result !== null, failure);
     }
   }
 
+  /**
+   * Publishes the timing of a settled command.
+   * @private
+   */
+  private publishCommandTrace(
+    cmd: string,
+    trace: CommandTrace,
+    ok: boolean,
+    failure: unknown
+  ): void {
+    const endedAt = performance.now();
+    const startedAt = trace.startedAt || endedAt;
+    const event: TcpCommandEvent = {
+      host: this.hostname,
+      port: this.port,
+      command: this.getCommandCode(cmd),
+      queueWaitMs: startedAt - trace.queuedAt,
+      writeMs: trace.writtenAt ? trace.writtenAt - startedAt : 0,
+      firstByteMs:
+        trace.writtenAt && trace.firstByteAt ? trace.firstByteAt - trace.writtenAt : null,
+      totalMs: endedAt - trace.queuedAt,
+      ok,
+    };
+    if (failure !== undefined) {
+      const err = failure as { code?: string; message?: string };
+      event.error = err.code ?? err.message ?? String(failure);
+    } else if (!ok) {
+      event.error = 'No valid reply';
+    }
+    tcpCommandChannel.publish(event);
+  }
+
   /**
    * Uploads a file to legacy printer storage using the documented M28/raw-binary/M29 flow.
    * The file is stored in the printer's `/data/` directory using a normalized filename.
+   * Data is streamed through the shared upload engine, so the socket's write buffer throttles
+   * reading and progress, stall detection and cancellation work as they do for HTTP uploads.
+   * TCP uploads are never retried: a failure resets the socket.
    *
-   * @param localFilePath Absolute or relative path to the local file to upload.
+   * @param localFilePath Path to the local file to upload, or an in-memory or streamed source.
    * @param remoteFileName Optional target filename. Legacy prefixes such as `0:/user/` or `/data/`
    * are normalized automatically.
+   * @param options Progress callback, abort signal and stall settings (`retries` is ignored).
    * @returns True when the printer accepts the upload and finalizes it successfully.
    */
-  public async uploadFile(localFilePath: string, remoteFileName?: string): Promise<boolean> {
-    let stats: Awaited<ReturnType<typeof fs.stat>>;
+  public async uploadFile(
+    localFilePath: UploadInput,
+    remoteFileName?: string,
+    options: UploadOptions = {}
+  ): Promise<boolean> {
+    let upload: UploadEngine;
     try {
-      stats = await fs.stat(localFilePath);
+      upload = await UploadEngine.prepare(localFilePath, { ...options, retries: 0 });
     } catch (error) {
-      console.error(
-        `Upload failed: unable to access file ${localFilePath}: ${
-          error instanceof Error ? error.message : String(error)
-        }`
-      );
-      return false;
-    }
-
-    if (!stats.isFile()) {
-      console.error(`Upload failed: ${localFilePath} is not a file.`);
+      log.error(`Upload failed: ${error instanceof Error ? error.message : String(error)}`);
       return false;
     }
 
     const normalizedFileName = this.normalizeLegacyUploadFilename(
-      remoteFileName ?? localFilePath
+      remoteFileName ?? (typeof localFilePath === 'string' ? localFilePath : upload.fileName)
     );
     if (!normalizedFileName) {
-      console.error('Upload failed: remote file name resolved to an empty value.');
+      log.error('Upload failed: remote file name resolved to an empty value.');
       return false;
     }
 
     const startCommand = GCodes.CmdPrepFileUpload
-      .replace('%%size%%', stats.size.toString())
+      .replace('%%size%%', upload.size.toString())
       .replace('%%filename%%', normalizedFileName);
 
-    if (this.socketBusy) {
-      await this.waitUntilSocketAvailable(30000);
+    try {
+      return await this.commandScheduler.schedule(
+        (signal) => this.uploadWithLockedSocket(upload, normalizedFileName, startCommand, signal),
+        { priority: CommandPriority.Normal, queueTimeoutMs: 30000, signal: options.signal }
+      );
+    } finally {
+      // Even a failed upload may have replaced or truncated the stored file.
+      this.fileCache.invalidate(normalizedFileName);
     }
+  }
 
-    this.socketBusy = true;
+  /**
+   * Runs the M28/raw-binary/M29 upload sequence. Must only be called from a scheduler job.
+   * @private
+   */
+  private async uploadWithLockedSocket(
+    upload: UploadEngine,
+    normalizedFileName: string,
+    startCommand: string,
+    signal: AbortSignal
+  ): Promise<boolean> {
     try {
-      const startResponse = await this.sendCommandWithLockedSocket(startCommand);
-      if (!startResponse || !this.isSuccessfulUploadBoundaryResponse(startCommand, startResponse)) {
-        console.error('Upload failed: printer rejected M28 upload initialization.');
-        return false;
-      }
+      return await upload.run(async (body, attemptSignal) => {
+        const startResponse = await this.sendCommandWithLockedSocket(startCommand);
+        if (
+          !startResponse ||
+          !this.isSuccessfulUploadBoundaryResponse(startCommand, startResponse)
+        ) {
+          log.error('Upload failed: printer rejected M28 upload initialization.');
+          return false;
+        }
 
-      for await (const chunk of createReadStream(localFilePath)) {
-        await this.writeSocketData(chunk);
-      }
+        for await (const chunk of body) {
+          await this.writeUploadChunk(chunk as Buffer, attemptSignal);
+        }
 
-      const finishResponse = await this.sendCommandWithLockedSocket(
-        GCodes.CmdCompleteFileUpload,
-        false
-      );
-      if (!finishResponse) {
-        console.error('Upload failed: printer did not respond to M29 upload finalization.');
-        return false;
-      }
+        const finishResponse = await this.sendCommandWithLockedSocket(
+          GCodes.CmdCompleteFileUpload,
+          false
+        );
+        if (!finishResponse) {
+          log.error('Upload failed: printer did not respond to M29 upload finalization.');
+          return false;
+        }
 
-      return this.isSuccessfulUploadBoundaryResponse(GCodes.CmdCompleteFileUpload, finishResponse);
+        return this.isSuccessfulUploadBoundaryResponse(
+          GCodes.CmdCompleteFileUpload,
+          finishResponse
+        );
+      }, signal);
     } catch (error: unknown) {
-      console.error(
+      log.error(
         `Upload failed for ${normalizedFileName}: ${
           error instanceof Error ? error.message : String(error)
         }`
       );
       this.resetSocket();
       return false;
-    } finally {
-      this.socketBusy = false;
     }
   }
 
   /**
-   * Waits until the socket is no longer busy or a timeout is reached.
-   * This is used to serialize commands sent over the socket.
-   * @throws Error if the socket remains busy for too long (10 seconds by default).
+   * Schedules the next keep-alive check.
    * @private
    */
-  private async waitUntilSocketAvailable(maxWaitTime: number = 10000): Promise<void> {
-    const startTime = Date.now();
+  private scheduleKeepAlive(delayMs: number): void {
+    this.keepAliveTimer = setTimeout(() => {
+      this.keepAliveTimer = null;
+      this.runKeepAlive();
+    }, delayMs);
+  }
 
-    while (this.socketBusy && Date.now() - startTime < maxWaitTime) {
-      await sleep(100);
+  /**
+   * Sends one keep-alive status command if the socket has been idle for a full interval,
+   * otherwise defers the check until it has been.
+   * @private
+   */
+  private async runKeepAlive(): Promise<void> {
+    if (this.keepAliveCancellationToken) return;
+
+    const interval = this.getKeepAliveIntervalMs();
+    const idleFor = Date.now() - this.commandScheduler.getLastActivityAt();
+    if (this.commandScheduler.isBusy() || idleFor < interval) {
+      // Regular traffic keeps the connection alive on its own.
+      this.scheduleKeepAlive(this.commandScheduler.isBusy() ? interval : interval - idleFor);
+      return;
     }
 
-    if (this.socketBusy) {
-      throw new Error('Socket remained busy for too long, timing out');
+    const controller = new AbortController();
+    this.keepAliveAbort = controller;
+    try {
+      const result = await this.sendCommandAsync(GCodes.CmdPrintStatus, {
+        priority: CommandPriority.Idle,
+        signal: controller.signal,
+      });
+      if (result === null) {
+        // keep alive failed, connection error/timeout etc
+        this.keepAliveErrors++; // keep track of errors
+        this.countFailure('keepAliveFailures', 'tcp.keepAliveFailure');
+        return;
+      }
+
+      if (this.keepAliveErrors > 0) this.keepAliveErrors--; // move back to 0 errors with each "good" keep-alive
+      if (!this.keepAliveCancellationToken) {
+        this.scheduleKeepAlive(this.getKeepAliveIntervalMs());
+      }
+    } catch (error: unknown) {
+      if (controller.signal.aborted) return; // stopped while the keep-alive was pending
+      const err = error as Error;
+      log.warn(`KeepAlive encountered an exception: ${err.message}`);
+      this.countFailure('keepAliveFailures', 'tcp.keepAliveFailure');
+    } finally {
+      if (this.keepAliveAbort === controller) this.keepAliveAbort = null;
     }
   }
 
+  /**
+   * Cancels a pending keep-alive check and its queued status command.
+   * @private
+   */
+  private cancelKeepAlive(): void {
+    if (this.keepAliveTimer) {
+      clearTimeout(this.keepAliveTimer);
+      this.keepAliveTimer = null;
+    }
+    if (this.keepAliveAbort) {
+      this.keepAliveAbort.abort();
+      this.keepAliveAbort = null;
+    }
+  }
+
+  /**
+   * Keep-alive interval; increases with the consecutive error count.
+   * @private
+   */
+  private getKeepAliveIntervalMs(): number {
+    return 5000 + this.keepAliveErrors * 1000;
+  }
+
+  /**
+   * Counts a connection failure locally and on the diagnostics counter channel.
+   * @private
+   */
+  private countFailure(
+    metric: keyof TcpTransportMetrics,
+    counter: 'tcp.timeout' | 'tcp.reconnect' | 'tcp.keepAliveFailure'
+  ): void {
+    this.transportMetrics[metric]++;
+    incrementCounter(this.hostname, counter);
+  }
+
   private async sendCommandWithLockedSocket(
     cmd: string,
-    allowReconnect: boolean = true
+    allowReconnect: boolean = true,
+    signal?: AbortSignal,
+    trace: CommandTrace | null = null
   ): Promise<string | null> {
-    console.log(`sendCommand: ${cmd}`);
+    return await this.exchangeWithLockedSocket<string>(
+      cmd,
+      allowReconnect,
+      signal,
+      '',
+      (frame) => this.decodeReply(cmd, frame),
+      trace
+    );
+  }
+
+  /**
+   * Writes a command and collects its reply. Must only be called from a scheduler job.
+   * @param cmd The command string to send.
+   * @param allowReconnect Whether a missing socket may be reopened first.
+   * @param signal Optional signal that abandons the reply early.
+   * @param skipped Value returned for commands that expect no reply.
+   * @param decode Converts the framed reply into the caller's result; null means invalid.
+   * @param trace Timestamps to fill in while a diagnostics subscriber listens.
+   * @private
+   */
+  private async exchangeWithLockedSocket<T>(
+    cmd: string,
+    allowReconnect: boolean,
+    signal: AbortSignal | undefined,
+    skipped: T,
+    decode: (frame: ResponseFrameDecoder) => T | null,
+    trace: CommandTrace | null = null
+  ): Promise<T | null> {
+    log.debug(`sendCommand: ${cmd}`);
     try {
       if (allowReconnect) {
         this.checkSocket();
-      } else if (!this.socket || this.socket.destroyed) {
-        console.error('Error while sending command: socket is unavailable.');
+      }
+      if (!this.socket || this.socket.destroyed) {
+        log.error('Error while sending command: socket is unavailable.');
         return null;
       }
 
-      return await new Promise<string | null>((resolve, reject) => {
+      return await new Promise<T | null>((resolve, reject) => {
         this.socket?.write(`${cmd}\n`, 'ascii', (err) => {
           if (err) {
-            console.error('Error writing command to socket:', err);
+            log.error('Error writing command to socket:', err);
             reject(err);
             return;
           }
+          if (trace) trace.writtenAt = performance.now();
 
           if (this.shouldSkipResponseWait(cmd)) {
-            resolve('');
+            resolve(skipped);
             return;
           }
 
-          this.receiveMultiLineReplayAsync(cmd)
-            .then((reply) => {
+          this.receiveMultiLineReplayAsync(cmd, signal, trace)
+            .then((frame) => {
+              if (frame && signal?.aborted) {
+                // The caller gave up (keep-alive stopped or deadline passed), but the reply was
+                // still read to its end, so the next command starts on a clean stream.
+                log.debug(`Discarded the abandoned reply to ${cmd}.`);
+                resolve(null);
+                return;
+              }
+              const reply = frame ? decode(frame) : null;
               if (reply !== null) {
                 resolve(reply);
+              } else if (this.disposed) {
+                log.debug(`Reply to ${cmd} abandoned: client disposed.`);
+                resolve(null);
               } else {
-                console.warn('Invalid or no reply received, resetting connection to printer.');
+                log.warn('Invalid or no reply received, resetting connection to printer.');
                 this.resetSocket();
                 if (allowReconnect) {
                   this.checkSocket();
@@ -271,7 +589,7 @@ export class FlashForgeTcpClient {
               }
             })
             .catch((error) => {
-              console.error('Error receiving reply:', error);
+              log.error('Error receiving reply:', error);
               reject(error);
             });
         });
@@ -281,12 +599,12 @@ export class FlashForgeTcpClient {
 
       if (err.code === 'ENETUNREACH') {
         const errMsg = `Error while connecting. No route to host [${this.hostname}].`;
-        console.error(`${errMsg}\n${err.stack}`);
+        log.error(`${errMsg}\n${err.stack}`);
       } else if (err.code === 'ENOTFOUND') {
         const errMsg = `Error while connecting. Unknown host [${this.hostname}].`;
-        console.error(`${errMsg}\n${err.stack}`);
+        log.error(`${errMsg}\n${err.stack}`);
       } else {
-        console.error(`Error while sending command: ${err.message}\n${err.stack}`);
+        log.error(`Error while sending command: ${err.message}\n${err.stack}`);
       }
       return null;
     }
@@ -294,11 +612,12 @@ export class FlashForgeTcpClient {
 
   /**
    * Checks the status of the socket connection and attempts to reconnect if it's null or destroyed.
-   * If reconnection occurs, it also restarts the keep-alive mechanism.
+   * If reconnection occurs, it also restarts the keep-alive mechanism. Does nothing once disposed.
    * @private
    */
   private checkSocket(): void {
-    console.log('CheckSocket()');
+    log.debug('CheckSocket()');
+    if (this.disposed) return;
     let fix = false;
     if (this.socket === null) {
       fix = true;
@@ -308,7 +627,8 @@ export class FlashForgeTcpClient {
 
     if (!fix) return;
 
-    console.warn('Reconnecting to TCP socket...');
+    log.info('Reconnecting to TCP socket...');
+    this.countFailure('reconnects', 'tcp.reconnect');
     this.connect();
     this.startKeepAlive(); // Start this here rather than Connect()
   }
@@ -324,7 +644,7 @@ export class FlashForgeTcpClient {
     this.socket.setTimeout(this.timeout);
 
     this.socket.on('error', (error) => {
-      console.log(`Socket error: ${error.message}`);
+      log.warn(`Socket error: ${error.message}`);
     });
   }
 
@@ -343,135 +663,183 @@ export class FlashForgeTcpClient {
 
   /**
    * Asynchronously receives a multi-line reply from the printer for a given command.
-   * It listens for 'data' events on the socket, concatenates incoming data buffers,
-   * and determines when the full reply has been received based on command-specific delimiters
+   * Socket chunks are forwarded by persistent `data`/`error` listeners into a
+   * {@link ResponseFrameDecoder}, which keeps one growing buffer and lets the completion checks
+   * scan only newly arrived bytes. Completion is determined by command-specific delimiters
    * (usually "ok" for text commands, or specific logic for binary data like thumbnails).
    * Handles timeouts and errors during reception.
    *
    * @param cmd The command string for which the reply is expected. This influences how completion is detected.
-   * @returns A Promise that resolves to the complete string reply from the printer,
-   *          or null if an error occurs, the reply is incomplete, or a timeout happens.
-   *          For thumbnail commands (M662), the response is a binary string.
+   * @param signal Optional signal that abandons the reply. The reply is still read to its end (or
+   * until it times out) so its bytes cannot leak into the next command's reply.
+   * @param trace Timestamps to fill in while a diagnostics subscriber listens.
+   * @returns A Promise that resolves to the framed reply, or null if an error occurs,
+   *          the reply is incomplete, or a timeout happens.
    * @private
    */
-  private async receiveMultiLineReplayAsync(cmd: string): Promise<string | null> {
-
-    if (!this.socket) {
+  private async receiveMultiLineReplayAsync(
+    cmd: string,
+    signal?: AbortSignal,
+    trace: CommandTrace | null = null
+  ): Promise<ResponseFrameDecoder | null> {
+    const socket = this.socket;
+    if (!socket) {
       return null;
     }
 
-    return new Promise<string | null>((resolve) => {
-      const answer: Buffer[] = [];
-      let timeoutId: NodeJS.Timeout;
+    this.ensureReplyListeners(socket);
+
+    return new Promise<ResponseFrameDecoder | null>((resolve) => {
+      const frame = new ResponseFrameDecoder();
+      const binary = this.isBinaryCommand(cmd);
       let settleTimeoutId: NodeJS.Timeout | null = null;
-      let _lastDataTime = Date.now();
+      let finished = false;
+      let abandoned = false;
+
+      const finish = (success: boolean, error?: Error) => {
+        if (finished) return;
+        finished = true;
+        clearTimeout(timeoutId);
+        if (settleTimeoutId) {
+          clearTimeout(settleTimeoutId);
+          settleTimeoutId = null;
+        }
+        if (this.pendingReply === pending) this.pendingReply = null;
+        signal?.removeEventListener('abort', abortHandler);
 
-      const queueCleanup = (binary: boolean) => {
+        if (!success) {
+          if (abandoned) log.debug(`Abandoned reply to ${cmd} did not complete:`, error?.message);
+          else log.error('Failed to receive complete response:', error?.message);
+          resolve(null);
+          return;
+        }
+
+        resolve(frame);
+      };
+
+      const queueCompletion = () => {
         if (settleTimeoutId) clearTimeout(settleTimeoutId);
         const delay = this.getResponseCompletionDelayMs(cmd, binary);
         if (delay === 0) {
-          cleanup(true);
+          finish(true);
           return;
         }
 
-        settleTimeoutId = setTimeout(() => {
-          settleTimeoutId = null;
-          cleanup(true);
-        }, delay);
+        settleTimeoutId = setTimeout(() => finish(true), delay);
       };
 
-      // Create our handler functions
-      const dataHandler = (data: Buffer) => {
-        _lastDataTime = Date.now();
-        answer.push(data);
+      const pending: PendingReply = {
+        onData: (chunk: Buffer) => {
+          if (trace && trace.firstByteAt === 0) trace.firstByteAt = performance.now();
+          frame.append(chunk);
 
-        // First, check for completion in non-binary response formats
-        // This is the standard case for most commands
-        if (!this.isBinaryCommand(cmd)) {
-          const fullBufferSoFar = Buffer.concat(answer);
-          const dataSoFar = fullBufferSoFar.toString('ascii');
+          if (binary) {
+            if (this.isBinaryResponseComplete(cmd, frame)) {
+              clearTimeout(timeoutId);
+              queueCompletion();
+            }
+            return;
+          }
 
-          if (this.isTextResponseComplete(cmd, dataSoFar)) {
+          // Standard case for most commands: a text reply terminated by "ok"
+          if (this.isTextResponseComplete(cmd, frame)) {
             clearTimeout(timeoutId);
-            queueCleanup(false);
+            queueCompletion();
             return;
           }
 
           if (this.shouldUseInactivityCompletion(cmd)) {
             if (settleTimeoutId) clearTimeout(settleTimeoutId);
-            settleTimeoutId = setTimeout(() => {
-              clearTimeout(timeoutId);
-              cleanup(true);
-            }, this.getInactivityCompletionDelayMs(cmd));
-          }
-        } else {
-          const fullBufferSoFar = Buffer.concat(answer);
-          if (this.isBinaryResponseComplete(cmd, fullBufferSoFar)) {
-            clearTimeout(timeoutId);
-            queueCleanup(true);
+            settleTimeoutId = setTimeout(
+              () => finish(true),
+              this.getInactivityCompletionDelayMs(cmd)
+            );
           }
-        }
+        },
+        onError: (err: Error) => {
+          log.error('Error receiving multi-line command reply:', err);
+          finish(false, err);
+        },
+        cancel: (reason: string) => finish(false, new Error(reason)),
       };
 
-      const errorHandler = (err: Error) => {
-        console.error('Error receiving multi-line command reply:', err);
-        clearTimeout(timeoutId);
-        cleanup(false, err);
+      // The command is already on the wire, so its reply will still arrive. Keep collecting it
+      // until it completes or times out; the scheduler holds the next command back until then.
+      const abortHandler = () => {
+        abandoned = true;
+        log.debug(`Reply to ${cmd} abandoned; discarding it as it arrives.`);
       };
 
-      const cleanup = (success: boolean, error?: Error) => {
-        // Remove our listeners properly
-        this.socket?.removeListener('data', dataHandler);
-        this.socket?.removeListener('error', errorHandler);
-        if (settleTimeoutId) {
-          clearTimeout(settleTimeoutId);
-          settleTimeoutId = null;
-        }
+      const timeoutDuration = this.getCommandTimeoutMs(cmd);
+      socket.setTimeout(timeoutDuration);
+      const timeoutId = setTimeout(() => {
+        log.error(`ReceiveMultiLineReplayAsync timed out after ${timeoutDuration}ms`);
+        this.countFailure('timeouts', 'tcp.timeout');
+        finish(false, new Error(`Timed out after ${timeoutDuration}ms`));
+      }, timeoutDuration);
 
-        if (!success) {
-          console.error('Failed to receive complete response:', error?.message);
-          resolve(null);
-          return;
-        }
+      this.pendingReply = pending;
+      if (signal?.aborted) {
+        abortHandler();
+      } else {
+        signal?.addEventListener('abort', abortHandler);
+      }
+    });
+  }
 
-        // For binary responses (M662), return the raw buffer as a binary string
-        if (cmd.startsWith(GCodes.CmdGetThumbnail)) {
-          const result = Buffer.concat(answer).toString('binary');
-          if (!result) {
-            console.error('Received empty thumbnail response.');
-            resolve(null);
-          } else {
-            resolve(result);
-          }
-        } else {
-          // For text responses, convert to UTF-8
-          const result = this.normalizeTextResponse(
-            cmd,
-            Buffer.concat(answer).toString('utf8')
-          );
-          if (!result) {
-            console.error('ReceiveMultiLineReplayAsync received an empty response.');
-            resolve(null);
-          } else {
-            resolve(result);
-          }
-        }
-      };
+  /**
+   * Attaches the persistent `data`/`error` listeners that forward socket events to the reply
+   * being collected. Listeners are attached once per socket instead of once per command.
+   * @private
+   */
+  private ensureReplyListeners(socket: net.Socket): void {
+    if (this.listeningSocket === socket) return;
+    this.listeningSocket = socket;
 
-      const timeoutDuration = this.getCommandTimeoutMs(cmd);
-      if (this.socket) {
-        this.socket.setTimeout(timeoutDuration);
+    socket.on('data', (chunk: Buffer) => {
+      // Late data from a replaced socket must not leak into the next command's reply
+      if (this.socket === socket) this.pendingReply?.onData(chunk);
+    });
+    socket.on('error', (error: Error) => {
+      if (this.socket === socket) this.pendingReply?.onError(error);
+    });
+  }
+
+  /**
+   * Converts a framed reply into the string returned by {@link sendCommandAsync}.
+   * Binary replies (M662) are returned as a `'binary'` string for backward compatibility;
+   * use {@link sendBinaryCommandAsync} to get the bytes directly.
+   * @private
+   */
+  private decodeReply(cmd: string, frame: ResponseFrameDecoder): string | null {
+    if (this.isBinaryCommand(cmd)) {
+      const result = frame.bytes().toString('binary');
+      if (!result) {
+        log.error('Received empty thumbnail response.');
+        return null;
       }
+      return result;
+    }
 
-      timeoutId = setTimeout(() => {
-        console.error(`ReceiveMultiLineReplayAsync timed out after ${timeoutDuration}ms`);
-        cleanup(false);
-      }, timeoutDuration);
+    // For text responses, convert to UTF-8
+    const result = this.normalizeTextResponse(cmd, frame.bytes().toString('utf8'));
+    if (!result) {
+      log.error('ReceiveMultiLineReplayAsync received an empty response.');
+      return null;
+    }
+    return result;
+  }
 
-      // Add listeners
-      this.socket?.on('data', dataHandler);
-      this.socket?.on('error', errorHandler);
-    });
+  /**
+   * Returns the reply bytes of a binary command as a view into the framed reply.
+   * @private
+   */
+  private decodeBinaryReply(frame: ResponseFrameDecoder): Buffer | null {
+    if (frame.length === 0) {
+      log.error('Received empty thumbnail response.');
+      return null;
+    }
+    return frame.bytes();
   }
 
   /**
@@ -493,9 +861,10 @@ export class FlashForgeTcpClient {
   /**
    * Determines when a text response is complete.
    * The default FlashForge protocol terminates command replies with `ok`.
+   * Called on every `data` event; use `response.findMarker` so only new bytes are scanned.
    */
-  protected isTextResponseComplete(_cmd: string, response: string): boolean {
-    return response.includes('ok');
+  protected isTextResponseComplete(_cmd: string, response: ResponseFrameDecoder): boolean {
+    return response.findMarker(OK_MARKER) !== -1;
   }
 
   /**
@@ -528,17 +897,13 @@ export class FlashForgeTcpClient {
   }
 
   /**
-   * Determines whether a binary response buffer is complete.
-   * The default behavior waits for `ok` in the leading header bytes.
+   * Determines whether a binary response is complete.
+   * The default behavior waits for `ok` in the leading 100 header bytes.
+   * Called on every `data` event; use `response.findMarker` so only new bytes are scanned.
    */
-  protected isBinaryResponseComplete(_cmd: string, response: Buffer): boolean {
-    try {
-      const header = response.subarray(0, 100).toString('ascii');
-      return header.includes('ok');
-    } catch (error) {
-      console.log(`Error checking binary response header: ${error}`);
-      return false;
-    }
+  protected isBinaryResponseComplete(_cmd: string, response: ResponseFrameDecoder): boolean {
+    const okOffset = response.findMarker(OK_MARKER);
+    return okOffset !== -1 && okOffset + OK_MARKER.length <= 100;
   }
 
   /**
@@ -549,6 +914,37 @@ export class FlashForgeTcpClient {
     return response;
   }
 
+  /**
+   * Returns the scheduling priority for a command that was sent without an explicit priority.
+   * Emergency stop jumps ahead of everything, job control (pause, resume, stop) ahead of regular
+   * commands, and status polls yield to both.
+   */
+  protected getCommandPriority(cmd: string): CommandPriority {
+    switch (this.getCommandCode(cmd)) {
+      case 'M112':
+        return CommandPriority.Emergency;
+      case 'M24':
+      case 'M25':
+      case 'M26':
+        return CommandPriority.Control;
+      case 'M27':
+      case 'M105':
+      case 'M114':
+      case 'M115':
+      case 'M119':
+        return CommandPriority.Telemetry;
+      default:
+        return CommandPriority.Normal;
+    }
+  }
+
+  /**
+   * Returns the command code without the `~` prefix or arguments, e.g. `M115`.
+   */
+  protected getCommandCode(cmd: string): string {
+    return cmd.trim().replace(/^~/, '').split(/\s+/, 1)[0].toUpperCase();
+  }
+
   /**
    * Returns the socket timeout to use for a given command.
    */
@@ -568,16 +964,37 @@ export class FlashForgeTcpClient {
   /**
    * Retrieves a list of G-code files stored on the printer's local storage.
    * Sends the `GCodes.CmdListLocalFiles` (M661) command and parses the response.
+   * The list is reused from {@link fileCache} for a short TTL, and thumbnails of files missing
+   * from a fresh list are dropped from the cache.
    * @returns A Promise that resolves to an array of file names (strings, without '/data/' prefix).
    *          Returns an empty array if the command fails or no files are found.
    */
   public async getFileListAsync(): Promise<string[]> {
-    const response = await this.sendCommandAsync(GCodes.CmdListLocalFiles);
-    if (response) {
-      return this.parseFileListResponse(response);
-    }
+    const files = await this.fileCache.getFileList(
+      'm661',
+      async () => {
+        const response = await this.sendCommandAsync(GCodes.CmdListLocalFiles);
+        return response ? this.parseFileListResponse(response) : null;
+      },
+      (name) => ({ name, version: '' }),
+      true
+    );
+    return files ? files.slice() : [];
+  }
 
-    return [];
+  /**
+   * Gets a thumbnail through {@link fileCache}: cached PNG bytes are returned while the file is
+   * unchanged, and concurrent requests for the same file share one M662 exchange.
+   * @param fileName The file name, with or without the `/data/` prefix.
+   * @param fetch Sends M662 for the file and extracts the PNG bytes, or resolves to null.
+   * @returns A Promise that resolves to the PNG bytes, or null if there is no thumbnail.
+   */
+  protected getCachedThumbnail(
+    fileName: string,
+    fetch: () => Promise<Buffer | null>
+  ): Promise<Buffer | null> {
+    const name = fileName.startsWith('/data/') ? fileName.substring(6) : fileName;
+    return this.fileCache.getThumbnail(name, fetch);
   }
 
   /**
@@ -617,32 +1034,41 @@ export class FlashForgeTcpClient {
     return filePaths;
   }
 
-  private async writeSocketData(data: Buffer | string): Promise<void> {
-    if (!this.socket || this.socket.destroyed) {
+  /**
+   * Writes raw upload data. Waits for `drain` only when the socket's write buffer is full, so
+   * chunks are queued back to back instead of waiting for each one to flush.
+   * @private
+   */
+  private async writeUploadChunk(chunk: Buffer, signal: AbortSignal): Promise<void> {
+    const socket = this.socket;
+    if (!socket || socket.destroyed) {
       throw new Error('Socket is unavailable for raw upload data.');
     }
+    if (socket.write(chunk)) {
+      return;
+    }
 
     await new Promise<void>((resolve, reject) => {
-      if (Buffer.isBuffer(data)) {
-        this.socket?.write(data, (err) => {
-          if (err) {
-            reject(err);
-            return;
-          }
-
-          resolve();
-        });
-        return;
-      }
-
-      this.socket?.write(data, 'ascii', (err) => {
-        if (err) {
-          reject(err);
-          return;
-        }
-
+      const cleanup = () => {
+        socket.off('drain', onDrain);
+        socket.off('close', onClose);
+        signal.removeEventListener('abort', onAbort);
+      };
+      const onDrain = () => {
+        cleanup();
         resolve();
-      });
+      };
+      const onClose = () => {
+        cleanup();
+        reject(new Error('Socket closed during upload.'));
+      };
+      const onAbort = () => {
+        cleanup();
+        reject(new Error('Upload was aborted.'));
+      };
+      socket.on('drain', onDrain);
+      socket.on('close', onClose);
+      signal.addEventListener('abort', onAbort, { once: true });
     });
   }
 
@@ -687,13 +1113,15 @@ export class FlashForgeTcpClient {
    */
   public async dispose(): Promise<void> {
     try {
-      console.log('TcpPrinterClient closing socket');
+      log.debug('TcpPrinterClient closing socket');
+      this.disposed = true;
 
       // First stop the keep-alive loop
       this.keepAliveCancellationToken = true;
+      this.cancelKeepAlive();
 
       // Send logout command if socket is available and not busy
-      if (this.socket && !this.socket.destroyed && !this.socketBusy) {
+      if (this.socket && !this.socket.destroyed && !this.commandScheduler.isBusy()) {
         try {
           await this.sendCommandAsync(GCodes.CmdLogout);
         } catch (_error) {
@@ -701,16 +1129,20 @@ export class FlashForgeTcpClient {
         }
       }
 
-      // Now destroy the socket
+      // Commands still waiting would otherwise reopen the socket after disposal
+      this.commandScheduler.clear('Client disposed');
+
+      // Now destroy the socket; a reply still being collected will never complete
       if (this.socket) {
         this.socket.destroy();
         this.socket = null;
       }
+      this.pendingReply?.cancel('Client disposed');
 
-      console.log('Keep-alive stopped.');
+      log.debug('Keep-alive stopped.');
     } catch (error: unknown) {
       const err = error as Error;
-      console.log(err.message);
+      log.warn(`Error stopping keep-alive: ${err.message}`);
     }
   }
 }
@@ -0,0 +1,76 @@
+/**
+ * @fileoverview Tests for ResponseFrameDecoder chunk accumulation and incremental marker search.
+ */
+import { describe, expect, it } from 'vitest';
+import { OK_MARKER, ResponseFrameDecoder } from './ResponseFrameDecoder';
+
+describe('ResponseFrameDecoder', () => {
+  it('keeps a single-chunk reply without copying it', () => {
+    const chunk = Buffer.from('CMD M105 Received.\nT0:200/200 B:60/60\nok\n', 'ascii');
+    const frame = new ResponseFrameDecoder();
+
+    frame.append(chunk);
+
+    expect(frame.length).toBe(chunk.length);
+    expect(frame.bytes().buffer).toBe(chunk.buffer);
+    expect(frame.bytes().byteOffset).toBe(chunk.byteOffset);
+  });
+
+  it('accumulates many chunks in order', () => {
+    const frame = new ResponseFrameDecoder();
+    const parts: Buffer[] = [];
+    for (let i = 0; i < 500; i++) {
+      const part = Buffer.from(`::/data/file-${i}.gcode`, 'ascii');
+      parts.push(part);
+      frame.append(part);
+    }
+
+    expect(frame.bytes().equals(Buffer.concat(parts))).toBe(true);
+  });
+
+  it('finds a marker split across chunks', () => {
+    const frame = new ResponseFrameDecoder();
+
+    frame.append(Buffer.from('CMD M27 Received.\nSD printing byte 0/100\no', 'ascii'));
+    expect(frame.findMarker(OK_MARKER)).toBe(-1);
+
+    frame.append(Buffer.from('k\n', 'ascii'));
+    expect(frame.findMarker(OK_MARKER)).toBe(frame.length - 3);
+  });
+
+  it('keeps reporting the first match once found', () => {
+    const frame = new ResponseFrameDecoder();
+
+    frame.append(Buffer.from('ok\n', 'ascii'));
+    expect(frame.findMarker(OK_MARKER)).toBe(0);
+
+    frame.append(Buffer.from('more data ok\n', 'ascii'));
+    expect(frame.findMarker(OK_MARKER)).toBe(0);
+  });
+
+  it('tracks several markers independently', () => {
+    const magic = Buffer.from([0xa2, 0xa2, 0x2a, 0x2a]);
+    const frame = new ResponseFrameDecoder();
+
+    frame.append(Buffer.from('CMD M662 Received.\nok\n', 'ascii'));
+    expect(frame.findMarker(OK_MARKER)).toBe(19);
+    expect(frame.findMarker(magic)).toBe(-1);
+
+    frame.append(Buffer.from([0xa2, 0xa2]));
+    frame.append(Buffer.from([0x2a, 0x2a, 0x00, 0x00, 0x00, 0x04]));
+    expect(frame.findMarker(magic)).toBe(22);
+    expect(frame.findMarker(OK_MARKER)).toBe(19);
+  });
+
+  it('does not overwrite a view handed out before more data arrives', () => {
+    const frame = new ResponseFrameDecoder();
+    frame.append(Buffer.from('first', 'ascii'));
+    frame.append(Buffer.from('-second', 'ascii'));
+    const snapshot = frame.bytes();
+
+    frame.append(Buffer.alloc(4096, 0x78));
+
+    expect(snapshot.toString('ascii')).toBe('first-second');
+    expect(frame.bytes().subarray(0, 12).toString('ascii')).toBe('first-second');
+  });
+});
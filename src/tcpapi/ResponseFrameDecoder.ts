@@ -0,0 +1,98 @@
+/**
+ * @fileoverview Incremental frame accumulator for TCP command replies. Collects socket chunks into
+ * one growing buffer and finds delimiter markers by scanning only the bytes that arrived since
+ * the previous search.
+ */
+
+/** The `ok` terminator that ends most FlashForge command replies. */
+export const OK_MARKER = Buffer.from('ok', 'ascii');
+
+/**
+ * Accumulates the chunks of a single command reply.
+ *
+ * A reply that arrives in one chunk is kept as that chunk without copying. Later chunks are copied
+ * once into a buffer whose capacity doubles as needed, so collecting a reply costs O(n) rather
+ * than re-concatenating every chunk on each `data` event. Marker lookups are memoized per marker
+ * and resume where the previous lookup stopped, so completion checks also stay linear.
+ *
+ * The buffer returned by {@link bytes} is a view into the decoder's storage. Use a new decoder
+ * for each reply; the decoder never overwrites bytes it has already handed out.
+ */
+export class ResponseFrameDecoder {
+  /** Backing storage; may be larger than the reply. */
+  private storage: Buffer = Buffer.alloc(0);
+  /** Number of reply bytes in `storage`. */
+  private byteLength = 0;
+  /** Per-marker search state: first match offset (or -1) and where the next search resumes. */
+  private readonly markers = new Map<string, { offset: number; resumeAt: number }>();
+
+  /** Number of reply bytes received so far. */
+  public get length(): number {
+    return this.byteLength;
+  }
+
+  /**
+   * Appends a socket chunk to the reply.
+   * @param chunk Bytes received from the socket.
+   */
+  public append(chunk: Buffer): void {
+    if (chunk.length === 0) return;
+
+    if (this.byteLength === 0) {
+      // Single-chunk replies (the common case) are never copied.
+      this.storage = chunk;
+      this.byteLength = chunk.length;
+      return;
+    }
+
+    // A borrowed first chunk is exactly full, so the second chunk always moves the reply into
+    // storage of our own before anything is written.
+    const required = this.byteLength + chunk.length;
+    if (required > this.storage.length) {
+      this.grow(required);
+    }
+
+    chunk.copy(this.storage, this.byteLength);
+    this.byteLength = required;
+  }
+
+  /**
+   * Returns the reply received so far as a view, without copying.
+   */
+  public bytes(): Buffer {
+    return this.storage.subarray(0, this.byteLength);
+  }
+
+  /**
+   * Finds the first occurrence of a marker in the reply.
+   * Only bytes that arrived since the previous lookup of the same marker are scanned (plus an
+   * overlap of `marker.length - 1` bytes, so markers split across chunks are found). Once found,
+   * the offset is cached.
+   * @param marker Byte sequence to look for.
+   * @returns Offset of the first occurrence, or -1 if it has not arrived yet.
+   */
+  public findMarker(marker: Buffer): number {
+    const key = marker.toString('latin1');
+    let state = this.markers.get(key);
+    if (!state) {
+      state = { offset: -1, resumeAt: 0 };
+      this.markers.set(key, state);
+    }
+
+    if (state.offset === -1 && this.byteLength >= marker.length) {
+      const start = Math.max(0, state.resumeAt - (marker.length - 1));
+      state.offset = this.bytes().indexOf(marker, start);
+      state.resumeAt = this.byteLength;
+    }
+
+    return state.offset;
+  }
+
+  /** Moves the reply into a freshly allocated buffer of at least `required` bytes. */
+  private grow(required: number): void {
+    const capacity = Math.max(required, this.storage.length * 2, 1024);
+    const next = Buffer.allocUnsafe(capacity);
+    this.storage.copy(next, 0, 0, this.byteLength);
+    this.storage = next;
+  }
+}
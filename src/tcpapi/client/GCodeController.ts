@@ -2,6 +2,7 @@
  * @fileoverview Abstraction layer for sending specific G-code commands to FlashForge printers,
  * wrapping operations like LED control, job management, homing, and temperature control.
  */
+import { log } from '../../diagnostics/Logger';
 import type { GCodeClientCapabilities } from './GCodeClientCapabilities';
 import { GCodes } from './GCodes';
 
@@ -197,7 +198,7 @@ export class GCodeController<TClient extends GCodeClientCapabilities = GCodeClie
       await new Promise((resolve) => setTimeout(resolve, 1000)); // Poll every second
     }
 
-    console.log(`WaitForBedTemp (target ${temp}) timed out after 30s.`);
+    log.warn(`WaitForBedTemp (target ${temp}) timed out after 30s.`);
     return false;
   }
 
@@ -221,7 +222,7 @@ export class GCodeController<TClient extends GCodeClientCapabilities = GCodeClie
       await new Promise((resolve) => setTimeout(resolve, 1000)); // Poll every second
     }
 
-    console.log(`WaitForExtruderTemp (target ${temp}) timed out after 30s.`);
+    log.warn(`WaitForExtruderTemp (target ${temp}) timed out after 30s.`);
     return false;
   }
 }
@@ -1,6 +1,8 @@
 /**
  * @fileoverview Parses M119 command responses to extract endstop states, machine status, movement mode, and LED state.
  */
+import { log } from '../../diagnostics/Logger';
+
 /**
  * Represents the status of the printer's endstops and various other machine states.
  * This information is typically parsed from the response of an M119 command or a similar
@@ -87,7 +89,7 @@ export class EndstopStatus {
         this._MachineStatus = MachineStatus.READY;
       else if (machineStatus.includes('BUSY')) this._MachineStatus = MachineStatus.BUSY;
       else {
-        console.log(`EndstopStatus Encountered unknown MachineStatus: ${machineStatus}`);
+        log.debug(`EndstopStatus Encountered unknown MachineStatus: ${machineStatus}`);
         this._MachineStatus = MachineStatus.DEFAULT;
       }
 
@@ -99,7 +101,7 @@ export class EndstopStatus {
       else if (moveM.includes('WAIT_ON_TOOL')) this._MoveMode = MoveMode.WAIT_ON_TOOL;
       else if (moveM.includes('HOMING')) this._MoveMode = MoveMode.HOMING;
       else {
-        console.log(`EndstopStatus Encountered unknown MoveMode: ${moveM}`);
+        log.debug(`EndstopStatus Encountered unknown MoveMode: ${moveM}`);
         this._MoveMode = MoveMode.DEFAULT;
       }
 
@@ -125,8 +127,8 @@ export class EndstopStatus {
 
       return this;
     } catch (_e) {
-      console.log('Unable to create EndstopStatus instance from replay');
-      console.log(replay);
+      log.warn('Unable to create EndstopStatus instance from replay');
+      log.debug(replay);
       return null;
     }
   }
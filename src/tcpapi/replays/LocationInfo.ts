@@ -1,6 +1,8 @@
 /**
  * @fileoverview Parses M114 command responses to extract current print head X, Y, Z coordinates.
  */
+import { log } from '../../diagnostics/Logger';
+
 /**
  * Represents the current X, Y, and Z coordinates of the printer's print head.
  * This information is typically parsed from the response of an M114 G-code command,
@@ -47,7 +49,7 @@ export class LocationInfo {
       this.Z = zMatch[1];
       return this;
     } catch (_error) {
-      console.log('LocationInfo replay has bad/null data');
+      log.debug('LocationInfo replay has bad/null data');
       return null;
     }
   }
@@ -1,6 +1,8 @@
 /**
  * @fileoverview Parses M27 command responses to extract print job progress including SD card bytes and layer counts.
  */
+import { log } from '../../diagnostics/Logger';
+
 /**
  * Represents the status of an ongoing print job, including SD card byte progress and layer progress.
  * This information is typically parsed from the response of an M27 G-code command,
@@ -41,13 +43,13 @@ export class PrintStatus {
 
       const sdLine = lines.find((line) => line.startsWith('SD printing byte'));
       if (!sdLine) {
-        console.log('Error parsing print status');
+        log.warn('Error parsing print status');
         return null;
       }
 
       const sdMatch = sdLine.match(/SD printing byte\s+(\d+)\s*\/\s*(\d+)/i);
       if (!sdMatch) {
-        console.log('Error parsing print status');
+        log.warn('Error parsing print status');
         return null;
       }
 
@@ -64,8 +66,8 @@ export class PrintStatus {
 
       const layerMatch = layerLine.match(/Layer:\s*(\d+)\s*\/\s*(\d+)/i);
       if (!layerMatch) {
-        console.log('PrintStatus bad layer progress');
-        console.log(`layerProgress: ${layerLine}`);
+        log.debug('PrintStatus bad layer progress');
+        log.debug(`layerProgress: ${layerLine}`);
         return null;
       }
 
@@ -73,7 +75,7 @@ export class PrintStatus {
       this._layerTotal = layerMatch[2].trim();
       return this;
     } catch (_error) {
-      console.log('Error parsing print status');
+      log.warn('Error parsing print status');
       return null;
     }
   }
@@ -1,6 +1,8 @@
 /**
  * @fileoverview Parses M115 command responses to extract printer information including model, firmware, serial number, and dimensions.
  */
+import { log } from '../../diagnostics/Logger';
+
 /**
  * Represents general information about the FlashForge 3D printer,
  * such as its type, name, firmware version, serial number, dimensions, and MAC address.
@@ -72,17 +74,17 @@ export class PrinterInfo {
       }
 
       if (!this.TypeName) {
-        console.log('PrinterInfo replay has null Machine Type');
+        log.debug('PrinterInfo replay has null Machine Type');
         return null;
       }
       if (!this.FirmwareVersion) {
-        console.log('PrinterInfo replay has null firmware version');
+        log.debug('PrinterInfo replay has null firmware version');
         return null;
       }
 
       return this;
     } catch (_error) {
-      console.log('Error creating PrinterInfo instance from replay');
+      log.warn('Error creating PrinterInfo instance from replay');
       return null;
     }
   }
@@ -1,6 +1,8 @@
 /**
  * @fileoverview Parses M105 command responses to extract extruder and bed temperatures with current and target values.
  */
+import { log } from '../../diagnostics/Logger';
+
 /**
  * Represents the temperature information for the printer's extruder and bed.
  * This data is typically parsed from the response of an M105 G-code command,
@@ -39,7 +41,7 @@ export class TempInfo {
         (line) => line.includes('T0:') || line.includes('T:') || line.includes('T):')
       );
       if (!temperatureLine) {
-        console.log(`TempInfo replay has invalid data?: ${lines.join(' | ')}`);
+        log.warn(`TempInfo replay has invalid data?: ${lines.join(' | ')}`);
         return null;
       }
 
@@ -69,7 +71,7 @@ export class TempInfo {
       if (extruderDataStr) {
         this._extruderTemp = new TempData(extruderDataStr);
       } else {
-        console.log(`No extruder temperature found in replay data: ${replay}`);
+        log.debug(`No extruder temperature found in replay data: ${replay}`);
         return null; // Extruder temp is critical
       }
 
@@ -77,17 +79,17 @@ export class TempInfo {
       if (bedDataStr) {
         this._bedTemp = new TempData(bedDataStr);
       } else {
-        console.log(`No bed temperature found in replay data, defaulting to 0/0: ${replay}`);
+        log.debug(`No bed temperature found in replay data, defaulting to 0/0: ${replay}`);
         this._bedTemp = new TempData('0/0'); // Default if not present
       }
 
       return this;
     } catch (error) {
-      console.log(
+      log.warn(
         'Unable to create TempInfo instance from replay: ' +
           (error instanceof Error ? error.message : String(error))
       );
-      console.log(`Raw replay data: ${replay}`);
+      log.debug(`Raw replay data: ${replay}`);
       return null;
     }
   }
@@ -49,6 +49,17 @@ describe('ThumbnailInfo', () => {
       expect(result?.getImageData()).not.toBeNull();
     });
 
+    it('should parse a Buffer reply without copying the image bytes', () => {
+      const pngSignature = Buffer.from([0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a, 0x01]);
+      const reply = Buffer.concat([Buffer.from('CMD M662 Received.\nok', 'ascii'), pngSignature]);
+
+      const result = new ThumbnailInfo().fromReplay(reply, 'test.gcode');
+
+      const image = result?.getImageBuffer();
+      expect(image?.equals(pngSignature)).toBe(true);
+      expect(image?.buffer).toBe(reply.buffer);
+    });
+
     it('should return null when no "ok" is found', () => {
       const thumbnailInfo = new ThumbnailInfo();
       const result = thumbnailInfo.fromReplay('invalid response', 'test.gcode');
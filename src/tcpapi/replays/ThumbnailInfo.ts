@@ -3,6 +3,12 @@
  */
 import * as fs from 'node:fs';
 import * as path from 'node:path';
+import { log } from '../../diagnostics/Logger';
+
+/** Text delimiter that precedes the binary payload. */
+const OK_DELIMITER = Buffer.from('ok', 'ascii');
+/** PNG file signature. */
+const PNG_SIGNATURE = Buffer.from([0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a]);
 
 /**
  * Handles the parsing, storage, and manipulation of 3D print file thumbnail images.
@@ -17,69 +23,49 @@ export class ThumbnailInfo {
   private _fileName: string | null = null;
 
   /**
-   * Parses thumbnail data from a raw printer response string.
+   * Parses thumbnail data from a raw printer response.
    * The method expects the response to contain an "ok" text delimiter, after which
    * the binary PNG data begins. It searches for the PNG signature (0x89 PNG)
    * within the binary portion to correctly extract the image.
    *
-   * @param replay The raw string response from the printer, which may include text and binary data.
+   * @param replay The raw printer response, which may include text and binary data. A Buffer
+   *               (as returned by `sendBinaryCommandAsync`) is used without copying; a string
+   *               is read as a `'binary'` string.
    * @param fileName The name of the file for which the thumbnail was retrieved. This is stored for reference.
    * @returns A `ThumbnailInfo` instance populated with the image data if parsing is successful,
    *          or null if the replay is invalid, "ok" is not found, or the PNG signature is missing.
    */
-  public fromReplay(replay: string, fileName: string): ThumbnailInfo | null {
-    if (!replay) return null;
+  public fromReplay(replay: string | Buffer, fileName: string): ThumbnailInfo | null {
+    if (!replay || replay.length === 0) return null;
 
     try {
       // Store the file name
       this._fileName = fileName;
 
+      // The printer sends binary data as part of its reply; string replies carry it as 'binary'.
+      const replyBuffer = typeof replay === 'string' ? Buffer.from(replay, 'binary') : replay;
+
       // Find where the PNG data starts (after the "ok" text delimiter)
-      const okIndex = replay.indexOf('ok');
+      const okIndex = replyBuffer.indexOf(OK_DELIMITER);
       if (okIndex === -1) {
-        console.log("ThumbnailInfo: No 'ok' found in response");
+        log.debug("ThumbnailInfo: No 'ok' found in response");
         return null;
       }
 
-      // Skip the 'ok' text and any immediately following control characters
-      // The actual binary data starts after "ok".
-      const binaryStartIndex = okIndex + 2; // Length of "ok"
-      const rawBinaryData = replay.substring(binaryStartIndex);
-
-      // Convert the extracted string part (assumed to be binary) into a Buffer.
-      // The printer sends binary data as part of a string reply.
-      const binaryBuffer = Buffer.from(rawBinaryData, 'binary');
-
-      // Look for the PNG file signature (89 50 4E 47 0D 0A 1A 0A) in the buffer
+      // Look for the PNG file signature (89 50 4E 47 0D 0A 1A 0A) after "ok"
       // to correctly identify the start of the actual image data.
-      let pngStart = -1;
-      for (let i = 0; i < binaryBuffer.length - 7; i++) {
-        // Ensure there's enough space for the full signature
-        if (
-          binaryBuffer[i] === 0x89 &&
-          binaryBuffer[i + 1] === 0x50 &&
-          binaryBuffer[i + 2] === 0x4e &&
-          binaryBuffer[i + 3] === 0x47 &&
-          binaryBuffer[i + 4] === 0x0d &&
-          binaryBuffer[i + 5] === 0x0a &&
-          binaryBuffer[i + 6] === 0x1a &&
-          binaryBuffer[i + 7] === 0x0a
-        ) {
-          pngStart = i;
-          break;
-        }
-      }
+      const pngStart = replyBuffer.indexOf(PNG_SIGNATURE, okIndex + OK_DELIMITER.length);
 
       if (pngStart >= 0) {
-        // Slice the buffer from the start of the PNG signature to get the clean image data.
-        this._imageData = binaryBuffer.slice(pngStart);
+        // View from the start of the PNG signature to the end of the reply (no copy).
+        this._imageData = replyBuffer.subarray(pngStart);
         return this;
       } else {
-        console.log('ThumbnailInfo: No PNG signature found in binary data.');
+        log.debug('ThumbnailInfo: No PNG signature found in binary data.');
         return null;
       }
     } catch (error) {
-      console.error(
+      log.error(
         'ThumbnailInfo: Error parsing response:',
         error instanceof Error ? error.message : String(error)
       );
@@ -87,6 +73,27 @@ export class ThumbnailInfo {
     }
   }
 
+  /**
+   * Populates this instance from PNG bytes that were already extracted from a reply, such as a
+   * thumbnail served from the file cache.
+   * @param imageData The PNG image data.
+   * @param fileName The name of the file the thumbnail belongs to.
+   * @returns This `ThumbnailInfo` instance.
+   */
+  public fromImageData(imageData: Buffer, fileName: string): ThumbnailInfo {
+    this._imageData = imageData;
+    this._fileName = fileName;
+    return this;
+  }
+
+  /**
+   * Gets the raw thumbnail image bytes.
+   * @returns The PNG image data, or null if no image data is available.
+   */
+  public getImageBuffer(): Buffer | null {
+    return this._imageData;
+  }
+
   /**
    * Gets the raw thumbnail image data as a Base64 encoded string.
    * @returns A Base64 encoded string of the PNG image data, or null if no image data is available.
@@ -126,7 +133,7 @@ export class ThumbnailInfo {
    */
   public async saveToFile(filePath?: string): Promise<boolean> {
     if (!this._imageData) {
-      console.log('ThumbnailInfo: No image data to save');
+      log.debug('ThumbnailInfo: No image data to save');
       return false;
     }
 
@@ -139,16 +146,16 @@ export class ThumbnailInfo {
       }
 
       if (!filePath) {
-        console.log('ThumbnailInfo: No file path provided and no filename to generate one from');
+        log.debug('ThumbnailInfo: No file path provided and no filename to generate one from');
         return false;
       }
 
       // Write the buffer to file
       fs.writeFileSync(filePath, this._imageData);
-      console.log(`ThumbnailInfo: Saved thumbnail to ${filePath}`);
+      log.debug(`ThumbnailInfo: Saved thumbnail to ${filePath}`);
       return true;
     } catch (error) {
-      console.log(
+      log.warn(
         'ThumbnailInfo: Error saving thumbnail to file: ' +
           (error instanceof Error ? error.message : String(error))
       );
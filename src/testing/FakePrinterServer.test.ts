@@ -0,0 +1,90 @@
+/**
+ * @fileoverview Tests for the fake printer's TCP replies: fragmented delivery, the M661 file list
+ * layout and both M662 thumbnail layouts, checked end to end through the real TCP clients.
+ */
+import type { Socket } from 'node:net';
+import { afterAll, afterEach, beforeAll, describe, expect, it, vi } from 'vitest';
+import { FlashForgeA3Client } from '../tcpapi/FlashForgeA3Client';
+import { FlashForgeClient } from '../tcpapi/FlashForgeClient';
+import { FakePrinterServer } from './FakePrinterServer';
+
+// Suppress client connection logs during tests
+const originalConsole = { ...console };
+beforeAll(() => {
+  console.log = vi.fn();
+  console.error = vi.fn();
+});
+
+afterAll(() => {
+  console.log = originalConsole.log;
+  console.error = originalConsole.error;
+});
+
+/** A fake PNG large enough to span many fragments. */
+const thumbnail = Buffer.concat([
+  Buffer.from([0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a]),
+  Buffer.alloc(4096, 7),
+]);
+
+describe('FakePrinterServer TCP replies', () => {
+  let printer: FakePrinterServer;
+  let client: FlashForgeClient | FlashForgeA3Client | null = null;
+
+  afterEach(async () => {
+    await client?.dispose();
+    client = null;
+    await printer.stop();
+  });
+
+  it('delivers a fragmented reply that the client reassembles', async () => {
+    printer = new FakePrinterServer({ tcpChunkSize: 8, tcpChunkDelayMs: 1 });
+    await printer.start();
+    const chunks: Buffer[] = [];
+    const tcp = new FlashForgeClient(printer.host, { port: printer.tcpPort });
+    client = tcp;
+    // @ts-expect-error - observe the raw socket the client reads from
+    (tcp.socket as Socket).on('data', (chunk: Buffer) => chunks.push(chunk));
+
+    const info = await tcp.getPrinterInfo();
+
+    expect(info?.SerialNumber).toBe(printer.serialNumber);
+    expect(chunks.length).toBeGreaterThan(10);
+    expect(Math.max(...chunks.map((chunk) => chunk.length))).toBeLessThanOrEqual(8);
+  });
+
+  it('lists files in the Adventurer 5M M661 layout', async () => {
+    printer = new FakePrinterServer({ files: ['benchy.gcode', 'Part 2 (PETG).3mf'] });
+    await printer.start();
+    const tcp = new FlashForgeClient(printer.host, { port: printer.tcpPort });
+    client = tcp;
+
+    await expect(tcp.getFileListAsync()).resolves.toEqual(['benchy.gcode', 'Part 2 (PETG).3mf']);
+  });
+
+  it('serves an Adventurer 3 M662 thumbnail split across fragments', async () => {
+    printer = new FakePrinterServer({
+      thumbnail,
+      thumbnailFormat: 'adventurer3',
+      tcpChunkSize: 512,
+    });
+    await printer.start();
+    const tcp = new FlashForgeA3Client(printer.host, { port: printer.tcpPort });
+    client = tcp;
+
+    const result = await tcp.getThumbnail('benchy.gcode');
+
+    expect(result?.data).toEqual(thumbnail);
+    expect(printer.getTcpCommandCount('M662')).toBe(1);
+  });
+
+  it('serves an Adventurer 5M M662 thumbnail after the ok line', async () => {
+    printer = new FakePrinterServer({ thumbnail });
+    await printer.start();
+    const tcp = new FlashForgeClient(printer.host, { port: printer.tcpPort });
+    client = tcp;
+
+    const reply = await tcp.sendBinaryCommandAsync('~M662 /data/benchy.gcode');
+
+    expect(reply?.subarray(reply.indexOf(thumbnail.subarray(0, 8)))).toEqual(thumbnail);
+  });
+});
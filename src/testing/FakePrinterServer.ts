@@ -0,0 +1,547 @@
+/**
+ * @fileoverview In-process fake FlashForge printer for integration tests and benchmarks. Serves the
+ * 8898 HTTP API endpoints and answers the 8899 TCP command channel on loopback ports, so clients
+ * can be exercised end to end without hardware. TCP replies can be split into small delayed
+ * fragments to exercise reply framing the way a slow network does.
+ */
+import { EventEmitter } from 'node:events';
+import * as http from 'node:http';
+import * as net from 'node:net';
+import { Endpoints } from '../api/server/Endpoints';
+import type { FFPrinterDetail } from '../models/ff-models';
+
+/**
+ * Options for a {@link FakePrinterServer}.
+ */
+export interface FakePrinterOptions {
+  /** Serial number the printer accepts and reports (default: `SNFAKE000001`). */
+  serialNumber?: string;
+  /** Check code the printer accepts (default: `123456`). */
+  checkCode?: string;
+  /** Printer name (default: `Fake Printer`). */
+  name?: string;
+  /** Machine type reported by M115 (default: `Flashforge Adventurer 5M Pro`). */
+  machineType?: string;
+  /** Fields merged over the default `/detail` payload. */
+  detail?: Partial<FFPrinterDetail>;
+  /** File names returned by `/gcodeList`. */
+  files?: string[];
+  /** Delay in milliseconds before every HTTP response and TCP reply (default: 0). */
+  latencyMs?: number;
+  /** Split every TCP reply into writes of at most this many bytes (default: 0, one write). */
+  tcpChunkSize?: number;
+  /** Delay in milliseconds between TCP reply fragments (default: 0, the next event loop turn). */
+  tcpChunkDelayMs?: number;
+  /** PNG bytes served by `/gcodeThumb` and `M662` (default: a 1x1 transparent PNG). */
+  thumbnail?: Buffer;
+  /**
+   * M662 reply layout: `ok` followed by the PNG, as on the Adventurer 5M series (default), or a
+   * magic marker and big-endian length before the PNG, as on the Adventurer 3.
+   */
+  thumbnailFormat?: 'adventurer5m' | 'adventurer3';
+  /** Host to bind (default: `127.0.0.1`). */
+  host?: string;
+  /** HTTP port to bind (default: 0, an ephemeral port). */
+  httpPort?: number;
+  /** TCP port to bind (default: 0, an ephemeral port). */
+  tcpPort?: number;
+  /** Whether to run the TCP command server (default: true). */
+  enableTcp?: boolean;
+  /** Keep the file bytes of every HTTP upload in {@link FakeUpload.file} (default: false). */
+  recordUploads?: boolean;
+}
+
+/** An HTTP `/uploadGcode` request received by a {@link FakePrinterServer}. */
+export interface FakeUpload {
+  /** Request headers, with lower-cased names. */
+  headers: http.IncomingHttpHeaders;
+  /** Number of request body bytes received. */
+  bytesReceived: number;
+  /** The uploaded file's bytes when `recordUploads` is enabled, otherwise null. */
+  file: Buffer | null;
+}
+
+/** Per-connection TCP parser state. */
+interface TcpSession {
+  /** Partial command line waiting for its newline. */
+  pending: string;
+  /** Raw upload bytes still expected after an M28. */
+  uploadRemaining: number;
+}
+
+/**
+ * A fake printer listening on loopback.
+ *
+ * HTTP requests are validated against the configured serial number and check code just like the
+ * firmware does. TCP commands get canned replies in the firmware's format (`CMD Mxxx Received.`
+ * followed by the payload and `ok`), and M28 uploads are consumed byte-exactly until M29. `M661`
+ * lists {@link files} in the binary Adventurer 5M layout and `M662` returns {@link thumbnail}.
+ *
+ * Emits `http` with the endpoint path for every HTTP request and `tcp` with the command code
+ * (for example `M115`) for every TCP command.
+ */
+export class FakePrinterServer extends EventEmitter {
+  public readonly serialNumber: string;
+  public readonly checkCode: string;
+  public readonly host: string;
+  /** Current `/detail` payload; tests may mutate it to simulate state changes. */
+  public detail: FFPrinterDetail;
+  /** File names returned by `/gcodeList`. */
+  public files: string[];
+  /** Delay in milliseconds before every response. */
+  public latencyMs: number;
+  /** Maximum bytes per TCP reply write; 0 writes each reply at once. */
+  public tcpChunkSize: number;
+  /** Delay in milliseconds between TCP reply fragments. */
+  public tcpChunkDelayMs: number;
+  /** PNG bytes served by `/gcodeThumb` and `M662`. */
+  public thumbnail: Buffer;
+
+  /** Requests served per HTTP endpoint path. */
+  public readonly httpRequests = new Map<string, number>();
+  /** Commands answered per TCP command code. */
+  public readonly tcpCommands = new Map<string, number>();
+  /** Number of HTTP connections accepted (lower than the request count when keep-alive works). */
+  public httpConnections = 0;
+  /** Number of TCP connections accepted. */
+  public tcpConnections = 0;
+  /** Completed HTTP uploads, in arrival order. */
+  public readonly uploads: FakeUpload[] = [];
+  /** Number of upcoming HTTP uploads to cut off with a connection reset after their first chunk. */
+  public failUploads = 0;
+  /**
+   * Number of upcoming HTTP uploads answered with HTTP 503 after their whole body arrived. The
+   * upload is still recorded, like a printer that stored the file and then failed to reply.
+   */
+  public failUploadReplies = 0;
+
+  private readonly options: FakePrinterOptions;
+  private readonly httpServer: http.Server;
+  private readonly tcpServer: net.Server | null;
+  private readonly tcpSockets = new Set<net.Socket>();
+  private offline = false;
+
+  /**
+   * Creates a new FakePrinterServer. Call {@link start} to begin listening.
+   * @param options Printer identity, canned data and timing.
+   */
+  constructor(options: FakePrinterOptions = {}) {
+    super();
+    this.options = options;
+    this.serialNumber = options.serialNumber ?? 'SNFAKE000001';
+    this.checkCode = options.checkCode ?? '123456';
+    this.host = options.host ?? '127.0.0.1';
+    this.latencyMs = options.latencyMs ?? 0;
+    this.tcpChunkSize = options.tcpChunkSize ?? 0;
+    this.tcpChunkDelayMs = options.tcpChunkDelayMs ?? 0;
+    this.thumbnail = options.thumbnail ?? Buffer.from(FAKE_THUMBNAIL_BASE64, 'base64');
+    this.files = options.files ?? ['benchy.gcode', 'calibration_cube.gcode'];
+    this.detail = {
+      name: options.name ?? 'Fake Printer',
+      firmwareVersion: '3.1.3-2.2.3',
+      ipAddr: this.host,
+      macAddr: '00:00:00:00:00:00',
+      measure: '220X220X220',
+      nozzleCnt: 1,
+      nozzleModel: '0.4mm',
+      pid: 0x24,
+      status: 'ready',
+      platTemp: 25,
+      platTargetTemp: 0,
+      rightTemp: 25,
+      rightTargetTemp: 0,
+      printProgress: 0,
+      cumulativeFilament: 0,
+      cumulativePrintTime: 0,
+      ...options.detail,
+    };
+
+    this.httpServer = http.createServer((req, res) => this.handleHttpRequest(req, res));
+    this.httpServer.on('connection', () => {
+      this.httpConnections++;
+    });
+
+    this.tcpServer =
+      options.enableTcp === false
+        ? null
+        : net.createServer((socket) => this.handleTcpSocket(socket));
+  }
+
+  /** Bound HTTP port (valid after {@link start}). */
+  public get httpPort(): number {
+    return (this.httpServer.address() as net.AddressInfo).port;
+  }
+
+  /** Bound TCP port (valid after {@link start}), or 0 when TCP is disabled. */
+  public get tcpPort(): number {
+    return this.tcpServer ? (this.tcpServer.address() as net.AddressInfo).port : 0;
+  }
+
+  /**
+   * Starts listening on the configured (or ephemeral) ports.
+   */
+  public async start(): Promise<void> {
+    await listen(this.httpServer, this.options.httpPort ?? 0, this.host);
+    if (this.tcpServer) {
+      await listen(this.tcpServer, this.options.tcpPort ?? 0, this.host);
+    }
+  }
+
+  /**
+   * Stops both servers and drops every open connection.
+   */
+  public async stop(): Promise<void> {
+    for (const socket of this.tcpSockets) {
+      socket.destroy();
+    }
+    this.tcpSockets.clear();
+    this.httpServer.closeAllConnections();
+
+    await close(this.httpServer);
+    if (this.tcpServer) {
+      await close(this.tcpServer);
+    }
+  }
+
+  /**
+   * Simulates the printer dropping off the network. While offline, HTTP requests and TCP
+   * connections are reset without a reply.
+   * @param offline True to go offline, false to come back.
+   */
+  public setOffline(offline: boolean): void {
+    this.offline = offline;
+    if (offline) {
+      for (const socket of this.tcpSockets) {
+        socket.destroy();
+      }
+      this.tcpSockets.clear();
+      this.httpServer.closeAllConnections();
+    }
+  }
+
+  /**
+   * Gets the number of requests served for an HTTP endpoint.
+   * @param path Endpoint path, e.g. `Endpoints.Detail`.
+   */
+  public getHttpRequestCount(path: string): number {
+    return this.httpRequests.get(path) ?? 0;
+  }
+
+  /**
+   * Gets the number of times a TCP command was answered.
+   * @param code Command code without the `~` prefix, e.g. `M115`.
+   */
+  public getTcpCommandCount(code: string): number {
+    return this.tcpCommands.get(code) ?? 0;
+  }
+
+  private handleHttpRequest(req: http.IncomingMessage, res: http.ServerResponse): void {
+    if (this.offline) {
+      req.socket.destroy();
+      return;
+    }
+
+    const path = (req.url ?? '/').split('?')[0];
+    this.httpRequests.set(path, (this.httpRequests.get(path) ?? 0) + 1);
+    this.emit('http', path);
+
+    const isUpload = path === Endpoints.UploadFile;
+    const failUpload = isUpload && this.failUploads > 0;
+    if (failUpload) this.failUploads--;
+
+    const chunks: Buffer[] = [];
+    let bytesReceived = 0;
+    req.on('data', (chunk: Buffer) => {
+      if (failUpload) {
+        req.socket.destroy();
+        return;
+      }
+      bytesReceived += chunk.length;
+      // Upload bodies are only kept when recording.
+      if (!isUpload || this.options.recordUploads) chunks.push(chunk);
+    });
+    req.on('end', () => {
+      if (isUpload) {
+        this.uploads.push({
+          headers: req.headers,
+          bytesReceived,
+          file: this.options.recordUploads
+            ? extractMultipartFile(Buffer.concat(chunks), req.headers['content-type'])
+            : null,
+        });
+      }
+      const failReply = isUpload && this.failUploadReplies > 0;
+      if (failReply) this.failUploadReplies--;
+      const body = this.routeHttp(path, req, isUpload ? Buffer.alloc(0) : Buffer.concat(chunks));
+      this.afterLatency(() => {
+        if (failReply) {
+          res.writeHead(503).end();
+          return;
+        }
+        if (body === null) {
+          res.writeHead(404).end();
+          return;
+        }
+        res.writeHead(200, { 'Content-Type': 'application/json' }).end(JSON.stringify(body));
+      });
+    });
+  }
+
+  /** Builds the JSON reply for an HTTP endpoint, or null for an unknown path. */
+  private routeHttp(path: string, req: http.IncomingMessage, body: Buffer): object | null {
+    const authorized =
+      path === Endpoints.UploadFile
+        ? req.headers.serialnumber === this.serialNumber && req.headers.checkcode === this.checkCode
+        : this.isAuthorized(body);
+    if (!authorized) {
+      return { code: 1, message: 'Unauthorized' };
+    }
+
+    switch (path) {
+      case Endpoints.Detail:
+        return { code: 0, message: 'Success', detail: this.detail };
+      case Endpoints.Product:
+        return {
+          code: 0,
+          message: 'Success',
+          product: {
+            chamberTempCtrlState: 0,
+            externalFanCtrlState: 1,
+            internalFanCtrlState: 1,
+            lightCtrlState: 1,
+            nozzleTempCtrlState: 1,
+            platformTempCtrlState: 1,
+          },
+        };
+      case Endpoints.GCodeList:
+        return { code: 0, message: 'Success', gcodeList: this.files };
+      case Endpoints.GCodeThumb:
+        return { code: 0, message: 'Success', imageData: this.thumbnail.toString('base64') };
+      case Endpoints.Control:
+      case Endpoints.GCodePrint:
+      case Endpoints.UploadFile:
+        return { code: 0, message: 'Success' };
+      default:
+        return null;
+    }
+  }
+
+  private isAuthorized(body: Buffer): boolean {
+    try {
+      const payload = JSON.parse(body.toString('utf8')) as {
+        serialNumber?: string;
+        checkCode?: string;
+      };
+      return payload.serialNumber === this.serialNumber && payload.checkCode === this.checkCode;
+    } catch {
+      return false;
+    }
+  }
+
+  private handleTcpSocket(socket: net.Socket): void {
+    this.tcpConnections++;
+    if (this.offline) {
+      socket.destroy();
+      return;
+    }
+
+    this.tcpSockets.add(socket);
+    // Fragments must leave as separate segments instead of waiting on Nagle's algorithm.
+    socket.setNoDelay(true);
+    const session: TcpSession = { pending: '', uploadRemaining: 0 };
+
+    socket.on('data', (chunk: Buffer) => this.handleTcpData(socket, session, chunk));
+    socket.on('error', () => undefined);
+    socket.on('close', () => {
+      this.tcpSockets.delete(socket);
+    });
+  }
+
+  /** Splits incoming bytes into command lines, skipping raw upload data after an M28. */
+  private handleTcpData(socket: net.Socket, session: TcpSession, chunk: Buffer): void {
+    let offset = 0;
+    while (offset < chunk.length) {
+      if (session.uploadRemaining > 0) {
+        const take = Math.min(session.uploadRemaining, chunk.length - offset);
+        session.uploadRemaining -= take;
+        offset += take;
+        continue;
+      }
+
+      const newline = chunk.indexOf(0x0a, offset);
+      if (newline === -1) {
+        session.pending += chunk.toString('latin1', offset);
+        return;
+      }
+
+      const line = (session.pending + chunk.toString('latin1', offset, newline)).trim();
+      session.pending = '';
+      offset = newline + 1;
+      if (line.length > 0) {
+        this.handleTcpCommand(socket, session, line);
+      }
+    }
+  }
+
+  private handleTcpCommand(socket: net.Socket, session: TcpSession, line: string): void {
+    const parts = line.replace(/^~/, '').split(/\s+/);
+    const code = parts[0].toUpperCase();
+    this.tcpCommands.set(code, (this.tcpCommands.get(code) ?? 0) + 1);
+    this.emit('tcp', code);
+
+    if (code === 'M28') {
+      session.uploadRemaining = Number.parseInt(parts[1] ?? '0', 10) || 0;
+    }
+
+    const reply = this.tcpReply(code);
+    this.afterLatency(() => this.writeTcpReply(socket, reply));
+  }
+
+  /**
+   * Writes a reply at once, or in {@link tcpChunkSize} fragments spaced by
+   * {@link tcpChunkDelayMs}.
+   */
+  private writeTcpReply(socket: net.Socket, reply: Buffer): void {
+    const chunkSize = this.tcpChunkSize;
+    if (chunkSize <= 0 || reply.length <= chunkSize) {
+      if (!socket.destroyed) socket.write(reply);
+      return;
+    }
+
+    let offset = 0;
+    const writeNext = () => {
+      if (socket.destroyed) return;
+      socket.write(reply.subarray(offset, offset + chunkSize));
+      offset += chunkSize;
+      if (offset >= reply.length) return;
+      if (this.tcpChunkDelayMs > 0) {
+        setTimeout(writeNext, this.tcpChunkDelayMs);
+      } else {
+        setImmediate(writeNext);
+      }
+    };
+    writeNext();
+  }
+
+  /** Builds the canned reply for a TCP command. */
+  private tcpReply(code: string): Buffer {
+    const header = `CMD ${code} Received.\r\n`;
+    switch (code) {
+      case 'M661':
+        return Buffer.concat([Buffer.from(`${header}ok\r\n`, 'latin1'), this.fileListPayload()]);
+      case 'M662':
+        return this.thumbnailReply(header);
+      default:
+        return Buffer.from(this.textReply(code, header), 'latin1');
+    }
+  }
+
+  /** Builds the text reply for a TCP command. */
+  private textReply(code: string, header: string): string {
+    switch (code) {
+      case 'M601':
+        return `${header}Control Success V2.1.\r\nok\r\n`;
+      case 'M602':
+        return `${header}Control Release.\r\nok\r\n`;
+      case 'M115':
+        return (
+          `${header}Machine Type: ${this.options.machineType ?? DEFAULT_MACHINE_TYPE}\r\n` +
+          `Machine Name: ${this.detail.name ?? ''}\r\n` +
+          `Firmware: v${this.detail.firmwareVersion ?? ''}\r\n` +
+          `SN: ${this.serialNumber}\r\n` +
+          'X:220 Y:220 Z:220\r\n' +
+          'Tool count: 1\r\n' +
+          `Mac Address: ${this.detail.macAddr ?? ''}\r\nok\r\n`
+        );
+      case 'M105':
+        return (
+          `${header}T0:${this.detail.rightTemp ?? 0}/${this.detail.rightTargetTemp ?? 0} ` +
+          `B:${this.detail.platTemp ?? 0}/${this.detail.platTargetTemp ?? 0}\r\nok\r\n`
+        );
+      case 'M27':
+        return `${header}SD printing byte 0/100\r\nLayer: 0/0\r\nok\r\n`;
+      case 'M114':
+        return `${header}X:0 Y:0 Z:0 A:0 B:0\r\nok\r\n`;
+      case 'M119':
+        return (
+          `${header}Endstop X-max:0 Y-max:0 Z-min:0\r\nMachineStatus: READY\r\n` +
+          'MoveMode: READY\r\nStatus S:0 L:0 J:0 F:0\r\nLED: 1\r\nCurrentFile: \r\nok\r\n'
+        );
+      default:
+        return `${header}ok\r\n`;
+    }
+  }
+
+  /**
+   * Encodes {@link files} in the Adventurer 5M `M661` layout: a `D\xAA\xAAD` marker and file count,
+   * then `::\xA3\xA3`, a big-endian path length and the `/data/` path for each file.
+   */
+  private fileListPayload(): Buffer {
+    const parts: Buffer[] = [];
+    const head = Buffer.from([0x44, 0xaa, 0xaa, 0x44, 0, 0, 0, 0]);
+    head.writeUInt32BE(this.files.length, 4);
+    parts.push(head);
+    for (const file of this.files) {
+      const filePath = Buffer.from(`/data/${file}`, 'utf8');
+      const entry = Buffer.from([0x3a, 0x3a, 0xa3, 0xa3, 0, 0, 0, 0]);
+      entry.writeUInt32BE(filePath.length, 4);
+      parts.push(entry, filePath);
+    }
+    return Buffer.concat(parts);
+  }
+
+  /** Builds the `M662` reply in the configured {@link FakePrinterOptions.thumbnailFormat}. */
+  private thumbnailReply(header: string): Buffer {
+    if (this.options.thumbnailFormat === 'adventurer3') {
+      const length = Buffer.from([0xa2, 0xa2, 0x2a, 0x2a, 0, 0, 0, 0]);
+      length.writeUInt32BE(this.thumbnail.length, 4);
+      return Buffer.concat([
+        Buffer.from('CMD M662 Received.\nack header length: 64\n', 'latin1'),
+        length,
+        this.thumbnail,
+      ]);
+    }
+    return Buffer.concat([Buffer.from(`${header}ok\r\n`, 'latin1'), this.thumbnail]);
+  }
+
+  private afterLatency(fn: () => void): void {
+    if (this.latencyMs > 0) {
+      setTimeout(fn, this.latencyMs);
+    } else {
+      fn();
+    }
+  }
+}
+
+/** Machine type reported by M115 unless overridden. */
+const DEFAULT_MACHINE_TYPE = 'Flashforge Adventurer 5M Pro';
+
+/** A 1x1 transparent PNG served by `/gcodeThumb`. */
+const FAKE_THUMBNAIL_BASE64 =
+  'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII=';
+
+function listen(server: net.Server, port: number, host: string): Promise<void> {
+  return new Promise((resolve, reject) => {
+    server.once('error', reject);
+    server.listen(port, host, () => {
+      server.off('error', reject);
+      resolve();
+    });
+  });
+}
+
+function close(server: net.Server): Promise<void> {
+  return new Promise((resolve) => {
+    server.close(() => resolve());
+  });
+}
+
+/** Returns the first part of a multipart/form-data body. */
+function extractMultipartFile(body: Buffer, contentType: string | undefined): Buffer | null {
+  const match = /boundary=(?:"([^"]+)"|([^;]+))/i.exec(contentType ?? '');
+  if (!match) return null;
+  const headerEnd = body.indexOf('\r\n\r\n');
+  if (headerEnd < 0) return null;
+  const partEnd = body.indexOf(`\r\n--${match[1] ?? match[2]}`, headerEnd + 4);
+  return partEnd < 0 ? null : body.subarray(headerEnd + 4, partEnd);
+}